@@ -0,0 +1,29 @@
+"""Microbenchmarks for engine and abstracts primitives, with baseline regression gates."""
+
+from .cases import BENCHMARKS
+from .harness import (
+    Benchmark,
+    Comparison,
+    Measurement,
+    Run,
+    compare_to_baseline,
+    load_results,
+    mann_whitney_greater,
+    measure,
+    run_benchmarks,
+    write_results,
+)
+
+__all__ = [
+    "BENCHMARKS",
+    "Benchmark",
+    "Comparison",
+    "Measurement",
+    "Run",
+    "compare_to_baseline",
+    "load_results",
+    "mann_whitney_greater",
+    "measure",
+    "run_benchmarks",
+    "write_results",
+]
@@ -0,0 +1,437 @@
+from __future__ import annotations
+
+from contextlib import contextmanager, redirect_stdout
+from dataclasses import dataclass, field
+from random import Random
+from time import perf_counter_ns
+from typing import Any, Callable, Iterator
+import argparse
+import json
+import os
+
+from ..avge_abstracts.AVGEEnvironment import GamePhase
+from ..constants import Pile, PlayerID, max_bench_size
+from ..server.protocol.command_codec import split_command
+from ..server.server_types import JsonObject
+
+SLOTS = ('p1', 'p2')
+EVENT_TYPES = ('card_moved', 'energy_moved', 'attack', 'input_result', 'phase_change')
+DEFAULT_GAMES = 3
+DEFAULT_MAX_EVENTS = 400
+
+# Server module globals a benchmark room replaces; all of them are restored
+# afterwards so the harness can run inside a test process.
+_ROOM_GLOBALS = (
+    'frontend_game_bridge',
+    'entity_setup_payload',
+    'protocol_seq',
+    'room_stage',
+    'pending_command_acks',
+    'next_command_id',
+    'winner_announced',
+    'winner_main_menu_ack_slots',
+    'room_finished_notified',
+    'transport_state',
+    'socketio',
+    'expected_p1_session_id',
+    'expected_p2_session_id',
+    '_notify_router_room_finished',
+    '_schedule_process_termination',
+    '_environment_body_for_client',
+)
+
+
+@dataclass(frozen=True)
+class EventSample:
+    event_type: str
+    total_ns: int
+    engine_ns: int
+    formatting_ns: int
+    bridge_ns: int
+    commands: int
+
+    @property
+    def protocol_ns(self) -> int:
+        return max(0, self.total_ns - self.engine_ns - self.formatting_ns - self.bridge_ns)
+
+
+@dataclass(frozen=True)
+class LatencyStats:
+    event_type: str
+    count: int
+    p50_ns: float
+    p99_ns: float
+    commands_per_event: float
+    # Share of total time per bucket across all samples of this type.
+    engine_share: float
+    formatting_share: float
+    bridge_share: float
+    protocol_share: float
+
+    def to_json(self) -> JsonObject:
+        return {
+            'event_type': self.event_type,
+            'count': self.count,
+            'p50_ns': self.p50_ns,
+            'p99_ns': self.p99_ns,
+            'commands_per_event': self.commands_per_event,
+            'engine_share': self.engine_share,
+            'formatting_share': self.formatting_share,
+            'bridge_share': self.bridge_share,
+            'protocol_share': self.protocol_share,
+        }
+
+
+@dataclass
+class LatencyRun:
+    samples: list[EventSample] = field(default_factory=list)
+    games: int = 0
+    winners: int = 0
+
+    def stats(self) -> list[LatencyStats]:
+        return [summarize(event_type, [sample for sample in self.samples if sample.event_type == event_type]) for event_type in EVENT_TYPES]
+
+    def to_json(self) -> JsonObject:
+        return {
+            'games': self.games,
+            'winners': self.winners,
+            'events': len(self.samples),
+            'stats': [entry.to_json() for entry in self.stats()],
+        }
+
+
+def percentile(values: list[int], fraction: float) -> float:
+    """Nearest-rank percentile; 0.0 for an empty list."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, min(len(ordered), int(-(-fraction * len(ordered) // 1))))
+    return float(ordered[rank - 1])
+
+
+def summarize(event_type: str, samples: list[EventSample]) -> LatencyStats:
+    total = sum(sample.total_ns for sample in samples)
+
+    def share(values: Callable[[EventSample], int]) -> float:
+        return sum(values(sample) for sample in samples) / total if total else 0.0
+
+    return LatencyStats(
+        event_type=event_type,
+        count=len(samples),
+        p50_ns=percentile([sample.total_ns for sample in samples], 0.5),
+        p99_ns=percentile([sample.total_ns for sample in samples], 0.99),
+        commands_per_event=sum(sample.commands for sample in samples) / len(samples) if samples else 0.0,
+        engine_share=share(lambda sample: sample.engine_ns),
+        formatting_share=share(lambda sample: sample.formatting_ns),
+        bridge_share=share(lambda sample: sample.bridge_ns),
+        protocol_share=share(lambda sample: sample.protocol_ns),
+    )
+
+
+class _Stopwatch:
+    """Accumulates time spent inside wrapped callables, per bucket."""
+
+    def __init__(self) -> None:
+        self.totals: dict[str, int] = {}
+
+    def reset(self) -> None:
+        self.totals = {}
+
+    def wrap(self, bucket: str, fn: Callable[..., Any]) -> Callable[..., Any]:
+        def _timed(*args: Any, **kwargs: Any) -> Any:
+            start = perf_counter_ns()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.totals[bucket] = self.totals.get(bucket, 0) + perf_counter_ns() - start
+
+        return _timed
+
+    def get(self, bucket: str) -> int:
+        return self.totals.get(bucket, 0)
+
+
+class _CollectingSocket:
+    """Stands in for Socket.IO; queues emitted packets on the addressed client."""
+
+    def __init__(self) -> None:
+        self.inbox_by_sid: dict[str, list[JsonObject]] = {}
+
+    def emit(self, event: str, payload: Any, to: str | None = None) -> None:
+        if event != 'protocol_packets' or to is None or not isinstance(payload, dict):
+            return
+        packets = payload.get('packets')
+        if isinstance(packets, list):
+            self.inbox_by_sid.setdefault(to, []).extend(packet for packet in packets if isinstance(packet, dict))
+
+
+@contextmanager
+def _benchmark_room(server: Any) -> Iterator[_CollectingSocket]:
+    from ..server.game_runner import FrontendGameBridge
+    from ..server.models.server_models import MultiplayerTransportState
+
+    saved = {name: getattr(server, name) for name in _ROOM_GLOBALS}
+    socket = _CollectingSocket()
+    bridge = FrontendGameBridge()
+    try:
+        server.frontend_game_bridge = bridge
+        server.entity_setup_payload = bridge.get_setup_payload()
+        server.protocol_seq = 0
+        server.room_stage = 'live'
+        server.pending_command_acks = []
+        server.next_command_id = 1
+        server.winner_announced = False
+        server.winner_main_menu_ack_slots = set()
+        server.room_finished_notified = False
+        server.transport_state = MultiplayerTransportState(disconnect_grace_seconds=server.DISCONNECT_GRACE_SECONDS)
+        server.socketio = socket
+        server.expected_p1_session_id = ''
+        server.expected_p2_session_id = ''
+        server._notify_router_room_finished = lambda reason, winner=None: None
+        server._schedule_process_termination = lambda reason: None
+        yield socket
+    finally:
+        for name, value in saved.items():
+            setattr(server, name, value)
+
+
+class _ScriptedRoom:
+    """Two scripted clients talking to the real room protocol in-process.
+
+    Every command is ACKed by each slot that has to ACK it as soon as it
+    arrives, and targeted input queries are answered with seeded picks, so
+    the measured latency is server-side work only.
+    """
+
+    def __init__(self, server: Any, socket: _CollectingSocket, watch: _Stopwatch, choices: Random) -> None:
+        from ..server.replay.selfplay import _input_result_for_command
+
+        self.server = server
+        self.socket = socket
+        self.watch = watch
+        self.choices = choices
+        self.input_result_for_command = _input_result_for_command
+        self.last_seq = {slot: 0 for slot in SLOTS}
+        self.pending_inputs: list[tuple[str, JsonObject, JsonObject]] = []
+        self.commands = 0
+        self.winner = False
+
+        bridge = server.frontend_game_bridge
+        bridge.env.forward = watch.wrap('engine', bridge.env.forward)
+        bridge._commands_from_response = watch.wrap('formatting', bridge._commands_from_response)
+        bridge._current_setup_payload = watch.wrap('formatting', bridge._current_setup_payload)
+        bridge.handle_frontend_event = watch.wrap('bridge', bridge.handle_frontend_event)
+        server._environment_body_for_client = watch.wrap('environment_body', server._environment_body_for_client)
+
+        for slot in SLOTS:
+            self._send(slot, 'register_client', {'requested_slot': slot})
+        self._drain_inboxes()
+
+    @property
+    def env(self) -> Any:
+        return self.server.frontend_game_bridge.env
+
+    def _send(self, slot: str, packet_type: str, body: JsonObject) -> None:
+        payload = {
+            'ACK': self.last_seq[slot],
+            'PacketType': packet_type,
+            'Body': body,
+            'client_id': f'sid-{slot}',
+        }
+        response, _ = self.server._process_protocol_packet(payload, slot)
+        packets = response.get('packets')
+        if isinstance(packets, list):
+            self.socket.inbox_by_sid.setdefault(f'sid-{slot}', []).extend(packets)
+
+    def _drain_inboxes(self) -> None:
+        # ACK until every delivered command is settled; input queries are
+        # parked so they can be timed as their own input_result event.
+        while True:
+            delivered: tuple[str, JsonObject] | None = None
+            for slot in SLOTS:
+                inbox = self.socket.inbox_by_sid.get(f'sid-{slot}')
+                while inbox:
+                    packet = inbox.pop(0)
+                    seq = packet.get('SEQ')
+                    if isinstance(seq, int) and seq > self.last_seq[slot]:
+                        self.last_seq[slot] = seq
+                    if packet.get('PacketType') == 'command' and isinstance(packet.get('Body'), dict):
+                        delivered = (slot, packet['Body'])
+                        break
+                if delivered is not None:
+                    break
+            if delivered is None:
+                return
+
+            slot, body = delivered
+            command = str(body.get('command', ''))
+            parts = split_command(command)
+            self.commands += 1
+            if parts and parts[0] == 'winner':
+                self.winner = True
+            client_event: JsonObject = {
+                'event_kind': 'ack',
+                'command': command,
+                'command_id': body.get('command_id'),
+            }
+            if parts and parts[0] == 'input':
+                response_data = self.input_result_for_command(parts, self.choices)
+                if response_data is not None:
+                    self.pending_inputs.append((slot, client_event, response_data))
+                    continue
+            self._send(slot, 'update_frontend', {'client_event': client_event})
+
+    def timed(self, event_type: str, send: Callable[[], None]) -> EventSample:
+        self.watch.reset()
+        commands_before = self.commands
+        start = perf_counter_ns()
+        send()
+        self._drain_inboxes()
+        total = perf_counter_ns() - start
+        engine = self.watch.get('engine')
+        formatting = self.watch.get('formatting')
+        return EventSample(
+            event_type=event_type,
+            total_ns=total,
+            engine_ns=engine,
+            formatting_ns=formatting + self.watch.get('environment_body'),
+            bridge_ns=max(0, self.watch.get('bridge') - engine - formatting),
+            commands=self.commands - commands_before,
+        )
+
+    def frontend_event(self, slot: str, event_type: str, response_data: JsonObject) -> Callable[[], None]:
+        client_event = {'event_kind': 'frontend_event', 'event_type': event_type, 'response_data': response_data, 'context': {}}
+        return lambda: self._send(slot, 'update_frontend', {'client_event': client_event})
+
+    def answer_input(self) -> Callable[[], None]:
+        slot, client_event, response_data = self.pending_inputs.pop(0)
+        answer = dict(client_event, event_kind='input_result', response_data=response_data)
+        return lambda: self._send(slot, 'update_frontend', {'client_event': answer})
+
+
+def _bench_candidate(player: Any) -> Any:
+    from ..avge_abstracts.AVGECards import AVGECharacterCard
+
+    if len(player.cardholders[Pile.BENCH]) >= max_bench_size:
+        return None
+    for card in player.cardholders[Pile.HAND]:
+        if isinstance(card, AVGECharacterCard):
+            return card
+    return None
+
+
+def _next_client_event(
+    room: _ScriptedRoom,
+    attempts: dict[tuple[int, str, str], int],
+    choices: Random,
+) -> tuple[str, Callable[[], None]] | None:
+    # Each turn benches a character from hand, attaches one energy, tries an
+    # attack and falls back to the phase buttons; None once the game is over.
+    if room.pending_inputs:
+        return 'input_result', room.answer_input()
+
+    env = room.env
+    player = env.player_turn
+    slot = 'p1' if player.unique_id == PlayerID.P1 else 'p2'
+    active = env.get_active_card(player.unique_id)
+    key = (env.round_id, slot, str(env.game_phase))
+    attempt = attempts.get(key, 0)
+    attempts[key] = attempt + 1
+    if env.game_phase == GamePhase.PHASE_2:
+        bench_card = _bench_candidate(player) if attempt == 0 else None
+        if bench_card is not None:
+            return 'card_moved', room.frontend_event(slot, 'card_moved', {
+                'card_id': bench_card.unique_id,
+                'to_zone_id': f'{slot}-bench',
+            })
+        if attempt <= 1 and player.energy and active is not None:
+            attempts[key] = 2
+            return 'energy_moved', room.frontend_event(slot, 'energy_moved', {
+                'energy_id': player.energy[0].unique_id,
+                'to_attached_to_card_id': active.unique_id,
+            })
+        return 'phase_change', room.frontend_event(slot, 'phase2_attack_button_clicked', {})
+    if env.game_phase == GamePhase.ATK_PHASE:
+        if attempt == 0 and active is not None:
+            return 'attack', room.frontend_event(slot, 'card_action', {
+                'action': choices.choice(['atk1', 'atk2']),
+                'card_id': active.unique_id,
+            })
+        return 'phase_change', room.frontend_event(slot, 'atk_skip_button_clicked', {})
+    return None
+
+
+def play_benchmark_game(
+    server: Any,
+    *,
+    choice_seed: int,
+    max_events: int,
+    after_event: Callable[[_ScriptedRoom], None] | None = None,
+) -> tuple[list[EventSample], bool]:
+    """Play one scripted game through the room protocol and time each client event.
+
+    ``after_event`` runs outside the timed region after every sample, with the
+    room still live, so other harnesses can inspect state between events.
+    """
+    choices = Random(choice_seed)
+    watch = _Stopwatch()
+    samples: list[EventSample] = []
+    attempts: dict[tuple[int, str, str], int] = {}
+    with open(os.devnull, 'w') as sink, redirect_stdout(sink), _benchmark_room(server) as socket:
+        room = _ScriptedRoom(server, socket, watch, choices)
+        while len(samples) < max_events and not room.winner:
+            next_event = _next_client_event(room, attempts, choices)
+            if next_event is None:
+                break
+            samples.append(room.timed(*next_event))
+            if after_event is not None:
+                after_event(room)
+        return samples, room.winner
+
+
+def run_latency_benchmark(*, games: int = DEFAULT_GAMES, max_events: int = DEFAULT_MAX_EVENTS, seed: int = 0) -> LatencyRun:
+    # Importing the room module builds its default bridge, which is chatty.
+    with open(os.devnull, 'w') as sink, redirect_stdout(sink):
+        from ..server import server
+
+    run = LatencyRun()
+    for game in range(games):
+        samples, winner = play_benchmark_game(server, choice_seed=seed + game, max_events=max_events)
+        run.samples.extend(samples)
+        run.games += 1
+        run.winners += int(winner)
+    return run
+
+
+def _print_stats(run: LatencyRun) -> None:
+    print(f'games={run.games} winners={run.winners} events={len(run.samples)}')
+    print(f'{"event":<14} {"count":>6} {"p50":>10} {"p99":>10} {"cmds/ev":>8} {"engine":>7} {"format":>7} {"bridge":>7} {"proto":>7}')
+    for entry in run.stats():
+        print(
+            f'{entry.event_type:<14} {entry.count:>6} {entry.p50_ns / 1000:>8.1f}us {entry.p99_ns / 1000:>8.1f}us '
+            f'{entry.commands_per_event:>8.2f} {entry.engine_share:>7.1%} {entry.formatting_share:>7.1%} '
+            f'{entry.bridge_share:>7.1%} {entry.protocol_share:>7.1%}'
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description='Measure frontend event to emitted command latency through the in-process room protocol.'
+    )
+    parser.add_argument('--games', type=int, default=DEFAULT_GAMES, help='Scripted games to play (default: %(default)s).')
+    parser.add_argument('--max-events', type=int, default=DEFAULT_MAX_EVENTS, help='Client events per game cap (default: %(default)s).')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the scripted clients\' choices (default: %(default)s).')
+    parser.add_argument('--json', dest='json_path', default=None, help='Write per-event-type stats as JSON to this path.')
+    args = parser.parse_args(argv)
+
+    run = run_latency_benchmark(games=args.games, max_events=args.max_events, seed=args.seed)
+    _print_stats(run)
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as handle:
+            json.dump(run.to_json(), handle, indent=2, sort_keys=True)
+            handle.write('\n')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
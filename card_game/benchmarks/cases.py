@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+from contextlib import redirect_stdout
+from typing import Any
+import io
+
+from ..avge_abstracts.AVGECardholder import AVGECardholder
+from ..avge_abstracts.AVGECards import AVGECard
+from ..avge_abstracts.envcache import EnvironmentCache
+from ..constants import Data, Pile, Response, ResponseType
+from ..engine.engine import Engine, EngineHistory, HistoryState
+from ..engine.engine_constants import EngineGroup, QueueStatus
+from ..engine.engine_queue import EngineQueue
+from ..engine.event import Event, Packet
+from ..engine.event_listener import AssessorEventListener
+from .harness import Benchmark, Setup
+
+# Groups that never raise an ordering query, so traversal cost is measured
+# without needing group_ordering input.
+UNORDERED_GROUPS = (
+    EngineGroup.INTERNAL_1,
+    EngineGroup.EXTERNAL_PRECHECK_1,
+    EngineGroup.EXTERNAL_PRECHECK_2,
+    EngineGroup.INTERNAL_2,
+    EngineGroup.EXTERNAL_POSTCHECK_1,
+    EngineGroup.INTERNAL_3,
+    EngineGroup.INTERNAL_4,
+)
+
+
+class _BenchEvent(Event):
+    def __init__(self, internal_listeners: int = 0, **kwargs: Any):
+        self.internal_listeners = internal_listeners
+        super().__init__(**kwargs)
+
+    def core(self, args: dict | None = None) -> Response:
+        return Response(ResponseType.CORE, Data())
+
+    def invert_core(self, args: dict | None = None) -> None:
+        return
+
+    def generate_internal_listeners(self):
+        for index in range(self.internal_listeners):
+            group = UNORDERED_GROUPS[index % len(UNORDERED_GROUPS)]
+            self.event_listener_groups[group].append(_AcceptListener(group))
+
+
+class _AcceptListener(AssessorEventListener[Event]):
+    def __init__(self, group: EngineGroup, matches: bool = True):
+        super().__init__(group=group, requires_runtime_info=False)
+        self.matches = matches
+
+    def event_match(self, event: Event) -> bool:
+        return self.matches
+
+    def assess(self) -> Response:
+        return Response(ResponseType.ACCEPT, Data())
+
+    def update_status(self):
+        return
+
+
+def _engine_queue(size: int) -> Setup:
+    priorities = [(index * 7919) % 13 for index in range(size)]
+
+    def setup():
+        queue: EngineQueue[int] = EngineQueue()
+
+        def run() -> object:
+            queue.set_status(QueueStatus.BUFFERED)
+            for item, priority in enumerate(priorities):
+                queue.propose(item, priority)
+            queue.flush_buffer()
+            while queue.queue_len() > 0:
+                queue.pop()
+            return queue
+
+        return run
+
+    return setup
+
+
+def _packet_expansion(size: int) -> Setup:
+    def setup():
+        packet: Packet[Event] = Packet([(lambda: [_BenchEvent()]) for _ in range(size)])
+
+        def run() -> object:
+            while packet.get_next_event() is not None:
+                pass
+            return packet
+
+        return run
+
+    return setup
+
+
+def _event_forward(size: int) -> Setup:
+    def setup():
+        event = _BenchEvent(internal_listeners=size)
+        event._initialize()
+
+        def run() -> object:
+            while event.forward([], {}).response_type != ResponseType.FINISHED:
+                pass
+            return event
+
+        return run
+
+    return setup
+
+
+def _listener_attach(size: int) -> Setup:
+    # Half of the external listeners match, the way most card listeners
+    # reject most events in event_match.
+    def setup():
+        engine: Engine[Event] = Engine()
+        for index in range(size):
+            engine.add_listener(_AcceptListener(UNORDERED_GROUPS[index % len(UNORDERED_GROUPS)], matches=index % 2 == 0))
+        engine._propose(Packet([_BenchEvent()]))
+
+        def run() -> object:
+            while engine.forward({}).response_type != ResponseType.NO_MORE_EVENTS:
+                pass
+            return engine
+
+        return run
+
+    return setup
+
+
+def _history_search(size: int) -> Setup:
+    history: EngineHistory[Event] = EngineHistory()
+    for index in range(size):
+        history.propose_event(_BenchEvent(slot=index % 10, marker=index))
+    history.set_unformalized_changes(HistoryState.FORMALIZED)
+    target = {'slot': (size - 1) % 10, 'marker': size - 1}
+
+    def setup():
+        return lambda: history.search(0, _BenchEvent, target)
+
+    return setup
+
+
+def _cardholder_ops(size: int) -> Setup:
+    def setup():
+        cards = [AVGECard(f'card_{index}') for index in range(size)]
+        reversed_ids = [card.unique_id for card in reversed(cards)]
+
+        def run() -> object:
+            holder = AVGECardholder(Pile.DECK)
+            for card in cards:
+                holder.add_card(card)
+            holder.reorder(list(reversed_ids))
+            holder.peek_n(size // 2)
+            holder.get_posn(cards[0])
+            for card in cards[::2]:
+                holder.remove_card_by_id(card.unique_id)
+            while len(holder) > 0:
+                holder.pop_card()
+            return holder
+
+        return run
+
+    return setup
+
+
+def _envcache_set_rewind(size: int) -> Setup:
+    cards = [AVGECard(f'card_{index}') for index in range(size)]
+    card_ids = [card.unique_id for card in cards]
+
+    def setup():
+        cache = EnvironmentCache(list(card_ids))
+        for card in cards:
+            cache.set(card, 'hp', 100)
+
+        def run() -> object:
+            cache.capture()
+            for card in cards:
+                cache.set(card, 'hp', 90)
+                cache.set(card, 'shield', 1)
+            for card in cards[::2]:
+                cache.delete(card, 'hp')
+            cache.rewind()
+            return cache
+
+        return run
+
+    return setup
+
+
+def _setup_payload(size: int) -> Setup:
+    # size = scripted frontend events played first, so later sizes serialize
+    # a board with discards, attached energy and status effects.
+    from ..server.game_runner import FrontendGameBridge, environment_to_setup_payload
+    from ..server.replay.selfplay import play_scripted_game
+
+    with redirect_stdout(io.StringIO()):
+        bridge = FrontendGameBridge()
+        if size > 0:
+            play_scripted_game(bridge, choice_seed=size, max_frontend_events=size)
+    env = bridge.env
+
+    def setup():
+        return lambda: environment_to_setup_payload(env)
+
+    return setup
+
+
+BENCHMARKS: tuple[Benchmark, ...] = (
+    Benchmark('engine_queue.propose_flush_pop', (100, 1_000, 10_000), _engine_queue),
+    Benchmark('packet.deferred_expansion', (10, 100, 1_000), _packet_expansion),
+    Benchmark('event.forward_groups', (0, 8, 64), _event_forward, quick_sizes=(8,)),
+    Benchmark('engine.listener_attach', (10, 100, 1_000), _listener_attach),
+    Benchmark('engine_history.search', (100, 1_000, 10_000), _history_search),
+    Benchmark('cardholder.ops', (10, 100, 500), _cardholder_ops),
+    Benchmark('envcache.set_rewind', (10, 100, 1_000), _envcache_set_rewind),
+    Benchmark('environment_to_setup_payload', (0, 150), _setup_payload),
+)
@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from math import erf, sqrt
+from statistics import median
+from time import perf_counter_ns
+from typing import Any, Callable, Iterable
+import gc
+import json
+import platform
+
+RESULTS_VERSION = 1
+DEFAULT_SAMPLES = 15
+DEFAULT_TARGET_SAMPLE_NS = 2_000_000
+DEFAULT_THRESHOLD = 0.15
+DEFAULT_ALPHA = 0.01
+CALIBRATION_INNER = 4
+
+# setup() builds fresh state and returns the operation to time; the harness
+# runs setup untimed before every timed call because most cases consume
+# their state (pop a queue, rewind a cache, drain a packet).
+type Setup = Callable[[], Callable[[], object]]
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    name: str
+    sizes: tuple[int, ...]
+    build: Callable[[int], Setup]
+    quick_sizes: tuple[int, ...] = ()
+
+    def sizes_for(self, quick: bool) -> tuple[int, ...]:
+        return (self.quick_sizes or self.sizes[:1]) if quick else self.sizes
+
+
+@dataclass(frozen=True)
+class Measurement:
+    name: str
+    size: int
+    inner: int
+    samples_ns: tuple[float, ...]
+    # Each sample divided by a calibration batch timed right before it, so
+    # CPU frequency changes and noisy neighbours cancel out of comparisons.
+    relative: tuple[float, ...] = ()
+
+    @property
+    def key(self) -> str:
+        return f'{self.name}[{self.size}]'
+
+    @property
+    def median_ns(self) -> float:
+        return median(self.samples_ns)
+
+
+@dataclass(frozen=True)
+class Comparison:
+    key: str
+    baseline_ns: float
+    current_ns: float
+    ratio: float
+    p_value: float
+    regressed: bool
+
+
+@dataclass
+class Run:
+    calibration_ns: float
+    measurements: list[Measurement] = field(default_factory=list)
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            'version': RESULTS_VERSION,
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'calibration_ns': self.calibration_ns,
+            'results': {
+                measurement.key: {
+                    'name': measurement.name,
+                    'size': measurement.size,
+                    'inner': measurement.inner,
+                    'median_ns': measurement.median_ns,
+                    'samples_ns': list(measurement.samples_ns),
+                    'relative': list(measurement.relative),
+                }
+                for measurement in self.measurements
+            },
+        }
+
+
+def _time_batch(setup: Setup, inner: int) -> float:
+    operations = [setup() for _ in range(inner)]
+    start = perf_counter_ns()
+    for operation in operations:
+        operation()
+    return (perf_counter_ns() - start) / inner
+
+
+def measure(
+    name: str,
+    size: int,
+    setup: Setup,
+    *,
+    samples: int = DEFAULT_SAMPLES,
+    target_sample_ns: int = DEFAULT_TARGET_SAMPLE_NS,
+) -> Measurement:
+    """Time one case: pick a batch size that fills ~target_sample_ns, then take ``samples`` batches."""
+    inner = 1
+    while True:
+        per_op = _time_batch(setup, inner)
+        if per_op * inner >= target_sample_ns / 4 or inner >= 1 << 16:
+            break
+        inner *= 4
+    inner = max(1, min(1 << 16, int(target_sample_ns / max(per_op, 1.0))))
+
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    collected: list[float] = []
+    relative: list[float] = []
+    try:
+        for _ in range(samples):
+            reference = _time_batch(_calibration_workload, CALIBRATION_INNER)
+            sample = _time_batch(setup, inner)
+            collected.append(sample)
+            relative.append(sample / reference)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return Measurement(name, size, inner, tuple(collected), tuple(relative))
+
+
+def _calibration_workload() -> Callable[[], object]:
+    def _run() -> object:
+        table: dict[int, int] = {}
+        for value in range(2000):
+            table[value & 255] = table.get(value & 255, 0) + value
+        return sorted(table.values())
+
+    return _run
+
+
+def measure_calibration(*, samples: int = DEFAULT_SAMPLES) -> float:
+    """Median time of the fixed pure-Python reference workload on this machine."""
+    return median(_time_batch(_calibration_workload, CALIBRATION_INNER) for _ in range(samples))
+
+
+def run_benchmarks(
+    benchmarks: Iterable[Benchmark],
+    *,
+    quick: bool = False,
+    samples: int = DEFAULT_SAMPLES,
+    name_filter: str | None = None,
+    on_measurement: Callable[[Measurement], None] | None = None,
+) -> Run:
+    run = Run(calibration_ns=measure_calibration(samples=samples))
+    for benchmark in benchmarks:
+        if name_filter and name_filter not in benchmark.name:
+            continue
+        for size in benchmark.sizes_for(quick):
+            measurement = measure(benchmark.name, size, benchmark.build(size), samples=samples)
+            run.measurements.append(measurement)
+            if on_measurement is not None:
+                on_measurement(measurement)
+    return run
+
+
+def mann_whitney_greater(current: Iterable[float], baseline: Iterable[float]) -> float:
+    """One-sided Mann-Whitney U p-value for "current is slower than baseline".
+
+    Normal approximation with tie correction; fine for the 10+ samples per side
+    the runner collects, and needs no scipy.
+    """
+    current_values = list(current)
+    baseline_values = list(baseline)
+    n1 = len(current_values)
+    n2 = len(baseline_values)
+    if n1 == 0 or n2 == 0:
+        return 1.0
+
+    ranked = sorted([(value, 0) for value in current_values] + [(value, 1) for value in baseline_values])
+    ranks = [0.0] * len(ranked)
+    tie_term = 0.0
+    index = 0
+    while index < len(ranked):
+        end = index
+        while end + 1 < len(ranked) and ranked[end + 1][0] == ranked[index][0]:
+            end += 1
+        average_rank = (index + end) / 2 + 1
+        for position in range(index, end + 1):
+            ranks[position] = average_rank
+        tied = end - index + 1
+        tie_term += tied ** 3 - tied
+        index = end + 1
+
+    rank_sum = sum(rank for rank, (_, group) in zip(ranks, ranked) if group == 0)
+    u_statistic = rank_sum - n1 * (n1 + 1) / 2
+    total = n1 + n2
+    variance = n1 * n2 / 12 * ((total + 1) - tie_term / (total * (total - 1)))
+    if variance <= 0:
+        return 1.0
+    z_score = (u_statistic - n1 * n2 / 2 - 0.5) / sqrt(variance)
+    return 0.5 * (1 - erf(z_score / sqrt(2)))
+
+
+def compare_to_baseline(
+    run: Run,
+    baseline: dict[str, Any],
+    *,
+    threshold: float = DEFAULT_THRESHOLD,
+    alpha: float = DEFAULT_ALPHA,
+) -> list[Comparison]:
+    """Compare a run with a saved baseline using calibration-relative samples.
+
+    Baselines recorded on another machine stay comparable because both sides
+    are expressed in units of the reference workload. A case regresses only if
+    it is both more than ``threshold`` slower at the median and significantly
+    slower across samples (p < ``alpha``); either alone is too noisy to fail a
+    run on.
+    """
+    baseline_results = baseline.get('results', {})
+
+    comparisons: list[Comparison] = []
+    for measurement in run.measurements:
+        entry = baseline_results.get(measurement.key)
+        if not isinstance(entry, dict) or not measurement.relative:
+            continue
+        baseline_relative = [float(value) for value in entry.get('relative', [])]
+        if not baseline_relative:
+            continue
+        baseline_median = median(baseline_relative)
+        ratio = median(measurement.relative) / baseline_median if baseline_median > 0 else 1.0
+        # Reported in this machine's nanoseconds for readability.
+        baseline_ns = baseline_median * run.calibration_ns
+        p_value = mann_whitney_greater(measurement.relative, baseline_relative)
+        comparisons.append(Comparison(
+            key=measurement.key,
+            baseline_ns=baseline_ns,
+            current_ns=median(measurement.relative) * run.calibration_ns,
+            ratio=ratio,
+            p_value=p_value,
+            regressed=ratio > 1 + threshold and p_value < alpha,
+        ))
+    return comparisons
+
+
+def load_results(path: str) -> dict[str, Any]:
+    with open(path, 'r', encoding='utf-8') as handle:
+        payload = json.load(handle)
+    if not isinstance(payload, dict) or payload.get('version') != RESULTS_VERSION:
+        raise ValueError(f'{path} is not a version {RESULTS_VERSION} benchmark results file')
+    return payload
+
+
+def write_results(path: str, run: Run) -> None:
+    with open(path, 'w', encoding='utf-8') as handle:
+        json.dump(run.to_json(), handle, indent=2, sort_keys=True)
+        handle.write('\n')
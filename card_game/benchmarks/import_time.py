@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from ..server.server_types import JsonObject
+from .bridge_latency import percentile
+
+DEFAULT_REPEATS = 5
+# Module a process imports before it can serve: the router app, and the pipe
+# runtime every room worker starts (which builds the default room on import).
+STARTUP_TARGETS = {
+    'router': 'card_game.server.router_server',
+    'room': 'card_game.server.workers.room_pipe_runtime',
+}
+_PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# Runs in a fresh interpreter so nothing is already cached in sys.modules.
+_PROBE = r"""
+from contextlib import redirect_stdout
+from time import perf_counter_ns
+import importlib, io, json, sys
+target = sys.argv[1]
+before = set(sys.modules)
+began = perf_counter_ns()
+with redirect_stdout(io.StringIO()):
+    importlib.import_module(target)
+elapsed = perf_counter_ns() - began
+loaded = set(sys.modules) - before
+# The room runtime reroutes print() to stderr, so write the result directly.
+sys.stdout.write(json.dumps({
+    'import_ns': elapsed,
+    'modules': len(loaded),
+    'catalog_modules': sum(1 for name in loaded if name.startswith('card_game.catalog.')),
+}) + '\n')
+"""
+
+
+@dataclass(frozen=True)
+class ImportRun:
+    name: str
+    module: str
+    import_ns: list[int]
+    modules: int
+    catalog_modules: int
+
+    def to_json(self) -> JsonObject:
+        samples = [float(value) for value in self.import_ns]
+        return {
+            'name': self.name,
+            'module': self.module,
+            'import_p50_ns': percentile(samples, 0.50),
+            'import_min_ns': min(self.import_ns),
+            'modules': self.modules,
+            'catalog_modules': self.catalog_modules,
+        }
+
+
+def _probe(module: str) -> dict[str, Any]:
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [str(_PROJECT_ROOT), env.get('PYTHONPATH')]))
+    completed = subprocess.run(
+        [sys.executable, '-c', _PROBE, module],
+        cwd=_PROJECT_ROOT,
+        env=env,
+        stdin=subprocess.DEVNULL,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def measure_startup(name: str, module: str, repeats: int) -> ImportRun:
+    """Import ``module`` in ``repeats`` fresh interpreters; module counts come from the last one."""
+    samples: list[int] = []
+    result: dict[str, Any] = {}
+    for _ in range(max(1, repeats)):
+        result = _probe(module)
+        samples.append(int(result['import_ns']))
+    return ImportRun(
+        name=name,
+        module=module,
+        import_ns=samples,
+        modules=int(result['modules']),
+        catalog_modules=int(result['catalog_modules']),
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='Time router and room startup imports in fresh interpreters.')
+    parser.add_argument('--repeats', type=int, default=DEFAULT_REPEATS, help='Fresh interpreters per target (default: %(default)s).')
+    parser.add_argument('--json', dest='json_path', default=None, help='Write the runs as JSON to this path.')
+    args = parser.parse_args(argv)
+
+    runs = [measure_startup(name, module, args.repeats) for name, module in STARTUP_TARGETS.items()]
+    for run in runs:
+        samples = [float(value) for value in run.import_ns]
+        print(
+            f'{run.name:<7} import_p50={percentile(samples, 0.50) / 1e6:.1f}ms import_min={min(run.import_ns) / 1e6:.1f}ms '
+            f'modules={run.modules} catalog_modules={run.catalog_modules}'
+        )
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as handle:
+            json.dump([run.to_json() for run in runs], handle, indent=2, sort_keys=True)
+            handle.write('\n')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from time import perf_counter_ns
+import argparse
+import json
+import random
+
+from ..server.matchmaking_engine import MatchmakingEngine, PairingWindow
+from ..server.matchmaking_queue import QueueEntry
+from ..server.server_types import JsonObject
+from .bridge_latency import percentile
+
+DEFAULT_PLAYERS = 10_000
+DEFAULT_SECONDS = 60
+DEFAULT_ARRIVALS_PER_SECOND = 100
+# The router's default sweep interval.
+SWEEP_SECONDS = 0.5
+RATING_MEAN = 1500.0
+RATING_STDDEV = 300.0
+
+
+@dataclass(frozen=True)
+class MatchmakingLoadRun:
+    players: int
+    arrivals: int
+    pairs: int
+    still_queued: int
+    # The first sweep, over every seeded player at once.
+    first_sweep_ns: int
+    match_ns: list[int]
+    sweep_ns: list[int]
+    # Simulated seconds from queueing to pairing, per paired player.
+    queue_seconds: list[float]
+    rating_gaps: list[float]
+
+    def to_json(self) -> JsonObject:
+        return {
+            'players': self.players,
+            'arrivals': self.arrivals,
+            'pairs': self.pairs,
+            'still_queued': self.still_queued,
+            'first_sweep_ns': self.first_sweep_ns,
+            'match_p50_ns': percentile([float(value) for value in self.match_ns], 0.50),
+            'match_p99_ns': percentile([float(value) for value in self.match_ns], 0.99),
+            'sweep_p50_ns': percentile([float(value) for value in self.sweep_ns], 0.50),
+            'sweep_p99_ns': percentile([float(value) for value in self.sweep_ns], 0.99),
+            'queue_p50_seconds': percentile(self.queue_seconds, 0.50),
+            'queue_p99_seconds': percentile(self.queue_seconds, 0.99),
+            'rating_gap_p50': percentile(self.rating_gaps, 0.50),
+            'rating_gap_p99': percentile(self.rating_gaps, 0.99),
+        }
+
+
+def measure_matchmaking_load(
+    players: int,
+    seconds: float,
+    arrivals_per_second: float,
+    window: PairingWindow | None = None,
+    seed: int = 0,
+) -> MatchmakingLoadRun:
+    """Seed ``players`` queued at once, then feed arrivals and sweep on a simulated clock.
+
+    Each arrival is matched as the router does on enqueue, and the whole
+    queue is swept every SWEEP_SECONDS. Latencies are wall-clock; queue
+    times use the simulated clock.
+    """
+    rng = random.Random(seed)
+    engine = MatchmakingEngine(window)
+    queue_seconds: list[float] = []
+    rating_gaps: list[float] = []
+    match_ns: list[int] = []
+    sweep_ns: list[int] = []
+    pairs = 0
+
+    def _record(pair: tuple[QueueEntry, QueueEntry], now: float) -> None:
+        nonlocal pairs
+        pairs += 1
+        rating_gaps.append(abs(pair[0].rating - pair[1].rating))
+        queue_seconds.extend(now - entry.enqueued_at for entry in pair)
+
+    def _sweep(now: float) -> int:
+        began = perf_counter_ns()
+        swept = engine.sweep(now)
+        elapsed = perf_counter_ns() - began
+        sweep_ns.append(elapsed)
+        for pair in swept:
+            _record(pair, now)
+        return elapsed
+
+    for index in range(players):
+        engine.push(QueueEntry(f'seed-{index}', 0.0, rating=rng.gauss(RATING_MEAN, RATING_STDDEV)))
+    first_sweep_ns = _sweep(0.0)
+
+    arrivals = 0
+    now = 0.0
+    next_sweep = SWEEP_SECONDS
+    while now < seconds:
+        now += rng.expovariate(arrivals_per_second) if arrivals_per_second > 0 else seconds
+        while next_sweep <= min(now, seconds):
+            _sweep(next_sweep)
+            next_sweep += SWEEP_SECONDS
+        if now >= seconds:
+            break
+        session_id = f'arrival-{arrivals}'
+        arrivals += 1
+        engine.push(QueueEntry(session_id, now, rating=rng.gauss(RATING_MEAN, RATING_STDDEV)))
+        began = perf_counter_ns()
+        pair = engine.match(session_id, now)
+        match_ns.append(perf_counter_ns() - began)
+        if pair is not None:
+            _record(pair, now)
+
+    return MatchmakingLoadRun(
+        players=players,
+        arrivals=arrivals,
+        pairs=pairs,
+        still_queued=len(engine),
+        first_sweep_ns=first_sweep_ns,
+        match_ns=match_ns,
+        sweep_ns=sweep_ns,
+        queue_seconds=queue_seconds,
+        rating_gaps=rating_gaps,
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='Measure rating-bucketed pairing cost and queue times with many players queued.')
+    parser.add_argument('--players', type=int, default=DEFAULT_PLAYERS, help='Players queued at the start (default: %(default)s).')
+    parser.add_argument('--seconds', type=float, default=DEFAULT_SECONDS, help='Simulated seconds of arrivals (default: %(default)s).')
+    parser.add_argument('--arrivals', type=float, default=DEFAULT_ARRIVALS_PER_SECOND, help='Arrivals per simulated second (default: %(default)s).')
+    parser.add_argument('--json', dest='json_path', default=None, help='Write the run as JSON to this path.')
+    args = parser.parse_args(argv)
+
+    run = measure_matchmaking_load(args.players, args.seconds, args.arrivals)
+    summary = run.to_json()
+    print(
+        f'players={run.players} arrivals={run.arrivals} pairs={run.pairs} still_queued={run.still_queued}\n'
+        f'first_sweep={run.first_sweep_ns / 1e6:.1f}ms '
+        f'sweep p50={summary["sweep_p50_ns"] / 1000:.0f}us p99={summary["sweep_p99_ns"] / 1000:.0f}us '
+        f'match p50={summary["match_p50_ns"] / 1000:.1f}us p99={summary["match_p99_ns"] / 1000:.1f}us\n'
+        f'queue p50={summary["queue_p50_seconds"]:.2f}s p99={summary["queue_p99_seconds"]:.2f}s '
+        f'rating_gap p50={summary["rating_gap_p50"]:.0f} p99={summary["rating_gap_p99"]:.0f}'
+    )
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as handle:
+            json.dump(summary, handle, indent=2, sort_keys=True)
+            handle.write('\n')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
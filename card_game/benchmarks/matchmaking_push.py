@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from threading import Lock
+from time import monotonic, perf_counter_ns, sleep
+import argparse
+import json
+import random
+
+from ..server import router_server
+from ..server.matchmaking_engine import PairingWindow
+from ..server.server_types import JsonObject
+from .bridge_latency import percentile
+
+DEFAULT_PLAYERS = 1_000
+DEFAULT_SECONDS = 20.0
+DEFAULT_CHURN_PER_SECOND = 10.0
+# How often a polling client asks for its status.
+DEFAULT_POLL_SECONDS = 1.0
+# A window no rating gap fits, so every player stays queued for the run.
+NO_PAIRING = PairingWindow(base=-1.0, growth_per_second=0.0, maximum=-1.0)
+
+
+@dataclass(frozen=True)
+class MatchmakingPushRun:
+    players: int
+    seconds: float
+    churned: int
+    poll_seconds: float
+    fallback_poll_seconds: float
+    # matchmaking_update events pushed during the run, one per session updated.
+    pushed: int
+    status_ns: list[int]
+
+    @property
+    def polling_requests_per_second(self) -> float:
+        return self.players / self.poll_seconds
+
+    @property
+    def push_requests_per_second(self) -> float:
+        return self.pushed / self.seconds + self.players / self.fallback_poll_seconds
+
+    def to_json(self) -> JsonObject:
+        return {
+            'players': self.players,
+            'seconds': self.seconds,
+            'churned': self.churned,
+            'poll_seconds': self.poll_seconds,
+            'fallback_poll_seconds': self.fallback_poll_seconds,
+            'pushed': self.pushed,
+            'pushed_per_second': self.pushed / self.seconds,
+            'polling_requests_per_second': self.polling_requests_per_second,
+            'push_requests_per_second': self.push_requests_per_second,
+            'reduction': self.polling_requests_per_second / self.push_requests_per_second,
+            'status_p50_ns': percentile([float(value) for value in self.status_ns], 0.50),
+            'status_p99_ns': percentile([float(value) for value in self.status_ns], 0.99),
+        }
+
+
+def measure_matchmaking_push(
+    players: int,
+    seconds: float,
+    churn_per_second: float,
+    poll_seconds: float = DEFAULT_POLL_SECONDS,
+    seed: int = 0,
+) -> MatchmakingPushRun:
+    """Keep ``players`` queued on a real router and count what it pushes.
+
+    Every player holds an auth socket. ``churn_per_second`` random players
+    leave and rejoin the queue, which moves everyone behind them; the
+    router's sweeper pushes those positions in batches. Polling traffic is
+    one status request per player every ``poll_seconds``; push traffic is
+    the updates sent plus one fallback poll per player every
+    MATCHMAKING_FALLBACK_POLL_SECONDS.
+    """
+    rng = random.Random(seed)
+    pushed = 0
+    pushed_lock = Lock()
+
+    def _count(socket_sids: list[str], _update: JsonObject) -> None:
+        nonlocal pushed
+        with pushed_lock:
+            pushed += len(socket_sids)
+
+    with TemporaryDirectory(prefix='matchmaking-push-') as directory:
+        router = router_server.MatchmakingRouter(db_path=str(Path(directory) / 'router.sqlite3'), pairing_window=NO_PAIRING)
+        session_ids = [router.login(f'player-{index}', None).session_id for index in range(players)]
+        for index, session_id in enumerate(session_ids):
+            router.register_auth_socket(session_id, f'sid-{index}')
+            router.enqueue(session_id)
+
+        status_ns: list[int] = []
+        for session_id in session_ids:
+            began = perf_counter_ns()
+            router.status(session_id)
+            status_ns.append(perf_counter_ns() - began)
+
+        router.set_matchmaking_notifier(_count)
+        churned = 0
+        began_at = monotonic()
+        while (elapsed := monotonic() - began_at) < seconds:
+            due = int(elapsed * churn_per_second) - churned
+            for _ in range(due):
+                session_id = rng.choice(session_ids)
+                router.dequeue(session_id)
+                router.enqueue(session_id)
+                churned += 1
+            sleep(0.01)
+        with pushed_lock:
+            total = pushed
+        for session_id in session_ids:
+            router.dequeue(session_id)
+
+    return MatchmakingPushRun(
+        players=players,
+        seconds=seconds,
+        churned=churned,
+        poll_seconds=poll_seconds,
+        fallback_poll_seconds=float(router_server.MATCHMAKING_FALLBACK_POLL_SECONDS),
+        pushed=total,
+        status_ns=status_ns,
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='Compare status polling with pushed matchmaking updates for many waiting players.')
+    parser.add_argument('--players', type=int, default=DEFAULT_PLAYERS, help='Players kept in the queue (default: %(default)s).')
+    parser.add_argument('--seconds', type=float, default=DEFAULT_SECONDS, help='Seconds to run (default: %(default)s).')
+    parser.add_argument('--churn', type=float, default=DEFAULT_CHURN_PER_SECOND, help='Players leaving and rejoining per second (default: %(default)s).')
+    parser.add_argument('--poll-seconds', type=float, default=DEFAULT_POLL_SECONDS, help='Polling interval to compare against (default: %(default)s).')
+    parser.add_argument('--json', dest='json_path', default=None, help='Write the run as JSON to this path.')
+    args = parser.parse_args(argv)
+
+    run = measure_matchmaking_push(args.players, args.seconds, args.churn, args.poll_seconds)
+    summary = run.to_json()
+    print(
+        f'players={run.players} seconds={run.seconds:.0f} churned={run.churned} pushed={run.pushed}\n'
+        f'polling={summary["polling_requests_per_second"]:.0f} req/s '
+        f'push={summary["pushed_per_second"]:.0f} updates/s + fallback={run.players / run.fallback_poll_seconds:.0f} req/s '
+        f'reduction={summary["reduction"]:.1f}x\n'
+        f'status p50={summary["status_p50_ns"] / 1000:.1f}us p99={summary["status_p99_ns"] / 1000:.1f}us'
+    )
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as handle:
+            json.dump(summary, handle, indent=2, sort_keys=True)
+            handle.write('\n')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
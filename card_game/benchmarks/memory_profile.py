@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+from contextlib import redirect_stdout
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+import argparse
+import gc
+import json
+import os
+import random
+import tracemalloc
+
+from ..server.server_types import JsonObject
+from .bridge_latency import _ScriptedRoom, play_benchmark_game
+
+DEFAULT_GAMES = 2
+DEFAULT_MAX_EVENTS = 2000
+DEFAULT_WARMUP_TURNS = 2
+DEFAULT_MAX_BYTES_PER_TURN = 64 * 1024
+DEFAULT_TOP = 15
+TRACE_FRAMES = 1
+
+# The harness's own bookkeeping (latency samples, snapshots) is not room memory.
+_IGNORED_FILES = (
+    tracemalloc.__file__,
+    '<frozen importlib._bootstrap>',
+    '<frozen importlib._bootstrap_external>',
+    '<unknown>',
+    str(Path(__file__).with_name('*')),
+)
+
+
+@dataclass(frozen=True)
+class TurnSample:
+    turn: int
+    traced_bytes: int
+    structures: dict[str, int]
+
+
+@dataclass(frozen=True)
+class AllocationSite:
+    location: str
+    size_diff: int
+    count_diff: int
+    size: int
+
+
+@dataclass(frozen=True)
+class GameMemory:
+    seed: int
+    winner: bool
+    turns: tuple[TurnSample, ...]
+    bytes_per_turn: float
+    growth_per_turn: dict[str, float]
+    top_sites: tuple[AllocationSite, ...]
+
+    def to_json(self) -> JsonObject:
+        return {
+            'seed': self.seed,
+            'winner': self.winner,
+            'bytes_per_turn': self.bytes_per_turn,
+            'growth_per_turn': dict(self.growth_per_turn),
+            'turns': [
+                {'turn': sample.turn, 'traced_bytes': sample.traced_bytes, 'structures': dict(sample.structures)}
+                for sample in self.turns
+            ],
+            'top_sites': [
+                {'location': site.location, 'size_diff': site.size_diff, 'count_diff': site.count_diff, 'size': site.size}
+                for site in self.top_sites
+            ],
+        }
+
+
+@dataclass
+class MemoryReport:
+    max_bytes_per_turn: float
+    games: list[GameMemory] = field(default_factory=list)
+
+    @property
+    def failed(self) -> bool:
+        return any(game.bytes_per_turn > self.max_bytes_per_turn for game in self.games)
+
+    def to_json(self) -> JsonObject:
+        return {
+            'max_bytes_per_turn': self.max_bytes_per_turn,
+            'failed': self.failed,
+            'games': [game.to_json() for game in self.games],
+        }
+
+
+def room_structure_sizes(server: Any) -> dict[str, int]:
+    """Entry counts of the room state that lives as long as the match does."""
+    env = server.frontend_game_bridge.env
+    engine = env._engine
+    return {
+        'history_events': sum(len(entries) for entries in engine.event_history.history.values()),
+        'external_listeners': len(engine._external_listeners),
+        'packet_reactors': len(engine._packet_reactors),
+        'constraints': len(engine._constraints),
+        'pending_packets': sum(len(session.pending_packets) for session in server.transport_state.session_by_sid.values()),
+        'pending_command_acks': len(server.pending_command_acks),
+        'cache_entries': sum(len(entries) for entries in env.cache.cache.values()),
+        'cache_changelog': len(env.cache._changelog),
+    }
+
+
+def growth_slope(points: list[tuple[int, int]]) -> float:
+    """Least-squares slope of value over turn; 0.0 with fewer than two turns."""
+    if len(points) < 2:
+        return 0.0
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    spread = sum((x - mean_x) ** 2 for x, _ in points)
+    if spread == 0:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / spread
+
+
+def _room_snapshot() -> tracemalloc.Snapshot:
+    gc.collect()
+    return tracemalloc.take_snapshot().filter_traces([
+        tracemalloc.Filter(False, pattern) for pattern in _IGNORED_FILES
+    ])
+
+
+def _top_sites(first: tracemalloc.Snapshot, last: tracemalloc.Snapshot, limit: int) -> tuple[AllocationSite, ...]:
+    sites: list[AllocationSite] = []
+    for stat in last.compare_to(first, 'lineno')[:limit]:
+        frame = stat.traceback[0]
+        sites.append(AllocationSite(f'{frame.filename}:{frame.lineno}', stat.size_diff, stat.count_diff, stat.size))
+    return tuple(sites)
+
+
+def profile_game(
+    server: Any,
+    *,
+    seed: int,
+    max_events: int = DEFAULT_MAX_EVENTS,
+    warmup_turns: int = DEFAULT_WARMUP_TURNS,
+    top: int = DEFAULT_TOP,
+) -> GameMemory:
+    """Play one seeded game through the room protocol, sampling memory at every turn boundary.
+
+    The global RNG is seeded the same way recorded games are, and restored
+    afterwards. Growth is the slope across turns after ``warmup_turns``, so
+    one-off allocations from the opening hands and first packets don't count.
+    """
+    turns: list[TurnSample] = []
+    snapshots: list[tracemalloc.Snapshot] = []
+    last_turn: list[int] = []
+
+    def _at_turn_boundary(room: _ScriptedRoom) -> None:
+        turn = room.env.round_id
+        if last_turn and last_turn[0] == turn:
+            return
+        last_turn[:] = [turn]
+        snapshot = _room_snapshot()
+        traced = sum(stat.size for stat in snapshot.statistics('filename'))
+        turns.append(TurnSample(turn, traced, room_structure_sizes(room.server)))
+        if len(turns) == warmup_turns + 1 or len(snapshots) < 2:
+            snapshots.append(snapshot)
+        else:
+            snapshots[-1] = snapshot
+
+    rng_state = random.getstate()
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start(TRACE_FRAMES)
+    try:
+        random.seed(seed)
+        _, winner = play_benchmark_game(server, choice_seed=seed, max_events=max_events, after_event=_at_turn_boundary)
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+        random.setstate(rng_state)
+
+    measured = turns[warmup_turns:]
+    growth = {
+        name: growth_slope([(sample.turn, sample.structures[name]) for sample in measured])
+        for name in (measured[0].structures if measured else {})
+    }
+    return GameMemory(
+        seed=seed,
+        winner=winner,
+        turns=tuple(turns),
+        bytes_per_turn=growth_slope([(sample.turn, sample.traced_bytes) for sample in measured]),
+        growth_per_turn=growth,
+        top_sites=_top_sites(snapshots[-2], snapshots[-1], top) if len(snapshots) >= 2 else (),
+    )
+
+
+def run_memory_profile(
+    *,
+    games: int = DEFAULT_GAMES,
+    seed: int = 0,
+    max_events: int = DEFAULT_MAX_EVENTS,
+    warmup_turns: int = DEFAULT_WARMUP_TURNS,
+    max_bytes_per_turn: float = DEFAULT_MAX_BYTES_PER_TURN,
+    top: int = DEFAULT_TOP,
+) -> MemoryReport:
+    with open(os.devnull, 'w') as sink, redirect_stdout(sink):
+        from ..server import server
+
+    report = MemoryReport(max_bytes_per_turn=max_bytes_per_turn)
+    for game in range(games):
+        report.games.append(profile_game(server, seed=seed + game, max_events=max_events, warmup_turns=warmup_turns, top=top))
+    return report
+
+
+def _print_report(report: MemoryReport) -> None:
+    for game in report.games:
+        status = 'FAIL' if game.bytes_per_turn > report.max_bytes_per_turn else 'ok'
+        print(
+            f'{status:<4} seed={game.seed} turns={len(game.turns)} winner={game.winner} '
+            f'bytes/turn={game.bytes_per_turn:.0f} limit={report.max_bytes_per_turn:.0f}'
+        )
+        for name, slope in game.growth_per_turn.items():
+            final = game.turns[-1].structures[name] if game.turns else 0
+            print(f'     {name:<22} final={final:>7} per_turn={slope:>9.2f}')
+        for site in game.top_sites:
+            print(f'     {site.size_diff:>+10} B {site.count_diff:>+7} blocks  {site.location}')
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description='Profile room memory over seeded scripted games and fail if it grows too fast per turn.'
+    )
+    parser.add_argument('--games', type=int, default=DEFAULT_GAMES, help='Seeded games to play (default: %(default)s).')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the first game (default: %(default)s).')
+    parser.add_argument('--max-events', type=int, default=DEFAULT_MAX_EVENTS, help='Client events per game cap (default: %(default)s).')
+    parser.add_argument('--warmup-turns', type=int, default=DEFAULT_WARMUP_TURNS, help='Turns ignored before measuring growth (default: %(default)s).')
+    parser.add_argument('--max-bytes-per-turn', type=float, default=DEFAULT_MAX_BYTES_PER_TURN, help='Traced growth per turn that fails the run (default: %(default)s).')
+    parser.add_argument('--top', type=int, default=DEFAULT_TOP, help='Allocation sites to report per game (default: %(default)s).')
+    parser.add_argument('--json', dest='json_path', default=None, help='Write the full report as JSON to this path.')
+    args = parser.parse_args(argv)
+
+    report = run_memory_profile(
+        games=args.games,
+        seed=args.seed,
+        max_events=args.max_events,
+        warmup_turns=args.warmup_turns,
+        max_bytes_per_turn=args.max_bytes_per_turn,
+        top=args.top,
+    )
+    _print_report(report)
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as handle:
+            json.dump(report.to_json(), handle, indent=2, sort_keys=True)
+            handle.write('\n')
+    return 1 if report.failed else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
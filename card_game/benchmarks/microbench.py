@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from pathlib import Path
+import argparse
+
+from .cases import BENCHMARKS
+from .harness import (
+    DEFAULT_ALPHA,
+    DEFAULT_SAMPLES,
+    DEFAULT_THRESHOLD,
+    Measurement,
+    compare_to_baseline,
+    load_results,
+    run_benchmarks,
+    write_results,
+)
+
+DEFAULT_BASELINE_PATH = Path(__file__).with_name('baselines.json')
+
+
+def _print_measurement(measurement: Measurement) -> None:
+    print(f'{measurement.key:<48} median={measurement.median_ns / 1000:>10.2f}us inner={measurement.inner}')
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description='Run engine/abstracts microbenchmarks and compare them with the committed baselines.'
+    )
+    parser.add_argument('--quick', action='store_true', help='Run only the smallest size of each benchmark.')
+    parser.add_argument('--filter', dest='name_filter', default=None, help='Only run benchmarks whose name contains this.')
+    parser.add_argument('--samples', type=int, default=DEFAULT_SAMPLES, help='Timed samples per case (default: %(default)s).')
+    parser.add_argument('--json', dest='json_path', default=None, help='Write results as JSON to this path.')
+    parser.add_argument('--baseline', default=str(DEFAULT_BASELINE_PATH), help='Baseline results file (default: %(default)s).')
+    parser.add_argument('--no-compare', action='store_true', help='Skip the baseline comparison.')
+    parser.add_argument('--update-baseline', action='store_true', help='Overwrite the baseline file with this run.')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help='Median slowdown that can fail the run (default: %(default)s).')
+    parser.add_argument('--alpha', type=float, default=DEFAULT_ALPHA, help='Significance level for slowdowns (default: %(default)s).')
+    args = parser.parse_args(argv)
+
+    run = run_benchmarks(
+        BENCHMARKS,
+        quick=args.quick,
+        samples=args.samples,
+        name_filter=args.name_filter,
+        on_measurement=_print_measurement,
+    )
+    if args.json_path:
+        write_results(args.json_path, run)
+    if args.update_baseline:
+        write_results(args.baseline, run)
+        print(f'baseline updated: {args.baseline}')
+        return 0
+    if args.no_compare:
+        return 0
+    if not Path(args.baseline).exists():
+        print(f'no baseline at {args.baseline}; run with --update-baseline to create one')
+        return 0
+
+    comparisons = compare_to_baseline(run, load_results(args.baseline), threshold=args.threshold, alpha=args.alpha)
+    regressions = [comparison for comparison in comparisons if comparison.regressed]
+    for comparison in comparisons:
+        status = 'REGRESSED' if comparison.regressed else 'ok'
+        print(
+            f'{status:<9} {comparison.key:<48} ratio={comparison.ratio:.3f} '
+            f'baseline={comparison.baseline_ns / 1000:.2f}us current={comparison.current_ns / 1000:.2f}us '
+            f'p={comparison.p_value:.4f}'
+        )
+    print(f'compared={len(comparisons)} regressions={len(regressions)}')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,338 @@
+from __future__ import annotations
+
+from contextlib import contextmanager, redirect_stdout
+from dataclasses import dataclass
+from io import BytesIO, StringIO
+from pathlib import Path
+from time import monotonic_ns, perf_counter_ns
+from typing import Any, Iterator, Literal
+import argparse
+import json
+import os
+import select
+import subprocess
+import sys
+import tempfile
+
+from ..server.server_types import JsonObject
+from ..server.workers.pipe_framing import (
+    PIPE_FRAMING_ENV,
+    FrameDecoder,
+    PipeFraming,
+    SocketJson,
+    encode_message,
+    read_message,
+    socket_payload_fields,
+    socket_payload_from_event,
+)
+from ..server.workers.pipe_reactor import READ_CHUNK_BYTES
+from ..server.workers.room_worker import RoomWorker
+from ..server.workers.shm_ring import RING_BYTES_ENV, RING_POLL_SECONDS, RingReader, ShmRing, create_ring_fd
+from .bridge_latency import percentile
+
+type PipeTransport = Literal['pipe', 'ring']
+
+FRAMINGS: tuple[PipeFraming, ...] = ('jsonl', 'binary')
+TRANSPORTS: tuple[PipeTransport, ...] = ('pipe', 'ring')
+DEFAULT_MESSAGES = 200
+DEFAULT_REQUESTS = 200
+DEFAULT_STREAM_MESSAGES = 5000
+DEFAULT_RING_BYTES = 1024 * 1024
+BOOT_TIMEOUT_SECONDS = 60.0
+
+# Room side of a stream run: sends socket_emit events as fast as it can.
+_PRODUCER = r'''
+import json, os, sys, time
+from card_game.server.workers.pipe_framing import encode_message, socket_payload_fields
+from card_game.server.workers.shm_ring import RingWriter, ShmRing
+framing, messages, ring_fd, payload_path = sys.argv[1], int(sys.argv[2]), int(sys.argv[3]), sys.argv[4]
+with open(payload_path, encoding='utf-8') as handle:
+    fields = socket_payload_fields(json.load(handle), framing)
+pipe = os.fdopen(1, 'wb')
+writer = RingWriter(ShmRing(ring_fd), framing) if ring_fd >= 0 else None
+for seq in range(messages):
+    frame = encode_message({
+        'type': 'event',
+        'event_type': 'socket_emit',
+        'payload': {'event': 'protocol_packets', 'to': 'sid', 'sent_ns': time.monotonic_ns(), **fields},
+    }, framing)
+    if writer is None:
+        pipe.write(frame)
+        pipe.flush()
+    else:
+        writer.write(pipe, [frame])
+pipe.close()
+'''
+
+
+@dataclass(frozen=True)
+class CodecRun:
+    """In-process cost of one room -> router -> Socket.IO hop per message."""
+
+    framing: PipeFraming
+    messages: int
+    wire_bytes: int
+    room_encode_ns: int
+    router_emit_ns: int
+
+    def to_json(self) -> JsonObject:
+        total_ns = self.room_encode_ns + self.router_emit_ns
+        return {
+            'framing': self.framing,
+            'messages': self.messages,
+            'wire_bytes': self.wire_bytes,
+            'room_encode_ns_per_message': self.room_encode_ns / self.messages,
+            'router_emit_ns_per_message': self.router_emit_ns / self.messages,
+            'messages_per_second': self.messages / (total_ns / 1e9) if total_ns else None,
+        }
+
+
+@dataclass(frozen=True)
+class RoundTripRun:
+    """Router request -> room response latency over a live room process pipe."""
+
+    framing: PipeFraming
+    params_bytes: int
+    round_trip_ns: list[int]
+    transport: PipeTransport = 'pipe'
+
+    def to_json(self) -> JsonObject:
+        samples = [float(value) for value in self.round_trip_ns]
+        return {
+            'transport': self.transport,
+            'framing': self.framing,
+            'params_bytes': self.params_bytes,
+            'requests': len(self.round_trip_ns),
+            'p50_ns': percentile(samples, 0.50),
+            'p99_ns': percentile(samples, 0.99),
+        }
+
+
+@dataclass(frozen=True)
+class StreamRun:
+    """Room -> router ``socket_emit`` stream between two live processes."""
+
+    transport: PipeTransport
+    framing: PipeFraming
+    messages: int
+    elapsed_ns: int
+    latency_ns: list[int]
+
+    def to_json(self) -> JsonObject:
+        samples = [float(value) for value in self.latency_ns]
+        return {
+            'transport': self.transport,
+            'framing': self.framing,
+            'messages': self.messages,
+            'messages_per_second': self.messages / (self.elapsed_ns / 1e9) if self.elapsed_ns else None,
+            'latency_p50_ns': percentile(samples, 0.50),
+            'latency_p99_ns': percentile(samples, 0.99),
+        }
+
+
+def environment_socket_payload() -> JsonObject:
+    """A ``protocol_packets`` emit carrying a full environment body, the largest thing rooms send."""
+    from ..server.game_runner import FrontendGameBridge
+
+    with redirect_stdout(StringIO()):
+        bridge = FrontendGameBridge()
+        body = bridge.get_setup_payload()
+    # As it looks on the wire, the form router commands forward from clients.
+    return json.loads(json.dumps({'packets': [{'seq': 1, 'type': 'environment', 'body': body}]}))
+
+
+def measure_codec(framing: PipeFraming, payload: JsonObject, messages: int) -> CodecRun:
+    """Encode ``socket_emit`` events as the room does, then decode and Socket.IO-encode them as the router does."""
+    began = perf_counter_ns()
+    frames = [
+        encode_message({
+            'type': 'event',
+            'event_type': 'socket_emit',
+            'payload': {'event': 'protocol_packets', 'to': 'sid', **socket_payload_fields(payload, framing)},
+        }, framing)
+        for _ in range(messages)
+    ]
+    room_encode_ns = perf_counter_ns() - began
+
+    stream = BytesIO(b''.join(frames))
+    began = perf_counter_ns()
+    while (message := read_message(stream, framing)) is not None:
+        body = message['payload']
+        SocketJson.dumps([body['event'], socket_payload_from_event(body)], separators=(',', ':'))
+    router_emit_ns = perf_counter_ns() - began
+    return CodecRun(
+        framing=framing,
+        messages=messages,
+        wire_bytes=len(frames[0]),
+        room_encode_ns=room_encode_ns,
+        router_emit_ns=router_emit_ns,
+    )
+
+
+def measure_stream(
+    transport: PipeTransport,
+    framing: PipeFraming,
+    payload: JsonObject,
+    messages: int,
+    ring_bytes: int = DEFAULT_RING_BYTES,
+) -> StreamRun:
+    """A child process streams ``messages`` events; this process reads them the way the router does."""
+    project_root = Path(__file__).resolve().parents[2]
+    with tempfile.TemporaryDirectory() as scratch:
+        payload_path = Path(scratch) / 'payload.json'
+        payload_path.write_text(json.dumps(payload), encoding='utf-8')
+        ring_fd = create_ring_fd(ring_bytes) if transport == 'ring' else -1
+        try:
+            process = subprocess.Popen(
+                [sys.executable, '-c', _PRODUCER, framing, str(messages), str(ring_fd), str(payload_path)],
+                cwd=str(project_root),
+                stdout=subprocess.PIPE,
+                pass_fds=(ring_fd,) if ring_fd >= 0 else (),
+            )
+            reader = RingReader(ShmRing(ring_fd), framing) if ring_fd >= 0 else None
+        finally:
+            if ring_fd >= 0:
+                os.close(ring_fd)
+        assert process.stdout is not None
+        source = reader if reader is not None else FrameDecoder(framing)
+        pipe_fd = process.stdout.fileno()
+        latency_ns: list[int] = []
+        first_sent_ns = last_received_ns = 0
+        open_pipe = True
+        while len(latency_ns) < messages:
+            for message in source.messages():
+                last_received_ns = monotonic_ns()
+                sent_ns = message['payload']['sent_ns']
+                first_sent_ns = first_sent_ns or sent_ns
+                latency_ns.append(last_received_ns - sent_ns)
+            if reader is not None and not reader.idle():
+                continue
+            if not open_pipe:
+                break
+            readable, _, _ = select.select([pipe_fd], [], [], RING_POLL_SECONDS)
+            if readable:
+                data = os.read(pipe_fd, READ_CHUNK_BYTES)
+                open_pipe = bool(data)
+                source.feed(data)
+        process.wait()
+        process.stdout.close()
+        if reader is not None:
+            reader.ring.close()
+    return StreamRun(
+        transport=transport,
+        framing=framing,
+        messages=len(latency_ns),
+        elapsed_ns=last_received_ns - first_sent_ns,
+        latency_ns=latency_ns,
+    )
+
+
+@contextmanager
+def _framing_env(framing: PipeFraming, ring_bytes: int = 0) -> Iterator[None]:
+    saved = {name: os.environ.get(name) for name in (PIPE_FRAMING_ENV, RING_BYTES_ENV)}
+    os.environ[PIPE_FRAMING_ENV] = framing
+    os.environ[RING_BYTES_ENV] = str(ring_bytes)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def _ignore_finished(_room_id: str, _reason: str) -> None:
+    return
+
+
+def measure_round_trip(
+    framing: PipeFraming,
+    params: dict[str, Any],
+    requests: int,
+    ring_bytes: int = 0,
+) -> RoundTripRun:
+    """Time ``health`` requests carrying ``params`` through a real room worker process."""
+    with _framing_env(framing, ring_bytes):
+        worker = RoomWorker(
+            room_id=f'bench-pipe-{framing}',
+            player_session_ids=('bench-p1', 'bench-p2'),
+            host='127.0.0.1',
+            port=0,
+            p1_username='bench-p1',
+            p2_username='bench-p2',
+            p1_selected_cards=None,
+            p2_selected_cards=None,
+            transport_mode='pipe',
+            on_finished=_ignore_finished,
+        )
+    samples: list[int] = []
+    try:
+        worker.start()
+        worker.request('health', {}, timeout_seconds=BOOT_TIMEOUT_SECONDS)
+        for _ in range(requests):
+            began = perf_counter_ns()
+            worker.request('health', params, timeout_seconds=BOOT_TIMEOUT_SECONDS)
+            samples.append(perf_counter_ns() - began)
+    finally:
+        worker.stop('benchmark_done')
+    return RoundTripRun(
+        framing=framing,
+        params_bytes=len(json.dumps(params)),
+        round_trip_ns=samples,
+        transport='ring' if ring_bytes > 0 else 'pipe',
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='Compare framings and pipe vs shared-memory ring transport between router and room.')
+    parser.add_argument('--messages', type=int, default=DEFAULT_MESSAGES, help='socket_emit events per codec run (default: %(default)s).')
+    parser.add_argument('--requests', type=int, default=DEFAULT_REQUESTS, help='Round trips per live pipe run; 0 skips them (default: %(default)s).')
+    parser.add_argument('--stream-messages', type=int, default=DEFAULT_STREAM_MESSAGES, help='socket_emit events per stream run; 0 skips them (default: %(default)s).')
+    parser.add_argument('--ring-bytes', type=int, default=DEFAULT_RING_BYTES, help='Ring size for ring transport runs (default: %(default)s).')
+    parser.add_argument('--json', dest='json_path', default=None, help='Write the runs as JSON to this path.')
+    args = parser.parse_args(argv)
+
+    payload = environment_socket_payload()
+    results: list[JsonObject] = []
+    for framing in FRAMINGS:
+        codec = measure_codec(framing, payload, args.messages)
+        results.append(codec.to_json())
+        print(
+            f'codec      {framing:<6} wire={codec.wire_bytes}B '
+            f'room_encode={codec.room_encode_ns / codec.messages / 1000:.1f}us '
+            f'router_emit={codec.router_emit_ns / codec.messages / 1000:.1f}us '
+            f'throughput={codec.to_json()["messages_per_second"]:.0f}msg/s'
+        )
+    if args.stream_messages > 0:
+        for label, stream_payload in (('small', {'packets': [{'seq': 1, 'type': 'ack'}]}), ('environment', payload)):
+            for transport in TRANSPORTS:
+                stream = measure_stream(transport, 'binary', stream_payload, args.stream_messages, args.ring_bytes)
+                summary = stream.to_json()
+                results.append({'payload': label, **summary})
+                print(
+                    f'stream     {transport:<6} payload={label:<11} '
+                    f'throughput={summary["messages_per_second"]:.0f}msg/s '
+                    f'p50={summary["latency_p50_ns"] / 1000:.1f}us p99={summary["latency_p99_ns"] / 1000:.1f}us'
+                )
+    if args.requests > 0:
+        for label, params in (('small', {}), ('environment', payload)):
+            for framing in FRAMINGS:
+                for transport in TRANSPORTS:
+                    ring_bytes = args.ring_bytes if transport == 'ring' else 0
+                    run = measure_round_trip(framing, params, args.requests, ring_bytes)
+                    results.append({'params': label, **run.to_json()})
+                    samples = [float(value) for value in run.round_trip_ns]
+                    print(
+                        f'round_trip {transport:<4} {framing:<6} params={label:<11} '
+                        f'p50={percentile(samples, 0.50) / 1000:.1f}us p99={percentile(samples, 0.99) / 1000:.1f}us'
+                    )
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as handle:
+            json.dump(results, handle, indent=2, sort_keys=True)
+            handle.write('\n')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter_ns
+from typing import Any, Callable
+import argparse
+import json
+
+from ..server.server_types import JsonObject
+from ..server.workers.room_host_pool import RoomHostPool
+from ..server.workers.room_worker import RoomWorker
+from ..server.workers.room_worker_pool import RoomWorkerPool
+from .bridge_latency import percentile
+
+DEFAULT_ROOMS = 8
+BOOT_TIMEOUT_SECONDS = 60.0
+# Routed to the room itself in every mode, so the round trip proves the room is open.
+READY_METHOD = 'engine_profile'
+
+
+@dataclass(frozen=True)
+class HostingRun:
+    mode: str
+    rooms: int
+    processes: int
+    start_ns: list[int]
+    boot_ns: int
+    rss_bytes: int | None
+    baseline_rss_bytes: int | None
+
+    @property
+    def rss_per_match(self) -> float | None:
+        if self.rss_bytes is None or self.baseline_rss_bytes is None or self.rooms == 0:
+            return None
+        return (self.rss_bytes - self.baseline_rss_bytes) / self.rooms
+
+    def to_json(self) -> JsonObject:
+        return {
+            'mode': self.mode,
+            'rooms': self.rooms,
+            'processes': self.processes,
+            'boot_ns': self.boot_ns,
+            'start_p50_ns': percentile([float(value) for value in self.start_ns], 0.50),
+            'start_p99_ns': percentile([float(value) for value in self.start_ns], 0.99),
+            'rss_bytes': self.rss_bytes,
+            'baseline_rss_bytes': self.baseline_rss_bytes,
+            'rss_per_match': self.rss_per_match,
+        }
+
+
+def process_rss_bytes(pid: int | None) -> int | None:
+    """Resident set size of a live process from /proc, or None where that isn't available."""
+    if pid is None:
+        return None
+    try:
+        status = Path(f'/proc/{pid}/status').read_text(encoding='utf-8')
+    except OSError:
+        return None
+    for line in status.splitlines():
+        if line.startswith('VmRSS:'):
+            return int(line.split()[1]) * 1024
+    return None
+
+
+def _sum_rss(pids: list[int | None]) -> int | None:
+    values = [process_rss_bytes(pid) for pid in pids]
+    if any(value is None for value in values):
+        return None
+    return sum(value for value in values if value is not None)
+
+
+def _room_options(index: int) -> dict[str, Any]:
+    return {
+        'room_id': f'bench-room-{index}',
+        'player_session_ids': (f'bench-p1-{index}', f'bench-p2-{index}'),
+        'host': '127.0.0.1',
+        'port': 0,
+        'p1_username': f'bench-p1-{index}',
+        'p2_username': f'bench-p2-{index}',
+        'p1_selected_cards': None,
+        'p2_selected_cards': None,
+        'transport_mode': 'pipe',
+        'on_finished': _ignore_finished,
+    }
+
+
+def _ignore_finished(_room_id: str, _reason: str) -> None:
+    return
+
+
+def _time_until_ready(start: Callable[[], None], request: Callable[..., dict[str, Any]]) -> int:
+    began = perf_counter_ns()
+    start()
+    request(READY_METHOD, {}, timeout_seconds=BOOT_TIMEOUT_SECONDS)
+    return perf_counter_ns() - began
+
+
+def measure_process_per_room(rooms: int) -> HostingRun:
+    """Today's layout: one room server process per match, ready when it answers."""
+    workers: list[RoomWorker] = []
+    start_ns: list[int] = []
+    try:
+        for index in range(rooms):
+            worker = RoomWorker(**_room_options(index))
+            workers.append(worker)
+            start_ns.append(_time_until_ready(worker.start, worker.request))
+        rss = _sum_rss([worker.snapshot().process_pid for worker in workers])
+    finally:
+        for worker in workers:
+            worker.stop('benchmark_done')
+    return HostingRun(
+        mode='process_per_room',
+        rooms=rooms,
+        processes=rooms,
+        start_ns=start_ns,
+        boot_ns=0,
+        rss_bytes=rss,
+        baseline_rss_bytes=0 if rss is not None else None,
+    )
+
+
+def measure_multi_room_host(rooms: int) -> HostingRun:
+    """One room host process; its boot is paid once and reported separately."""
+    pool = RoomHostPool(1, max(1, rooms))
+    hosts = []
+    start_ns: list[int] = []
+    try:
+        first = pool.place_room(**_room_options(0))
+        assert first is not None
+        host_worker = first.host_worker
+        hosts.append(host_worker)
+
+        began = perf_counter_ns()
+        host_worker.start()
+        host_worker.request('health', {}, timeout_seconds=BOOT_TIMEOUT_SECONDS)
+        boot_ns = perf_counter_ns() - began
+        baseline_rss = process_rss_bytes(host_worker.snapshot().process_pid)
+
+        start_ns.append(_time_until_ready(first.start, first.request))
+        for index in range(1, rooms):
+            room = pool.place_room(**_room_options(index))
+            assert room is not None
+            start_ns.append(_time_until_ready(room.start, room.request))
+        rss = process_rss_bytes(host_worker.snapshot().process_pid)
+    finally:
+        for host_worker in hosts:
+            host_worker.stop('benchmark_done')
+    return HostingRun(
+        mode='multi_room_host',
+        rooms=rooms,
+        processes=1,
+        start_ns=start_ns,
+        boot_ns=boot_ns,
+        rss_bytes=rss,
+        baseline_rss_bytes=baseline_rss,
+    )
+
+
+def measure_warm_pool(rooms: int) -> HostingRun:
+    """One process per match, handed out by a pre-warmed standby pool."""
+    pool = RoomWorkerPool(rooms, host='127.0.0.1', port=0, transport_mode='pipe', boot_timeout_seconds=BOOT_TIMEOUT_SECONDS)
+    workers: list[RoomWorker] = []
+    start_ns: list[int] = []
+    try:
+        began = perf_counter_ns()
+        pool.refill()
+        boot_ns = perf_counter_ns() - began
+        for index in range(rooms):
+            options = _room_options(index)
+            began = perf_counter_ns()
+            worker = pool.acquire(**options)
+            if worker is None:
+                raise RuntimeError('warm pool ran out of standby workers')
+            workers.append(worker)
+            worker.request(READY_METHOD, {}, timeout_seconds=BOOT_TIMEOUT_SECONDS)
+            start_ns.append(perf_counter_ns() - began)
+        rss = _sum_rss([worker.snapshot().process_pid for worker in workers])
+    finally:
+        pool.shutdown()
+        for worker in workers:
+            worker.stop('benchmark_done')
+    return HostingRun(
+        mode='warm_pool',
+        rooms=rooms,
+        processes=rooms,
+        start_ns=start_ns,
+        boot_ns=boot_ns,
+        rss_bytes=rss,
+        baseline_rss_bytes=0 if rss is not None else None,
+    )
+
+
+def _format_bytes(value: float | None) -> str:
+    return 'n/a' if value is None else f'{value / (1024 * 1024):.1f} MiB'
+
+
+def _print_run(run: HostingRun) -> None:
+    start = [float(value) for value in run.start_ns]
+    print(
+        f'{run.mode:<17} rooms={run.rooms} processes={run.processes} '
+        f'boot={run.boot_ns / 1e6:.1f}ms '
+        f'start_p50={percentile(start, 0.50) / 1e6:.2f}ms start_p99={percentile(start, 0.99) / 1e6:.2f}ms '
+        f'rss={_format_bytes(run.rss_bytes)} rss_per_match={_format_bytes(run.rss_per_match)}'
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description='Compare room start latency and memory per match: cold process per room, warm standby pool, one multi-room host.'
+    )
+    parser.add_argument('--rooms', type=int, default=DEFAULT_ROOMS, help='Concurrent rooms to open (default: %(default)s).')
+    parser.add_argument('--json', dest='json_path', default=None, help='Write both runs as JSON to this path.')
+    args = parser.parse_args(argv)
+
+    runs = [measure_process_per_room(args.rooms), measure_warm_pool(args.rooms), measure_multi_room_host(args.rooms)]
+    for run in runs:
+        _print_run(run)
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as handle:
+            json.dump([run.to_json() for run in runs], handle, indent=2, sort_keys=True)
+            handle.write('\n')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
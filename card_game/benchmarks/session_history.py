@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter_ns
+import argparse
+import json
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+from ..server.server_types import JsonObject
+from ..server.storage.router_storage import RouterStorage
+from .bridge_latency import percentile
+
+DEFAULT_SESSIONS = 1_000_000
+DEFAULT_USERS = 10_000
+DEFAULT_QUERIES = 200
+# Of a user's historical sessions: the newest is live, and of the rest this
+# share were revoked by a later login; the others ran out.
+REVOKED_SHARE = 0.7
+# The indexes RouterStorage adds for the per-user and expiry queries.
+SESSION_INDEXES = ('idx_sessions_user_active', 'idx_sessions_expires_at', 'idx_sessions_revoked_at')
+
+
+@dataclass(frozen=True)
+class QueryLatency:
+    phase: str
+    per_user_ns: list[int]
+    get_session_ns: list[int]
+
+    def to_json(self) -> JsonObject:
+        return {
+            'phase': self.phase,
+            'per_user_p50_ns': percentile([float(value) for value in self.per_user_ns], 0.50),
+            'per_user_p99_ns': percentile([float(value) for value in self.per_user_ns], 0.99),
+            'get_session_p50_ns': percentile([float(value) for value in self.get_session_ns], 0.50),
+            'get_session_p99_ns': percentile([float(value) for value in self.get_session_ns], 0.99),
+        }
+
+
+@dataclass(frozen=True)
+class SessionHistoryRun:
+    sessions: int
+    users: int
+    phases: list[QueryLatency]
+    index_build_ns: int
+    gc_ns: int
+    gc_deleted: int
+    gc_batch_max_ms: float
+    bytes_before_gc: int
+    bytes_after_gc: int
+
+    def to_json(self) -> JsonObject:
+        return {
+            'sessions': self.sessions,
+            'users': self.users,
+            'phases': [phase.to_json() for phase in self.phases],
+            'index_build_ns': self.index_build_ns,
+            'gc_ns': self.gc_ns,
+            'gc_deleted': self.gc_deleted,
+            'gc_rows_per_second': self.gc_deleted / (self.gc_ns / 1e9) if self.gc_ns else 0.0,
+            'gc_batch_max_ms': self.gc_batch_max_ms,
+            'bytes_before_gc': self.bytes_before_gc,
+            'bytes_after_gc': self.bytes_after_gc,
+        }
+
+
+def seed_history(db_path: str, sessions: int, users: int, seed: int = 0) -> list[tuple[str, str]]:
+    """Write ``sessions`` rows spread over ``users``; returns each user's (user_id, live session_id)."""
+    rng = random.Random(seed)
+    now = time.time()
+    live: list[tuple[str, str]] = []
+
+    def _rows():
+        for index in range(sessions):
+            user_index = index % users
+            user_id = f'history-user-{user_index}'
+            session_id = f'history-session-{index}'
+            issued_at = now - 86_400 * 60 * (1 - index / sessions)
+            if index >= sessions - users:
+                live.append((user_id, session_id))
+                yield session_id, user_id, issued_at, now + 86_400, None
+            elif rng.random() < REVOKED_SHARE:
+                yield session_id, user_id, issued_at, now + 86_400, issued_at + 3600
+            else:
+                yield session_id, user_id, issued_at, issued_at + 3600, None
+
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany(
+            'INSERT INTO users (user_id, username, created_at, updated_at) VALUES (?, ?, ?, ?)',
+            ((f'history-user-{index}', f'history-user-{index}', now, now) for index in range(users)),
+        )
+        conn.executemany(
+            'INSERT INTO sessions (session_id, user_id, issued_at, expires_at, revoked_at) VALUES (?, ?, ?, ?, ?)',
+            _rows(),
+        )
+    return live
+
+
+def _database_bytes(db_path: str) -> int:
+    return sum(os.path.getsize(path) for path in (db_path, f'{db_path}-wal') if os.path.exists(path))
+
+
+def _measure_queries(storage: RouterStorage, phase: str, live: list[tuple[str, str]], queries: int, rng: random.Random) -> QueryLatency:
+    per_user_ns: list[int] = []
+    get_session_ns: list[int] = []
+    for _ in range(queries):
+        user_id, session_id = rng.choice(live)
+        began = perf_counter_ns()
+        storage.list_active_session_ids_for_user(user_id)
+        per_user_ns.append(perf_counter_ns() - began)
+        began = perf_counter_ns()
+        storage.get_session(session_id)
+        get_session_ns.append(perf_counter_ns() - began)
+    return QueryLatency(phase=phase, per_user_ns=per_user_ns, get_session_ns=get_session_ns)
+
+
+def measure_session_history(db_path: str, sessions: int, users: int, queries: int = DEFAULT_QUERIES, seed: int = 0) -> SessionHistoryRun:
+    """Query a session table with ``sessions`` historical rows before and after indexing and GC.
+
+    The first phase drops the session indexes, as the schema had none; the
+    second recreates them; the third runs after collect_sessions has
+    deleted every expired and revoked row.
+    """
+    rng = random.Random(seed)
+    storage = RouterStorage(db_path, session_gc_seconds=0)
+    try:
+        with sqlite3.connect(db_path) as conn:
+            for name in SESSION_INDEXES:
+                conn.execute(f'DROP INDEX {name}')
+        live = seed_history(db_path, sessions, users, seed)
+        phases = [_measure_queries(storage, 'unindexed', live, queries, rng)]
+
+        storage.close()
+        began = perf_counter_ns()
+        # Reopening recreates the indexes.
+        storage = RouterStorage(db_path, session_gc_seconds=0)
+        index_build_ns = perf_counter_ns() - began
+        phases.append(_measure_queries(storage, 'indexed', live, queries, rng))
+
+        bytes_before_gc = _database_bytes(db_path)
+        deleted = 0
+        began = perf_counter_ns()
+        while collected := storage.collect_sessions():
+            deleted += collected
+        gc_ns = perf_counter_ns() - began
+        with sqlite3.connect(db_path) as conn:
+            conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        bytes_after_gc = _database_bytes(db_path)
+        phases.append(_measure_queries(storage, 'collected', live, queries, rng))
+        gc_batch_max_ms = float(storage.session_gc_stats()['batch_max_ms'])
+    finally:
+        storage.close()
+
+    return SessionHistoryRun(
+        sessions=sessions,
+        users=users,
+        phases=phases,
+        index_build_ns=index_build_ns,
+        gc_ns=gc_ns,
+        gc_deleted=deleted,
+        gc_batch_max_ms=gc_batch_max_ms,
+        bytes_before_gc=bytes_before_gc,
+        bytes_after_gc=bytes_after_gc,
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='Measure session queries and GC on a table of historical sessions.')
+    parser.add_argument('--sessions', type=int, default=DEFAULT_SESSIONS, help='Historical session rows (default: %(default)s).')
+    parser.add_argument('--users', type=int, default=DEFAULT_USERS, help='Users the rows belong to (default: %(default)s).')
+    parser.add_argument('--queries', type=int, default=DEFAULT_QUERIES, help='Queries of each kind per phase (default: %(default)s).')
+    parser.add_argument('--json', dest='json_path', default=None, help='Write the run as JSON to this path.')
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix='avge-session-history-') as directory:
+        run = measure_session_history(str(Path(directory) / 'router.sqlite3'), args.sessions, args.users, args.queries)
+    summary = run.to_json()
+    for phase in summary['phases']:
+        print(
+            f'{phase["phase"]:<10} per_user p50={phase["per_user_p50_ns"] / 1000:.0f}us p99={phase["per_user_p99_ns"] / 1000:.0f}us '
+            f'get_session p50={phase["get_session_p50_ns"] / 1000:.0f}us p99={phase["get_session_p99_ns"] / 1000:.0f}us'
+        )
+    print(
+        f'index_build={run.index_build_ns / 1e9:.1f}s gc_deleted={run.gc_deleted} gc={run.gc_ns / 1e9:.1f}s '
+        f'({summary["gc_rows_per_second"]:.0f} rows/s, batch max {run.gc_batch_max_ms:.1f}ms) '
+        f'db {run.bytes_before_gc / 1e6:.0f}MB -> {run.bytes_after_gc / 1e6:.0f}MB'
+    )
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as handle:
+            json.dump(summary, handle, indent=2, sort_keys=True)
+            handle.write('\n')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Barrier, Thread
+from time import perf_counter_ns
+import argparse
+import json
+import tempfile
+
+from ..server.server_types import JsonObject
+from ..server.storage.router_storage import RouterStorage
+from .bridge_latency import percentile
+
+DEFAULT_CONCURRENCY = (1, 4, 16)
+DEFAULT_OPS_PER_THREAD = 2000
+DEFAULT_USERS = 64
+SESSION_TTL_SECONDS = 3600
+# One pass through the router's storage calls in a login/matchmaking burst:
+# mostly session lookups, with the writes each request also makes.
+OPERATION_MIX = (
+    'get_session',
+    'get_session',
+    'get_session',
+    'get_session',
+    'get_session',
+    'touch_session',
+    'touch_session',
+    'get_selected_deck',
+    'get_selected_deck',
+    'get_or_create_user',
+)
+
+
+@dataclass(frozen=True)
+class StorageLoadRun:
+    threads: int
+    operations: int
+    elapsed_ns: int
+    # Per operation type: each call's latency.
+    latency_ns: dict[str, list[int]]
+
+    @property
+    def ops_per_second(self) -> float:
+        return self.operations / (self.elapsed_ns / 1e9) if self.elapsed_ns else 0.0
+
+    def to_json(self) -> JsonObject:
+        return {
+            'threads': self.threads,
+            'operations': self.operations,
+            'elapsed_ns': self.elapsed_ns,
+            'ops_per_second': self.ops_per_second,
+            'latency_p50_ns': {name: percentile([float(value) for value in samples], 0.50) for name, samples in self.latency_ns.items()},
+            'latency_p99_ns': {name: percentile([float(value) for value in samples], 0.99) for name, samples in self.latency_ns.items()},
+        }
+
+
+def seed_storage(storage: RouterStorage, users: int) -> list[tuple[str, str, str]]:
+    """Users with a live session and a selected deck, as (username, user_id, session_id)."""
+    seeded: list[tuple[str, str, str]] = []
+    for index in range(users):
+        username = f'load-user-{index}'
+        user_id = storage.get_or_create_user(username)
+        session_id = f'load-session-{index}'
+        storage.create_or_update_session(session_id, user_id, SESSION_TTL_SECONDS)
+        deck = storage.create_deck(user_id, 'Load deck', json.dumps([f'card-{card}' for card in range(20)]))
+        storage.set_selected_deck(user_id, deck.deck_id)
+        seeded.append((username, user_id, session_id))
+    return seeded
+
+
+def measure_storage_load(db_path: str, threads: int, ops_per_thread: int, users: int = DEFAULT_USERS) -> StorageLoadRun:
+    """Run ``threads`` workers through OPERATION_MIX against a freshly seeded database."""
+    storage = RouterStorage(db_path)
+    try:
+        seeded = seed_storage(storage, users)
+        start = Barrier(threads + 1)
+        latencies: list[dict[str, list[int]]] = [{name: [] for name in set(OPERATION_MIX)} for _ in range(threads)]
+
+        def _worker(worker_index: int) -> None:
+            samples = latencies[worker_index]
+            start.wait()
+            for step in range(ops_per_thread):
+                username, user_id, session_id = seeded[(worker_index * 7 + step) % len(seeded)]
+                operation = OPERATION_MIX[step % len(OPERATION_MIX)]
+                began = perf_counter_ns()
+                if operation == 'get_session':
+                    storage.get_session(session_id)
+                elif operation == 'touch_session':
+                    storage.touch_session(session_id, SESSION_TTL_SECONDS)
+                elif operation == 'get_selected_deck':
+                    storage.get_selected_deck(user_id)
+                else:
+                    storage.get_or_create_user(username)
+                samples[operation].append(perf_counter_ns() - began)
+
+        workers = [Thread(target=_worker, args=(index,), name=f'storage-load-{index}') for index in range(threads)]
+        for worker in workers:
+            worker.start()
+        start.wait()
+        began = perf_counter_ns()
+        for worker in workers:
+            worker.join()
+        elapsed_ns = perf_counter_ns() - began
+    finally:
+        storage.close()
+
+    merged: dict[str, list[int]] = {name: [] for name in set(OPERATION_MIX)}
+    for samples in latencies:
+        for name, values in samples.items():
+            merged[name].extend(values)
+    return StorageLoadRun(threads=threads, operations=threads * ops_per_thread, elapsed_ns=elapsed_ns, latency_ns=merged)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='Measure router storage throughput at several concurrency levels.')
+    parser.add_argument(
+        '--threads',
+        default=','.join(str(value) for value in DEFAULT_CONCURRENCY),
+        help='Comma-separated concurrency levels (default: %(default)s).',
+    )
+    parser.add_argument('--ops', type=int, default=DEFAULT_OPS_PER_THREAD, help='Storage calls per thread (default: %(default)s).')
+    parser.add_argument('--users', type=int, default=DEFAULT_USERS, help='Seeded users with sessions and decks (default: %(default)s).')
+    parser.add_argument('--json', dest='json_path', default=None, help='Write the runs as JSON to this path.')
+    args = parser.parse_args(argv)
+
+    results: list[JsonObject] = []
+    for threads in (int(part) for part in args.threads.split(',') if part.strip()):
+        with tempfile.TemporaryDirectory(prefix='avge-storage-load-') as directory:
+            run = measure_storage_load(str(Path(directory) / 'router.sqlite3'), threads, args.ops, args.users)
+        summary = run.to_json()
+        results.append(summary)
+        p99 = ' '.join(f'{name}={value / 1000:.0f}us' for name, value in sorted(summary['latency_p99_ns'].items()))
+        print(f'threads={threads:<3} ops={run.operations:<6} throughput={run.ops_per_second:.0f}ops/s p99 {p99}')
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as handle:
+            json.dump(results, handle, indent=2, sort_keys=True)
+            handle.write('\n')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
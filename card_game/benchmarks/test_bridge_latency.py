@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from card_game.benchmarks.bridge_latency import (
+    EventSample,
+    _ROOM_GLOBALS,
+    percentile,
+    run_latency_benchmark,
+    summarize,
+)
+from card_game.server import server
+
+
+def test_scripted_games_cover_each_event_type_and_restore_room_globals() -> None:
+    before = {name: getattr(server, name) for name in _ROOM_GLOBALS}
+
+    run = run_latency_benchmark(games=1, max_events=120, seed=1)
+
+    assert {name: getattr(server, name) for name in _ROOM_GLOBALS} == before
+    stats = {entry.event_type: entry for entry in run.stats()}
+    for event_type in ('energy_moved', 'attack', 'input_result'):
+        assert stats[event_type].count > 0
+        assert stats[event_type].p50_ns > 0
+        assert stats[event_type].commands_per_event > 0
+    assert all(sample.engine_ns <= sample.total_ns for sample in run.samples)
+
+
+def test_summary_shares_and_percentiles() -> None:
+    samples = [
+        EventSample('attack', total_ns=1000, engine_ns=400, formatting_ns=300, bridge_ns=200, commands=2),
+        EventSample('attack', total_ns=3000, engine_ns=1200, formatting_ns=900, bridge_ns=600, commands=4),
+    ]
+
+    stats = summarize('attack', samples)
+
+    assert stats.p50_ns == 1000
+    assert stats.p99_ns == 3000
+    assert stats.commands_per_event == 3
+    assert abs(stats.engine_share - 0.4) < 1e-9
+    assert abs(stats.protocol_share - 0.1) < 1e-9
+    assert percentile([], 0.5) == 0.0
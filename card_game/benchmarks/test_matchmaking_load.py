@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from card_game.benchmarks.matchmaking_load import measure_matchmaking_load
+from card_game.server.matchmaking_engine import PairingWindow
+
+
+def test_load_run_accounts_for_every_player() -> None:
+    window = PairingWindow(maximum=400.0)
+    run = measure_matchmaking_load(players=400, seconds=5.0, arrivals_per_second=40.0, window=window)
+
+    assert 2 * run.pairs + run.still_queued == run.players + run.arrivals
+    assert len(run.queue_seconds) == 2 * run.pairs
+    assert len(run.match_ns) == run.arrivals and run.first_sweep_ns > 0
+    assert max(run.rating_gaps) <= window.maximum
+    assert run.to_json()['queue_p99_seconds'] >= run.to_json()['queue_p50_seconds'] >= 0.0
@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+import card_game.server.router_server as router_server
+from card_game.benchmarks.matchmaking_push import measure_matchmaking_push
+
+
+def test_push_run_sends_fewer_requests_than_polling(monkeypatch) -> None:
+    monkeypatch.setattr(router_server, 'MATCHMAKING_SWEEP_MS', 20)
+    monkeypatch.setattr(router_server, 'MATCHMAKING_POSITION_PUSH_SECONDS', 0)
+    run = measure_matchmaking_push(players=40, seconds=0.5, churn_per_second=20.0)
+
+    assert run.churned >= 5 and run.pushed >= 2 * run.churned
+    assert len(run.status_ns) == run.players
+    summary = run.to_json()
+    assert summary['polling_requests_per_second'] == 40.0
+    assert summary['reduction'] == run.polling_requests_per_second / run.push_requests_per_second
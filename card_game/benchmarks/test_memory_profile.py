@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import random
+import tracemalloc
+
+from card_game.benchmarks.memory_profile import (
+    GameMemory,
+    MemoryReport,
+    growth_slope,
+    profile_game,
+)
+from card_game.server import server
+
+
+def test_profiled_game_samples_each_turn_and_restores_rng() -> None:
+    rng_state = random.getstate()
+
+    game = profile_game(server, seed=3, max_events=60, warmup_turns=1, top=5)
+
+    assert random.getstate() == rng_state
+    assert not tracemalloc.is_tracing()
+    assert len(game.turns) >= 3
+    assert [sample.turn for sample in game.turns] == sorted({sample.turn for sample in game.turns})
+    assert {'history_events', 'external_listeners', 'pending_packets', 'pending_command_acks', 'cache_entries'} <= set(game.turns[0].structures)
+    assert game.turns[-1].structures['history_events'] > game.turns[0].structures['history_events']
+    assert game.top_sites
+
+
+def test_growth_slope_and_gate() -> None:
+    assert growth_slope([(1, 100), (2, 300), (3, 500)]) == 200
+    assert growth_slope([(1, 100)]) == 0.0
+
+    def _game(bytes_per_turn: float) -> GameMemory:
+        return GameMemory(seed=0, winner=True, turns=(), bytes_per_turn=bytes_per_turn, growth_per_turn={}, top_sites=())
+
+    assert not MemoryReport(max_bytes_per_turn=1000, games=[_game(999)]).failed
+    assert MemoryReport(max_bytes_per_turn=1000, games=[_game(999), _game(1001)]).failed
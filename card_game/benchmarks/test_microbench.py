@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from card_game.benchmarks.cases import BENCHMARKS
+from card_game.benchmarks.harness import (
+    Run,
+    compare_to_baseline,
+    load_results,
+    mann_whitney_greater,
+    measure,
+    run_benchmarks,
+    write_results,
+)
+from card_game.benchmarks.microbench import DEFAULT_BASELINE_PATH
+
+
+def _busy_work(iterations: int):
+    def setup():
+        def run() -> object:
+            total = 0
+            for value in range(iterations):
+                total += value * value
+            return total
+
+        return run
+
+    return setup
+
+
+def _run_of(iterations: int) -> Run:
+    run = Run(calibration_ns=1.0)
+    run.measurements.append(measure('busy', 0, _busy_work(iterations), samples=10, target_sample_ns=200_000))
+    return run
+
+
+def test_every_benchmark_runs_at_its_quick_size(tmp_path: Path) -> None:
+    run = run_benchmarks(BENCHMARKS, quick=True, samples=2)
+
+    assert {measurement.name for measurement in run.measurements} == {benchmark.name for benchmark in BENCHMARKS}
+    assert all(measurement.median_ns > 0 for measurement in run.measurements)
+
+    path = tmp_path / 'results.json'
+    write_results(str(path), run)
+    assert compare_to_baseline(run, load_results(str(path)), threshold=10.0)
+
+
+def test_committed_baseline_covers_every_benchmark_size() -> None:
+    baseline = load_results(str(DEFAULT_BASELINE_PATH))
+
+    expected = {f'{benchmark.name}[{size}]' for benchmark in BENCHMARKS for size in benchmark.sizes}
+    assert expected <= set(baseline['results'])
+
+
+def test_significant_slowdown_fails_and_noise_does_not() -> None:
+    baseline = _run_of(300).to_json()
+
+    same = compare_to_baseline(_run_of(300), baseline)
+    slower = compare_to_baseline(_run_of(1200), baseline)
+
+    assert not same[0].regressed
+    assert slower[0].regressed
+    assert slower[0].ratio > 2
+
+
+def test_mann_whitney_direction() -> None:
+    fast = [1.0, 1.1, 0.9, 1.05, 0.95, 1.02, 0.98, 1.01]
+    slow = [value * 1.5 for value in fast]
+
+    assert mann_whitney_greater(slow, fast) < 0.01
+    assert mann_whitney_greater(fast, slow) > 0.99
+    assert mann_whitney_greater([], fast) == 1.0
@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+from card_game.benchmarks.session_history import measure_session_history
+
+
+def test_history_run_collects_everything_but_the_live_sessions(tmp_path) -> None:
+    run = measure_session_history(str(tmp_path / 'history.sqlite3'), sessions=3000, users=50, queries=20)
+
+    assert [phase.phase for phase in run.phases] == ['unindexed', 'indexed', 'collected']
+    assert run.gc_deleted == run.sessions - run.users
+    assert all(len(phase.per_user_ns) == len(phase.get_session_ns) == 20 for phase in run.phases)
+    assert run.to_json()['gc_rows_per_second'] > 0
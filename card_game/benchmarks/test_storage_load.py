@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+from card_game.benchmarks.storage_load import OPERATION_MIX, measure_storage_load
+
+
+def test_load_run_covers_every_operation_at_each_concurrency(tmp_path) -> None:
+    for threads in (1, 4):
+        run = measure_storage_load(str(tmp_path / f'load-{threads}.sqlite3'), threads, ops_per_thread=40, users=8)
+
+        assert run.operations == threads * 40
+        assert sum(len(samples) for samples in run.latency_ns.values()) == run.operations
+        assert set(run.latency_ns) == set(OPERATION_MIX)
+        assert run.to_json()['ops_per_second'] > 0
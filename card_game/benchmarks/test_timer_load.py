@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+from card_game.benchmarks.timer_load import measure_timer_load
+
+
+def test_heap_run_fires_only_uncancelled_timers_on_one_thread() -> None:
+    run = measure_timer_load('heap', timers=200, delay_seconds=0.05, cancel_fraction=0.25)
+
+    assert (run.cancelled, run.fired) == (50, 150)
+    assert len(run.schedule_ns) == 200 and len(run.cancel_ns) == 50
+    assert run.extra_threads <= 1
+    assert run.to_json()['schedule_p99_ns'] >= run.to_json()['schedule_p50_ns'] > 0
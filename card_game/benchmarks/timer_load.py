@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from threading import Event, Lock, Timer, active_count
+from time import perf_counter_ns
+import argparse
+import json
+
+from ..server.server_types import JsonObject
+from ..server.timer_service import TimerService
+from .bridge_latency import percentile
+
+DEFAULT_TIMERS = 10_000
+# Disconnect grace and room retention are a few seconds; most such timers
+# are cancelled by a reconnect or a rejoin before they fire.
+DEFAULT_DELAY_SECONDS = 1.0
+DEFAULT_CANCEL_FRACTION = 0.5
+
+
+@dataclass(frozen=True)
+class TimerLoadRun:
+    layout: str
+    timers: int
+    cancelled: int
+    fired: int
+    schedule_ns: list[int]
+    cancel_ns: list[int]
+    # Threads alive while every timer was pending, beyond those before the run.
+    extra_threads: int
+
+    def to_json(self) -> JsonObject:
+        return {
+            'layout': self.layout,
+            'timers': self.timers,
+            'cancelled': self.cancelled,
+            'fired': self.fired,
+            'schedule_p50_ns': percentile([float(value) for value in self.schedule_ns], 0.50),
+            'schedule_p99_ns': percentile([float(value) for value in self.schedule_ns], 0.99),
+            'cancel_p50_ns': percentile([float(value) for value in self.cancel_ns], 0.50),
+            'cancel_p99_ns': percentile([float(value) for value in self.cancel_ns], 0.99),
+            'extra_threads': self.extra_threads,
+        }
+
+
+def measure_timer_load(
+    layout: str,
+    timers: int,
+    delay_seconds: float = DEFAULT_DELAY_SECONDS,
+    cancel_fraction: float = DEFAULT_CANCEL_FRACTION,
+) -> TimerLoadRun:
+    """Schedule ``timers`` at once, cancel a share of them and wait for the rest.
+
+    ``layout`` is ``heap`` for one TimerService or ``threads`` for a
+    threading.Timer per timer, as the room runtime used before.
+    """
+    threads_before = active_count()
+    fired = 0
+    fired_lock = Lock()
+    all_fired = Event()
+    cancelled = int(timers * cancel_fraction)
+    expected = timers - cancelled
+
+    def _fire() -> None:
+        nonlocal fired
+        with fired_lock:
+            fired += 1
+            if fired == expected:
+                all_fired.set()
+
+    service = TimerService(name='timer-load')
+    schedule_ns: list[int] = []
+    handles: list = []
+    for _ in range(timers):
+        began = perf_counter_ns()
+        if layout == 'heap':
+            handle = service.schedule(delay_seconds, _fire)
+        else:
+            handle = Timer(delay_seconds, _fire)
+            handle.daemon = True
+            handle.start()
+        schedule_ns.append(perf_counter_ns() - began)
+        handles.append(handle)
+    extra_threads = active_count() - threads_before
+
+    cancel_ns: list[int] = []
+    for handle in handles[:cancelled]:
+        began = perf_counter_ns()
+        handle.cancel()
+        cancel_ns.append(perf_counter_ns() - began)
+    if expected:
+        all_fired.wait(timeout=delay_seconds + 30)
+
+    return TimerLoadRun(
+        layout=layout,
+        timers=timers,
+        cancelled=cancelled,
+        fired=fired,
+        schedule_ns=schedule_ns,
+        cancel_ns=cancel_ns,
+        extra_threads=extra_threads,
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='Compare the timer heap with a thread per timer.')
+    parser.add_argument('--timers', type=int, default=DEFAULT_TIMERS, help='Timers scheduled at once (default: %(default)s).')
+    parser.add_argument('--delay', type=float, default=DEFAULT_DELAY_SECONDS, help='Seconds until each timer fires (default: %(default)s).')
+    parser.add_argument('--cancel', type=float, default=DEFAULT_CANCEL_FRACTION, help='Share of timers cancelled (default: %(default)s).')
+    parser.add_argument('--json', dest='json_path', default=None, help='Write the runs as JSON to this path.')
+    args = parser.parse_args(argv)
+
+    summaries: list[JsonObject] = []
+    for layout in ('heap', 'threads'):
+        run = measure_timer_load(layout, args.timers, args.delay, args.cancel)
+        summary = run.to_json()
+        summaries.append(summary)
+        print(
+            f'{layout}: timers={run.timers} fired={run.fired} extra_threads={run.extra_threads} '
+            f'schedule p50={summary["schedule_p50_ns"] / 1000:.1f}us p99={summary["schedule_p99_ns"] / 1000:.1f}us '
+            f'cancel p50={summary["cancel_p50_ns"] / 1000:.1f}us p99={summary["cancel_p99_ns"] / 1000:.1f}us'
+        )
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as handle:
+            json.dump(summaries, handle, indent=2, sort_keys=True)
+            handle.write('\n')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -1,7 +1,17 @@
-"""Package exports for this catalog namespace."""
-from .characters import *
-from .items import *
-from .stadiums import *
-from .status_effects import *
-from .supporters import *
-from .tools import *
+"""Card catalog. Names resolve lazily: a card module is imported the first time one of its names is used."""
+from typing import Any
+
+from .registry import export_names as _export_names
+from .registry import load_export as _load_export
+
+__all__ = _export_names()
+
+
+def __getattr__(name: str) -> Any:
+    value = _load_export(name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
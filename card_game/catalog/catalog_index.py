@@ -0,0 +1,294 @@
+# Generated by `python -m card_game.catalog.generate_index --write`; do not edit by hand.
+from __future__ import annotations
+
+from typing import Any
+
+CARDS: dict[str, dict[str, Any]] = {
+    'AVGEBirb': {'module': 'card_game.catalog.items.AVGEBirb', 'kind': 'item'},
+    'AVGEShowcaseSticker': {'module': 'card_game.catalog.tools.AVGEShowcaseSticker', 'kind': 'tool'},
+    'AVGETShirt': {'module': 'card_game.catalog.tools.AVGETShirt', 'kind': 'tool'},
+    'AliceWang': {'module': 'card_game.catalog.characters.strings.AliceWang', 'kind': 'character', 'hp': 110, 'card_type': 'STRING', 'retreat_cost': 2, 'atk_1_name': 'Vibrato', 'atk_1_cost': 2, 'atk_2_name': None, 'atk_2_cost': 0, 'has_passive': True, 'active_name': None},
+    'AlumnaeHall': {'module': 'card_game.catalog.stadiums.AlumnaeHall', 'kind': 'stadium'},
+    'AnaliseJia': {'module': 'card_game.catalog.characters.woodwinds.AnaliseJia', 'kind': 'character', 'hp': 110, 'card_type': 'WW', 'retreat_cost': 1, 'atk_1_name': 'Reed Replenishment', 'atk_1_cost': 2, 'atk_2_name': 'Banana Bread for Everyone!', 'atk_2_cost': 3, 'has_passive': False, 'active_name': None},
+    'AndreaCR': {'module': 'card_game.catalog.characters.strings.AndreaCR', 'kind': 'character', 'hp': 100, 'card_type': 'STRING', 'retreat_cost': 1, 'atk_1_name': 'Foresight', 'atk_1_cost': 1, 'atk_2_name': 'Snap Pizz', 'atk_2_cost': 3, 'has_passive': False, 'active_name': None},
+    'Angel': {'module': 'card_game.catalog.supporters.Angel', 'kind': 'supporter'},
+    'AnnaBrown': {'module': 'card_game.catalog.characters.woodwinds.AnnaBrown', 'kind': 'character', 'hp': 110, 'card_type': 'WW', 'retreat_cost': 2, 'atk_1_name': 'Hyper-Ventilation!', 'atk_1_cost': 3, 'atk_2_name': None, 'atk_2_cost': 0, 'has_passive': True, 'active_name': None},
+    'AnnotatedScore': {'module': 'card_game.catalog.items.AnnotatedScore', 'kind': 'item'},
+    'AntongChen': {'module': 'card_game.catalog.characters.guitars.AntongChen', 'kind': 'character', 'hp': 100, 'card_type': 'GUITAR', 'retreat_cost': 2, 'atk_1_name': 'Fingerstyle', 'atk_1_cost': 2, 'atk_2_name': 'Power Chord', 'atk_2_cost': 3, 'has_passive': False, 'active_name': None},
+    'AshleyToby': {'module': 'card_game.catalog.characters.strings.AshleyToby', 'kind': 'character', 'hp': 100, 'card_type': 'STRING', 'retreat_cost': 1, 'atk_1_name': 'Code Gyu: Seal Attack', 'atk_1_cost': 2, 'atk_2_name': None, 'atk_2_cost': 0, 'has_passive': True, 'active_name': None},
+    'BAIEmail': {'module': 'card_game.catalog.items.BAIEmail', 'kind': 'item'},
+    'BUOStand': {'module': 'card_game.catalog.items.BUOStand', 'kind': 'item'},
+    'BarronLee': {'module': 'card_game.catalog.characters.brass.BarronLee', 'kind': 'character', 'hp': 100, 'card_type': 'BRASS', 'retreat_cost': 2, 'atk_1_name': 'Embouchure', 'atk_1_cost': 1, 'atk_2_name': None, 'atk_2_cost': 0, 'has_passive': True, 'active_name': None},
+    'BenCherekIII': {'module': 'card_game.catalog.characters.guitars.BenCherekIII', 'kind': 'character', 'hp': 100, 'card_type': 'GUITAR', 'retreat_cost': 1, 'atk_1_name': 'Feedback Loop', 'atk_1_cost': 2, 'atk_2_name': None, 'atk_2_cost': 0, 'has_passive': True, 'active_name': None},
+    'BettySolomon': {'module': 'card_game.catalog.characters.woodwinds.BettySolomon', 'kind': 'character', 'hp': 100, 'card_type': 'WW', 'retreat_cost': 1, 'atk_1_name': 'Outreach', 'atk_1_cost': 1, 'atk_2_name': 'Multiphonics', 'atk_2_cost': 3, 'has_passive': False, 'active_name': None},
+    'BokaiBi': {'module': 'card_game.catalog.characters.percussion.BokaiBi', 'kind': 'character', 'hp': 110, 'card_type': 'PERC', 'retreat_cost': 2, 'atk_1_name': 'Rimshot', 'atk_1_cost': 2, 'atk_2_name': None, 'atk_2_cost': 0, 'has_passive': True, 'active_name': None},
+    'Bucket': {'module': 'card_game.catalog.tools.Bucket', 'kind': 'tool'},
+    'Camera': {'module': 'card_game.catalog.items.Camera', 'kind': 'item'},
+    'CarolynZheng': {'module': 'card_game.catalog.characters.brass.CarolynZheng', 'kind': 'character', 'hp': 90, 'card_type': 'BRASS', 'retreat_cost': 2, 'atk_1_name': 'Blast', 'atk_1_cost': 3, 'atk_2_name': None, 'atk_2_cost': 0, 'has_passive': True, 'active_name': None},
+    'CastReserve': {'module': 'card_game.catalog.items.CastReserve', 'kind': 'item'},
+    'CathyRong': {'module': 'card_game.catalog.characters.pianos.CathyRong', 'kind': 'character', 'hp': 110, 'card_type': 'PIANO', 'retreat_cost': 2, 'atk_1_name': 'Racket Smash', 'atk_1_cost': 2, 'atk_2_name': 'Four Hands', 'atk_2_cost': 3, 'has_passive': False, 'active_name': None},
+    'CavinXue': {'module': 'card_game.catalog.characters.percussion.CavinXue', 'kind': 'character', 'hp': 100, 'card_type': 'PERC', 'retreat_cost': 2, 'atk_1_name': 'Cymbal Crash', 'atk_1_cost': 1, 'atk_2_name': None, 'atk_2_cost': 0, 'has_passive': True, 'active_name': None},
+    'ChristmasKim': {'module': 'card_game.catalog.characters.guitars.ChristmasKim', 'kind': 'character', 'hp': 100, 'card_type': 'GUITAR', 'retreat_cost': 1, 'atk_1_name': 'Strum', 'atk_1_cost': 1, 'atk_2_name': 'Surprise Delivery', 'atk_2_cost': 2, 'has_passive': False, 'active_name': None},
+    'CocoZeng': {'module': 'card_game.catalog.characters.pianos.CocoZeng', 'kind': 'character', 'hp': 100, 'card_type': 'PIANO', 'retreat_cost': 2, 'atk_1_name': 'Glissando', 'atk_1_cost': 2, 'atk_2_name': 'Inventory Management', 'atk_2_cost': 3, 'has_passive': False, 'active_name': None},
+    'ConcertProgram': {'module': 'card_game.catalog.items.ConcertProgram', 'kind': 'item'},
+    'ConcertRoster': {'module': 'card_game.catalog.items.ConcertRoster', 'kind': 'item'},
+    'ConcertTicket': {'module': 'card_game.catalog.items.ConcertTicket', 'kind': 'item'},
+    'CorruptedMusescoreFile': {'module': 'card_game.catalog.items.CorruptedMusescoreFile', 'kind': 'item'},
+    'DanielYang': {'module': 'card_game.catalog.characters.percussion.DanielYang', 'kind': 'character', 'hp': 100, 'card_type': 'PIANO', 'retreat_cost': 2, 'atk_1_name': 'Eight Hands Piano', 'atk_1_cost': 3, 'atk_2_name': None, 'atk_2_cost': 0, 'has_passive': True, 'active_name': None},
+    'DanielZhu': {'module': 'card_game.catalog.characters.woodwinds.DanielZhu', 'kind': 'character', 'hp': 120, 'card_type': 'WW', 'retreat_cost': 2, 'atk_1_name': 'Hyper-Ventilation!', 'atk_1_cost': 3, 'atk_2_name': None, 'atk_2_cost': 0, 'has_passive': True, 'active_name': None},
+    'DavidMan': {'module': 'card_game.catalog.characters.pianos.DavidMan', 'kind': 'character', 'hp': 100, 'card_type': 'PIANO', 'retreat_cost': 2, 'atk_1_name': 'Three Hand Technique', 'atk_1_cost': 3, 'atk_2_name': None, 'atk_2_cost': 0, 'has_passive': False, 'active_name': 'Reverse Heist'},
+    'DemiLu': {'module': 'card_game.catalog.characters.pianos.DemiLu', 'kind': 'character', 'hp': 90, 'card_type': 'PIANO', 'retreat_cost': 2, 'atk_1_name': 'Four Hands', 'atk_1_cost': 3, 'atk_2_name': None, 'atk_2_cost': 0, 'has_passive': True, 'active_name': None},
+    'DesmondRoper': {'module': 'card_game.catalog.characters.woodwinds.DesmondRoper', 'kind': 'character', 'hp': 100, 'card_type': 'WW', 'retreat_cost': 2, 'atk_1_name': 'Circular Breathing', 'atk_1_cost': 1, 'atk_2_name': 'Speedrun Central', 'atk_2_cost': 3, 'has_passive': False, 'active_name': None},
+    'DressRehearsalRoster': {'module': 'card_game.catalog.items.DressRehearsalRoster', 'kind': 'item'},
+    'EdwardWibowo': {'module': 'card_game.catalog.characters.guitars.EdwardWibowo', 'kind': 'character', 'hp': 110, 'card_type': 'GUITAR', 'retreat_cost': 2, 'atk_1_name': 'Packet Loss', 'atk_1_cost': 2, 'atk_2_name': 'Distortion', 'atk_2_cost': 3, 'has_passive': False, 'active_name': None},
+    'EmilyWang': {'module': 'card_game.catalog.characters.strings.EmilyWang', 'kind': 'character', 'hp': 100, 'card_type': 'STRING', 'retreat_cost': 1, 'atk_1_name': 'Triple Stop', 'atk_1_cost': 3, 'atk_2_name': None, 'atk_2_cost': 0, 'has_passive': False, 'active_name': 'Profit Margins'},
+    'Emma': {'module': 'card_game.catalog.supporters.Emma', 'kind': 'supporter'},
+    'EugeniaAmpofo': {'module': 'card_game.catalog.characters.percussion.EugeniaAmpofo', 'kind': 'character', 'hp': 100, 'card_type': 'PERC', 'retreat_cost': 2, 'atk_1_name': 'Stick Trick', 'atk_1_cost': 2, 'atk_2_name': None, 'atk_2_cost': 0, 'has_passive': False, 'active_name': 'Fermentation'},
+    'EvelynWu': {'module': 'card_game.catalog.characters.woodwinds.EvelynWu', 'kind': 'character', 'hp': 100, 'card_type': 'WW', 'retreat_cost': 1, 'atk_1_name': 'Circular Breathing', 'atk_1_cost': 1, 'atk_2_name': 'Small Ensemble Lord', 'atk_2_cost': 2, 'has_passive': False, 'active_name': None},
+    'FelixChen': {'module': 'card_game.catalog.characters.woodwinds.FelixChen', 'kind': 'character', 'hp': 90, 'card_type': 'WW', 'retreat_cost': 1, 'atk_1_name': 'Multiphonics', 'atk_1_cost': 3, 'atk_2_name': None, 'atk_2_cost': 0, 'has_passive': True, 'active_name': None},
+    'FilipKaminski': {'module': 'card_game.catalog.characters.brass.FilipKaminski', 'kind': 'character', 'hp': 100, 'card_type': 'BRASS', 'retreat_cost': 2, 'atk_1_name': 'Heart of the Cards', 'atk_1_cost': 1, 'atk_2_name': 'Intense Echo', 'atk_2_cost': 3, 'has_passive': False, 'active_name': None},
+    'FionaLi': {'module': 'card_game.catalog.characters.strings.FionaLi', 'kind': 'character', 'hp': 90, 'card_type': 'STRING', 'retreat_cost': 1, 'atk_1_name': 'Vibrato', 'atk_1_cost': 2, 'atk_2_name': None, 'atk_2_cost': 0, 'has_passive': True, 'active_name': None},
+    'FoldingStand': {'module': 'card_game.catalog.items.FoldingStand', 'kind': 'item'},
+    'FriedmanHall': {'module': 'card_game.catalog.stadiums.FriedmanHall', 'kind': 'stadium'},
+    'GabrielChen': {'module': 'card_game.catalog.characters.strings.GabrielChen', 'kind': 'character', 'hp': 90, 'card_type': 'STRING', 'retreat_cost': 2, 'atk_1_name': None, 'atk_1_cost': 1, 'atk_2_name': 'Harmonics', 'atk_2_cost': 2, 'has_passive': True, 'active_name': None},
+    'GraceZhao': {'module': 'card_game.catalog.characters.guitars.GraceZhao', 'kind': 'character', 'hp': 100, 'card_type': 'GUITAR', 'retreat_cost': 2, 'atk_1_name': 'Feedback Loop', 'atk_1_cost': 2, 'atk_2_name': None, 'atk_2_cost': 0, 'has_passive': True, 'active_name': None},
+    'HanleiGao': {'module': 'card_game.catalog.characters.percussion.HanleiGao', 'kind': 'character', 'hp': 100, 'card_type': 'PERC', 'retreat_cost': 2, 'atk_1_name': 'Stick Trick', 'atk_1_cost': 2, 'atk_2_name': 'Tricky Rhythms', 'atk_2_cost': 3, 'has_passive': False, 'active_name': None},
+    'HappyRuthJara': {'module': 'card_game.catalog.characters.choir.HappyRuthJara', 'kind': 'character', 'hp': 100, 'card_type': 'CHOIR', 'retreat_cost': 1, 'atk_1_name': 'Coloratura', 'atk_1_cost': 3, 'atk_2_name': None, 'atk_2_cost': 0, 'has_passive': False, 'active_name': 'Leave Rehearsal Early'},
+    'HarperAitken': {'module': 'card_game.catalog.characters.woodwinds.HarperAitken', 'kind': 'character', 'hp': 100, 'card_type': 'WW', 'retreat_cost': 2, 'atk_1_name': 'Overblow', 'atk_1_cost': 2, 'atk_2_name': 'Wipeout', 'atk_2_cost': 3, 'has_passive': False, 'active_name': None},
+    'HenryWang': {'module': 'card_game.catalog.characters.pianos.HenryWang', 'kind': 'character', 'hp': 100, 'card_type': 'PIANO', 'retreat_cost': 2, 'atk_1_name': 'Glissando', 'atk_1_cost': 2, 'atk_2_name': 'Improv', 'atk_2_cost': 3, 'has_passive': False, 'active_name': None},
+    'IceSkates': {'module': 'card_game.catalog.items.IceSkates', 'kind': 'item'},
+    'InaMa': {'module': 'card_game.catalog.characters.strings.InaMa', 'kind': 'character', 'hp': 100, 'card_type': 'STRING', 'retreat_cost': 2, 'atk_1_name': 'Triple Stop', 'atk_1_cost': 3, 'atk_2_name': None, 'atk_2_cost': 0, 'has_passive': False, 'active_name': 'Borrow a Bow'},
+    'IrisYang': {'module': 'card_game.catalog.characters.strings.IrisYang', 'kind': 'character', 'hp': 100, 'card_type': 'STRING', 'retreat_cost': 1, 'atk_1_name': 'Open Strings', 'atk_1_cost': 1, 'atk_2_name': 'Spike', 'atk_2_cost': 3, 'has_passive': False, 'active_name': None},
+    'IzzyChen': {'module': 'card_game.catalog.characters.woodwinds.IzzyChen', 'kind': 'character', 'hp': 110, 'card_type': 'WW', 'retreat_cost': 2, 'atk_1_name': 'Overblow', 'atk_1_cost': 2, 'atk_2_name': None, 'atk_2_cost': 0, 'has_passive': False, 'active_name': 'BAI Wrangler'},
+    'JaydenBrown': {'module': 'card_game.catalog.characters.woodwinds.JaydenBrown', 'kind': 'character', 'hp': 90, 'card_type': 'WW', 'retreat_cost': 1, 'atk_1_name': 'Hyper-Ventilation!', 'atk_1_cost': 3, 'atk_2_name': None, 'atk_2_cost': 0, 'has_passive': True, 'active_name': None},
+    'JennieWang': {'module': 'card_game.catalog.characters.pianos.JennieWang', 'kind': 'character', 'hp': 100, 'card_type': 'PIANO', 'retreat_cost': 2, 'atk_1_name': 'Small Ensemble Committee', 'atk_1_cost': 2, 'atk_2_name': 'Grand Piano', 'atk_2_cost': 3, 'has_passive': False, 'active_name': None},
+    'JessicaJung': {'module': 'card_game.catalog.characters.strings.JessicaJung', 'kind': 'character', 'hp': 100, 'card_type': 'STRING', 'retreat_cost': 1, 'atk_1_name': 'Vibrato', 'atk_1_cost': 2, 'atk_2_name': None, 'atk_2_cost': 0, 'has_passive': False, 'active_name': 'Cleric Spell'},
+    'Johann': {'module': 'card_game.catalog.supporters.Johann', 'kind': 'supporter'},
+    'JordanRoosevelt': {'module': 'card_game.catalog.characters.woodwinds.JordanRoosevelt', 'kind': 'character', 'hp': 100, 'card_type': 'WW', 'retreat_cost': 1, 'atk_1_name': 'Trickster', 'atk_1_cost': 1, 'atk_2_name': 'Sparkling Run', 'atk_2_cost': 2, 'has_passive': False, 'active_name': None},
+    'JoshuaKou': {'module': 'card_game.catalog.characters.pianos.JoshuaKou', 'kind': 'character', 'hp': 90, 'card_type': 'PIANO', 'retreat_cost': 1, 'atk_1_name': 'Separate Hands', 'atk_1_cost': 1, 'atk_2_name': None, 'atk_2_cost': 0, 'has_passive': True, 'active_name': None},
+    'JuanBurgos': {'module': 'card_game.catalog.characters.brass.JuanBurgos', 'kind': 'character', 'hp': 90, 'card_type': 'BRASS', 'retreat_cost': 2, 'atk_1_name': 'Concert Pitch', 'atk_1_cost': 3, 'atk_2_name': None, 'atk_2_cost': 0, 'has_passive': True, 'active_name': None},
+    'JuliaCeccarelli': {'module': 'card_game.catalog.characters.strings.JuliaCeccarelli', 'kind': 'character', 'hp': 100, 'card_type': 'STRING', 'retreat_cost': 1, 'atk_1_name': 'Photograph', 'atk_1_cost': 1, 'atk_2_name': 'Ricochet', 'atk_2_cost': 3, 'has_passive': False, 'active_name': None},
+    'KanaTakizawa': {'module': 'card_game.catalog.characters.woodwinds.KanaTakizawa', 'kind': 'character', 'hp': 110, 'card_type': 'WW', 'retreat_cost': 2, 'atk_1_name': 'Flutter Tongue', 'atk_1_cost': 3, 'atk_2_name': None, 'atk_2_cost': 0, 'has_passive': True, 'active_name': None},
+    'KathySun': {'module': 'card_game.catalog.characters.woodwinds.KathySun', 'kind': 'character', 'hp': 100, 'card_type': 'WW', 'retreat_cost': 1, 'atk_1_name': 'Analysis Paralysis', 'atk_1_cost': 1, 'atk_2_name': 'Flutter Tongue', 'atk_2_cost': 3, 'has_passive': False, 'active_name': None},
+    'KatieXiang': {'module': 'card_game.catalog.characters.pianos.KatieXiang', 'kind': 'character', 'hp': 100, 'card_type': 'PIANO', 'retreat_cost': 2, 'atk_1_name': 'Rubato', 'atk_1_cost': 2, 'atk_2_name': None, 'atk_2_cost': 0, 'has_passive': True, 'active_name': None},
+    'KeiWatanabe': {'module': 'card_game.catalog.characters.percussion.KeiWatanabe', 'kind': 'character', 'hp': 100, 'card_type': 'PERC', 'retreat_cost': 1, 'atk_1_name': 'Rudiments', 'atk_1_cost': 1, 'atk_2_name': 'Drum Kid Workshop', 'atk_2_cost': 3, 'has_passive': False, 'active_name': None},
+    'KevinYang': {'module': 'card_game.catalog.characters.percussion.KevinYang', 'kind': 'character', 'hp': 100, 'card_type': 'PERC', 'retreat_cost': 2, 'atk_1_name': 'Rimshot', 'atk_1_cost': 2, 'atk_2_name': 'Stickshot', 'atk_2_cost': 3, 'has_passive': False, 'active_name': None},
+    'KikisHeadband': {'module': 'card_game.catalog.tools.KikisHeadband', 'kind': 'tool'},
+    'LindemannPracticeRoom': {'module': 'card_game.catalog.stadiums.LindemannPracticeRoom', 'kind': 'stadium'},
+    'Lio': {'module': 'card_game.catalog.supporters.Lio', 'kind': 'supporter'},
+    'LoangChiang': {'module': 'card_game.catalog.characters.percussion.LoangChiang', 'kind': 'character', 'hp': 110, 'card_type': 'PERC', 'retreat_cost': 1, 'atk_1_name': 'Stick Trick', 'atk_1_cost': 2, 'atk_2_name': 'Excused Absence', 'atk_2_cost': 3, 'has_passive': False, 'active_name': None},
+    'LucaChen': {'module': 'card_game.catalog.characters.woodwinds.LucaChen', 'kind': 'character', 'hp': 90, 'card_type': 'WW', 'retreat_cost': 1, 'atk_1_name': 'Sparkling Run', 'atk_1_cost': 2, 'atk_2_name': 'Piccolo Solo', 'atk_2_cost': 3, 'has_passive': False, 'active_name': None},
+    'Lucas': {'module': 'card_game.catalog.supporters.Lucas', 'kind': 'supporter'},
+    'LukeXu': {'module': 'card_game.catalog.characters.pianos.LukeXu', 'kind': 'character', 'hp': 90, 'card_type': 'PIANO', 'retreat_cost': 2, 'atk_1_name': 'Damper Pedal', 'atk_1_cost': 2, 'atk_2_name': None, 'atk_2_cost': 0, 'has_passive': True, 'active_name': None},
+    'MaggieLi': {'module': 'card_game.catalog.characters.strings.MaggieLi', 'kind': 'character', 'hp': 110, 'card_type': 'STRING', 'retreat_cost': 2, 'atk_1_name': 'Snap Pizz', 'atk_1_cost': 3, 'atk_2_name': None, 'atk_2_cost': 0, 'has_passive': True, 'active_name': None},
+    'MaidOutfit': {'module': 'card_game.catalog.tools.MaidOutfit', 'kind': 'tool'},
+    'MainHall': {'module': 'card_game.catalog.stadiums.MainHall', 'kind': 'stadium'},
+    'MasonYu': {'module': 'card_game.catalog.characters.strings.MasonYu', 'kind': 'character', 'hp': 100, 'card_type': 'STRING', 'retreat_cost': 2, 'atk_1_name': 'Arrangement', 'atk_1_cost': 1, 'atk_2_name': 'We Play God', 'atk_2_cost': 3, 'has_passive': False, 'active_name': None},
+    'MatchaLatte': {'module': 'card_game.catalog.items.MatchaLatte', 'kind': 'item'},
+    'MatthewWang': {'module': 'card_game.catalog.characters.pianos.MatthewWang', 'kind': 'character', 'hp': 110, 'card_type': 'PIANO', 'retreat_cost': 2, 'atk_1_name': 'Arpeggios', 'atk_1_cost': 2, 'atk_2_name': None, 'atk_2_cost': 0, 'has_passive': True, 'active_name': None},
+    'MeiyiSong': {'module': 'card_game.catalog.characters.woodwinds.MeiyiSong', 'kind': 'character', 'hp': 90, 'card_type': 'WW', 'retreat_cost': 1, 'atk_1_name': 'Reed Replenishment', 'atk_1_cost': 2, 'atk_2_name': 'Clarinet Solo', 'atk_2_cost': 2, 'has_passive': False, 'active_name': None},
+    'MeyaGao': {'module': 'card_game.catalog.characters.guitars.MeyaGao', 'kind': 'character', 'hp': 120, 'card_type': 'GUITAR', 'retreat_cost': 2, 'atk_1_name': 'Distortion', 'atk_1_cost': 3, 'atk_2_name': None, 'atk_2_cost': 0, 'has_passive': True, 'active_name': None},
+    'MichaelTu': {'module': 'card_game.catalog.characters.strings.MichaelTu', 'kind': 'character', 'hp': 100, 'card_type': 'STRING', 'retreat_cost': 1, 'atk_1_name': 'Synchro Summon', 'atk_1_cost': 2, 'atk_2_name': 'Electric Cello', 'atk_2_cost': 3, 'has_passive': False, 'active_name': None},
+    'Michelle': {'module': 'card_game.catalog.supporters.Michelle', 'kind': 'supporter'},
+    'MichelleKim': {'module': 'card_game.catalog.characters.strings.MichelleKim', 'kind': 'character', 'hp': 100, 'card_type': 'STRING', 'retreat_cost': 1, 'atk_1_name': 'Open Strings', 'atk_1_cost': 1, 'atk_2_name': 'VocaRock!!', 'atk_2_cost': 2, 'has_passive': False, 'active_name': None},
+    'MikuOtamatone': {'module': 'card_game.catalog.items.MikuOtamatone', 'kind': 'item'},
+    'MusescoreSubscription': {'module': 'card_game.catalog.tools.MusescoreSubscription', 'kind': 'tool'},
+    'Otamatone': {'module': 'card_game.catalog.items.Otamatone', 'kind': 'item'},
+    'OwenLandry': {'module': 'card_game.catalog.characters.guitars.OwenLandry', 'kind': 'character', 'hp': 100, 'card_type': 'GUITAR', 'retreat_cost': 2, 'atk_1_name': 'Feedback Loop', 'atk_1_cost': 2, 'atk_2_name': 'Domain Expansion', 'atk_2_cost': 3, 'has_passive': False, 'active_name': None},
+    'PascalKim': {'module': 'card_game.catalog.characters.percussion.PascalKim', 'kind': 'character', 'hp': 100, 'card_type': 'PERC', 'retreat_cost': 2, 'atk_1_name': 'Ragebaited', 'atk_1_cost': 2, 'atk_2_name': 'Ominous Chimes', 'atk_2_cost': 3, 'has_passive': False, 'active_name': None},
+    'PetterutiLounge': {'module': 'card_game.catalog.stadiums.PetterutiLounge', 'kind': 'stadium'},
+    'PrintedScore': {'module': 'card_game.catalog.items.PrintedScore', 'kind': 'item'},
+    'RachaelYuan': {'module': 'card_game.catalog.characters.woodwinds.RachaelYuan', 'kind': 'character', 'hp': 100, 'card_type': 'WW', 'retreat_cost': 2, 'atk_1_name': 'Circular Breathing', 'atk_1_cost': 1, 'atk_2_name': 'E2 Reaction', 'atk_2_cost': 3, 'has_passive': False, 'active_name': None},
+    'RachelChen': {'module': 'card_game.catalog.characters.choir.RachelChen', 'kind': 'character', 'hp': 100, 'card_type': 'CHOIR', 'retreat_cost': 1, 'atk_1_name': 'SATB', 'atk_1_cost': 3, 'atk_2_name': None, 'atk_2_cost': 0, 'has_passive': False, 'active_name': None},
+    'RaffleTicket': {'module': 'card_game.catalog.items.RaffleTicket', 'kind': 'item'},
+    'RedRoom': {'module': 'card_game.catalog.stadiums.RedRoom', 'kind': 'stadium'},
+    'Richard': {'module': 'card_game.catalog.supporters.Richard', 'kind': 'supporter'},
+    'RileyHall': {'module': 'card_game.catalog.stadiums.RileyHall', 'kind': 'stadium'},
+    'RobertoGonzales': {'module': 'card_game.catalog.characters.guitars.RobertoGonzales', 'kind': 'character', 'hp': 110, 'card_type': 'GUITAR', 'retreat_cost': 2, 'atk_1_name': 'Guitar Shredding', 'atk_1_cost': 2, 'atk_2_name': 'Distortion', 'atk_2_cost': 3, 'has_passive': False, 'active_name': None},
+    'RossWilliams': {'module': 'card_game.catalog.characters.choir.RossWilliams', 'kind': 'character', 'hp': 110, 'card_type': 'CHOIR', 'retreat_cost': 2, 'atk_1_name': 'Ross Attack!', 'atk_1_cost': 2, 'atk_2_name': None, 'atk_2_cost': 0, 'has_passive': True, 'active_name': None},
+    'RyanDu': {'module': 'card_game.catalog.characters.choir.RyanDu', 'kind': 'character', 'hp': 100, 'card_type': 'CHOIR', 'retreat_cost': 2, 'atk_1_name': 'Tabemono King', 'atk_1_cost': 1, 'atk_2_name': 'Chorus', 'atk_2_cost': 2, 'has_passive': False, 'active_name': None},
+    'RyanLee': {'module': 'card_game.catalog.characters.percussion.RyanLee', 'kind': 'character', 'hp': 100, 'card_type': 'PERC', 'retreat_cost': 2, 'atk_1_name': 'Percussion Ensemble', 'atk_1_cost': 1, 'atk_2_name': 'Four Mallets', 'atk_2_cost': 3, 'has_passive': False, 'active_name': None},
+    'RyanLi': {'module': 'card_game.catalog.characters.pianos.RyanLi', 'kind': 'character', 'hp': 90, 'card_type': 'PIANO', 'retreat_cost': 2, 'atk_1_name': 'Four Hands', 'atk_1_cost': 3, 'atk_2_name': None, 'atk_2_cost': 0, 'has_passive': True, 'active_name': None},
+    'SalomonDECI': {'module': 'card_game.catalog.stadiums.SalomonDECI', 'kind': 'stadium'},
+    'SarahChen': {'module': 'card_game.catalog.characters.woodwinds.SarahChen', 'kind': 'character', 'hp': 100, 'card_type': 'WW', 'retreat_cost': 1, 'atk_1_name': 'Double Tongue', 'atk_1_cost': 1, 'atk_2_name': 'Artist Alley', 'atk_2_cost': 3, 'has_passive': False, 'active_name': None},
+    'SasMajumder': {'module': 'card_game.catalog.characters.percussion.SasMajumder', 'kind': 'character', 'hp': 110, 'card_type': 'PERC', 'retreat_cost': 2, 'atk_1_name': 'Four Mallets', 'atk_1_cost': 3, 'atk_2_name': None, 'atk_2_cost': 0, 'has_passive': True, 'active_name': None},
+    'SophiaSWang': {'module': 'card_game.catalog.characters.pianos.SophiaSWang', 'kind': 'character', 'hp': 100, 'card_type': 'PIANO', 'retreat_cost': 2, 'atk_1_name': 'Damper Pedal', 'atk_1_cost': 2, 'atk_2_name': None, 'atk_2_cost': 0, 'has_passive': True, 'active_name': None},
+    'SophiaYWang': {'module': 'card_game.catalog.characters.strings.SophiaYWang', 'kind': 'character', 'hp': 110, 'card_type': 'STRING', 'retreat_cost': 2, 'atk_1_name': 'Gacha Gaming', 'atk_1_cost': 1, 'atk_2_name': 'Ricochet', 'atk_2_cost': 3, 'has_passive': False, 'active_name': None},
+    'StandardMusescoreFile': {'module': 'card_game.catalog.items.StandardMusescoreFile', 'kind': 'item'},
+    'SteinertBasement': {'module': 'card_game.catalog.stadiums.SteinertBasement', 'kind': 'stadium'},
+    'SteinertPracticeRoom': {'module': 'card_game.catalog.stadiums.SteinertPracticeRoom', 'kind': 'stadium'},
+    'StrawberryMatchaLatte': {'module': 'card_game.catalog.items.StrawberryMatchaLatte', 'kind': 'item'},
+    'Victoria': {'module': 'card_game.catalog.supporters.Victoria', 'kind': 'supporter'},
+    'VideoCamera': {'module': 'card_game.catalog.items.VideoCamera', 'kind': 'item'},
+    'VincentChen': {'module': 'card_game.catalog.characters.brass.VincentChen', 'kind': 'character', 'hp': 120, 'card_type': 'BRASS', 'retreat_cost': 2, 'atk_1_name': 'Fanfare', 'atk_1_cost': 1, 'atk_2_name': 'Cherry Flavored Valve Oil', 'atk_2_cost': 3, 'has_passive': False, 'active_name': None},
+    'WestonPoe': {'module': 'card_game.catalog.characters.woodwinds.WestonPoe', 'kind': 'character', 'hp': 110, 'card_type': 'WW', 'retreat_cost': 2, 'atk_1_name': 'Overblow', 'atk_1_cost': 2, 'atk_2_name': None, 'atk_2_cost': 0, 'has_passive': True, 'active_name': None},
+    'Will': {'module': 'card_game.catalog.supporters.Will', 'kind': 'supporter'},
+    'YanwanZhu': {'module': 'card_game.catalog.characters.choir.YanwanZhu', 'kind': 'character', 'hp': 100, 'card_type': 'CHOIR', 'retreat_cost': 1, 'atk_1_name': 'Intense Voice', 'atk_1_cost': 3, 'atk_2_name': None, 'atk_2_cost': 0, 'has_passive': True, 'active_name': None},
+    'YuelinHu': {'module': 'card_game.catalog.characters.strings.YuelinHu', 'kind': 'character', 'hp': 100, 'card_type': 'STRING', 'retreat_cost': 1, 'atk_1_name': 'Triple Stop', 'atk_1_cost': 3, 'atk_2_name': None, 'atk_2_cost': 0, 'has_passive': True, 'active_name': None},
+}
+
+EXPORTS: dict[str, str] = {
+    'AVGEBirb': 'card_game.catalog.items.AVGEBirb',
+    'AVGEBirbNextTurnDamageModifier': 'card_game.catalog.items.AVGEBirb',
+    'AVGEShowcaseSticker': 'card_game.catalog.tools.AVGEShowcaseSticker',
+    'AVGEShowcaseStickerTurnStartReactor': 'card_game.catalog.tools.AVGEShowcaseSticker',
+    'AVGETShirt': 'card_game.catalog.tools.AVGETShirt',
+    'AliceWang': 'card_game.catalog.characters.strings.AliceWang',
+    'AlumnaeHall': 'card_game.catalog.stadiums.AlumnaeHall',
+    'AlumnaeHallDrawPunishReactor': 'card_game.catalog.stadiums.AlumnaeHall',
+    'AnaliseJia': 'card_game.catalog.characters.woodwinds.AnaliseJia',
+    'AndreaCR': 'card_game.catalog.characters.strings.AndreaCR',
+    'Angel': 'card_game.catalog.supporters.Angel',
+    'AnnaBrown': 'card_game.catalog.characters.woodwinds.AnnaBrown',
+    'AnnaBrownBenchDamageShield': 'card_game.catalog.characters.woodwinds.AnnaBrown',
+    'AnnotatedScore': 'card_game.catalog.items.AnnotatedScore',
+    'AntongChen': 'card_game.catalog.characters.guitars.AntongChen',
+    'ArrangerStatusReactor': 'card_game.catalog.status_effects.Arranger',
+    'AshleyToby': 'card_game.catalog.characters.strings.AshleyToby',
+    'BAIEmail': 'card_game.catalog.items.BAIEmail',
+    'BAIEmailStadiumPlayLockAssessor': 'card_game.catalog.items.BAIEmail',
+    'BUOStand': 'card_game.catalog.items.BUOStand',
+    'BUOStandNextAttackModifier': 'card_game.catalog.items.BUOStand',
+    'BarronLee': 'card_game.catalog.characters.brass.BarronLee',
+    'BenCherekIII': 'card_game.catalog.characters.guitars.BenCherekIII',
+    'BettySolomon': 'card_game.catalog.characters.woodwinds.BettySolomon',
+    'BokaiBi': 'card_game.catalog.characters.percussion.BokaiBi',
+    'Bucket': 'card_game.catalog.tools.Bucket',
+    'Camera': 'card_game.catalog.items.Camera',
+    'CarolynZheng': 'card_game.catalog.characters.brass.CarolynZheng',
+    'CastReserve': 'card_game.catalog.items.CastReserve',
+    'CathyRong': 'card_game.catalog.characters.pianos.CathyRong',
+    'CavinMaidBoostModifier': 'card_game.catalog.characters.percussion.CavinXue',
+    'CavinXue': 'card_game.catalog.characters.percussion.CavinXue',
+    'ChristmasKim': 'card_game.catalog.characters.guitars.ChristmasKim',
+    'CocoZeng': 'card_game.catalog.characters.pianos.CocoZeng',
+    'ConcertProgram': 'card_game.catalog.items.ConcertProgram',
+    'ConcertRoster': 'card_game.catalog.items.ConcertRoster',
+    'ConcertTicket': 'card_game.catalog.items.ConcertTicket',
+    'CorruptedMusescoreFile': 'card_game.catalog.items.CorruptedMusescoreFile',
+    'DanielYang': 'card_game.catalog.characters.percussion.DanielYang',
+    'DanielZhu': 'card_game.catalog.characters.woodwinds.DanielZhu',
+    'DanielZhuSharePainModifier': 'card_game.catalog.characters.woodwinds.DanielZhu',
+    'DavidMan': 'card_game.catalog.characters.pianos.DavidMan',
+    'DemiLu': 'card_game.catalog.characters.pianos.DemiLu',
+    'DemiLuConstraint': 'card_game.catalog.characters.pianos.DemiLu',
+    'DemiLuDamageBlockModifier': 'card_game.catalog.characters.pianos.DemiLu',
+    'DesmondRoper': 'card_game.catalog.characters.woodwinds.DesmondRoper',
+    'DressRehearsalRoster': 'card_game.catalog.items.DressRehearsalRoster',
+    'EdwardWibowo': 'card_game.catalog.characters.guitars.EdwardWibowo',
+    'EmilyWang': 'card_game.catalog.characters.strings.EmilyWang',
+    'Emma': 'card_game.catalog.supporters.Emma',
+    'EmmaNextTurnSwapLockAssessor': 'card_game.catalog.supporters.Emma',
+    'EugeniaAmpofo': 'card_game.catalog.characters.percussion.EugeniaAmpofo',
+    'EvelynWu': 'card_game.catalog.characters.woodwinds.EvelynWu',
+    'FelixChen': 'card_game.catalog.characters.woodwinds.FelixChen',
+    'FelixSynesthesiaModifier': 'card_game.catalog.characters.woodwinds.FelixChen',
+    'FilipKaminski': 'card_game.catalog.characters.brass.FilipKaminski',
+    'FionaLi': 'card_game.catalog.characters.strings.FionaLi',
+    'FoldingStand': 'card_game.catalog.items.FoldingStand',
+    'FoldingStandNextAttackModifier': 'card_game.catalog.items.FoldingStand',
+    'FriedmanHall': 'card_game.catalog.stadiums.FriedmanHall',
+    'FriedmanHallTurnBeginOverrideAssessor': 'card_game.catalog.stadiums.FriedmanHall',
+    'GabrielChen': 'card_game.catalog.characters.strings.GabrielChen',
+    'GoonStatusChangeReactor': 'card_game.catalog.status_effects.Goon',
+    'GoonStatusTransferModifier': 'card_game.catalog.status_effects.Goon',
+    'GraceZhao': 'card_game.catalog.characters.guitars.GraceZhao',
+    'HanleiGao': 'card_game.catalog.characters.percussion.HanleiGao',
+    'HappyRuthJara': 'card_game.catalog.characters.choir.HappyRuthJara',
+    'HarperAitken': 'card_game.catalog.characters.woodwinds.HarperAitken',
+    'HenryWang': 'card_game.catalog.characters.pianos.HenryWang',
+    'IceSkates': 'card_game.catalog.items.IceSkates',
+    'InaMa': 'card_game.catalog.characters.strings.InaMa',
+    'IrisYang': 'card_game.catalog.characters.strings.IrisYang',
+    'IzzyChen': 'card_game.catalog.characters.woodwinds.IzzyChen',
+    'JaydenBrown': 'card_game.catalog.characters.woodwinds.JaydenBrown',
+    'JaydenBrownFourLeafCloverReactor': 'card_game.catalog.characters.woodwinds.JaydenBrown',
+    'JennieWang': 'card_game.catalog.characters.pianos.JennieWang',
+    'JessicaJung': 'card_game.catalog.characters.strings.JessicaJung',
+    'Johann': 'card_game.catalog.supporters.Johann',
+    'JordanOpponentAttackBoost': 'card_game.catalog.characters.woodwinds.JordanRoosevelt',
+    'JordanRoosevelt': 'card_game.catalog.characters.woodwinds.JordanRoosevelt',
+    'JordanSelfAttackBoost': 'card_game.catalog.characters.woodwinds.JordanRoosevelt',
+    'JoshuaKou': 'card_game.catalog.characters.pianos.JoshuaKou',
+    'JuanBurgos': 'card_game.catalog.characters.brass.JuanBurgos',
+    'JuliaCeccarelli': 'card_game.catalog.characters.strings.JuliaCeccarelli',
+    'KanaImmenseAuraModifier': 'card_game.catalog.characters.woodwinds.KanaTakizawa',
+    'KanaTakizawa': 'card_game.catalog.characters.woodwinds.KanaTakizawa',
+    'KathySun': 'card_game.catalog.characters.woodwinds.KathySun',
+    'KatieTurnEndReactor': 'card_game.catalog.characters.pianos.KatieXiang',
+    'KatieXiang': 'card_game.catalog.characters.pianos.KatieXiang',
+    'KeiWatanabe': 'card_game.catalog.characters.percussion.KeiWatanabe',
+    'KevinYang': 'card_game.catalog.characters.percussion.KevinYang',
+    'KikisHeadband': 'card_game.catalog.tools.KikisHeadband',
+    'KikisHeadbandTransferModifier': 'card_game.catalog.tools.KikisHeadband',
+    'LindemannPracticeRoom': 'card_game.catalog.stadiums.LindemannPracticeRoom',
+    'LindemannReducedAttackCostModifier': 'card_game.catalog.stadiums.LindemannPracticeRoom',
+    'Lio': 'card_game.catalog.supporters.Lio',
+    'LoangChiang': 'card_game.catalog.characters.percussion.LoangChiang',
+    'LucaChen': 'card_game.catalog.characters.woodwinds.LucaChen',
+    'Lucas': 'card_game.catalog.supporters.Lucas',
+    'LukeNextAttackHalvedModifier': 'card_game.catalog.characters.pianos.LukeXu',
+    'LukeXu': 'card_game.catalog.characters.pianos.LukeXu',
+    'LukeXuPassiveConstraint': 'card_game.catalog.characters.pianos.LukeXu',
+    'MaggieLi': 'card_game.catalog.characters.strings.MaggieLi',
+    'MaidOutfit': 'card_game.catalog.tools.MaidOutfit',
+    'MaidStatusDamageShieldModifier': 'card_game.catalog.status_effects.Maid',
+    'MainHall': 'card_game.catalog.stadiums.MainHall',
+    'MainHallPlayLimitAssessor': 'card_game.catalog.stadiums.MainHall',
+    'MasonYu': 'card_game.catalog.characters.strings.MasonYu',
+    'MatchaLatte': 'card_game.catalog.items.MatchaLatte',
+    'MatthewWang': 'card_game.catalog.characters.pianos.MatthewWang',
+    'MeiyiSong': 'card_game.catalog.characters.woodwinds.MeiyiSong',
+    'MeyaGao': 'card_game.catalog.characters.guitars.MeyaGao',
+    'MichaelTu': 'card_game.catalog.characters.strings.MichaelTu',
+    'Michelle': 'card_game.catalog.supporters.Michelle',
+    'MichelleKim': 'card_game.catalog.characters.strings.MichelleKim',
+    'MikuOtamatone': 'card_game.catalog.items.MikuOtamatone',
+    'MikuOtamatoneEnergy': 'card_game.catalog.items.MikuOtamatone',
+    'MusescoreSubscription': 'card_game.catalog.tools.MusescoreSubscription',
+    'Otamatone': 'card_game.catalog.items.Otamatone',
+    'OtamatoneEnergy': 'card_game.catalog.items.Otamatone',
+    'OwenLandry': 'card_game.catalog.characters.guitars.OwenLandry',
+    'PascalKim': 'card_game.catalog.characters.percussion.PascalKim',
+    'PetterutiLounge': 'card_game.catalog.stadiums.PetterutiLounge',
+    'PetterutiMaidDamageModifier': 'card_game.catalog.stadiums.PetterutiLounge',
+    'PetterutiMaidTransfer': 'card_game.catalog.stadiums.PetterutiLounge',
+    'PetterutiPowerpointNightPacketListener': 'card_game.catalog.stadiums.PetterutiLounge',
+    'PrintedScore': 'card_game.catalog.items.PrintedScore',
+    'RachaelYuan': 'card_game.catalog.characters.woodwinds.RachaelYuan',
+    'RachelChen': 'card_game.catalog.characters.choir.RachelChen',
+    'RaffleTicket': 'card_game.catalog.items.RaffleTicket',
+    'RedRoom': 'card_game.catalog.stadiums.RedRoom',
+    'RedRoomAmpDiff': 'card_game.catalog.stadiums.RedRoom',
+    'Richard': 'card_game.catalog.supporters.Richard',
+    'RileyHall': 'card_game.catalog.stadiums.RileyHall',
+    'RileyHallStartTurnBenchGapDamageReactor': 'card_game.catalog.stadiums.RileyHall',
+    'RobertoGonzales': 'card_game.catalog.characters.guitars.RobertoGonzales',
+    'RossWilliams': 'card_game.catalog.characters.choir.RossWilliams',
+    'RyanDu': 'card_game.catalog.characters.choir.RyanDu',
+    'RyanLee': 'card_game.catalog.characters.percussion.RyanLee',
+    'RyanLi': 'card_game.catalog.characters.pianos.RyanLi',
+    'RyanLiMaidDamageModifier': 'card_game.catalog.characters.pianos.RyanLi',
+    'SalomonDECI': 'card_game.catalog.stadiums.SalomonDECI',
+    'SalomonDECIAttackBoostModifier': 'card_game.catalog.stadiums.SalomonDECI',
+    'SarahChen': 'card_game.catalog.characters.woodwinds.SarahChen',
+    'SasMajumder': 'card_game.catalog.characters.percussion.SasMajumder',
+    'SophiaNextAttackHalvedModifier': 'card_game.catalog.characters.pianos.SophiaSWang',
+    'SophiaSWang': 'card_game.catalog.characters.pianos.SophiaSWang',
+    'SophiaYWang': 'card_game.catalog.characters.strings.SophiaYWang',
+    'StandardMusescoreFile': 'card_game.catalog.items.StandardMusescoreFile',
+    'SteinertBasement': 'card_game.catalog.stadiums.SteinertBasement',
+    'SteinertBasementAttackExtraCostAssessor': 'card_game.catalog.stadiums.SteinertBasement',
+    'SteinertBasementTwoInPlayBonusDrawReactor': 'card_game.catalog.stadiums.SteinertBasement',
+    'SteinertPracticeRoom': 'card_game.catalog.stadiums.SteinertPracticeRoom',
+    'SteinertPracticeRoomAttackExtraCostAssessor': 'card_game.catalog.stadiums.SteinertPracticeRoom',
+    'SteinertPracticeRoomBenchCapAssessor': 'card_game.catalog.stadiums.SteinertPracticeRoom',
+    'StrawberryMatchaLatte': 'card_game.catalog.items.StrawberryMatchaLatte',
+    'Victoria': 'card_game.catalog.supporters.Victoria',
+    'VideoCamera': 'card_game.catalog.items.VideoCamera',
+    'VincentChen': 'card_game.catalog.characters.brass.VincentChen',
+    'WestonPoe': 'card_game.catalog.characters.woodwinds.WestonPoe',
+    'Will': 'card_game.catalog.supporters.Will',
+    'YanwanZhu': 'card_game.catalog.characters.choir.YanwanZhu',
+    'YuelinHu': 'card_game.catalog.characters.strings.YuelinHu',
+}
@@ -1,8 +1 @@
-"""Package exports for this catalog namespace."""
-from .brass import *
-from .choir import *
-from .guitars import *
-from .percussion import *
-from .pianos import *
-from .strings import *
-from .woodwinds import *
+"""Card modules for this catalog namespace; import names through card_game.catalog."""
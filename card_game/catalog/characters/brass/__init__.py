@@ -1,6 +1 @@
-"""Package exports for this catalog namespace."""
-from .BarronLee import *
-from .CarolynZheng import *
-from .FilipKaminski import *
-from .JuanBurgos import *
-from .VincentChen import *
+"""Card modules for this catalog namespace; import names through card_game.catalog."""
@@ -1,6 +1 @@
-"""Package exports for this catalog namespace."""
-from .HappyRuthJara import *
-from .RachelChen import *
-from .RossWilliams import *
-from .RyanDu import *
-from .YanwanZhu import *
+"""Card modules for this catalog namespace; import names through card_game.catalog."""
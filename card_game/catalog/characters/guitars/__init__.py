@@ -1,9 +1 @@
-"""Package exports for this catalog namespace."""
-from .AntongChen import *
-from .BenCherekIII import *
-from .ChristmasKim import *
-from .EdwardWibowo import *
-from .GraceZhao import *
-from .MeyaGao import *
-from .OwenLandry import *
-from .RobertoGonzales import *
+"""Card modules for this catalog namespace; import names through card_game.catalog."""
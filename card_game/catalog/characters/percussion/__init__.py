@@ -1,12 +1 @@
-"""Package exports for this catalog namespace."""
-from .BokaiBi import *
-from .CavinXue import *
-from .DanielYang import *
-from .EugeniaAmpofo import *
-from .HanleiGao import *
-from .KeiWatanabe import *
-from .KevinYang import *
-from .LoangChiang import *
-from .PascalKim import *
-from .RyanLee import *
-from .SasMajumder import *
+"""Card modules for this catalog namespace; import names through card_game.catalog."""
@@ -1,13 +1 @@
-"""Package exports for this catalog namespace."""
-from .CathyRong import *
-from .CocoZeng import *
-from .DavidMan import *
-from .DemiLu import *
-from .HenryWang import *
-from .JennieWang import *
-from .JoshuaKou import *
-from .KatieXiang import *
-from .LukeXu import *
-from .MatthewWang import *
-from .RyanLi import *
-from .SophiaSWang import *
+"""Card modules for this catalog namespace; import names through card_game.catalog."""
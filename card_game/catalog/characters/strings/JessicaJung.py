@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from random import randint
+import random
 
 from card_game.avge_abstracts import *
 from card_game.constants import *
@@ -93,7 +93,7 @@ class JessicaJung(AVGECharacterCard):
                     ActionTypes.ACTIVATE_ABILITY,
                     self,
                     None,
-                    randint(0, len(deck)),
+                    random.randint(0, len(deck)),
                 )
             )
             return packet
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from random import randint
+import random
 
 from card_game.avge_abstracts import *
 from card_game.catalog.items.AVGEBirb import AVGEBirb
@@ -144,7 +144,7 @@ class SophiaYWang(AVGECharacterCard):
                         ActionTypes.ATK_1,
                         card,
                         None,
-                        randint(0, len(deck)),
+                        random.randint(0, len(deck)),
                     )
                 ]
 
@@ -1,17 +1 @@
-"""Package exports for this catalog namespace."""
-from .AndreaCR import *
-from .AshleyToby import *
-from .EmilyWang import *
-from .FionaLi import *
-from .GabrielChen import *
-from .InaMa import *
-from .IrisYang import *
-from .JessicaJung import *
-from .JuliaCeccarelli import *
-from .MaggieLi import *
-from .MasonYu import *
-from .MichaelTu import *
-from .MichelleKim import *
-from .SophiaYWang import *
-from .YuelinHu import *
-from .AliceWang import *
+"""Card modules for this catalog namespace; import names through card_game.catalog."""
@@ -1,19 +1 @@
-"""Package exports for this catalog namespace."""
-from .AnaliseJia import *
-from .AnnaBrown import *
-from .BettySolomon import *
-from .DanielZhu import *
-from .DesmondRoper import *
-from .EvelynWu import *
-from .FelixChen import *
-from .HarperAitken import *
-from .IzzyChen import *
-from .JaydenBrown import *
-from .JordanRoosevelt import *
-from .KanaTakizawa import *
-from .KathySun import *
-from .LucaChen import *
-from .MeiyiSong import *
-from .RachaelYuan import *
-from .SarahChen import *
-from .WestonPoe import *
+"""Card modules for this catalog namespace; import names through card_game.catalog."""
@@ -0,0 +1,7 @@
+"""Regenerate (--write) or verify (--check) catalog_index.py after adding or changing cards."""
+from __future__ import annotations
+
+from .registry import main
+
+if __name__ == '__main__':
+    raise SystemExit(main())
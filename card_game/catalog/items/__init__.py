@@ -1,22 +1 @@
-"""Package exports for this catalog namespace."""
-from .AnnotatedScore import *
-from .AVGEBirb import *
-from .BAIEmail import *
-from .BUOStand import *
-from .Camera import *
-from .CastReserve import *
-from .ConcertProgram import *
-from .ConcertRoster import *
-from .ConcertTicket import *
-from .CorruptedMusescoreFile import *
-from .DressRehearsalRoster import *
-from .FoldingStand import *
-from .IceSkates import *
-from .MatchaLatte import *
-from .MikuOtamatone import *
-from .Otamatone import *
-from .PrintedScore import *
-from .RaffleTicket import *
-from .StandardMusescoreFile import *
-from .StrawberryMatchaLatte import *
-from .VideoCamera import *
+"""Card modules for this catalog namespace; import names through card_game.catalog."""
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Literal
+import argparse
+import importlib
+import pkgutil
+import sys
+
+from . import catalog_index
+
+if TYPE_CHECKING:
+    from ..avge_abstracts.AVGECards import AVGECard
+
+type CardKind = Literal['character', 'item', 'tool', 'stadium', 'supporter']
+
+INDEX_PATH = Path(__file__).with_name('catalog_index.py')
+_PACKAGE = __name__.rpartition('.')[0]
+_GENERATOR = f'{_PACKAGE}.generate_index'
+# Catalog support modules, not card modules.
+_NOT_CARD_MODULES = {__name__, catalog_index.__name__, _GENERATOR}
+
+# Base class name -> kind, most specific first.
+_KIND_BY_BASE: tuple[tuple[str, CardKind], ...] = (
+    ('AVGECharacterCard', 'character'),
+    ('AVGEItemCard', 'item'),
+    ('AVGEToolCard', 'tool'),
+    ('AVGEStadiumCard', 'stadium'),
+    ('AVGESupporterCard', 'supporter'),
+)
+
+# Character attributes set in __init__ that the index records.
+_CHARACTER_FIELDS = (
+    'hp',
+    'card_type',
+    'retreat_cost',
+    'atk_1_name',
+    'atk_1_cost',
+    'atk_2_name',
+    'atk_2_cost',
+    'has_passive',
+    'active_name',
+)
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    """Static facts about one card, readable without importing its module."""
+
+    card_id: str
+    module: str
+    kind: CardKind
+    hp: int | None = None
+    card_type: str | None = None
+    retreat_cost: int | None = None
+    atk_1_name: str | None = None
+    atk_1_cost: int | None = None
+    atk_2_name: str | None = None
+    atk_2_cost: int | None = None
+    has_passive: bool = False
+    active_name: str | None = None
+
+
+@cache
+def _entries() -> dict[str, CatalogEntry]:
+    return {card_id: CatalogEntry(card_id=card_id, **fields) for card_id, fields in catalog_index.CARDS.items()}
+
+
+def card_entry(card_id: str) -> CatalogEntry | None:
+    return _entries().get(card_id)
+
+
+def card_entries(kind: CardKind | None = None) -> list[CatalogEntry]:
+    return [entry for entry in _entries().values() if kind is None or entry.kind == kind]
+
+
+def export_names() -> list[str]:
+    return sorted(catalog_index.EXPORTS)
+
+
+def load_export(name: str) -> Any:
+    """Import the module defining a catalog name and return it; AttributeError if unknown."""
+    module_name = catalog_index.EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f'module {_PACKAGE!r} has no attribute {name!r}')
+    return getattr(importlib.import_module(module_name), name)
+
+
+def load_card_class(card_id: str) -> type[AVGECard] | None:
+    """Card class for ``card_id``, importing its module on first use; None if not a card."""
+    from ..avge_abstracts.AVGECards import AVGECard
+
+    entry = card_entry(card_id)
+    if entry is None:
+        return None
+    symbol = getattr(importlib.import_module(entry.module), card_id, None)
+    if not isinstance(symbol, type) or not issubclass(symbol, AVGECard):
+        return None
+    return symbol
+
+
+def build_index() -> tuple[dict[str, dict[str, Any]], dict[str, str]]:
+    """Import every catalog module and collect its cards and public names."""
+    from ..avge_abstracts.AVGECards import AVGECard
+
+    package = importlib.import_module(_PACKAGE)
+    cards: dict[str, dict[str, Any]] = {}
+    exports: dict[str, str] = {}
+    for module_info in pkgutil.walk_packages(package.__path__, f'{_PACKAGE}.'):
+        if module_info.ispkg or module_info.name in _NOT_CARD_MODULES:
+            continue
+        module = importlib.import_module(module_info.name)
+        for name, symbol in vars(module).items():
+            if name.startswith('_') or getattr(symbol, '__module__', None) != module.__name__:
+                continue
+            if name in exports:
+                raise ValueError(f'catalog name {name!r} is defined in {exports[name]} and {module.__name__}')
+            exports[name] = module.__name__
+            if isinstance(symbol, type) and issubclass(symbol, AVGECard):
+                cards[name] = _card_fields(symbol)
+    return dict(sorted(cards.items())), dict(sorted(exports.items()))
+
+
+def _card_fields(card_class: type[AVGECard]) -> dict[str, Any]:
+    base_names = {base.__name__ for base in card_class.__mro__}
+    kind = next(kind for base_name, kind in _KIND_BY_BASE if base_name in base_names)
+    fields: dict[str, Any] = {'module': card_class.__module__, 'kind': kind}
+    if kind != 'character':
+        return fields
+
+    card = card_class('catalog-index')
+    for name in _CHARACTER_FIELDS:
+        value = getattr(card, name)
+        fields[name] = getattr(value, 'value', value)
+    return fields
+
+
+def render_index(cards: dict[str, dict[str, Any]], exports: dict[str, str]) -> str:
+    lines = [
+        f'# Generated by `python -m {_GENERATOR} --write`; do not edit by hand.',
+        'from __future__ import annotations',
+        '',
+        'from typing import Any',
+        '',
+        'CARDS: dict[str, dict[str, Any]] = {',
+    ]
+    lines.extend(f'    {card_id!r}: {fields!r},' for card_id, fields in cards.items())
+    lines.extend(['}', '', 'EXPORTS: dict[str, str] = {'])
+    lines.extend(f'    {name!r}: {module!r},' for name, module in exports.items())
+    lines.extend(['}', ''])
+    return '\n'.join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='Generate or check the lazy catalog index.')
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument('--write', action='store_true', help=f'Rewrite {INDEX_PATH.name} from the catalog modules.')
+    mode.add_argument('--check', action='store_true', help=f'Exit 1 if {INDEX_PATH.name} is out of date.')
+    args = parser.parse_args(argv)
+
+    rendered = render_index(*build_index())
+    if args.write:
+        INDEX_PATH.write_text(rendered, encoding='utf-8')
+        print(f'wrote {INDEX_PATH}')
+        return 0
+    if INDEX_PATH.read_text(encoding='utf-8') != rendered:
+        print(f'{INDEX_PATH} is out of date; run python -m {_GENERATOR} --write', file=sys.stderr)
+        return 1
+    return 0
+
@@ -1,11 +1 @@
-"""Package exports for this catalog namespace."""
-from .AlumnaeHall import *
-from .FriedmanHall import *
-from .LindemannPracticeRoom import *
-from .MainHall import *
-from .PetterutiLounge import *
-from .RedRoom import *
-from .RileyHall import *
-from .SalomonDECI import *
-from .SteinertBasement import *
-from .SteinertPracticeRoom import *
+"""Card modules for this catalog namespace; import names through card_game.catalog."""
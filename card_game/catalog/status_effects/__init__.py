@@ -1,4 +1 @@
-"""Package exports for this catalog namespace."""
-from .Arranger import *
-from .Goon import *
-from .Maid import *
+"""Card modules for this catalog namespace; import names through card_game.catalog."""
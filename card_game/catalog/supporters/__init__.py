@@ -1,10 +1 @@
-"""Package exports for this catalog namespace."""
-from .Angel import *
-from .Emma import *
-from .Johann import *
-from .Lio import *
-from .Lucas import *
-from .Michelle import *
-from .Richard import *
-from .Victoria import *
-from .Will import *
+"""Card modules for this catalog namespace; import names through card_game.catalog."""
@@ -1,7 +1 @@
-"""Package exports for this catalog namespace."""
-from .AVGEShowcaseSticker import *
-from .AVGETShirt import *
-from .Bucket import *
-from .KikisHeadband import *
-from .MaidOutfit import *
-from .MusescoreSubscription import *
+"""Card modules for this catalog namespace; import names through card_game.catalog."""
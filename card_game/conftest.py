@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+
+import pytest
+
+_router_db_dir: str | None = None
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    # router_server opens the default router database when it is imported;
+    # point it at a scratch directory so test runs leave nothing in the tree.
+    global _router_db_dir
+    if 'ROUTER_DB_PATH' in os.environ:
+        return
+    _router_db_dir = tempfile.mkdtemp(prefix='avge-router-test-')
+    os.environ['ROUTER_DB_PATH'] = os.path.join(_router_db_dir, 'router.sqlite3')
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    global _router_db_dir
+    if _router_db_dir is None:
+        return
+    os.environ.pop('ROUTER_DB_PATH', None)
+    shutil.rmtree(_router_db_dir, ignore_errors=True)
+    _router_db_dir = None
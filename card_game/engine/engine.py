@@ -3,6 +3,7 @@ from typing import TYPE_CHECKING, Callable, Generic, TypeVar, cast, Type, Tuple,
 from .engine_queue import EngineQueue
 from .event import Event, Packet
 from .engine_constants import *
+from .profiler import EngineProfiler, CORE, LISTENER
 from card_game.constants import Data, Response, ResponseType, Interrupt
 
 if TYPE_CHECKING:
@@ -72,6 +73,21 @@ class Engine(Generic[EV]):
         self.packet_running : Packet[EV] = Packet([])
         self.listeners_attached_during_packet : set[event_listener.AbstractEventListener] = set([])
         self._queue : EngineQueue[Packet[EV]] = EngineQueue()
+        self._profiler : EngineProfiler | None = None#instrumentation is off unless a profiler is attached
+
+    def enable_profiling(self, profiler : EngineProfiler | None = None) -> EngineProfiler:
+        #attaches a profiler (or keeps the current one) and returns it
+        if(profiler is not None):
+            self._profiler = profiler
+        elif(self._profiler is None):
+            self._profiler = EngineProfiler()
+        return self._profiler
+
+    def disable_profiling(self) -> EngineProfiler | None:
+        #detaches and returns the profiler so its results can still be read
+        profiler = self._profiler
+        self._profiler = None
+        return profiler
 
     def add_constraint(self, constraint : 'constrainer.Constraint[EV]'):
         #first, check if this constrainer falls under other constrainers. if it does, drop it.
@@ -153,6 +169,12 @@ class Engine(Generic[EV]):
         #extends the current running EVENT with the givne
         self.packet_running.insert(0, packet)
         
+    def _invert_core(self, e : EV):
+        if(self._profiler is None):
+            e.invert_core(e.core_args)
+        else:
+            self._profiler.measure(CORE, f"{type(e).__qualname__}.invert_core", e.invert_core, e.core_args)
+
     def forward(self, args : dict | None = None) -> Response:
         if(args is None):
             args = {}
@@ -174,10 +196,13 @@ class Engine(Generic[EV]):
                 self._external_listeners_backup.append(l)
             #reset listeners run
             self.listeners_attached_during_packet = set([])
+            if(self._profiler is not None):
+                self._profiler.begin_packet()
             return Response(ResponseType.NEXT_PACKET, Data())
         elif(self.event_running is None and len(self.packet_running) > 0):
             #prepares a fresh event from the current packet to run
-            self.event_running = self.packet_running.get_next_event()
+            profiler = self._profiler
+            self.event_running = self.packet_running.get_next_event(profiler)
             if(self.event_running is None):
                 return self.forward(args)
             else:
@@ -186,7 +211,10 @@ class Engine(Generic[EV]):
                 #attach all required external listeners
                 if(not self.event_running._external_listeners_attached):
                     for listener in self._external_listeners:
-                        attached = self.event_running.attach_listener(listener)
+                        if(profiler is None):
+                            attached = self.event_running.attach_listener(listener)
+                        else:
+                            attached = profiler.measure(LISTENER, f"{type(listener).__qualname__}.event_match", self.event_running.attach_listener, listener)
                         if(attached):
                             self.listeners_attached_during_packet.add(listener)
                     self.event_running._external_listeners_attached = True
@@ -196,8 +224,14 @@ class Engine(Generic[EV]):
             if(self.event_running.group_on == EngineGroup.CORE):
                 #opens the buffer for CORE and all groups after
                 self._queue.set_status(QueueStatus.BUFFERED)
-            response = self.event_running.forward(self._constraints, args)
+            profiler = self._profiler
+            if(profiler is None):
+                response = self.event_running.forward(self._constraints, args)
+            else:
+                response = profiler.measure_event_forward(self.event_running, self.event_running.group_on, self.event_running.forward, self._constraints, args)
             if(response.response_type == ResponseType.GAME_END):
+                if(profiler is not None):
+                    profiler.record_response(response.response_type)
                 return response
             elif(response.response_type == ResponseType.INTERRUPT):
                 assert isinstance(response.data, Interrupt)
@@ -277,10 +311,10 @@ class Engine(Generic[EV]):
                 while(len(to_undo) > 0):
                     e = to_undo.pop()#FILO order
                     if(e.core_ran):
-                        e.invert_core(e.core_args)
+                        self._invert_core(e)
                 if(self.event_running.core_ran):
                     #undo this event's core if it went through
-                    self.event_running.invert_core(self.event_running.core_args)
+                    self._invert_core(self.event_running)
                 
                 #probe packet listeners 
                 self._probe_packet_listeners()
@@ -298,4 +332,7 @@ class Engine(Generic[EV]):
 
                 
                     
-            return response
\ No newline at end of file
+            if(profiler is not None):
+                #counted after FINISHED -> FINISHED_PACKET so the packet record closes here
+                profiler.record_response(response.response_type)
+            return response
@@ -3,9 +3,11 @@ from . import event_listener
 from typing import TYPE_CHECKING, Callable, Generic, TypeVar, cast
 from card_game.constants import *
 from . import engine_constants
+from . import profiler as profiler_module
 if TYPE_CHECKING:
     from . import engine
     from . import constrainer
+    from .profiler import EngineProfiler
 
 EV = TypeVar("EV", bound="Event")
 
@@ -41,7 +43,7 @@ class Packet(Generic[EV]):
         if(not isinstance(self.element, list)):
             raise Exception("Tried to get length when packet not assembled yet")
         return len(self.element)
-    def get_next_event(self) -> EV | None:
+    def get_next_event(self, profiler : EngineProfiler | None = None) -> EV | None:
         if(not isinstance(self.element, list)):
             raise Exception("Tried to get next event when packet not assembled yet")
         else:
@@ -50,11 +52,17 @@ class Packet(Generic[EV]):
             else:
                 x = self.element.pop(0)
                 if(isinstance(x, Callable)):
-                    next_seq = x()
+                    if(profiler is None):
+                        next_seq = x()
+                    else:
+                        next_seq = profiler.measure(profiler_module.EXPAND, profiler_module.callable_name(x), x)
                     self.element = next_seq + self.element
-                    return self.get_next_event()
+                    return self.get_next_event(profiler)
                 else:
-                    x._initialize()
+                    if(profiler is None):
+                        x._initialize()
+                    else:
+                        profiler.measure(profiler_module.INITIALIZE, f"{type(x).__qualname__}._initialize", x._initialize, profiler)
                     self.full_packet.append(x)
                     return x
 
@@ -73,13 +81,17 @@ class Event():
         self.fast_forward = False
         self.skip_forward = False
         self.initiated = False
-    def _initialize(self):
+    def _initialize(self, profiler : EngineProfiler | None = None):
         if(not self.initiated):
             self.generate_internal_listeners()
             self.initiated = True
             for group in self.event_listener_groups.values():
                 for listener in group:
-                    if(not listener.event_match(self)):
+                    if(profiler is None):
+                        matched = listener.event_match(self)
+                    else:
+                        matched = profiler.measure(profiler_module.LISTENER, f"{type(listener).__qualname__}.event_match", listener.event_match, self)
+                    if(not matched):
                         listener.invalidate()
                     else:
                         listener.attach_to_event(self)
@@ -162,7 +174,11 @@ class Event():
             return Response(ResponseType.FINISHED, Data())
         elif(self.group_on == engine_constants.EngineGroup.CORE):
             #case 2: we're running the core function
-            response = self.core_wrapper(args)
+            profiler = self.engine._profiler if self.engine is not None else None
+            if(profiler is None):
+                response = self.core_wrapper(args)
+            else:
+                response = profiler.measure(profiler_module.CORE, f"{type(self).__qualname__}.core", self.core_wrapper, args)
             if(response.response_type ==ResponseType.CORE):
                 #if the response indicates that we can move on
                 self.group_on = self.group_on.succ()
@@ -201,9 +217,12 @@ class Event():
             self.groups_ordered[self.group_on] = True
             #step 3: question whether to go through with the listener
             next_listener = self.event_listener_groups[self.group_on].pop(0)
-            if(next_listener._invalidated or not bool(next_listener.event_effect())):
+            profiler = self.engine._profiler if self.engine is not None else None
+            if(profiler is not None):
+                response = self._run_listener_profiled(next_listener, profiler)
+            elif(next_listener._invalidated or not bool(next_listener.event_effect())):
                 #skip if invalidated
-                return Response(ResponseType.ACCEPT, Data())
+                response = None
             else:
                 response = Response(ResponseType.ACCEPT, Data())
                 if(isinstance(next_listener, event_listener.AssessorEventListener)):
@@ -214,16 +233,30 @@ class Event():
                     response = next_listener.modify()
                 elif(isinstance(next_listener, event_listener.ReactorEventListener)):
                     response = next_listener.react()
-                
-                if(response.response_type ==ResponseType.REQUIRES_QUERY):
-                    #if requires query, we need to wait for args next time and try to run the same listener again -- since we used pop, we now need to insert back
-                    self.event_listener_groups[self.group_on].insert(0, next_listener)
-                elif(response.response_type == ResponseType.INTERRUPT):
-                    #if interrupt, when this event continues, it needs to run the listener again
-                    self.event_listener_groups[self.group_on].insert(0, next_listener)
-                elif(response.response_type in [ResponseType.FINISHED, ResponseType.SKIP]):
-                    #if event is over with, detach all listeners 
-                    self._detach_listeners()
-                return response
-        
-        
\ No newline at end of file
+            if(response is None):
+                return Response(ResponseType.ACCEPT, Data())
+            if(response.response_type ==ResponseType.REQUIRES_QUERY):
+                #if requires query, we need to wait for args next time and try to run the same listener again -- since we used pop, we now need to insert back
+                self.event_listener_groups[self.group_on].insert(0, next_listener)
+            elif(response.response_type == ResponseType.INTERRUPT):
+                #if interrupt, when this event continues, it needs to run the listener again
+                self.event_listener_groups[self.group_on].insert(0, next_listener)
+            elif(response.response_type in [ResponseType.FINISHED, ResponseType.SKIP]):
+                #if event is over with, detach all listeners 
+                self._detach_listeners()
+            return response
+
+    def _run_listener_profiled(self, next_listener : event_listener.AbstractEventListener, profiler : EngineProfiler) -> Response | None:
+        #same dispatch as step 3 of forward, with event_effect and the listener call timed separately. None means skipped
+        listener_name = type(next_listener).__qualname__
+        if(next_listener._invalidated):
+            return None
+        if(not bool(profiler.measure(profiler_module.LISTENER, f"{listener_name}.event_effect", next_listener.event_effect))):
+            return None
+        if(isinstance(next_listener, (event_listener.AssessorEventListener, event_listener.PostCheckEventListener))):
+            return profiler.measure(profiler_module.LISTENER, f"{listener_name}.assess", next_listener.assess)
+        elif(isinstance(next_listener, event_listener.ModifierEventListener)):
+            return profiler.measure(profiler_module.LISTENER, f"{listener_name}.modify", next_listener.modify)
+        elif(isinstance(next_listener, event_listener.ReactorEventListener)):
+            return profiler.measure(profiler_module.LISTENER, f"{listener_name}.react", next_listener.react)
+        return Response(ResponseType.ACCEPT, Data())
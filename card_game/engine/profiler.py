@@ -0,0 +1,184 @@
+from __future__ import annotations
+from collections import deque
+from time import perf_counter_ns, time
+from typing import TYPE_CHECKING, Any, Callable
+from card_game.constants import ResponseType
+
+if TYPE_CHECKING:
+    from .event import Event
+    from .engine_constants import EngineGroup
+
+#stat categories
+EVENT = 'event'#Event.forward steps, keyed by event class
+GROUP = 'group'#Event.forward steps, keyed by the engine group the event was on
+CORE = 'core'#core_wrapper / invert_core
+LISTENER = 'listener'#event_match, event_effect, assess/modify/react
+EXPAND = 'expand'#deferred generator expansion inside Packet.get_next_event
+INITIALIZE = 'initialize'#Event._initialize (internal listeners + their event_match)
+
+_PACKET_END_TYPES = (ResponseType.FINISHED_PACKET, ResponseType.SKIP, ResponseType.GAME_END)
+
+def callable_name(fn : Any) -> str:
+    #deferred generators are usually closures, so their qualname points at the card that built them
+    name = getattr(fn, '__qualname__', None) or type(fn).__qualname__
+    return name.replace(';', ',').replace(' ', '_')
+
+class EngineProfiler():
+    """
+    Collects wall time and call counts for one Engine.
+    The engine only calls into this when a profiler is attached (Engine.enable_profiling); with no profiler
+    attached every hook is a single `is None` check.
+    Timed calls nest, so each call is also charged to a flamegraph stack (self time only, in nanoseconds).
+    """
+    def __init__(self, recent_packets : int = 64):
+        self.started_at : float = time()
+        #(category, name) -> [calls, total_ns, max_ns]
+        self._stats : dict[tuple[str, str], list[int]] = {}
+        #'frame;frame;frame' -> self time in ns
+        self._folded : dict[str, int] = {}
+        self._stack : list[str] = ['Engine.forward']
+        self._child_ns : list[int] = [0]
+        #response type name -> count, across every packet
+        self.response_totals : dict[str, int] = {}
+        self.packets_started : int = 0
+        self.packets_finished : int = 0
+        self.packets_skipped : int = 0
+        self._packet_counts : dict[str, int] | None = None
+        self._packet_started_ns : int = 0
+        self._packet_steps : int = 0
+        self.recent_packets : deque[dict[str, Any]] = deque(maxlen=recent_packets)
+
+    def reset(self):
+        self.__init__(self.recent_packets.maxlen or 64)
+
+    def measure(self, category : str, name : str, fn : Callable[..., Any], *args : Any) -> Any:
+        #runs fn(*args), charging its time to (category, name) and to the current stack
+        self._stack.append(name)
+        self._child_ns.append(0)
+        start = perf_counter_ns()
+        try:
+            return fn(*args)
+        finally:
+            elapsed = perf_counter_ns() - start
+            self._charge(category, name, elapsed)
+
+    def measure_event_forward(self, event : Event, group : EngineGroup, fn : Callable[..., Any], *args : Any) -> Any:
+        #one Event.forward step counts towards both its event class and the group it was run on
+        event_name = type(event).__qualname__
+        self._stack.append(f'{event_name};{group.name}')
+        self._child_ns.append(0)
+        start = perf_counter_ns()
+        try:
+            return fn(*args)
+        finally:
+            elapsed = perf_counter_ns() - start
+            self._add_stat(GROUP, group.name, elapsed)
+            self._charge(EVENT, event_name, elapsed)
+
+    def _charge(self, category : str, name : str, elapsed : int):
+        child = self._child_ns.pop()
+        path = ';'.join(self._stack)
+        self._stack.pop()
+        self._folded[path] = self._folded.get(path, 0) + elapsed - child
+        self._child_ns[-1] += elapsed
+        self._add_stat(category, name, elapsed)
+
+    def _add_stat(self, category : str, name : str, elapsed : int):
+        stat = self._stats.get((category, name))
+        if(stat is None):
+            self._stats[(category, name)] = [1, elapsed, elapsed]
+        else:
+            stat[0] += 1
+            stat[1] += elapsed
+            if(elapsed > stat[2]):
+                stat[2] = elapsed
+
+    def begin_packet(self):
+        self.packets_started += 1
+        self._packet_counts = {}
+        self._packet_started_ns = perf_counter_ns()
+        self._packet_steps = 0
+
+    def record_response(self, response_type : ResponseType):
+        name = response_type.name
+        self.response_totals[name] = self.response_totals.get(name, 0) + 1
+        if(self._packet_counts is None):
+            return
+        self._packet_steps += 1
+        self._packet_counts[name] = self._packet_counts.get(name, 0) + 1
+        if(response_type in _PACKET_END_TYPES):
+            self._end_packet(response_type)
+
+    def _end_packet(self, response_type : ResponseType):
+        if(response_type == ResponseType.SKIP):
+            self.packets_skipped += 1
+        else:
+            self.packets_finished += 1
+        assert self._packet_counts is not None
+        self.recent_packets.append({
+            'index': self.packets_started,
+            'outcome': response_type.name,
+            'steps': self._packet_steps,
+            'elapsed_us': (perf_counter_ns() - self._packet_started_ns) // 1000,
+            'accept': self._packet_counts.get(ResponseType.ACCEPT.name, 0),
+            'interrupt': self._packet_counts.get(ResponseType.INTERRUPT.name, 0),
+            'skip': self._packet_counts.get(ResponseType.SKIP.name, 0),
+            'responses': dict(self._packet_counts),
+        })
+        self._packet_counts = None
+
+    def rows(self, category : str | None = None) -> list[dict[str, Any]]:
+        #stats as plain rows, most expensive first
+        rows = []
+        for (row_category, name), (calls, total_ns, max_ns) in self._stats.items():
+            if(category is not None and row_category != category):
+                continue
+            rows.append({
+                'category': row_category,
+                'name': name,
+                'calls': calls,
+                'total_us': total_ns // 1000,
+                'mean_us': total_ns / calls / 1000,
+                'max_us': max_ns // 1000,
+            })
+        rows.sort(key=lambda row: row['total_us'], reverse=True)
+        return rows
+
+    def folded_stacks(self) -> list[str]:
+        #brendan gregg folded format, one 'frame;frame;frame value' line per stack; feed to flamegraph.pl or speedscope
+        return [f'{path} {ns}' for path, ns in sorted(self._folded.items()) if ns > 0]
+
+    def export_folded(self, path : str):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(self.folded_stacks()) + '\n')
+
+    def summary_table(self, limit : int = 25, category : str | None = None) -> str:
+        rows = self.rows(category)[:limit]
+        header = f"{'category':<10} {'name':<56} {'calls':>8} {'total_ms':>10} {'mean_us':>10} {'max_us':>10}"
+        lines = [header, '-' * len(header)]
+        for row in rows:
+            lines.append(
+                f"{row['category']:<10} {row['name'][:56]:<56} {row['calls']:>8} "
+                f"{row['total_us'] / 1000:>10.2f} {row['mean_us']:>10.1f} {row['max_us']:>10}"
+            )
+        lines.append(
+            f'packets started={self.packets_started} finished={self.packets_finished} skipped={self.packets_skipped} '
+            + ' '.join(f'{name.lower()}={count}' for name, count in sorted(self.response_totals.items()))
+        )
+        return '\n'.join(lines)
+
+    def snapshot(self, limit : int = 50) -> dict[str, Any]:
+        #JSON-safe view, used for the per-room metrics the router fetches
+        return {
+            'started_at': self.started_at,
+            'captured_at': time(),
+            'packets': {
+                'started': self.packets_started,
+                'finished': self.packets_finished,
+                'skipped': self.packets_skipped,
+                'recent': list(self.recent_packets),
+            },
+            'responses': dict(self.response_totals),
+            'top': self.rows()[:limit],
+            'groups': self.rows(GROUP),
+        }
@@ -10,6 +10,7 @@ from card_game.engine.engine import Engine, EngineHistory, HistoryState
 from card_game.engine.engine_constants import EngineGroup, QueueStatus
 from card_game.engine.event import Event, Packet
 from card_game.engine.event_listener import AbstractEventListener, AbstractPacketListener, AssessorEventListener, ModifierEventListener, ReactorEventListener
+from card_game.engine.profiler import EngineProfiler
 
 
 @dataclass
@@ -2502,5 +2503,74 @@ class EngineHistoryTests(unittest.TestCase):
         self.assertEqual(found_idx, 2)
 
 
+class EngineProfilerTests(unittest.TestCase):
+    def run_profiled_packets(self, eng: Engine[Event], state: MutableState):
+        listener = CountingExternalListener("profiled")
+        eng.add_listener(listener)
+        eng._propose(Packet([DeltaEvent(state, 2), lambda: [DeltaEvent(state, 3)]]))
+        eng._propose(Packet([PostCoreSkipEvent(state, 10)]))
+        for _ in range(200):
+            if eng.forward({}).response_type == ResponseType.NO_MORE_EVENTS:
+                return listener
+        self.fail("Engine did not reach NO_MORE_EVENTS in max_steps")
+
+    def test_profiling_is_off_by_default_and_does_not_change_results(self):
+        plain_state = MutableState()
+        plain = Engine[Event]()
+        plain_listener = self.run_profiled_packets(plain, plain_state)
+        self.assertIsNone(plain._profiler)
+
+        profiled_state = MutableState()
+        profiled = Engine[Event]()
+        profiler = profiled.enable_profiling()
+        profiled_listener = self.run_profiled_packets(profiled, profiled_state)
+
+        self.assertEqual(profiled_state.value, plain_state.value)
+        self.assertEqual(profiled_listener.call_count, plain_listener.call_count)
+        self.assertIs(profiled.disable_profiling(), profiler)
+        self.assertIsNone(profiled._profiler)
+
+    def test_profiler_keys_time_by_event_listener_group_and_generator(self):
+        eng = Engine[Event]()
+        profiler = eng.enable_profiling()
+        self.run_profiled_packets(eng, MutableState())
+
+        names = {(row["category"], row["name"]) for row in profiler.rows()}
+        self.assertIn(("event", "DeltaEvent"), names)
+        self.assertIn(("group", "CORE"), names)
+        self.assertIn(("group", "EXTERNAL_MODIFIERS_2"), names)
+        self.assertIn(("core", "DeltaEvent.core"), names)
+        self.assertIn(("core", "PostCoreSkipEvent.invert_core"), names)
+        self.assertIn(("listener", "CountingExternalListener.event_match"), names)
+        self.assertIn(("listener", "CountingExternalListener.assess"), names)
+        self.assertIn(("listener", "SkipListener.assess"), names)
+        self.assertTrue(any(category == "expand" for category, _ in names))
+
+        stacks = profiler.folded_stacks()
+        self.assertTrue(any(line.startswith("Engine.forward;DeltaEvent;CORE;DeltaEvent.core ") for line in stacks))
+        for line in stacks:
+            _, value = line.rsplit(" ", 1)
+            self.assertGreater(int(value), 0)
+
+    def test_profiler_counts_responses_per_packet(self):
+        eng = Engine[Event]()
+        profiler = eng.enable_profiling(EngineProfiler(recent_packets=1))
+        self.run_profiled_packets(eng, MutableState())
+
+        self.assertEqual(profiler.packets_started, 2)
+        self.assertEqual(profiler.packets_finished, 1)
+        self.assertEqual(profiler.packets_skipped, 1)
+        self.assertEqual(len(profiler.recent_packets), 1)
+        skipped = profiler.recent_packets[0]
+        self.assertEqual(skipped["outcome"], "SKIP")
+        self.assertEqual(skipped["skip"], 1)
+        self.assertGreater(skipped["accept"], 0)
+
+        snapshot = profiler.snapshot()
+        self.assertEqual(snapshot["packets"]["skipped"], 1)
+        self.assertEqual(snapshot["responses"]["FINISHED_PACKET"], 1)
+        self.assertIn("DeltaEvent", profiler.summary_table())
+
+
 if __name__ == "__main__":
     unittest.main()
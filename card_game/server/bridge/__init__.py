@@ -5,6 +5,7 @@ from .setup_defaults import (
     blank_player_setup,
     resolve_catalog_card_class,
     selected_cards_from_env,
+    selected_cards_from_ids,
 )
 from .setup_payload import (
     build_default_setup_payload_from_environment,
@@ -131,6 +132,7 @@ __all__ = [
     'blank_player_setup',
     'resolve_catalog_card_class',
     'selected_cards_from_env',
+    'selected_cards_from_ids',
     'apply_selected_cards_to_setup',
     'build_environment_from_default_setups',
     'build_default_setup_payload_from_environment',
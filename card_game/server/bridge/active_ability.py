@@ -28,4 +28,7 @@ def queue_active_ability_interrupt(
     ]
     packet = AVGEPacket(packet_events, AVGEEngineID(card, ActionTypes.PLAYER_CHOICE, type(card)))
     bridge.env._engine.external_interrupt(packet)
+    recorder = getattr(bridge, '_recorder', None)
+    if recorder is not None:
+        recorder.record_active_ability(card)
     return []
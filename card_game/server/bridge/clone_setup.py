@@ -11,17 +11,33 @@ def clone_with_init_setup(
     *,
     environment_factory: Callable[..., Any],
     bridge_factory: Callable[..., Any],
+    recorder: Any = None,
 ) -> Any:
     with bridge._lock:
         p1_setup = bridge._build_player_setup_for_init('p1', setup_by_slot.get('p1', {}))
         p2_setup = bridge._build_player_setup_for_init('p2', setup_by_slot.get('p2', {}))
+        start_turn = bridge.env.player_turn.unique_id
+        p1_username = bridge.env.players['p1'].username
+        p2_username = bridge.env.players['p2'].username
+        start_round = bridge.env.round_id
+        if recorder is not None:
+            # Seeds the game RNG, so it must run right before the environment
+            # is built for the recording to replay deterministically.
+            recorder.begin_game(
+                p1_setup,
+                p2_setup,
+                start_turn,
+                p1_username=p1_username,
+                p2_username=p2_username,
+                start_round=start_round,
+            )
         next_env = environment_factory(
             deepcopy(p1_setup),
             deepcopy(p2_setup),
-            bridge.env.player_turn.unique_id,
-            p1_username=bridge.env.players['p1'].username,
-            p2_username=bridge.env.players['p2'].username,
-            start_round=bridge.env.round_id,
+            start_turn,
+            p1_username=p1_username,
+            p2_username=p2_username,
+            start_round=start_round,
         )
 
-    return bridge_factory(env=next_env)
+    return bridge_factory(env=next_env, recorder=recorder)
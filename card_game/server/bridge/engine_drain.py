@@ -19,16 +19,23 @@ def drain_engine(
     payloads_to_emit: list[CommandPayload] = []
     steps = 0
     next_args = input_args
+    recorder = getattr(bridge, '_recorder', None)
+    if recorder is not None:
+        recorder.record_drain_start(bridge, input_args)
 
     while steps < bridge._max_forward_steps:
         steps += 1
         try:
             response = bridge.env.forward(next_args)
         except Exception as exc:
+            if recorder is not None:
+                recorder.record_drain_end(steps, aborted=True)
             bridge._raise_engine_runtime_error('drain', exc)
             raise
 
         bridge._log_engine_response(response, step=steps, stage='drain', input_args=next_args)
+        if recorder is not None:
+            recorder.record_engine_response(bridge, response)
 
         # Keep pending args through transition responses (NEXT_PACKET/NEXT_EVENT/NO_MORE_EVENTS)
         # so the intended action reaches the actual phase event core call.
@@ -144,11 +151,15 @@ def drain_engine(
             try:
                 should_continue = bridge._auto_advance_when_idle()
             except Exception as exc:
+                if recorder is not None:
+                    recorder.record_drain_end(steps, aborted=True)
                 bridge._raise_engine_runtime_error('drain', exc)
                 raise
 
             if not should_continue:
                 break
+            if recorder is not None:
+                recorder.record_auto_advance(steps)
 
     # Safety fallback: if we hit step cap mid-packet, treat it as interruption
     # so frontend is not starved waiting for any update.
@@ -164,6 +175,9 @@ def drain_engine(
     if next_args is not None:
         bridge._pending_engine_input_args = next_args
 
+    if recorder is not None:
+        recorder.record_drain_end(steps)
+
     return commands_to_emit, payloads_to_emit
 
 
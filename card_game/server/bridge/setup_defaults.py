@@ -1,11 +1,12 @@
 from __future__ import annotations
 
-from random import sample
-from typing import Any, Callable, Mapping
+from typing import Any, Callable
 import json
 import os
+import random
 
 from ...avge_abstracts.AVGECards import AVGECard, AVGECharacterCard
+from ...catalog.registry import load_card_class
 from ...constants import Pile
 
 
@@ -21,17 +22,9 @@ def blank_player_setup() -> dict[Pile, list[type[AVGECard]]]:
     }
 
 
-def resolve_catalog_card_class(
-    card_id: str,
-    *,
-    symbol_lookup: Mapping[str, Any],
-) -> type[AVGECard] | None:
-    symbol = symbol_lookup.get(card_id)
-    if not isinstance(symbol, type):
-        return None
-    if not issubclass(symbol, AVGECard):
-        return None
-    return symbol
+def resolve_catalog_card_class(card_id: str) -> type[AVGECard] | None:
+    """Look the card up in the catalog index; only its own module is imported."""
+    return load_card_class(card_id)
 
 
 def selected_cards_from_env(
@@ -51,8 +44,16 @@ def selected_cards_from_env(
     if not isinstance(parsed, list):
         return []
 
+    return selected_cards_from_ids(parsed, resolver=resolver)
+
+
+def selected_cards_from_ids(
+    card_ids: list[Any],
+    *,
+    resolver: Callable[[str], type[AVGECard] | None],
+) -> list[type[AVGECard]]:
     resolved: list[type[AVGECard]] = []
-    for raw_card_id in parsed:
+    for raw_card_id in card_ids:
         if not isinstance(raw_card_id, str) or not raw_card_id.strip():
             continue
         resolved_class = resolver(raw_card_id.strip())
@@ -73,12 +74,12 @@ def apply_selected_cards_to_setup(
     if not character_cards:
         return resolved_setup
 
-    active_card = sample(character_cards, 1)[0]
+    active_card = random.sample(character_cards, 1)[0]
     remaining_cards.remove(active_card)
     resolved_setup[Pile.ACTIVE] = [active_card]
 
     hand_count = min(initial_hand_size, len(remaining_cards))
-    initial_hand = sample(remaining_cards, hand_count) if hand_count > 0 else []
+    initial_hand = random.sample(remaining_cards, hand_count) if hand_count > 0 else []
     for card in initial_hand:
         remaining_cards.remove(card)
 
@@ -1,10 +1,10 @@
 from __future__ import annotations
 
-from random import randint
 from threading import RLock
-from typing import NoReturn
+from typing import TYPE_CHECKING, NoReturn
 from card_game.server.server_types import JsonObject, CommandPayload
 import os
+import random
 
 from ..avge_abstracts.AVGEEnvironment import AVGEEnvironment
 from ..avge_abstracts.AVGEEnvironment import GamePhase
@@ -35,6 +35,7 @@ from .bridge.setup_defaults import (
     blank_player_setup as bridge_blank_player_setup,
     resolve_catalog_card_class as bridge_resolve_catalog_card_class,
     selected_cards_from_env as bridge_selected_cards_from_env,
+    selected_cards_from_ids as bridge_selected_cards_from_ids,
 )
 from .bridge.setup_payload import (
     build_default_setup_payload_from_environment as bridge_build_default_setup_payload_from_environment,
@@ -145,45 +146,54 @@ from .bridge.frontend_enqueue import (
 from .bridge.clone_setup import (
     clone_with_init_setup as bridge_clone_with_init_setup,
 )
-from card_game.catalog import *
 from card_game.constants import *
 
+if TYPE_CHECKING:
+    from .replay.recorder import GameRecorder
+
+
+def randint(low: int, high: int) -> int:
+    # Looked up on each draw so a room host's per-room RNG streams apply.
+    return random.randint(low, high)
+
+
 p1_username = os.getenv("P1_USERNAME", "Ash")
 starting_round = 0
 p2_username = os.getenv("P2_USERNAME", "Misty")
 
-_DEFAULT_P1_SELECTED_CARDS: list[type[AVGECard]] = [
-    KeiWatanabe,
-    RobertoGonzales,
-    DavidMan,
-    BenCherekIII,
-    Lucas,
-    Bucket,
-    AVGETShirt,
-    Richard,
-    Victoria,
-    MainHall,
-    Johann,
-    IceSkates,
-    AVGEBirb,
-    FionaLi,
-    JennieWang,
-    LukeXu,
-    DanielYang,
-]
-
-_DEFAULT_P2_SELECTED_CARDS: list[type[AVGECard]] = [
-    MatthewWang,
-    DavidMan,
-    AVGEBirb,
-    SteinertPracticeRoom,
-    JennieWang,
-    ConcertTicket,
-    FoldingStand,
-    VideoCamera,
-    JuliaCeccarelli,
-    MaggieLi,
-]
+# Card ids resolve through the catalog index, so only these cards' modules are imported.
+_DEFAULT_P1_CARD_IDS: tuple[str, ...] = (
+    'KeiWatanabe',
+    'RobertoGonzales',
+    'DavidMan',
+    'BenCherekIII',
+    'Lucas',
+    'Bucket',
+    'AVGETShirt',
+    'Richard',
+    'Victoria',
+    'MainHall',
+    'Johann',
+    'IceSkates',
+    'AVGEBirb',
+    'FionaLi',
+    'JennieWang',
+    'LukeXu',
+    'DanielYang',
+)
+
+_DEFAULT_P2_CARD_IDS: tuple[str, ...] = (
+    'MatthewWang',
+    'DavidMan',
+    'AVGEBirb',
+    'SteinertPracticeRoom',
+    'JennieWang',
+    'ConcertTicket',
+    'FoldingStand',
+    'VideoCamera',
+    'JuliaCeccarelli',
+    'MaggieLi',
+)
 
 
 def _blank_player_setup() -> dict[Pile, list[type[AVGECard]]]:
@@ -191,7 +201,7 @@ def _blank_player_setup() -> dict[Pile, list[type[AVGECard]]]:
 
 
 def _resolve_catalog_card_class(card_id: str) -> type[AVGECard] | None:
-    return bridge_resolve_catalog_card_class(card_id, symbol_lookup=globals())
+    return bridge_resolve_catalog_card_class(card_id)
 
 
 def _selected_cards_from_env(env_name: str) -> list[type[AVGECard]]:
@@ -207,6 +217,9 @@ def _apply_selected_cards_to_setup(
     )
 
 
+_DEFAULT_P1_SELECTED_CARDS = bridge_selected_cards_from_ids(list(_DEFAULT_P1_CARD_IDS), resolver=_resolve_catalog_card_class)
+_DEFAULT_P2_SELECTED_CARDS = bridge_selected_cards_from_ids(list(_DEFAULT_P2_CARD_IDS), resolver=_resolve_catalog_card_class)
+
 _p1_selected_cards = _selected_cards_from_env('P1_DECK_CARDS_JSON')
 if len(_p1_selected_cards) == 0:
     _p1_selected_cards = list(_DEFAULT_P1_SELECTED_CARDS)
@@ -239,6 +252,27 @@ def build_environment_from_default_setups(
     )
 
 
+def build_environment_for_players(
+    p1_username: str,
+    p2_username: str,
+    p1_card_ids: list[str] | None = None,
+    p2_card_ids: list[str] | None = None,
+) -> AVGEEnvironment:
+    """Build an AVGEEnvironment for one hosted room; empty or unknown decks fall back to the defaults."""
+    p1_cards = bridge_selected_cards_from_ids(p1_card_ids or [], resolver=_resolve_catalog_card_class)
+    p2_cards = bridge_selected_cards_from_ids(p2_card_ids or [], resolver=_resolve_catalog_card_class)
+    return bridge_build_environment_from_default_setups(
+        p1_setup=_apply_selected_cards_to_setup(p1_cards or list(_DEFAULT_P1_SELECTED_CARDS)),
+        p2_setup=_apply_selected_cards_to_setup(p2_cards or list(_DEFAULT_P2_SELECTED_CARDS)),
+        p1_username=p1_username,
+        p2_username=p2_username,
+        start_turn=PlayerID.P1,
+        starting_stadium=None,
+        starting_stadium_player=None,
+        round_number=starting_round,
+    )
+
+
 def build_default_setup_payload_from_environment(
     start_turn: PlayerID = PlayerID.P1,
     starting_stadium: type[AVGEStadiumCard] | None = None,
@@ -281,8 +315,9 @@ class BridgeEngineRuntimeError(RuntimeError):
 class FrontendGameBridge:
     """Translate frontend events to engine actions and engine responses back to frontend commands."""
 
-    def __init__(self, env: AVGEEnvironment | None = None) -> None:
+    def __init__(self, env: AVGEEnvironment | None = None, recorder: GameRecorder | None = None) -> None:
         self._lock = RLock()
+        self._recorder: GameRecorder | None = None
         self.env = env if isinstance(env, AVGEEnvironment) else build_environment_from_default_setups()
         self._max_forward_steps = 5000
         self._pending_packet_commands: list[str] = []
@@ -302,15 +337,40 @@ class FrontendGameBridge:
         self._bootstrap_phase_cycle()
         self._prime_engine_for_frontend_inputs()
         self._last_emitted_phase_token = self._frontend_phase_token(self.env.game_phase)
+        if recorder is not None:
+            # Attach after bootstrap: replay rebuilds the bridge the same way,
+            # so only inputs arriving from here on need recording.
+            recorder.attach(self)
+            self._recorder = recorder
 
-    def clone_with_init_setup(self, setup_by_slot: dict[str, JsonObject]) -> 'FrontendGameBridge':
+    def clone_with_init_setup(
+        self,
+        setup_by_slot: dict[str, JsonObject],
+        recorder: GameRecorder | None = None,
+    ) -> 'FrontendGameBridge':
         return bridge_clone_with_init_setup(
             self,
             setup_by_slot,
             environment_factory=AVGEEnvironment,
             bridge_factory=FrontendGameBridge,
+            recorder=recorder,
         )
 
+    def finish_recording(self, reason: str) -> None:
+        with self._lock:
+            if self._recorder is not None:
+                self._recorder.finish(reason)
+
+    def enable_engine_profiling(self) -> None:
+        with self._lock:
+            self.env._engine.enable_profiling()
+
+    def engine_profile_snapshot(self) -> JsonObject | None:
+        # Taken under the bridge lock so the snapshot never interleaves with a drain.
+        with self._lock:
+            profiler = self.env._engine._profiler
+            return profiler.snapshot() if profiler is not None else None
+
     def _build_player_setup_for_init(self, slot: str, setup: JsonObject) -> dict[Pile, list[type[AVGECard]]]:
         return bridge_build_player_setup_for_init(
             self,
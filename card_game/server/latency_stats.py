@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+import math
+
+
+def percentile_ms(samples: list[int], fraction: float) -> float | None:
+    """Nearest-rank percentile of nanosecond samples, in milliseconds; None when empty."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = max(0, math.ceil(fraction * len(ordered)) - 1)
+    return ordered[index] / 1e6
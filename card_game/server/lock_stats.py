@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from threading import RLock
+from time import perf_counter_ns
+from types import TracebackType
+
+from .server_types import JsonObject
+
+
+class TimedRLock:
+    """A reentrant lock that records how long callers wait for it and hold it.
+
+    Only the outermost acquire of a reentrant hold is measured. The counters
+    are updated while the lock is held, so they need no lock of their own.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._lock = RLock()
+        self._depth = 0
+        self._held_since_ns = 0
+        self._acquisitions = 0
+        self._contended = 0
+        self._wait_ns_total = 0
+        self._wait_ns_max = 0
+        self._hold_ns_total = 0
+        self._hold_ns_max = 0
+
+    def acquire(self) -> None:
+        if self._lock.acquire(blocking=False):
+            waited_ns = 0
+        else:
+            began = perf_counter_ns()
+            self._lock.acquire()
+            waited_ns = perf_counter_ns() - began
+        self._depth += 1
+        if self._depth > 1:
+            return
+        self._acquisitions += 1
+        if waited_ns:
+            self._contended += 1
+            self._wait_ns_total += waited_ns
+            self._wait_ns_max = max(self._wait_ns_max, waited_ns)
+        self._held_since_ns = perf_counter_ns()
+
+    def release(self) -> None:
+        self._depth -= 1
+        if self._depth == 0:
+            held_ns = perf_counter_ns() - self._held_since_ns
+            self._hold_ns_total += held_ns
+            self._hold_ns_max = max(self._hold_ns_max, held_ns)
+        self._lock.release()
+
+    def __enter__(self) -> TimedRLock:
+        self.acquire()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.release()
+
+    def stats(self) -> JsonObject:
+        # Read without the lock: a snapshot may be one acquisition behind.
+        acquisitions = self._acquisitions
+        return {
+            'acquisitions': acquisitions,
+            'contended': self._contended,
+            'wait_ms_total': self._wait_ns_total / 1e6,
+            'wait_ms_max': self._wait_ns_max / 1e6,
+            'hold_ms_avg': self._hold_ns_total / 1e6 / acquisitions if acquisitions else 0.0,
+            'hold_ms_max': self._hold_ns_max / 1e6,
+        }
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from math import ceil, floor
+from time import perf_counter_ns
+from typing import Iterable, Iterator
+
+from .latency_stats import percentile_ms
+from .matchmaking_queue import MatchmakingQueue, QueueEntry
+
+# Queue waits and sweep durations kept for the percentile metrics.
+SAMPLE_LIMIT = 1024
+
+
+@dataclass(frozen=True)
+class PairingWindow:
+    """How far apart in rating two players may be, as a function of waiting time.
+
+    A player accepts opponents within ``base`` rating points on arrival,
+    ``growth_per_second`` more for every second queued, up to ``maximum``.
+    """
+
+    bucket_width: float = 50.0
+    base: float = 100.0
+    growth_per_second: float = 10.0
+    maximum: float = 1000.0
+
+    def width(self, waited_seconds: float) -> float:
+        return min(self.maximum, self.base + self.growth_per_second * max(0.0, waited_seconds))
+
+
+class MatchmakingEngine:
+    """The matchmaking queue, with players bucketed by rating.
+
+    Arrival order and ``position`` come from a ``MatchmakingQueue``. Each
+    player also sits in a bucket of ``bucket_width`` rating points, oldest
+    first. Pairing only looks at bucket heads, the longest waiting player
+    of each bucket, so its cost follows the number of buckets a window
+    spans and not the number of players queued:
+
+    - ``match`` pairs one player, normally on arrival, inside their
+      current window;
+    - ``sweep`` walks every bucket, oldest head first, and pairs what the
+      widened windows now allow. The router runs it periodically.
+
+    Two players may pair when their rating gap fits the wider of their two
+    windows, so a long wait is never held up by a newcomer's narrow one.
+    """
+
+    def __init__(self, window: PairingWindow | None = None) -> None:
+        self.window = window or PairingWindow()
+        self._queue = MatchmakingQueue()
+        self._buckets: dict[int, OrderedDict[str, QueueEntry]] = {}
+        self._paired = 0
+        self._sweeps = 0
+        self._wait_ns: deque[int] = deque(maxlen=SAMPLE_LIMIT)
+        self._sweep_ns: deque[int] = deque(maxlen=SAMPLE_LIMIT)
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def __contains__(self, session_id: object) -> bool:
+        return session_id in self._queue
+
+    def __iter__(self) -> Iterator[QueueEntry]:
+        return iter(self._queue)
+
+    def push(self, entry: QueueEntry) -> bool:
+        """Queue ``entry`` at the back; False if its session is already queued."""
+        if not self._queue.push(entry):
+            return False
+        self._buckets.setdefault(self._bucket_of(entry), OrderedDict())[entry.session_id] = entry
+        return True
+
+    def push_front(self, entries: Iterable[QueueEntry]) -> None:
+        """Queue ``entries`` ahead of everyone, in the given order; queued sessions are skipped."""
+        fresh = [entry for entry in entries if entry.session_id not in self._queue]
+        self._queue.push_front(fresh)
+        for entry in reversed(fresh):
+            bucket = self._buckets.setdefault(self._bucket_of(entry), OrderedDict())
+            bucket[entry.session_id] = entry
+            bucket.move_to_end(entry.session_id, last=False)
+
+    def remove(self, session_id: str) -> QueueEntry | None:
+        entry = self._queue.remove(session_id)
+        if entry is not None:
+            self._unbucket(entry)
+        return entry
+
+    def position(self, session_id: str) -> int | None:
+        """1-based place in arrival order, or None when not queued."""
+        return self._queue.position(session_id)
+
+    def match(self, session_id: str, now: float) -> tuple[QueueEntry, QueueEntry] | None:
+        """Pair a queued player now if anyone fits; both leave the queue."""
+        entry = self._queue.get(session_id)
+        if entry is None:
+            return None
+        partner = self._partner_for(entry, now, self.window.maximum)
+        if partner is None:
+            return None
+        return self._take_pair(entry, partner, now)
+
+    def sweep(self, now: float) -> list[tuple[QueueEntry, QueueEntry]]:
+        """Pair everyone the current windows allow, oldest bucket heads first."""
+        began = perf_counter_ns()
+        pairs: list[tuple[QueueEntry, QueueEntry]] = []
+        order = sorted(self._buckets, key=lambda index: next(iter(self._buckets[index].values())).enqueued_at)
+        # Only heads are paired, and none has a wider window than the oldest one.
+        widest = self.window.width(now - next(iter(self._buckets[order[0]].values())).enqueued_at) if order else 0.0
+        for index in order:
+            while index in self._buckets:
+                head = next(iter(self._buckets[index].values()))
+                partner = self._partner_for(head, now, widest)
+                if partner is None:
+                    break
+                pairs.append(self._take_pair(head, partner, now))
+        self._sweeps += 1
+        self._sweep_ns.append(perf_counter_ns() - began)
+        return pairs
+
+    def stats(self) -> dict[str, float | int | None]:
+        return {
+            'queued': len(self._queue),
+            'buckets': len(self._buckets),
+            'paired': self._paired,
+            'sweeps': self._sweeps,
+            'sweep_p50_ms': percentile_ms(list(self._sweep_ns), 0.50),
+            'sweep_p99_ms': percentile_ms(list(self._sweep_ns), 0.99),
+            'queue_time_p50_ms': percentile_ms(list(self._wait_ns), 0.50),
+            'queue_time_p99_ms': percentile_ms(list(self._wait_ns), 0.99),
+        }
+
+    def _bucket_of(self, entry: QueueEntry) -> int:
+        return floor(entry.rating / self.window.bucket_width)
+
+    def _partner_for(self, entry: QueueEntry, now: float, widest: float) -> QueueEntry | None:
+        """The longest waiting bucket head that either window accepts.
+
+        Buckets are scanned as far as ``widest``, an upper bound on anyone's
+        window, reaches: a long waiting head may accept ``entry`` from
+        beyond its own window.
+        """
+        own_window = self.window.width(now - entry.enqueued_at)
+        center = self._bucket_of(entry)
+        reach = ceil(max(own_window, widest) / self.window.bucket_width)
+        best: QueueEntry | None = None
+        for index in range(center - reach, center + reach + 1):
+            bucket = self._buckets.get(index)
+            if bucket is None:
+                continue
+            candidate = _first_other(bucket, entry.session_id)
+            if candidate is None:
+                continue
+            gap = abs(candidate.rating - entry.rating)
+            if gap > max(own_window, self.window.width(now - candidate.enqueued_at)):
+                continue
+            if best is None or candidate.enqueued_at < best.enqueued_at:
+                best = candidate
+        return best
+
+    def _take_pair(self, entry: QueueEntry, partner: QueueEntry, now: float) -> tuple[QueueEntry, QueueEntry]:
+        for taken in (entry, partner):
+            self._queue.remove(taken.session_id)
+            self._unbucket(taken)
+            self._wait_ns.append(int(max(0.0, now - taken.enqueued_at) * 1e9))
+        self._paired += 1
+        return entry, partner
+
+    def _unbucket(self, entry: QueueEntry) -> None:
+        index = self._bucket_of(entry)
+        bucket = self._buckets.get(index)
+        if bucket is None:
+            return
+        bucket.pop(entry.session_id, None)
+        if not bucket:
+            del self._buckets[index]
+
+
+def _first_other(bucket: OrderedDict[str, QueueEntry], session_id: str) -> QueueEntry | None:
+    for candidate_id, candidate in bucket.items():
+        if candidate_id != session_id:
+            return candidate
+    return None
+
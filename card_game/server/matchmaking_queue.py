@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+
+from .storage.router_storage import DEFAULT_RATING
+
+# Ticket slots allocated on each side of the live range when the index is rebuilt.
+_MIN_TICKET_SLACK = 64
+
+
+@dataclass
+class QueueEntry:
+    session_id: str
+    enqueued_at: float
+    spawn_failures: int = 0
+    rating: float = DEFAULT_RATING
+
+
+class _Fenwick:
+    """Counts of live tickets by slot, with prefix sums in O(log n)."""
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self._tree = [0] * (size + 1)
+
+    @classmethod
+    def from_counts(cls, counts: list[int]) -> _Fenwick:
+        """Build the tree over ``counts`` in O(n), pushing each node into its parent once."""
+        tree = cls(len(counts))
+        nodes = tree._tree
+        nodes[1:] = counts
+        for index in range(1, tree.size + 1):
+            parent = index + (index & -index)
+            if parent <= tree.size:
+                nodes[parent] += nodes[index]
+        return tree
+
+    def add(self, slot: int, delta: int) -> None:
+        index = slot + 1
+        while index <= self.size:
+            self._tree[index] += delta
+            index += index & -index
+
+    def prefix(self, slot: int) -> int:
+        """Live tickets in slots ``0..slot`` inclusive."""
+        total = 0
+        index = slot + 1
+        while index > 0:
+            total += self._tree[index]
+            index -= index & -index
+        return total
+
+
+class MatchmakingQueue:
+    """The matchmaking queue, indexed by session.
+
+    Entries stay in arrival order in an OrderedDict keyed by session id, so
+    enqueue, removal by session and popping the front are O(1) and a
+    session is queued at most once. Each entry also holds a ticket number,
+    increasing from front to back. A Fenwick tree over the tickets answers
+    ``position`` in O(log n). Tickets are renumbered when they run out of
+    room on either side.
+    """
+
+    def __init__(self) -> None:
+        self._entries: OrderedDict[str, tuple[int, QueueEntry]] = OrderedDict()
+        self._counts = _Fenwick(2 * _MIN_TICKET_SLACK)
+        # Next free ticket at the front (going down) and at the back (going up).
+        self._front_ticket = _MIN_TICKET_SLACK - 1
+        self._back_ticket = _MIN_TICKET_SLACK
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, session_id: object) -> bool:
+        return session_id in self._entries
+
+    def __iter__(self) -> Iterator[QueueEntry]:
+        return (entry for _, entry in self._entries.values())
+
+    def push(self, entry: QueueEntry) -> bool:
+        """Queue ``entry`` at the back; False if its session is already queued."""
+        if entry.session_id in self._entries:
+            return False
+        if self._back_ticket >= self._counts.size:
+            self._renumber()
+        ticket = self._back_ticket
+        self._back_ticket += 1
+        self._entries[entry.session_id] = (ticket, entry)
+        self._counts.add(ticket, 1)
+        return True
+
+    def push_front(self, entries: Iterable[QueueEntry]) -> None:
+        """Queue ``entries`` ahead of everyone, in the given order; queued sessions are skipped."""
+        for entry in reversed([entry for entry in entries if entry.session_id not in self._entries]):
+            if self._front_ticket < 0:
+                self._renumber()
+            ticket = self._front_ticket
+            self._front_ticket -= 1
+            self._entries[entry.session_id] = (ticket, entry)
+            self._entries.move_to_end(entry.session_id, last=False)
+            self._counts.add(ticket, 1)
+
+    def remove(self, session_id: str) -> QueueEntry | None:
+        queued = self._entries.pop(session_id, None)
+        if queued is None:
+            return None
+        ticket, entry = queued
+        self._counts.add(ticket, -1)
+        return entry
+
+    def get(self, session_id: str) -> QueueEntry | None:
+        queued = self._entries.get(session_id)
+        return queued[1] if queued is not None else None
+
+    def pop_front(self) -> QueueEntry:
+        _, (ticket, entry) = self._entries.popitem(last=False)
+        self._counts.add(ticket, -1)
+        return entry
+
+    def position(self, session_id: str) -> int | None:
+        """1-based place in the queue, or None when not queued."""
+        queued = self._entries.get(session_id)
+        if queued is None:
+            return None
+        return self._counts.prefix(queued[0])
+
+    def _renumber(self) -> None:
+        # O(n) per rebuild, amortized O(1) per push: the new range has slack
+        # proportional to the live entries.
+        live = len(self._entries)
+        slack = max(_MIN_TICKET_SLACK, live)
+        self._counts = _Fenwick.from_counts([0] * slack + [1] * live + [0] * slack)
+        self._front_ticket = slack - 1
+        self._back_ticket = slack
+        for session_id, (_, entry) in self._entries.items():
+            self._entries[session_id] = (self._back_ticket, entry)
+            self._back_ticket += 1
@@ -46,7 +46,6 @@ class MultiplayerTransportState:
         return all(self.sid_by_slot[slot] is not None for slot in ('p1', 'p2'))
 
     def slot_for_sid(self, sid: str) -> PlayerSlot | None:
-        self._expire_grace_slots()
         session = self.session_by_sid.get(sid)
         if session is None:
             return None
@@ -58,8 +57,6 @@ class MultiplayerTransportState:
         requested_slot: str | None = None,
         reconnect_token: str | None = None,
     ) -> ClientSession | None:
-        self._expire_grace_slots()
-
         existing_session = self.session_by_sid.get(sid)
         if existing_session is not None:
             return existing_session
@@ -104,7 +101,6 @@ class MultiplayerTransportState:
         return None
 
     def release_sid(self, sid: str) -> PlayerSlot | None:
-        self._expire_grace_slots()
         session = self.session_by_sid.pop(sid, None)
         if session is None:
             return None
@@ -118,7 +114,6 @@ class MultiplayerTransportState:
         return slot
 
     def grace_remaining_seconds(self, slot: PlayerSlot) -> int:
-        self._expire_grace_slots()
         deadline = self.grace_deadline_by_slot.get(slot)
         if deadline is None:
             return 0
@@ -141,7 +136,6 @@ class MultiplayerTransportState:
         token: str,
         reusable_session: ClientSession | None = None,
     ) -> ClientSession:
-        self._expire_grace_slots()
         previous_sid = self.sid_by_slot[slot]
         if previous_sid is not None and previous_sid != sid:
             self.session_by_sid.pop(previous_sid, None)
@@ -166,17 +160,17 @@ class MultiplayerTransportState:
         self.session_by_sid[sid] = session
         return session
 
-    def _expire_grace_slots(self) -> None:
-        now = monotonic()
-        for slot in ('p1', 'p2'):
-            deadline = self.grace_deadline_by_slot.get(slot)
-            if deadline is None or now < deadline:
-                continue
-            if self.sid_by_slot[slot] is not None:
-                continue
-
-            reserved = self.reserved_session_by_slot.get(slot)
-            if reserved is not None:
-                self.reconnect_token_to_slot.pop(reserved.reconnect_token, None)
-            self.reserved_session_by_slot[slot] = None
-            self.grace_deadline_by_slot[slot] = None
+    def expire_grace_slot(self, slot: PlayerSlot) -> bool:
+        """End a disconnected slot's grace window; its reconnect token stops working.
+
+        The room's disconnect timer calls this when the window runs out, so
+        nothing has to check deadlines on every lookup.
+        """
+        if self.grace_deadline_by_slot.get(slot) is None or self.sid_by_slot[slot] is not None:
+            return False
+        reserved = self.reserved_session_by_slot.get(slot)
+        if reserved is not None:
+            self.reconnect_token_to_slot.pop(reserved.reconnect_token, None)
+        self.reserved_session_by_slot[slot] = None
+        self.grace_deadline_by_slot[slot] = None
+        return True
@@ -0,0 +1,33 @@
+"""Recorded-game logs, deterministic replay and replay benchmarks."""
+
+from .game_log import (
+    GAME_LOG_SUFFIX,
+    GameLogError,
+    GameLogWriter,
+    RecordKind,
+    iter_game_log,
+)
+from .recorder import GameRecorder, build_bridge_from_header, environment_state_digest
+from .replayer import (
+    ReplayBenchmarkResult,
+    ReplayDivergenceError,
+    ReplayResult,
+    benchmark_corpus,
+    replay_game_log,
+)
+
+__all__ = [
+    'GAME_LOG_SUFFIX',
+    'GameLogError',
+    'GameLogWriter',
+    'RecordKind',
+    'iter_game_log',
+    'GameRecorder',
+    'build_bridge_from_header',
+    'environment_state_digest',
+    'ReplayBenchmarkResult',
+    'ReplayDivergenceError',
+    'ReplayResult',
+    'benchmark_corpus',
+    'replay_game_log',
+]
@@ -0,0 +1,314 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Any, BinaryIO, Iterator
+import json
+import struct
+
+from card_game.server.server_types import JsonObject
+
+from ...avge_abstracts.AVGECards import AVGECard
+from ...constants import ActionTypes, EnergyToken, Pile, PlayerID
+
+GAME_LOG_MAGIC = b'AVGR'
+GAME_LOG_VERSION = 1
+GAME_LOG_SUFFIX = '.avgr'
+
+_MT_STATE_WORDS = 625
+_RNG_STATE_STRUCT = struct.Struct(f'<B{_MT_STATE_WORDS}I')
+_GAUSS_STRUCT = struct.Struct('<d')
+
+# Enum types that may appear as engine input arg values.
+_ENUM_TYPES: dict[str, type[Any]] = {
+    enum_type.__name__: enum_type
+    for enum_type in (ActionTypes, Pile, PlayerID)
+}
+
+
+class GameLogError(ValueError):
+    """Raised when a recorded game log cannot be encoded or decoded."""
+
+
+class RecordKind(IntEnum):
+    HEADER = 1
+    DRAIN = 2
+    ACTIVE_ABILITY = 3
+    CHECKPOINT = 4
+    RNG_STATE = 5
+    END = 6
+
+
+@dataclass(frozen=True)
+class GameLogRecord:
+    kind: RecordKind
+    body: bytes
+
+
+def _encode_varint(value: int) -> bytes:
+    if value < 0:
+        raise GameLogError(f'varint cannot encode negative value {value}')
+    out = bytearray()
+    while True:
+        low = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(low | 0x80)
+        else:
+            out.append(low)
+            return bytes(out)
+
+
+def _decode_varint(data: bytes, offset: int) -> tuple[int, int]:
+    value = 0
+    shift = 0
+    while True:
+        if offset >= len(data):
+            raise GameLogError('truncated varint')
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, offset
+        shift += 7
+
+
+def _read_varint(stream: BinaryIO) -> int | None:
+    value = 0
+    shift = 0
+    while True:
+        raw = stream.read(1)
+        if not raw:
+            return None
+        byte = raw[0]
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value
+        shift += 7
+
+
+def _compact_json(payload: object) -> bytes:
+    return json.dumps(payload, separators=(',', ':'), sort_keys=True).encode('utf-8')
+
+
+def encode_engine_value(value: object, *, ordering_group: list[object] | None = None) -> object:
+    """Encode one engine input arg value into JSON-safe form.
+
+    Live objects are stored by reference: cards and energy tokens by
+    ``unique_id`` and ordering listeners by their index in the running
+    event's listener group, which is identical on replay.
+    """
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, AVGECard):
+        return {'$card': value.unique_id}
+    if isinstance(value, EnergyToken):
+        return {'$energy': value.unique_id}
+    enum_name = type(value).__name__
+    if enum_name in _ENUM_TYPES and isinstance(value, _ENUM_TYPES[enum_name]):
+        return {'$enum': enum_name, 'value': value.value}
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [encode_engine_value(item, ordering_group=ordering_group) for item in value]
+    if isinstance(value, dict):
+        return {
+            str(key): encode_engine_value(item, ordering_group=ordering_group)
+            for key, item in value.items()
+        }
+    if ordering_group is not None:
+        for index, listener in enumerate(ordering_group):
+            if listener is value:
+                return {'$listener': index}
+    raise GameLogError(f'cannot encode engine input value of type {type(value).__name__}')
+
+
+def decode_engine_value(
+    value: object,
+    *,
+    env: Any,
+    ordering_group: list[object] | None = None,
+) -> object:
+    if isinstance(value, list):
+        return [decode_engine_value(item, env=env, ordering_group=ordering_group) for item in value]
+    if not isinstance(value, dict):
+        return value
+
+    if '$card' in value:
+        card = env.cards.get(value['$card'])
+        if card is None:
+            raise GameLogError(f"unknown card reference {value['$card']!r}")
+        return card
+    if '$energy' in value:
+        token_id = value['$energy']
+        for token in _iter_energy_tokens(env):
+            if token.unique_id == token_id:
+                return token
+        raise GameLogError(f'unknown energy token reference {token_id!r}')
+    if '$enum' in value:
+        enum_type = _ENUM_TYPES.get(str(value['$enum']))
+        if enum_type is None:
+            raise GameLogError(f"unknown enum type {value['$enum']!r}")
+        return enum_type(value['value'])
+    if '$listener' in value:
+        index = value['$listener']
+        if ordering_group is None or not isinstance(index, int) or not 0 <= index < len(ordering_group):
+            raise GameLogError(f'listener reference {index!r} does not match the running ordering group')
+        return ordering_group[index]
+
+    return {
+        key: decode_engine_value(item, env=env, ordering_group=ordering_group)
+        for key, item in value.items()
+    }
+
+
+def _iter_energy_tokens(env: Any) -> Iterator[EnergyToken]:
+    yield from env.energy
+    for player in env.players.values():
+        yield from player.energy
+        for holder in player.cardholders.values():
+            for card in holder:
+                yield from getattr(card, 'energy', [])
+
+
+def running_ordering_group(env: Any) -> list[object] | None:
+    """Return the listener group an ORDERING query would currently resolve against."""
+    running = env._engine.event_running
+    if running is None:
+        return None
+    groups = getattr(running, 'event_listener_groups', None)
+    group_on = getattr(running, 'group_on', None)
+    if groups is None or group_on is None:
+        return None
+    return list(groups[group_on])
+
+
+def encode_engine_input_args(input_args: JsonObject | None, *, env: Any) -> object | None:
+    """Encode drain input args; must run before the engine consumes them."""
+    if input_args is None:
+        return None
+    ordering_group = running_ordering_group(env) if 'group_ordering' in input_args else None
+    return encode_engine_value(input_args, ordering_group=ordering_group)
+
+
+def decode_engine_input_args(encoded_args: object | None, *, env: Any) -> JsonObject | None:
+    if encoded_args is None:
+        return None
+    if not isinstance(encoded_args, dict):
+        raise GameLogError('engine input args must decode to an object')
+    ordering_group = running_ordering_group(env) if 'group_ordering' in encoded_args else None
+    decoded = decode_engine_value(encoded_args, env=env, ordering_group=ordering_group)
+    return decoded if isinstance(decoded, dict) else None
+
+
+DRAIN_FLAG_ABORTED = 0x01
+
+
+def encode_drain_body(
+    encoded_args: object | None,
+    steps: int,
+    advance_steps: list[int],
+    *,
+    aborted: bool = False,
+) -> bytes:
+    """Frame one bridge drain: flags, forward step count, auto-advance steps, args."""
+    out = bytearray(_encode_varint(DRAIN_FLAG_ABORTED if aborted else 0))
+    out += _encode_varint(steps)
+    out += _encode_varint(len(advance_steps))
+    previous = 0
+    for step in advance_steps:
+        out += _encode_varint(step - previous)
+        previous = step
+    if encoded_args is not None:
+        out += _compact_json(encoded_args)
+    return bytes(out)
+
+
+def decode_drain_body(body: bytes) -> tuple[int, int, list[int], object | None]:
+    flags, offset = _decode_varint(body, 0)
+    steps, offset = _decode_varint(body, offset)
+    advance_count, offset = _decode_varint(body, offset)
+    advance_steps: list[int] = []
+    previous = 0
+    for _ in range(advance_count):
+        delta, offset = _decode_varint(body, offset)
+        previous += delta
+        advance_steps.append(previous)
+    encoded_args = json.loads(body[offset:]) if offset < len(body) else None
+    return flags, steps, advance_steps, encoded_args
+
+
+def encode_rng_state(state: tuple[Any, ...]) -> bytes:
+    version, words, gauss_next = state
+    body = _RNG_STATE_STRUCT.pack(version, *words)
+    if gauss_next is not None:
+        body += _GAUSS_STRUCT.pack(gauss_next)
+    return body
+
+
+def decode_rng_state(body: bytes) -> tuple[Any, ...]:
+    unpacked = _RNG_STATE_STRUCT.unpack_from(body, 0)
+    gauss_next = None
+    if len(body) > _RNG_STATE_STRUCT.size:
+        gauss_next = _GAUSS_STRUCT.unpack_from(body, _RNG_STATE_STRUCT.size)[0]
+    return unpacked[0], tuple(unpacked[1:]), gauss_next
+
+
+class GameLogWriter:
+    """Append-only writer for the framed ``.avgr`` recorded-game format.
+
+    Every record is ``kind:u8 | length:varint | body``. Records are flushed as
+    they are written so a crashed room still leaves a readable prefix.
+    """
+
+    def __init__(self, stream: BinaryIO, *, owns_stream: bool = True) -> None:
+        self._stream = stream
+        self._owns_stream = owns_stream
+        self.bytes_written = 0
+        self._write(GAME_LOG_MAGIC + bytes([GAME_LOG_VERSION]))
+
+    def _write(self, data: bytes) -> None:
+        self._stream.write(data)
+        self.bytes_written += len(data)
+
+    def write_record(self, kind: RecordKind, body: bytes) -> None:
+        self._write(bytes([int(kind)]) + _encode_varint(len(body)) + body)
+        self._stream.flush()
+
+    def write_json_record(self, kind: RecordKind, payload: JsonObject) -> None:
+        self.write_record(kind, _compact_json(payload))
+
+    def close(self) -> None:
+        if self._owns_stream:
+            self._stream.close()
+
+
+def iter_game_log(stream: BinaryIO) -> Iterator[GameLogRecord]:
+    preamble = stream.read(len(GAME_LOG_MAGIC) + 1)
+    if preamble[:len(GAME_LOG_MAGIC)] != GAME_LOG_MAGIC:
+        raise GameLogError('not a recorded game log')
+    if preamble[len(GAME_LOG_MAGIC)] != GAME_LOG_VERSION:
+        raise GameLogError(f'unsupported game log version {preamble[len(GAME_LOG_MAGIC)]}')
+
+    while True:
+        raw_kind = stream.read(1)
+        if not raw_kind:
+            return
+        length = _read_varint(stream)
+        body = stream.read(length) if length is not None else b''
+        if length is None or len(body) != length:
+            # A room that died mid-write leaves a torn final record; the
+            # prefix before it is still a valid recording.
+            return
+        try:
+            kind = RecordKind(raw_kind[0])
+        except ValueError as exc:
+            raise GameLogError(f'unknown record kind {raw_kind[0]}') from exc
+        yield GameLogRecord(kind, body)
+
+
+def record_json(record: GameLogRecord) -> JsonObject:
+    payload = json.loads(record.body)
+    if not isinstance(payload, dict):
+        raise GameLogError(f'{record.kind.name} record body must be a JSON object')
+    return payload
@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+from hashlib import blake2b
+from pathlib import Path
+from typing import Any
+import json
+import random
+import time
+
+from card_game.server.server_types import JsonObject
+
+from ...avge_abstracts.AVGECards import AVGECard
+from ...avge_abstracts.AVGEEnvironment import AVGEEnvironment
+from ...constants import Pile, PlayerID, ResponseType
+from ..bridge.setup_defaults import blank_player_setup, resolve_catalog_card_class
+from ..game_runner import FrontendGameBridge, environment_to_setup_payload
+from .game_log import (
+    GAME_LOG_SUFFIX,
+    GameLogError,
+    GameLogWriter,
+    RecordKind,
+    encode_drain_body,
+    encode_engine_input_args,
+    encode_rng_state,
+)
+
+STATE_DIGEST_SIZE = 8
+
+type PlayerSetup = dict[Pile, list[type[AVGECard]]]
+
+
+def environment_state_digest(env: AVGEEnvironment) -> bytes:
+    """Hash the frontend-visible game state (cards, holders, hp, energy, phase)."""
+    payload = environment_to_setup_payload(env)
+    encoded = json.dumps(payload, separators=(',', ':'), sort_keys=True, default=str).encode('utf-8')
+    return blake2b(encoded, digest_size=STATE_DIGEST_SIZE).digest()
+
+
+def encode_player_setup(setup: PlayerSetup) -> JsonObject:
+    return {
+        str(pile.value): [card_class.__name__ for card_class in card_classes]
+        for pile, card_classes in setup.items()
+    }
+
+
+def decode_player_setup(raw_setup: object) -> PlayerSetup:
+    if not isinstance(raw_setup, dict):
+        raise GameLogError('recorded player setup must be an object')
+    setup = blank_player_setup()
+    for raw_pile, raw_names in raw_setup.items():
+        pile = Pile(raw_pile)
+        resolved: list[type[AVGECard]] = []
+        for raw_name in raw_names:
+            card_class = resolve_catalog_card_class(str(raw_name))
+            if card_class is None:
+                raise GameLogError(f'recorded card class {raw_name!r} is not in the catalog')
+            resolved.append(card_class)
+        setup[pile] = resolved
+    return setup
+
+
+def build_bridge_from_header(header: JsonObject) -> FrontendGameBridge:
+    """Rebuild the bridge a recording started from, consuming randomness identically."""
+    random.seed(int(header['seed']))
+    env = AVGEEnvironment(
+        decode_player_setup(header.get('p1_setup')),
+        decode_player_setup(header.get('p2_setup')),
+        PlayerID(header['start_turn']),
+        p1_username=str(header.get('p1_username', '')),
+        p2_username=str(header.get('p2_username', '')),
+        start_round=int(header.get('start_round', 0)),
+    )
+    return FrontendGameBridge(env=env)
+
+
+class GameRecorder:
+    """Record the engine inputs of one room into an append-only game log.
+
+    The bridge calls the ``record_*`` hooks from inside its drain loop; every
+    mutation of the environment after construction goes through those hooks,
+    so the log plus the header seed is enough to re-execute the match.
+    Recording problems never reach the game: the recorder logs and disables
+    itself instead.
+    """
+
+    def __init__(self, writer: GameLogWriter, *, seed: int | None = None, room_id: str = '') -> None:
+        self._writer: GameLogWriter | None = writer
+        self.seed = seed if seed is not None else random.SystemRandom().randrange(1 << 63)
+        self.room_id = room_id
+        self.drain_count = 0
+        self.checkpoint_count = 0
+        self._last_rng_state: tuple[Any, ...] | None = None
+        self._drain_args: object | None = None
+        self._drain_advance_steps: list[int] = []
+        self._drain_checkpoints: list[bytes] = []
+
+    @classmethod
+    def open_for_room(cls, directory: str | Path, room_id: str, *, seed: int | None = None) -> 'GameRecorder':
+        directory_path = Path(directory)
+        directory_path.mkdir(parents=True, exist_ok=True)
+        stem = room_id or f'room-{int(time.time() * 1000)}'
+        stream = open(directory_path / f'{stem}{GAME_LOG_SUFFIX}', 'wb')
+        return cls(GameLogWriter(stream), seed=seed, room_id=room_id)
+
+    @property
+    def active(self) -> bool:
+        return self._writer is not None
+
+    @property
+    def bytes_written(self) -> int:
+        return self._writer.bytes_written if self._writer is not None else 0
+
+    def begin_game(
+        self,
+        p1_setup: PlayerSetup,
+        p2_setup: PlayerSetup,
+        start_turn: PlayerID,
+        *,
+        p1_username: str,
+        p2_username: str,
+        start_round: int,
+    ) -> None:
+        """Seed the game RNG and write the header; call right before building the environment."""
+        random.seed(self.seed)
+        self._write_json(RecordKind.HEADER, {
+            'seed': self.seed,
+            'room_id': self.room_id,
+            'p1_setup': encode_player_setup(p1_setup),
+            'p2_setup': encode_player_setup(p2_setup),
+            'start_turn': str(PlayerID(start_turn).value),
+            'p1_username': p1_username,
+            'p2_username': p2_username,
+            'start_round': start_round,
+            'recorded_at': int(time.time()),
+        })
+
+    def attach(self, bridge: Any) -> None:
+        _ = bridge
+        self._last_rng_state = random.getstate()
+
+    def record_drain_start(self, bridge: Any, input_args: JsonObject | None) -> None:
+        if self._writer is None:
+            return
+        try:
+            self._sync_rng_state()
+            self._drain_args = encode_engine_input_args(input_args, env=bridge.env)
+        except Exception as exc:
+            self._disable(exc)
+        self._drain_advance_steps = []
+        self._drain_checkpoints = []
+
+    def record_engine_response(self, bridge: Any, response: Any) -> None:
+        if self._writer is None or response.response_type != ResponseType.FINISHED_PACKET:
+            return
+        try:
+            self._drain_checkpoints.append(environment_state_digest(bridge.env))
+        except Exception as exc:
+            self._disable(exc)
+
+    def record_auto_advance(self, step: int) -> None:
+        if self._writer is not None:
+            self._drain_advance_steps.append(step)
+
+    def record_drain_end(self, steps: int, *, aborted: bool = False) -> None:
+        if self._writer is None:
+            return
+        try:
+            self._write(RecordKind.DRAIN, encode_drain_body(
+                self._drain_args,
+                steps,
+                self._drain_advance_steps,
+                aborted=aborted,
+            ))
+            for digest in self._drain_checkpoints:
+                self._write(RecordKind.CHECKPOINT, digest)
+            self.drain_count += 1
+            self.checkpoint_count += len(self._drain_checkpoints)
+            self._last_rng_state = random.getstate()
+        except Exception as exc:
+            self._disable(exc)
+        self._drain_args = None
+        self._drain_checkpoints = []
+
+    def record_active_ability(self, card: AVGECard) -> None:
+        if self._writer is None:
+            return
+        try:
+            self._sync_rng_state()
+            self._write(RecordKind.ACTIVE_ABILITY, str(card.unique_id).encode('utf-8'))
+            self._last_rng_state = random.getstate()
+        except Exception as exc:
+            self._disable(exc)
+
+    def finish(self, reason: str) -> None:
+        if self._writer is None:
+            return
+        try:
+            self._write_json(RecordKind.END, {
+                'reason': reason,
+                'drains': self.drain_count,
+                'checkpoints': self.checkpoint_count,
+            })
+        except Exception as exc:
+            self._disable(exc)
+            return
+        print(
+            '[GAME_RECORDER] finished '
+            f'room_id={self.room_id!r} reason={reason!r} drains={self.drain_count} '
+            f'checkpoints={self.checkpoint_count} bytes={self._writer.bytes_written}'
+        )
+        self.close()
+
+    def close(self) -> None:
+        writer = self._writer
+        self._writer = None
+        if writer is not None:
+            writer.close()
+
+    def _sync_rng_state(self) -> None:
+        # Randomness consumed outside engine drains (for example coin values
+        # the bridge rolls while parsing a single frontend result) is not
+        # re-executed on replay, so snapshot the RNG whenever it moved.
+        state = random.getstate()
+        if state != self._last_rng_state:
+            self._write(RecordKind.RNG_STATE, encode_rng_state(state))
+            self._last_rng_state = state
+
+    def _write(self, kind: RecordKind, body: bytes) -> None:
+        if self._writer is not None:
+            self._writer.write_record(kind, body)
+
+    def _write_json(self, kind: RecordKind, payload: JsonObject) -> None:
+        if self._writer is not None:
+            self._writer.write_json_record(kind, payload)
+
+    def _disable(self, exc: Exception) -> None:
+        print(f'[GAME_RECORDER] recording_disabled room_id={self.room_id!r} error={exc!r}')
+        self.close()
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from contextlib import redirect_stdout
+from pathlib import Path
+import argparse
+import io
+import json
+
+from .game_log import GAME_LOG_SUFFIX
+from .replayer import ReplayDivergenceError, benchmark_corpus, iter_corpus_paths, replay_game_log
+from .selfplay import record_scripted_game
+
+
+def _quiet() -> redirect_stdout[io.StringIO]:
+    # The engine and bridge log every step to stdout; keep tool output readable.
+    return redirect_stdout(io.StringIO())
+
+
+def _run_verify(paths: list[str]) -> int:
+    failures = 0
+    for path in iter_corpus_paths(paths):
+        try:
+            with _quiet():
+                result = replay_game_log(path, verify=True)
+        except ReplayDivergenceError as exc:
+            failures += 1
+            print(f'DIVERGED {exc}')
+            continue
+        print(
+            f'OK {path} drains={result.drains} steps={result.engine_steps} '
+            f'checkpoints={result.checkpoints_verified} end={result.end_reason}'
+        )
+    return 1 if failures else 0
+
+
+def _run_bench(paths: list[str], *, repeat: int, verify: bool, json_path: str | None) -> int:
+    with _quiet():
+        result = benchmark_corpus(paths, repeat=repeat, verify=verify)
+    for game in result.games:
+        print(
+            f'{game.source} steps={game.engine_steps} packets={game.packets} '
+            f'elapsed_ms={game.elapsed_seconds * 1000:.2f} steps_per_s={game.steps_per_second:.0f}'
+        )
+    summary = result.summary()
+    print('TOTAL ' + ' '.join(f'{key}={value}' for key, value in summary.items()))
+    if json_path:
+        Path(json_path).write_text(json.dumps({
+            'summary': summary,
+            'games': [
+                {
+                    'source': game.source,
+                    'engine_steps': game.engine_steps,
+                    'packets': game.packets,
+                    'elapsed_seconds': game.elapsed_seconds,
+                }
+                for game in result.games
+            ],
+        }, indent=2))
+    return 0 if result.games else 1
+
+
+def _run_record_scripted(output_dir: str, *, games: int, seed: int, max_events: int) -> int:
+    directory = Path(output_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    for index in range(games):
+        game_seed = seed + index
+        path = directory / f'scripted-{game_seed}{GAME_LOG_SUFFIX}'
+        with _quiet():
+            result = record_scripted_game(path, seed=game_seed, max_frontend_events=max_events)
+        print(
+            f'recorded {path} events={result.frontend_events} rounds={result.rounds} '
+            f'winner={result.winner_declared} bytes={path.stat().st_size}'
+        )
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description='Verify, benchmark, or generate recorded AVGE games.'
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    verify_parser = subparsers.add_parser('verify', help='Replay recordings and check every state hash.')
+    verify_parser.add_argument('paths', nargs='+', help='Recording files or directories of recordings.')
+
+    bench_parser = subparsers.add_parser('bench', help='Re-execute a corpus at full speed and report throughput.')
+    bench_parser.add_argument('paths', nargs='+', help='Recording files or directories of recordings.')
+    bench_parser.add_argument('--repeat', type=int, default=3, help='Runs per game; fastest is kept (default: %(default)s).')
+    bench_parser.add_argument('--verify', action='store_true', help='Also hash state at every packet checkpoint.')
+    bench_parser.add_argument('--json', dest='json_path', default=None, help='Write results as JSON to this path.')
+
+    record_parser = subparsers.add_parser('record-scripted', help='Record scripted self-play games into a corpus directory.')
+    record_parser.add_argument('output_dir')
+    record_parser.add_argument('--games', type=int, default=5, help='Number of games (default: %(default)s).')
+    record_parser.add_argument('--seed', type=int, default=1, help='Seed of the first game (default: %(default)s).')
+    record_parser.add_argument('--max-events', type=int, default=2000, help='Frontend event cap per game (default: %(default)s).')
+
+    args = parser.parse_args(argv)
+    if args.command == 'verify':
+        return _run_verify(args.paths)
+    if args.command == 'bench':
+        return _run_bench(args.paths, repeat=args.repeat, verify=args.verify, json_path=args.json_path)
+    return _run_record_scripted(args.output_dir, games=args.games, seed=args.seed, max_events=args.max_events)
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
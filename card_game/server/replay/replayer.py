@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter
+from typing import Any, BinaryIO, Iterable
+import random
+
+from ...constants import ResponseType
+from .game_log import (
+    DRAIN_FLAG_ABORTED,
+    GAME_LOG_SUFFIX,
+    GameLogError,
+    RecordKind,
+    decode_drain_body,
+    decode_engine_input_args,
+    decode_rng_state,
+    iter_game_log,
+    record_json,
+)
+from .recorder import build_bridge_from_header, environment_state_digest
+
+# Responses that keep drain input args pending; mirrors bridge.engine_drain.
+_ARG_PRESERVING_RESPONSES = {
+    ResponseType.NEXT_PACKET,
+    ResponseType.NEXT_EVENT,
+    ResponseType.NO_MORE_EVENTS,
+}
+
+
+class ReplayDivergenceError(RuntimeError):
+    """Raised when a replayed game no longer matches its recorded checkpoints."""
+
+
+@dataclass(frozen=True)
+class ReplayResult:
+    source: str
+    drains: int
+    engine_steps: int
+    packets: int
+    checkpoints_verified: int
+    elapsed_seconds: float
+    end_reason: str | None
+
+    @property
+    def steps_per_second(self) -> float:
+        return self.engine_steps / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+    @property
+    def packets_per_second(self) -> float:
+        return self.packets / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+
+class _ReplayCursor:
+    def __init__(self, source: str, *, verify: bool) -> None:
+        self.source = source
+        self.verify = verify
+        self.bridge: Any = None
+        self.drains = 0
+        self.engine_steps = 0
+        self.packets = 0
+        self.produced_digests: list[bytes] = []
+        self.checkpoints_verified = 0
+        self.end_reason: str | None = None
+
+    def require_bridge(self) -> Any:
+        if self.bridge is None:
+            raise GameLogError('recording is missing its header record')
+        return self.bridge
+
+    def replay_drain(self, body: bytes) -> None:
+        bridge = self.require_bridge()
+        env = bridge.env
+        flags, steps, advance_steps, encoded_args = decode_drain_body(body)
+        next_args = decode_engine_input_args(encoded_args, env=env)
+        advance_at = set(advance_steps)
+        aborted = bool(flags & DRAIN_FLAG_ABORTED)
+
+        for step in range(1, steps + 1):
+            try:
+                response = env.forward(next_args)
+            except Exception:
+                if aborted and step == steps:
+                    break
+                raise
+            if next_args is not None and response.response_type not in _ARG_PRESERVING_RESPONSES:
+                next_args = None
+            if response.response_type == ResponseType.FINISHED_PACKET:
+                self.packets += 1
+                if self.verify:
+                    self.produced_digests.append(environment_state_digest(env))
+            if step in advance_at:
+                bridge._auto_advance_when_idle()
+
+        self.drains += 1
+        self.engine_steps += steps
+
+    def verify_checkpoint(self, digest: bytes) -> None:
+        if not self.verify:
+            return
+        index = self.checkpoints_verified
+        if index >= len(self.produced_digests):
+            raise ReplayDivergenceError(
+                f'{self.source}: checkpoint {index} recorded but replay finished only '
+                f'{len(self.produced_digests)} packets (drain {self.drains})'
+            )
+        if self.produced_digests[index] != digest:
+            raise ReplayDivergenceError(
+                f'{self.source}: state hash mismatch at packet checkpoint {index} '
+                f'(drain {self.drains}): recorded={digest.hex()} replayed={self.produced_digests[index].hex()}'
+            )
+        self.checkpoints_verified += 1
+
+
+def replay_game_log(source: str | Path | BinaryIO, *, verify: bool = True) -> ReplayResult:
+    """Re-execute a recorded game headlessly, checking every packet checkpoint.
+
+    Replay reseeds and advances the global ``random`` module, exactly as the
+    room did while recording.
+    """
+    if isinstance(source, (str, Path)):
+        with open(source, 'rb') as stream:
+            return _replay_stream(stream, source_name=str(source), verify=verify)
+    return _replay_stream(source, source_name=getattr(source, 'name', '<stream>'), verify=verify)
+
+
+def _replay_stream(stream: BinaryIO, *, source_name: str, verify: bool) -> ReplayResult:
+    cursor = _ReplayCursor(source_name, verify=verify)
+    started_at = perf_counter()
+
+    for record in iter_game_log(stream):
+        if record.kind == RecordKind.HEADER:
+            if cursor.bridge is not None:
+                raise GameLogError('recording contains more than one header record')
+            cursor.bridge = build_bridge_from_header(record_json(record))
+        elif record.kind == RecordKind.RNG_STATE:
+            random.setstate(decode_rng_state(record.body))
+        elif record.kind == RecordKind.DRAIN:
+            cursor.replay_drain(record.body)
+        elif record.kind == RecordKind.ACTIVE_ABILITY:
+            bridge = cursor.require_bridge()
+            card_id = record.body.decode('utf-8')
+            card = bridge.env.cards.get(card_id)
+            if card is None:
+                raise GameLogError(f'unknown active ability card {card_id!r}')
+            bridge._queue_active_ability_interrupt(card, bridge.env._engine.event_running)
+        elif record.kind == RecordKind.CHECKPOINT:
+            cursor.verify_checkpoint(record.body)
+        elif record.kind == RecordKind.END:
+            end_reason = record_json(record).get('reason')
+            cursor.end_reason = end_reason if isinstance(end_reason, str) else None
+
+    cursor.require_bridge()
+    return ReplayResult(
+        source=source_name,
+        drains=cursor.drains,
+        engine_steps=cursor.engine_steps,
+        packets=cursor.packets,
+        checkpoints_verified=cursor.checkpoints_verified,
+        elapsed_seconds=perf_counter() - started_at,
+        end_reason=cursor.end_reason,
+    )
+
+
+@dataclass(frozen=True)
+class ReplayBenchmarkResult:
+    games: list[ReplayResult]
+    repeat: int
+
+    @property
+    def elapsed_seconds(self) -> float:
+        return sum(result.elapsed_seconds for result in self.games)
+
+    @property
+    def engine_steps(self) -> int:
+        return sum(result.engine_steps for result in self.games)
+
+    @property
+    def packets(self) -> int:
+        return sum(result.packets for result in self.games)
+
+    def summary(self) -> dict[str, float | int]:
+        elapsed = self.elapsed_seconds
+        return {
+            'games': len(self.games),
+            'repeat': self.repeat,
+            'engine_steps': self.engine_steps,
+            'packets': self.packets,
+            'elapsed_seconds': round(elapsed, 6),
+            'steps_per_second': round(self.engine_steps / elapsed, 1) if elapsed > 0 else 0.0,
+            'packets_per_second': round(self.packets / elapsed, 1) if elapsed > 0 else 0.0,
+        }
+
+
+def iter_corpus_paths(paths: Iterable[str | Path]) -> list[Path]:
+    resolved: list[Path] = []
+    for raw_path in paths:
+        path = Path(raw_path)
+        if path.is_dir():
+            resolved.extend(sorted(path.glob(f'*{GAME_LOG_SUFFIX}')))
+        else:
+            resolved.append(path)
+    return resolved
+
+
+def benchmark_corpus(
+    paths: Iterable[str | Path],
+    *,
+    repeat: int = 1,
+    verify: bool = False,
+) -> ReplayBenchmarkResult:
+    """Replay every recording ``repeat`` times, keeping the fastest run per game."""
+    results: list[ReplayResult] = []
+    for path in iter_corpus_paths(paths):
+        best: ReplayResult | None = None
+        for _ in range(max(1, repeat)):
+            result = replay_game_log(path, verify=verify)
+            if best is None or result.elapsed_seconds < best.elapsed_seconds:
+                best = result
+        if best is not None:
+            results.append(best)
+    return ReplayBenchmarkResult(games=results, repeat=max(1, repeat))
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+from copy import deepcopy
+from dataclasses import dataclass
+from pathlib import Path
+from random import Random
+
+from card_game.server.server_types import JsonObject
+
+from ...avge_abstracts.AVGEEnvironment import AVGEEnvironment, GamePhase
+from ...constants import PlayerID
+from ..game_runner import FrontendGameBridge, p1_setup, p1_username, p2_setup, p2_username
+from ..protocol.command_codec import split_command
+from .game_log import GameLogWriter
+from .recorder import GameRecorder
+
+ACK_LINE = 'ack backend_update_processed'
+
+
+@dataclass(frozen=True)
+class ScriptedGameResult:
+    frontend_events: int
+    commands: int
+    rounds: int
+    winner_declared: bool
+
+
+def _bracket_tokens(raw: str) -> list[str]:
+    inner = raw.strip().removeprefix('[').removesuffix(']')
+    return [token for token in inner.split(',') if token]
+
+
+def _input_result_for_command(parts: list[str], choices: Random) -> JsonObject | None:
+    if len(parts) < 3 or parts[0] != 'input':
+        return None
+    kind = parts[1]
+    if kind == 'selection' and len(parts) >= 7:
+        pool = _bracket_tokens(parts[5]) or _bracket_tokens(parts[4])
+        count = int(parts[6])
+        if parts[3] == 'order_listeners':
+            choices.shuffle(pool)
+            return {'ordered_selections': pool}
+        if not pool:
+            return {'ordered_selections': [None] * count}
+        if len(pool) >= count:
+            return {'ordered_selections': choices.sample(pool, count)}
+        return {'ordered_selections': (pool * count)[:count]}
+    if kind == 'numerical-entry':
+        return {'value': choices.randint(1, 3)}
+    if kind in {'coin', 'd6'} and len(parts) >= 5:
+        return {'result_values': [int(value) for value in _bracket_tokens(parts[4]) or [parts[4]]]}
+    return None
+
+
+def play_scripted_game(
+    bridge: FrontendGameBridge,
+    *,
+    choice_seed: int = 0,
+    max_frontend_events: int = 2000,
+) -> ScriptedGameResult:
+    """Drive a bridge like two scripted frontends until a winner or the event cap.
+
+    Each turn attaches one energy, tries one of the active card's attacks and
+    falls back to skipping; queries get seeded picks from their highlighted
+    options and every command is ACKed, exercising the same strict-ACK flow
+    as real rooms. Choices use their own RNG so the game RNG is untouched.
+    """
+    choices = Random(choice_seed)
+    pending_commands: list[str] = []
+    attempts: dict[tuple[int, str, str], int] = {}
+    frontend_events = 0
+    commands = 0
+
+    def _send(event_type: str, payload: JsonObject) -> None:
+        nonlocal frontend_events
+        frontend_events += 1
+        result = bridge.handle_frontend_event(event_type, payload, None)
+        for entry in result.get('commands', []):
+            pending_commands.append(entry['command'])
+
+    while frontend_events < max_frontend_events:
+        if pending_commands:
+            command = pending_commands.pop(0)
+            commands += 1
+            _send('terminal_log', {'line': ACK_LINE, 'command': command})
+            parts = split_command(command)
+            if parts and parts[0] == 'winner':
+                return ScriptedGameResult(frontend_events, commands, bridge.env.round_id, True)
+            input_result = _input_result_for_command(parts, choices)
+            if input_result is not None:
+                _send('input_result', input_result)
+            continue
+
+        env = bridge.env
+        player = env.player_turn
+        active = env.get_active_card(player.unique_id)
+        key = (env.round_id, str(player.unique_id), str(env.game_phase))
+        attempt = attempts.get(key, 0)
+        attempts[key] = attempt + 1
+        if env.game_phase == GamePhase.PHASE_2:
+            if attempt == 0 and player.energy and active is not None:
+                _send('energy_moved', {
+                    'energy_id': player.energy[0].unique_id,
+                    'to_attached_to_card_id': active.unique_id,
+                })
+            else:
+                _send('phase2_attack_button_clicked', {})
+        elif env.game_phase == GamePhase.ATK_PHASE:
+            if attempt == 0 and active is not None:
+                _send('card_action', {'action': choices.choice(['atk1', 'atk2']), 'card_id': active.unique_id})
+            else:
+                _send('atk_skip_button_clicked', {})
+        else:
+            break
+
+    return ScriptedGameResult(frontend_events, commands, bridge.env.round_id, False)
+
+
+def record_scripted_game(
+    path: str | Path,
+    *,
+    seed: int,
+    max_frontend_events: int = 2000,
+) -> ScriptedGameResult:
+    """Record one scripted game from the default decks; used to build replay corpora."""
+    recorder = GameRecorder(GameLogWriter(open(path, 'wb')), seed=seed, room_id=Path(path).stem)
+    recorder.begin_game(
+        p1_setup,
+        p2_setup,
+        PlayerID.P1,
+        p1_username=p1_username,
+        p2_username=p2_username,
+        start_round=0,
+    )
+    env = AVGEEnvironment(
+        deepcopy(p1_setup),
+        deepcopy(p2_setup),
+        PlayerID.P1,
+        p1_username=p1_username,
+        p2_username=p2_username,
+        start_round=0,
+    )
+    bridge = FrontendGameBridge(env=env, recorder=recorder)
+    try:
+        result = play_scripted_game(bridge, choice_seed=seed, max_frontend_events=max_frontend_events)
+    except Exception:
+        recorder.close()
+        raise
+    recorder.finish('winner' if result.winner_declared else 'event_cap')
+    return result
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from dataclasses import field
+from dataclasses import replace
+from itertools import count
 from datetime import datetime, timezone
-from threading import RLock
-from time import monotonic
-from typing import Any, Callable, Literal, cast
+from threading import Thread
+from time import monotonic, sleep
+from typing import Any, Callable, Iterable, Literal, cast
 from card_game.server.server_types import JsonObject, CommandPayload
 from uuid import uuid4
 import importlib
@@ -25,23 +28,45 @@ except Exception:  # pragma: no cover - optional websocket transport dependency
     SocketIO = None
     emit = None
 
-from ..avge_abstracts.AVGECards import AVGECard
-from ..avge_abstracts.AVGECards import AVGECharacterCard
-from ..avge_abstracts.AVGECards import AVGEItemCard
-from ..avge_abstracts.AVGECards import AVGEToolCard
-from ..catalog import *
+from ..catalog.registry import CatalogEntry
+from ..catalog.registry import card_entry
 
 try:
+    from .workers.pipe_framing import SocketJson
+    from .workers.pipe_framing import socket_payload_from_event
+    from .workers.remote_room_host import RemoteHostListener
     from .workers.room_worker import RoomWorker
     from .workers.room_worker import RoomWorkerSnapshot
+    from .workers.room_host_pool import HostedRoom
+    from .workers.room_host_pool import RoomHostPool
+    from .workers.room_spawner import RoomSpawner
+    from .workers.room_worker_pool import RoomWorkerPool
 except ImportError:  # pragma: no cover - direct script execution fallback
+    from card_game.server.workers.pipe_framing import SocketJson  # type: ignore
+    from card_game.server.workers.pipe_framing import socket_payload_from_event  # type: ignore
+    from card_game.server.workers.remote_room_host import RemoteHostListener  # type: ignore
     from card_game.server.workers.room_worker import RoomWorker  # type: ignore
     from card_game.server.workers.room_worker import RoomWorkerSnapshot  # type: ignore
+    from card_game.server.workers.room_host_pool import HostedRoom  # type: ignore
+    from card_game.server.workers.room_host_pool import RoomHostPool  # type: ignore
+    from card_game.server.workers.room_spawner import RoomSpawner  # type: ignore
+    from card_game.server.workers.room_worker_pool import RoomWorkerPool  # type: ignore
 
 try:
-    from .storage.router_storage import RouterStorage
+    from .lock_stats import TimedRLock
+    from .matchmaking_engine import MatchmakingEngine, PairingWindow
+    from .matchmaking_queue import QueueEntry
+    from .timer_service import TimerHandle, shared_timer_service
 except ImportError:  # pragma: no cover - direct script execution fallback
-    from card_game.server.storage.router_storage import RouterStorage  # type: ignore
+    from card_game.server.lock_stats import TimedRLock  # type: ignore
+    from card_game.server.matchmaking_engine import MatchmakingEngine, PairingWindow  # type: ignore
+    from card_game.server.matchmaking_queue import QueueEntry  # type: ignore
+    from card_game.server.timer_service import TimerHandle, shared_timer_service  # type: ignore
+
+try:
+    from .storage.cached_storage import CachedRouterStorage
+except ImportError:  # pragma: no cover - direct script execution fallback
+    from card_game.server.storage.cached_storage import CachedRouterStorage  # type: ignore
 
 
 def _env_bool(name: str, default: bool) -> bool:
@@ -93,6 +118,9 @@ def _env_socketio_async_mode(name: str, default: SocketIOAsyncMode) -> SocketIOA
 SESSION_COOKIE_NAME = "avge_session"
 SESSION_COOKIE_MAX_AGE_SECONDS = 60 * 60 * 24 * 30
 ROOM_FINISH_GRACE_SECONDS = 5
+# How often in-memory sessions are checked for idleness; a session leaves
+# memory at most this long after its cookie lifetime of idleness ran out.
+SESSION_EXPIRY_SWEEP_SECONDS = _env_int("SESSION_EXPIRY_SWEEP_SECONDS", 3600, minimum=1)
 ROUTER_HOST = os.getenv("ROUTER_HOST", "0.0.0.0")
 ROUTER_PORT = _env_int("ROUTER_PORT", 5600, minimum=1, maximum=65535)
 ROUTER_DEBUG = _env_bool("ROUTER_DEBUG", False)
@@ -104,22 +132,57 @@ ROUTER_COOKIE_SAMESITE = os.getenv("ROUTER_COOKIE_SAMESITE", "Lax").strip() or "
 
 ROOM_BIND_HOST = ROUTER_HOST
 ROOM_TRANSPORT_MODE: RoomTransportMode = "pipe"
+# Multi-room host processes; 0 keeps one room process per match.
+ROOM_HOST_POOL_SIZE = _env_int("ROOM_HOST_POOL_SIZE", 0, minimum=0)
+ROOM_HOST_MAX_ROOMS = _env_int("ROOM_HOST_MAX_ROOMS", 16, minimum=1)
+# TCP port room host agents on other machines register on; 0 keeps rooms local.
+ROOM_HOST_LISTEN_PORT = _env_int("ROOM_HOST_LISTEN_PORT", 0, minimum=0, maximum=65535)
+# Address that port binds; set it to a private interface, the link is plain TCP.
+ROOM_HOST_LISTEN_HOST = os.getenv("ROOM_HOST_LISTEN_HOST", "").strip() or ROUTER_HOST
+ROOM_HOST_TOKEN = os.getenv("ROOM_HOST_TOKEN", "").strip()
+# Pre-imported standby room workers; 0 cold-starts a process for every match.
+ROOM_WARM_POOL_SIZE = _env_int("ROOM_WARM_POOL_SIZE", 0, minimum=0)
+ROOM_WARM_MAX_IDLE_SECONDS = _env_int("ROOM_WARM_MAX_IDLE_SECONDS", 600, minimum=0)
+ROOM_WARM_MAX_AGE_SECONDS = _env_int("ROOM_WARM_MAX_AGE_SECONDS", 3600, minimum=0)
+# Rooms being started at once, off the router locks; more pairs wait their turn.
+ROOM_SPAWN_CONCURRENCY = _env_int("ROOM_SPAWN_CONCURRENCY", 4, minimum=1)
+# Seconds a cold-started room process has to answer its first health check.
+ROOM_READY_TIMEOUT_SECONDS = _env_int("ROOM_READY_TIMEOUT_SECONDS", 15, minimum=1)
+# Failed room starts a queued player sits through before leaving the queue.
+ROOM_SPAWN_MAX_ATTEMPTS = _env_int("ROOM_SPAWN_MAX_ATTEMPTS", 3, minimum=1)
+# Rating-bucketed pairing: bucket size, and the rating gap accepted on arrival,
+# added per second queued, and at most, all in rating points.
+MATCHMAKING_BUCKET_WIDTH = _env_int("MATCHMAKING_BUCKET_WIDTH", 50, minimum=1)
+MATCHMAKING_BASE_WINDOW = _env_int("MATCHMAKING_BASE_WINDOW", 100, minimum=0)
+MATCHMAKING_WINDOW_GROWTH_PER_SECOND = _env_int("MATCHMAKING_WINDOW_GROWTH_PER_SECOND", 10, minimum=0)
+MATCHMAKING_MAX_WINDOW = _env_int("MATCHMAKING_MAX_WINDOW", 1000, minimum=0)
+# Interval between batch pairing sweeps while anyone is queued.
+MATCHMAKING_SWEEP_MS = _env_int("MATCHMAKING_SWEEP_MS", 500, minimum=10)
+# matchmaking_update pushes: queue position changes alone are sent this often.
+MATCHMAKING_POSITION_PUSH_SECONDS = _env_int("MATCHMAKING_POSITION_PUSH_SECONDS", 5, minimum=1)
+# Status polling is the fallback: clients are told to poll this often, and a
+# long poll is held open for at most this long.
+MATCHMAKING_FALLBACK_POLL_SECONDS = _env_int("MATCHMAKING_FALLBACK_POLL_SECONDS", 15, minimum=1)
+MATCHMAKING_LONG_POLL_SECONDS = _env_int("MATCHMAKING_LONG_POLL_SECONDS", 25, minimum=0)
+LONG_POLL_CHECK_SECONDS = 0.1
 ROUTER_DB_PATH = os.getenv(
     "ROUTER_DB_PATH",
     os.path.join(os.path.dirname(__file__), "router.sqlite3"),
 )
+# Read-through cache of sessions and selected decks in front of the database.
+ROUTER_CACHE_MAX_ENTRIES = _env_int("ROUTER_CACHE_MAX_ENTRIES", 4096, minimum=1)
+ROUTER_CACHE_TTL_SECONDS = _env_int("ROUTER_CACHE_TTL_SECONDS", 30, minimum=0)
+# Expired and revoked sessions are deleted from the database this often; 0 turns it off.
+ROUTER_SESSION_GC_SECONDS = _env_int("ROUTER_SESSION_GC_SECONDS", 600, minimum=0)
 DECK_REQUIRED_CARD_COUNT = 20
 DECK_MAX_ITEM_OR_TOOL_COPIES = 2
 DECK_MAX_OTHER_COPIES = 1
 
 
-def _resolve_catalog_card_class(card_id: str) -> type[AVGECard] | None:
-    symbol = globals().get(card_id)
-    if not isinstance(symbol, type):
-        return None
-    if not issubclass(symbol, AVGECard):
-        return None
-    return symbol
+def _resolve_catalog_card(card_id: str) -> CatalogEntry | None:
+    # Deck checks only need the card kind, which the catalog index records
+    # without importing any card module.
+    return card_entry(card_id)
 
 
 def _validate_deck_cards(
@@ -137,16 +200,16 @@ def _validate_deck_cards(
             return "cards must contain non-empty string IDs."
 
         card_id = raw_card_id.strip()
-        resolved_symbol = _resolve_catalog_card_class(card_id)
-        if resolved_symbol is None:
+        resolved_card = _resolve_catalog_card(card_id)
+        if resolved_card is None:
             return f"Unknown card ID: {card_id}"
-        if issubclass(resolved_symbol, AVGECharacterCard):
+        if resolved_card.kind == "character":
             has_character_card = True
 
         next_count = copies_by_card_id.get(card_id, 0) + 1
         max_copies = (
             DECK_MAX_ITEM_OR_TOOL_COPIES
-            if issubclass(resolved_symbol, AVGEItemCard) or issubclass(resolved_symbol, AVGEToolCard)
+            if resolved_card.kind in {"item", "tool"}
             else DECK_MAX_OTHER_COPIES
         )
         if next_count > max_copies:
@@ -166,6 +229,11 @@ def _validate_deck_cards(
     return None
 
 
+def _validate_selected_deck_cards(raw_cards: list[Any]) -> str | None:
+    """Whether a selected deck can join the queue; cached with the deck."""
+    return _validate_deck_cards(raw_cards, require_exact_count=True, require_at_least_one_character=True)
+
+
 @dataclass
 class SessionIdentity:
     session_id: str
@@ -176,12 +244,6 @@ class SessionIdentity:
     current_room_id: str | None = None
 
 
-@dataclass
-class QueueEntry:
-    session_id: str
-    enqueued_at: float
-
-
 @dataclass
 class RoomRecord:
     room_id: str
@@ -190,15 +252,31 @@ class RoomRecord:
     bind_host: str
     port: int
     transport_mode: RoomTransportMode = "pipe"
+    # User ids by slot, kept for the rating update when a winner is declared.
+    player_user_ids: tuple[str | None, str | None] = (None, None)
+    # "starting" until the spawner has a worker running, then "running", then "finished".
     status: str = "running"
     finished_at: float | None = None
     retain_until: float | None = None
     finish_reason: str | None = None
-    worker: RoomWorker | None = None
+    worker: RoomWorker | HostedRoom | None = None
 
 
 @dataclass
 class RouterState:
+    """Router state in four domains, each guarded by its own router lock.
+
+    sessions: sessions_by_id, active_session_id_by_user_id,
+    superseded_session_ids, auth_socket_sids_by_session_id.
+    queue: queue.
+    rooms: rooms_by_id, room_id_by_session_id and every
+    SessionIdentity.current_room_id.
+    transport: game_session_id_by_socket_sid, game_session_id_by_client_id.
+
+    Writes hold the domain's lock. Single-key lookups may skip it, since
+    each one is atomic; iteration and read-then-write may not.
+    """
+
     sessions_by_id: dict[str, SessionIdentity] = field(default_factory=dict)
     active_session_id_by_user_id: dict[str, str] = field(default_factory=dict)
     superseded_session_ids: set[str] = field(default_factory=set)
@@ -207,22 +285,97 @@ class RouterState:
     game_session_id_by_client_id: dict[str, str] = field(default_factory=dict)
     rooms_by_id: dict[str, RoomRecord] = field(default_factory=dict)
     room_id_by_session_id: dict[str, str] = field(default_factory=dict)
-    queue: list[QueueEntry] = field(default_factory=list)
+    queue: MatchmakingEngine = field(default_factory=MatchmakingEngine)
 
 
 class MatchmakingRouter:
-    def __init__(self, db_path: str | None = None) -> None:
-        self._state = RouterState()
-        self._lock = RLock()
-        self._storage = RouterStorage(db_path or ROUTER_DB_PATH)
+    def __init__(self, db_path: str | None = None, pairing_window: PairingWindow | None = None) -> None:
+        self._state = RouterState(
+            queue=MatchmakingEngine(
+                pairing_window
+                or PairingWindow(
+                    bucket_width=MATCHMAKING_BUCKET_WIDTH,
+                    base=MATCHMAKING_BASE_WINDOW,
+                    growth_per_second=MATCHMAKING_WINDOW_GROWTH_PER_SECOND,
+                    maximum=max(MATCHMAKING_BASE_WINDOW, MATCHMAKING_MAX_WINDOW),
+                )
+            )
+        )
+        # Nested acquisitions follow this order: sessions, queue, rooms, transport.
+        self._sessions_lock = TimedRLock("sessions")
+        self._queue_lock = TimedRLock("queue")
+        self._rooms_lock = TimedRLock("rooms")
+        self._transport_lock = TimedRLock("transport")
+        self._storage = CachedRouterStorage(
+            db_path or ROUTER_DB_PATH,
+            validate_cards=_validate_selected_deck_cards,
+            max_entries=ROUTER_CACHE_MAX_ENTRIES,
+            ttl_seconds=ROUTER_CACHE_TTL_SECONDS,
+            session_gc_seconds=ROUTER_SESSION_GC_SECONDS,
+        )
         self._superseded_notifier: Callable[[str, list[str]], None] | None = None
+        self._matchmaking_notifier: Callable[[list[str], JsonObject], None] | None = None
+        # Latest matchmaking_update version per session; versions only grow.
+        self._status_versions: dict[str, int] = {}
+        self._status_version_counter = count(1)
+        # Queue positions last sent, and when positions were last checked; guarded by the queue lock.
+        self._pushed_positions: dict[str, int] = {}
+        self._positions_pushed_at = monotonic()
+        self._updates_pushed = 0
+        self._status_polls = 0
+        self._room_host_pool: RoomHostPool | None = (
+            RoomHostPool(ROOM_HOST_POOL_SIZE, ROOM_HOST_MAX_ROOMS)
+            if ROOM_HOST_POOL_SIZE > 0 or ROOM_HOST_LISTEN_PORT > 0
+            else None
+        )
+        self._remote_host_listener: RemoteHostListener | None = None
+        if ROOM_HOST_LISTEN_PORT > 0 and self._room_host_pool is not None:
+            if ROOM_HOST_TOKEN:
+                self._remote_host_listener = RemoteHostListener(
+                    ROOM_HOST_LISTEN_HOST,
+                    ROOM_HOST_LISTEN_PORT,
+                    ROOM_HOST_TOKEN,
+                    on_host=self._room_host_pool.add_host,
+                    on_host_finished=self._room_host_pool.on_host_finished,
+                )
+                self._remote_host_listener.start()
+            else:
+                print("[ROUTER] remote_room_hosts_disabled reason=ROOM_HOST_TOKEN unset")
+        self._room_worker_pool: RoomWorkerPool | None = None
+        if ROOM_WARM_POOL_SIZE > 0:
+            self._room_worker_pool = RoomWorkerPool(
+                ROOM_WARM_POOL_SIZE,
+                host=ROOM_BIND_HOST,
+                port=ROUTER_PORT,
+                transport_mode=ROOM_TRANSPORT_MODE,
+                max_idle_seconds=ROOM_WARM_MAX_IDLE_SECONDS,
+                max_age_seconds=ROOM_WARM_MAX_AGE_SECONDS,
+            )
+            self._room_worker_pool.start()
+        self._room_spawner = RoomSpawner(ROOM_SPAWN_CONCURRENCY)
+        # Rating writes and pushes for finished rooms. Finishes arrive on the
+        # pipe reactor thread, which must not block; one thread keeps them in order.
+        self._room_finish_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="room-finish")
+        # Runs batch pairing sweeps while the queue is not empty; guarded by the queue lock.
+        self._queue_sweeper: Thread | None = None
+        # Finished-room retention and the idle-session sweep run as timers.
+        # The timer thread is shared by the whole process, so the callbacks
+        # only hand the work, which takes the router locks, to this thread.
+        self._timers = shared_timer_service()
+        self._maintenance_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="router-maintenance")
+        # The pending idle-session sweep, if any sessions are in memory; guarded by the sessions lock.
+        self._session_sweep_timer: TimerHandle | None = None
 
     def set_superseded_notifier(self, notifier: Callable[[str, list[str]], None] | None) -> None:
-        with self._lock:
+        with self._sessions_lock:
             self._superseded_notifier = notifier
 
+    def set_matchmaking_notifier(self, notifier: Callable[[list[str], JsonObject], None] | None) -> None:
+        with self._sessions_lock:
+            self._matchmaking_notifier = notifier
+
     def register_auth_socket(self, session_id: str, socket_sid: str) -> tuple[bool, JsonObject]:
-        with self._lock:
+        with self._sessions_lock:
             session = self._ensure_session_locked(session_id)
             if session is None:
                 error_body, _ = self.session_error_payload(session_id)
@@ -236,7 +389,7 @@ class MatchmakingRouter:
             return True, {"ok": True, "session_id": session.session_id}
 
     def unregister_auth_socket(self, socket_sid: str) -> None:
-        with self._lock:
+        with self._sessions_lock:
             empty_keys: list[str] = []
             for session_id, sid_set in self._state.auth_socket_sids_by_session_id.items():
                 sid_set.discard(socket_sid)
@@ -247,12 +400,13 @@ class MatchmakingRouter:
                 self._state.auth_socket_sids_by_session_id.pop(session_id, None)
 
     def register_game_socket(self, session_id: str, socket_sid: str) -> tuple[bool, JsonObject]:
-        with self._lock:
+        with self._sessions_lock:
             session = self._ensure_session_locked(session_id)
             if session is None:
                 error_body, _ = self.session_error_payload(session_id)
                 return False, error_body
 
+        with self._rooms_lock:
             room = self._active_room_for_session_locked(session_id)
             if room is None:
                 return False, {
@@ -260,8 +414,16 @@ class MatchmakingRouter:
                     'error': 'No active room for session.',
                     'error_code': 'no_active_room',
                 }
+            if room.status == 'starting':
+                return False, {
+                    'ok': False,
+                    'error': 'Room is still starting.',
+                    'error_code': 'room_starting',
+                }
 
-            self._state.game_session_id_by_socket_sid[socket_sid] = session_id
+            # Bound under the rooms lock, so finishing the room clears it.
+            with self._transport_lock:
+                self._state.game_session_id_by_socket_sid[socket_sid] = session_id
             return True, {
                 'ok': True,
                 'session_id': session_id,
@@ -269,21 +431,22 @@ class MatchmakingRouter:
             }
 
     def unregister_game_socket(self, socket_sid: str) -> str | None:
-        with self._lock:
+        with self._transport_lock:
             return self._state.game_session_id_by_socket_sid.pop(socket_sid, None)
 
     def game_session_for_socket(self, socket_sid: str) -> str | None:
-        with self._lock:
-            value = self._state.game_session_id_by_socket_sid.get(socket_sid)
-            return value if isinstance(value, str) and value else None
+        # Per packet; a single lookup needs no lock.
+        value = self._state.game_session_id_by_socket_sid.get(socket_sid)
+        return value if isinstance(value, str) and value else None
 
     def register_game_client(self, client_id: str, session_id: str) -> tuple[bool, JsonObject]:
-        with self._lock:
+        with self._sessions_lock:
             session = self._ensure_session_locked(session_id)
             if session is None:
                 error_body, _ = self.session_error_payload(session_id)
                 return False, error_body
 
+        with self._rooms_lock:
             room = self._active_room_for_session_locked(session_id)
             if room is None:
                 return False, {
@@ -291,8 +454,15 @@ class MatchmakingRouter:
                     'error': 'No active room for session.',
                     'error_code': 'no_active_room',
                 }
+            if room.status == 'starting':
+                return False, {
+                    'ok': False,
+                    'error': 'Room is still starting.',
+                    'error_code': 'room_starting',
+                }
 
-            self._state.game_session_id_by_client_id[client_id] = session_id
+            with self._transport_lock:
+                self._state.game_session_id_by_client_id[client_id] = session_id
             return True, {
                 'ok': True,
                 'client_id': client_id,
@@ -301,21 +471,38 @@ class MatchmakingRouter:
             }
 
     def unregister_game_client(self, client_id: str) -> str | None:
-        with self._lock:
+        with self._transport_lock:
             return self._state.game_session_id_by_client_id.pop(client_id, None)
 
     def game_session_for_client(self, client_id: str) -> str | None:
-        with self._lock:
-            value = self._state.game_session_id_by_client_id.get(client_id)
-            return value if isinstance(value, str) and value else None
+        value = self._state.game_session_id_by_client_id.get(client_id)
+        return value if isinstance(value, str) and value else None
 
-    def room_worker_for_session(self, session_id: str) -> tuple[RoomWorker | None, JsonObject | None]:
-        with self._lock:
+    def room_worker_for_session(self, session_id: str) -> tuple[RoomWorker | HostedRoom | None, JsonObject | None]:
+        # Every protocol packet comes through here. A current session in a
+        # running room is resolved with single lookups and no lock; anything
+        # else takes the locked path, which also cleans up stale state.
+        session = self._state.sessions_by_id.get(session_id)
+        room_id = self._state.room_id_by_session_id.get(session_id)
+        room = self._state.rooms_by_id.get(room_id) if room_id is not None else None
+        if (
+            session is not None
+            and room is not None
+            and room.status == 'running'
+            and room.worker is not None
+            and self._state.active_session_id_by_user_id.get(session.user_id) == session_id
+        ):
+            session.last_seen_at = monotonic()
+            self._storage.touch_session(session_id, SESSION_COOKIE_MAX_AGE_SECONDS)
+            return room.worker, None
+
+        with self._sessions_lock:
             session = self._ensure_session_locked(session_id)
             if session is None:
                 error_body, _ = self.session_error_payload(session_id)
                 return None, error_body
 
+        with self._rooms_lock:
             room = self._active_room_for_session_locked(session_id)
             if room is None:
                 return None, {
@@ -324,6 +511,13 @@ class MatchmakingRouter:
                     'error_code': 'no_active_room',
                 }
 
+            if room.status == 'starting':
+                return None, {
+                    'ok': False,
+                    'error': 'Room is still starting.',
+                    'error_code': 'room_starting',
+                }
+
             worker = room.worker
             if worker is None:
                 return None, {
@@ -363,33 +557,88 @@ class MatchmakingRouter:
                 'error_code': 'room_pipe_failed',
             }
 
+    def forward_pipe_command_for_session(
+        self,
+        session_id: str,
+        *,
+        method: str,
+        params: JsonObject,
+        on_error: Callable[[JsonObject], None] | None = None,
+    ) -> JsonObject | None:
+        """Queue a room command without waiting for it; returns an error body only if it could not be queued.
+
+        When the room later rejects the command, or its process exits first,
+        ``on_error`` is called from the pipe reader thread with the error body.
+        """
+        worker, lookup_error = self.room_worker_for_session(session_id)
+        if lookup_error is not None:
+            return lookup_error
+        assert worker is not None
+
+        try:
+            if on_error is None:
+                worker.send(method, params)
+                return None
+            future = worker.submit(method, params)
+        except Exception as exc:
+            return {
+                'ok': False,
+                'error': str(exc) or f'Room pipe command failed: {method}',
+                'error_code': 'room_pipe_failed',
+            }
+
+        def _report(done: Future[JsonObject]) -> None:
+            if done.cancelled() or done.exception() is None:
+                return
+            on_error({
+                'ok': False,
+                'error': str(done.exception()) or f'Room pipe command failed: {method}',
+                'error_code': 'room_pipe_failed',
+            })
+
+        future.add_done_callback(_report)
+        return None
+
     def handle_room_worker_event(self, room_id: str, event_type: str, payload: JsonObject) -> None:
         if event_type == 'socket_emit':
-            if socketio is None:
-                return
-            event_name = payload.get('event')
-            if not isinstance(event_name, str) or not event_name.strip():
-                return
-            socket_payload = payload.get('payload')
-            target_sid = payload.get('to')
-            if isinstance(target_sid, str) and target_sid.strip():
-                socketio.emit(event_name.strip(), socket_payload, to=target_sid.strip())
-            else:
-                socketio.emit(event_name.strip(), socket_payload)
+            self._emit_room_socket_event(payload)
+            return
+
+        if event_type == 'socket_emit_batch':
+            # The room already merged runs of protocol_packets per sid; one emit each, in order.
+            emits = payload.get('emits')
+            if isinstance(emits, list):
+                for body in emits:
+                    if isinstance(body, dict):
+                        self._emit_room_socket_event(body)
             return
 
         if event_type == 'room_finished':
             reason_raw = payload.get('reason')
             reason = reason_raw.strip() if isinstance(reason_raw, str) and reason_raw.strip() else 'finished'
-            self.mark_room_finished(room_id, reason)
+            self.mark_room_finished(room_id, reason, _payload_winner_slot(payload))
+
+    def _emit_room_socket_event(self, body: JsonObject) -> None:
+        if socketio is None:
+            return
+        event_name = body.get('event')
+        if not isinstance(event_name, str) or not event_name.strip():
+            return
+        # Pre-encoded room payloads reach the client without being decoded here.
+        socket_payload = socket_payload_from_event(body)
+        target_sid = body.get('to')
+        if isinstance(target_sid, str) and target_sid.strip():
+            socketio.emit(event_name.strip(), socket_payload, to=target_sid.strip())
+        else:
+            socketio.emit(event_name.strip(), socket_payload)
 
     def login(self, username: str, existing_session_id: str | None) -> SessionIdentity:
         now = monotonic()
         user_id = self._storage.get_or_create_user(username)
+        stored_session = self._storage.get_session(existing_session_id) if existing_session_id else None
+        handoff: tuple[RoomRecord, str] | None = None
 
-        with self._lock:
-            self._cleanup_expired_rooms_locked(now)
-
+        with self._sessions_lock:
             reusable_session_id: str | None = None
 
             if existing_session_id:
@@ -397,7 +646,6 @@ class MatchmakingRouter:
                 if existing is not None and existing.user_id == user_id:
                     reusable_session_id = existing.session_id
 
-                stored_session = self._storage.get_session(existing_session_id)
                 if stored_session is not None and stored_session.user_id == user_id:
                     reusable_session_id = stored_session.session_id
 
@@ -429,7 +677,7 @@ class MatchmakingRouter:
                             last_seen_at=now,
                             current_room_id=self._state.room_id_by_session_id.get(stored_reusable.session_id),
                         )
-                        self._state.sessions_by_id[reusable.session_id] = reusable
+                        self._remember_session_locked(reusable)
 
                 if reusable is not None and reusable.user_id == user_id:
                     reusable.username = username
@@ -455,33 +703,37 @@ class MatchmakingRouter:
                 user_id=user_id,
                 ttl_seconds=SESSION_COOKIE_MAX_AGE_SECONDS,
             )
-            self._state.sessions_by_id[session.session_id] = session
+            self._remember_session_locked(session)
             self._state.active_session_id_by_user_id[user_id] = session.session_id
             self._state.superseded_session_ids.discard(session.session_id)
 
             if isinstance(session_id_for_room_transfer, str) and session_id_for_room_transfer:
-                handoff = self._transfer_room_assignment_locked(
-                    from_session_id=session_id_for_room_transfer,
-                    to_session_id=session.session_id,
-                )
-                if handoff is not None:
-                    room, slot = handoff
-                    self._notify_room_session_takeover(room, slot, session_id_for_room_transfer, session.session_id)
+                with self._rooms_lock:
+                    handoff = self._transfer_room_assignment_locked(
+                        from_session_id=session_id_for_room_transfer,
+                        to_session_id=session.session_id,
+                    )
 
-            return session
+        # A pipe round trip to the room; no router lock is held. The new
+        # session is not returned to its client until the room knows it.
+        if handoff is not None and session_id_for_room_transfer is not None:
+            room, slot = handoff
+            self._notify_room_session_takeover(room, slot, session_id_for_room_transfer, session.session_id)
+        return session
 
     def session(self, session_id: str) -> SessionIdentity | None:
-        with self._lock:
+        with self._sessions_lock:
             return self._ensure_session_locked(session_id)
 
     def logout(self, session_id: str) -> bool:
-        with self._lock:
+        with self._sessions_lock:
             session = self._ensure_session_locked(session_id)
             if session is None:
                 return False
 
-            self._state.queue = [entry for entry in self._state.queue if entry.session_id != session_id]
-            self._state.sessions_by_id.pop(session_id, None)
+            with self._queue_lock:
+                self._state.queue.remove(session_id)
+            self._forget_session_locked(session_id)
             self._state.auth_socket_sids_by_session_id.pop(session_id, None)
             if self._state.active_session_id_by_user_id.get(session.user_id) == session_id:
                 self._state.active_session_id_by_user_id.pop(session.user_id, None)
@@ -492,9 +744,10 @@ class MatchmakingRouter:
     def bootstrap_session(self, username: str, existing_session_id: str | None) -> SessionIdentity:
         now = monotonic()
         user_id = self._storage.get_or_create_user(username)
-        with self._lock:
-            self._cleanup_expired_rooms_locked(now)
+        stored_session = self._storage.get_session(existing_session_id) if existing_session_id else None
+        handoff: tuple[RoomRecord, str] | None = None
 
+        with self._sessions_lock:
             reusable_session_id: str | None = None
 
             if existing_session_id:
@@ -502,7 +755,6 @@ class MatchmakingRouter:
                 if existing is not None and existing.user_id == user_id:
                     reusable_session_id = existing.session_id
 
-                stored_session = self._storage.get_session(existing_session_id)
                 if stored_session is not None and stored_session.user_id == user_id:
                     reusable_session_id = stored_session.session_id
 
@@ -534,7 +786,7 @@ class MatchmakingRouter:
                             last_seen_at=now,
                             current_room_id=self._state.room_id_by_session_id.get(stored_reusable.session_id),
                         )
-                        self._state.sessions_by_id[reusable.session_id] = reusable
+                        self._remember_session_locked(reusable)
 
                 if reusable is not None and reusable.user_id == user_id:
                     reusable.username = username
@@ -560,20 +812,23 @@ class MatchmakingRouter:
                 user_id=user_id,
                 ttl_seconds=SESSION_COOKIE_MAX_AGE_SECONDS,
             )
-            self._state.sessions_by_id[session.session_id] = session
+            self._remember_session_locked(session)
             self._state.active_session_id_by_user_id[user_id] = session.session_id
             self._state.superseded_session_ids.discard(session.session_id)
 
             if isinstance(session_id_for_room_transfer, str) and session_id_for_room_transfer:
-                handoff = self._transfer_room_assignment_locked(
-                    from_session_id=session_id_for_room_transfer,
-                    to_session_id=session.session_id,
-                )
-                if handoff is not None:
-                    room, slot = handoff
-                    self._notify_room_session_takeover(room, slot, session_id_for_room_transfer, session.session_id)
+                with self._rooms_lock:
+                    handoff = self._transfer_room_assignment_locked(
+                        from_session_id=session_id_for_room_transfer,
+                        to_session_id=session.session_id,
+                    )
 
-            return session
+        # A pipe round trip to the room; no router lock is held. The new
+        # session is not returned to its client until the room knows it.
+        if handoff is not None and session_id_for_room_transfer is not None:
+            room, slot = handoff
+            self._notify_room_session_takeover(room, slot, session_id_for_room_transfer, session.session_id)
+        return session
 
     def session_error_payload(self, session_id: str | None) -> tuple[JsonObject, int]:
         if not isinstance(session_id, str) or not session_id.strip():
@@ -590,64 +845,54 @@ class MatchmakingRouter:
         return {"ok": False, "error": "Unknown session.", "error_code": "unknown_session"}, 401
 
     def enqueue(self, session_id: str) -> JsonObject:
-        with self._lock:
-            now = monotonic()
-            self._cleanup_expired_rooms_locked(now)
+        now = monotonic()
 
+        with self._sessions_lock:
             session = self._ensure_session_locked(session_id)
             if session is None:
                 error_body, _ = self.session_error_payload(session_id)
                 return error_body
 
-            # Only running rooms are considered active assignments for queueing.
-            room = self._active_room_for_session_locked(session_id)
-            if room is not None:
-                session.current_room_id = room.room_id
-                return {
-                    "ok": True,
-                    "queued": False,
-                    "room_id": room.room_id,
-                    "status": "assigned",
-                    "room": self._serialize_room_locked(room),
-                }
+        selected = self._storage.get_selected_deck_cards(session.user_id)
+        rating = self._storage.get_rating(session.user_id)
 
-            selected = self._storage.get_selected_deck(session.user_id)
-            if selected is not None:
-                selected_cards: list[Any]
-                try:
-                    parsed_cards = json.loads(str(selected.get("card_payload_json", "[]")))
-                except Exception:
-                    self._state.queue = [entry for entry in self._state.queue if entry.session_id != session_id]
+        with self._queue_lock:
+            # Checked under the queue lock, so a session matched meanwhile is not queued again.
+            with self._rooms_lock:
+                # Only running rooms are considered active assignments for queueing.
+                room = self._active_room_for_session_locked(session_id)
+                if room is not None:
+                    session.current_room_id = room.room_id
                     return {
-                        "ok": False,
-                        "error": "Cannot join queue: invalid selected deck. selected deck payload is invalid JSON.",
-                    }
-
-                if not isinstance(parsed_cards, list):
-                    self._state.queue = [entry for entry in self._state.queue if entry.session_id != session_id]
-                    return {
-                        "ok": False,
-                        "error": "Cannot join queue: invalid selected deck. selected deck payload is not a card list.",
+                        "ok": True,
+                        "queued": False,
+                        "room_id": room.room_id,
+                        "status": _assignment_status(room),
+                        "room": self._serialize_room_locked(room),
                     }
 
-                selected_cards = parsed_cards
-                deck_error = _validate_deck_cards(
-                    selected_cards,
-                    require_exact_count=True,
-                    require_at_least_one_character=True,
-                )
-                if deck_error is not None:
-                    self._state.queue = [entry for entry in self._state.queue if entry.session_id != session_id]
-                    return {
-                        "ok": False,
-                        "error": f"Cannot join queue: invalid selected deck. {deck_error}",
-                    }
+            deck_error = selected.error if selected is not None else None
+            if deck_error is not None:
+                dequeued = self._state.queue.remove(session_id) is not None
+            else:
+                self._state.queue.push(QueueEntry(session_id=session_id, enqueued_at=now, rating=rating))
+                paired_rooms = self._assign_rooms_from_queue_locked(now, session_id)
+                position = self._queue_position_locked(session_id)
+                self._ensure_queue_sweeper_locked()
+
+        if deck_error is not None:
+            if dequeued:
+                self._publish_matchmaking_updates([session_id])
+            return {
+                "ok": False,
+                "error": f"Cannot join queue: invalid selected deck. {deck_error}",
+            }
 
-            if not any(entry.session_id == session_id for entry in self._state.queue):
-                self._state.queue.append(QueueEntry(session_id=session_id, enqueued_at=now))
+        self._publish_matchmaking_updates([session_id, *_session_ids_of(paired_rooms)])
+        assigned_room_id = paired_rooms[-1].room_id if paired_rooms else None
 
-            assigned_room_id = self._assign_rooms_from_queue_locked(now)
-            if assigned_room_id is not None:
+        if assigned_room_id is not None:
+            with self._rooms_lock:
                 if self._state.room_id_by_session_id.get(session_id) == assigned_room_id:
                     session.current_room_id = assigned_room_id
                     room = self._state.rooms_by_id.get(assigned_room_id)
@@ -655,68 +900,59 @@ class MatchmakingRouter:
                         "ok": True,
                         "queued": False,
                         "room_id": assigned_room_id,
-                        "status": "assigned",
+                        "status": _assignment_status(room) if room is not None else "starting",
                         "room": self._serialize_room_locked(room) if room is not None else None,
                     }
 
-            position = self._queue_position_locked(session_id)
-            return {
-                "ok": True,
-                "queued": True,
-                "queue_position": position,
-                "status": "waiting",
-            }
+        return {
+            "ok": True,
+            "queued": True,
+            "queue_position": position,
+            "status": "waiting",
+        }
 
     def dequeue(self, session_id: str) -> JsonObject:
-        with self._lock:
-            before = len(self._state.queue)
-            self._state.queue = [entry for entry in self._state.queue if entry.session_id != session_id]
-            removed = len(self._state.queue) != before
-            return {
-                "ok": True,
-                "removed": removed,
-            }
+        with self._queue_lock:
+            removed = self._state.queue.remove(session_id) is not None
+        if removed:
+            self._publish_matchmaking_updates([session_id])
+        return {
+            "ok": True,
+            "removed": removed,
+        }
 
     def status(self, session_id: str) -> JsonObject:
-        with self._lock:
-            now = monotonic()
-            self._cleanup_expired_rooms_locked(now)
-
+        with self._sessions_lock:
             session = self._ensure_session_locked(session_id)
             if session is None:
                 error_body, _ = self.session_error_payload(session_id)
                 return error_body
 
-            room = self._active_room_for_session_locked(session_id)
-            if room is not None:
-                session.current_room_id = room.room_id
-                return {
-                    "ok": True,
-                    "status": "assigned",
-                    "session_id": session_id,
-                    "username": session.username,
-                    "room": self._serialize_room_locked(room),
-                }
+        with self._queue_lock:
+            self._status_polls += 1
+            body = self._matchmaking_status_locked(session_id)
+        return {
+            "ok": True,
+            **body,
+            "session_id": session_id,
+            "username": session.username,
+            "status_version": self.status_version(session_id),
+            # Pushed matchmaking_update events carry changes; polling is the fallback.
+            "poll_after_seconds": MATCHMAKING_FALLBACK_POLL_SECONDS,
+        }
 
-            position = self._queue_position_locked(session_id)
-            return {
-                "ok": True,
-                "status": "waiting" if position is not None else "idle",
-                "session_id": session_id,
-                "username": session.username,
-                "queue_position": position,
-            }
+    def status_version(self, session_id: str) -> int:
+        """Version of the session's latest matchmaking_update; 0 before the first one."""
+        return self._status_versions.get(session_id, 0)
 
     def rejoin_room(self, session_id: str, room_id: str | None = None) -> JsonObject:
-        with self._lock:
-            now = monotonic()
-            self._cleanup_expired_rooms_locked(now)
-
+        with self._sessions_lock:
             session = self._ensure_session_locked(session_id)
             if session is None:
                 error_body, _ = self.session_error_payload(session_id)
                 return error_body
 
+        with self._rooms_lock:
             resolved_room_id = room_id or self._state.room_id_by_session_id.get(session_id)
             if resolved_room_id is None:
                 return {"ok": False, "error": "No active room for session."}
@@ -725,6 +961,9 @@ class MatchmakingRouter:
             if room is None:
                 return {"ok": False, "error": "Room not found."}
 
+            if room.status == "starting":
+                return {"ok": False, "error": "Room is still starting.", "error_code": "room_starting"}
+
             if room.status != "running":
                 # Do not allow reconnecting into retained finished rooms.
                 if self._state.room_id_by_session_id.get(session_id) == resolved_room_id:
@@ -742,50 +981,156 @@ class MatchmakingRouter:
                 "room": self._serialize_room_locked(room),
             }
 
-    def mark_room_finished(self, room_id: str, reason: str) -> JsonObject:
-        with self._lock:
+    def mark_room_finished(self, room_id: str, reason: str, winner: str | None = None) -> JsonObject:
+        """Finish a room; a ``winner_declared`` finish naming the winning slot updates both ratings."""
+        rated_result: tuple[str, str] | None = None
+        worker_to_stop: RoomWorker | HostedRoom | None = None
+        with self._rooms_lock:
             room = self._state.rooms_by_id.get(room_id)
             if room is None:
                 return {"ok": False, "error": "Room not found."}
 
             if room.status != "finished":
+                if reason == "winner_declared" and winner in {"p1", "p2"}:
+                    winner_user_id, loser_user_id = room.player_user_ids if winner == "p1" else room.player_user_ids[::-1]
+                    if winner_user_id and loser_user_id and winner_user_id != loser_user_id:
+                        rated_result = (winner_user_id, loser_user_id)
                 now = monotonic()
                 room.status = "finished"
                 room.finished_at = now
-                room.retain_until = now + ROOM_FINISH_GRACE_SECONDS
+                self._retain_finished_room_locked(room, now)
                 room.finish_reason = reason
                 # Winner declaration should drop router assignment immediately,
                 # but keep the room process alive so clients can finish the
                 # winner UI and return to MainMenu explicitly.
                 should_stop_worker = reason not in {"winner_declared"}
-                if should_stop_worker and room.worker is not None:
-                    room.worker.stop(reason=reason)
+                if should_stop_worker:
+                    worker_to_stop = room.worker
 
             # Finished rooms are retained for diagnostics only; active session
             # assignment should be cleared immediately.
             for session_id in room.player_session_ids:
                 if self._state.room_id_by_session_id.get(session_id) == room.room_id:
                     self._state.room_id_by_session_id.pop(session_id, None)
-                self._clear_transport_bindings_for_session_locked(session_id)
+                self._clear_transport_bindings_for_session(session_id)
                 session = self._state.sessions_by_id.get(session_id)
                 if session is not None and session.current_room_id == room.room_id:
                     session.current_room_id = None
 
-            return {
+            body = {
                 "ok": True,
                 "room": self._serialize_room_locked(room),
             }
 
-    def _assign_rooms_from_queue_locked(self, now: float) -> str | None:
-        last_assigned_room: str | None = None
-        while len(self._state.queue) >= 2:
-            entry_a = self._state.queue.pop(0)
-            entry_b = self._state.queue.pop(0)
+        # Stopping can wait for the process to exit, so not under the rooms lock.
+        if worker_to_stop is not None:
+            worker_to_stop.stop(reason=reason)
+        self._room_finish_executor.submit(
+            self._after_room_finished, room_id, room.player_session_ids, rated_result, winner
+        )
+        return body
+
+    def _after_room_finished(
+        self,
+        room_id: str,
+        player_session_ids: tuple[str, str],
+        rated_result: tuple[str, str] | None,
+        winner: str | None,
+    ) -> None:
+        """Push the players' new status and record a rated result; runs on the room-finish thread."""
+        self._publish_matchmaking_updates(player_session_ids)
+        if rated_result is None:
+            return
+        try:
+            winner_rating, loser_rating = self._storage.record_match_result(*rated_result)
+        except Exception as exc:
+            print(f"[ROUTER] ratings_update_failed room_id={room_id} winner={winner} error={exc!r}")
+            return
+        print(
+            f"[ROUTER] ratings_updated room_id={room_id} winner={winner} "
+            f"winner_rating={winner_rating:.1f} loser_rating={loser_rating:.1f}"
+        )
 
-            if entry_a.session_id == entry_b.session_id:
-                # Defensive guard in case duplicate queue rows slipped through.
-                self._state.queue.insert(0, entry_b)
-                break
+    def room_worker_pool_metrics(self) -> tuple[JsonObject, int]:
+        pool = self._room_worker_pool
+        if pool is None:
+            return {"ok": True, "enabled": False, "spawner": self._room_spawner.metrics()}, 200
+        return {"ok": True, "enabled": True, "pool": pool.metrics(), "spawner": self._room_spawner.metrics()}, 200
+
+    def matchmaking_metrics(self) -> tuple[JsonObject, int]:
+        with self._queue_lock:
+            return {
+                "ok": True,
+                "matchmaking": self._state.queue.stats(),
+                "updates_pushed": self._updates_pushed,
+                "status_polls": self._status_polls,
+            }, 200
+
+    def lock_metrics(self) -> tuple[JsonObject, int]:
+        locks = (self._sessions_lock, self._queue_lock, self._rooms_lock, self._transport_lock)
+        return {"ok": True, "locks": {lock.name: lock.stats() for lock in locks}}, 200
+
+    def timer_metrics(self) -> tuple[JsonObject, int]:
+        with self._sessions_lock:
+            sessions_in_memory = len(self._state.sessions_by_id)
+            sweep_armed = self._session_sweep_timer is not None and self._session_sweep_timer.active
+        return {
+            "ok": True,
+            "timers": self._timers.stats(),
+            "sessions_in_memory": sessions_in_memory,
+            "session_sweep_armed": sweep_armed,
+        }, 200
+
+    def storage_metrics(self) -> tuple[JsonObject, int]:
+        return {
+            "ok": True,
+            "session_touches": self._storage.session_touch_stats(),
+            "read_cache": self._storage.cache_stats(),
+            "session_gc": self._storage.session_gc_stats(),
+        }, 200
+
+    def room_engine_profile(self, room_id: str) -> tuple[JsonObject, int]:
+        with self._rooms_lock:
+            room = self._state.rooms_by_id.get(room_id)
+            if room is None:
+                return {"ok": False, "error": "Room not found."}, 404
+            worker = room.worker
+            if worker is None or room.status != "running":
+                return {"ok": False, "error": "Room is not active.", "room": self._serialize_room_locked(room)}, 409
+
+        # Ask the room outside the router lock; the worker may be mid-drain.
+        try:
+            response = worker.request("engine_profile", {}, timeout_seconds=2.0)
+        except TimeoutError:
+            return {
+                "ok": False,
+                "error": "Room pipe command timed out: engine_profile",
+                "error_code": "room_pipe_timeout",
+            }, 504
+        except Exception as exc:
+            return {
+                "ok": False,
+                "error": str(exc) or "Room pipe command failed: engine_profile",
+                "error_code": "room_pipe_failed",
+            }, 502
+        if not isinstance(response, dict):
+            return {"ok": False, "error": "Invalid room engine profile response."}, 502
+        return response, 200
+
+    def _assign_rooms_from_queue_locked(self, now: float, session_id: str | None = None) -> list[RoomRecord]:
+        """Start a room for each pair the engine makes and return them; the caller holds the queue lock.
+
+        With ``session_id`` only that player is matched, as on arrival;
+        otherwise the whole queue is swept.
+        """
+        if session_id is not None:
+            pair = self._state.queue.match(session_id, now)
+            pairs = [pair] if pair is not None else []
+        else:
+            pairs = self._state.queue.sweep(now)
+
+        paired_rooms: list[RoomRecord] = []
+        for entry_a, entry_b in pairs:
 
             # Randomize slot assignment so either queued player can become p1.
             p1_entry, p2_entry = (entry_a, entry_b)
@@ -794,6 +1139,8 @@ class MatchmakingRouter:
 
             room_id = f"room-{uuid4().hex[:12]}"
             room_port = ROUTER_PORT
+            p1_session = self._state.sessions_by_id.get(p1_entry.session_id)
+            p2_session = self._state.sessions_by_id.get(p2_entry.session_id)
             room = RoomRecord(
                 room_id=room_id,
                 player_session_ids=(p1_entry.session_id, p2_entry.session_id),
@@ -801,65 +1148,212 @@ class MatchmakingRouter:
                 bind_host=ROOM_BIND_HOST,
                 port=room_port,
                 transport_mode=ROOM_TRANSPORT_MODE,
-                status="running",
+                player_user_ids=(
+                    p1_session.user_id if p1_session is not None else None,
+                    p2_session.user_id if p2_session is not None else None,
+                ),
+                status="starting",
+            )
+
+            # Only the reservation is made here; the spawner loads decks and starts the worker.
+            with self._rooms_lock:
+                self._state.rooms_by_id[room_id] = room
+                for entry in (p1_entry, p2_entry):
+                    self._state.room_id_by_session_id[entry.session_id] = room_id
+                    session = self._state.sessions_by_id.get(entry.session_id)
+                    if session is not None:
+                        session.current_room_id = room_id
+
+            entries = (p1_entry, p2_entry)
+            self._room_spawner.submit(room_id, lambda room=room, entries=entries: self._start_room(room, entries))
+            print(
+                f"[ROUTER] room_paired room_id={room_id} "
+                f"players=({p1_entry.session_id},{p2_entry.session_id}) "
+                f"ratings=({p1_entry.rating:.0f},{p2_entry.rating:.0f})"
             )
+            paired_rooms.append(room)
 
-            session_a = self._state.sessions_by_id.get(p1_entry.session_id)
-            session_b = self._state.sessions_by_id.get(p2_entry.session_id)
+        return paired_rooms
+
+    def _ensure_queue_sweeper_locked(self) -> None:
+        """Start the sweeper if anyone is queued and it is not running; the caller holds the queue lock."""
+        if self._queue_sweeper is not None or len(self._state.queue) == 0:
+            return
+        self._queue_sweeper = Thread(target=self._sweep_queue_periodically, name="matchmaking-sweeper", daemon=True)
+        self._queue_sweeper.start()
+
+    def _sweep_queue_periodically(self) -> None:
+        # Windows widen with waiting time, so a player nobody fit on arrival may fit later.
+        while True:
+            sleep(MATCHMAKING_SWEEP_MS / 1000)
+            with self._queue_lock:
+                if len(self._state.queue) == 0:
+                    self._queue_sweeper = None
+                    return
+                now = monotonic()
+                changed = _session_ids_of(self._assign_rooms_from_queue_locked(now))
+                if now - self._positions_pushed_at >= MATCHMAKING_POSITION_PUSH_SECONDS:
+                    self._positions_pushed_at = now
+                    changed.extend(self._moved_queue_positions_locked())
+            self._publish_matchmaking_updates(changed)
+
+    def _moved_queue_positions_locked(self) -> list[str]:
+        """Queued sessions whose position differs from the one last pushed; the caller holds the queue lock."""
+        moved: list[str] = []
+        positions: dict[str, int] = {}
+        for position, entry in enumerate(self._state.queue, start=1):
+            positions[entry.session_id] = position
+            if self._pushed_positions.get(entry.session_id) != position:
+                moved.append(entry.session_id)
+        self._pushed_positions = positions
+        return moved
+
+    def _matchmaking_status_locked(self, session_id: str) -> JsonObject:
+        """Status, and the room or queue position, as polls and pushes report it; the caller holds the queue lock."""
+        with self._rooms_lock:
+            room = self._active_room_for_session_locked(session_id)
+            if room is not None:
+                session = self._state.sessions_by_id.get(session_id)
+                if session is not None:
+                    session.current_room_id = room.room_id
+                return {"status": _assignment_status(room), "room": self._serialize_room_locked(room)}
+
+        position = self._queue_position_locked(session_id)
+        return {"status": "waiting" if position is not None else "idle", "queue_position": position}
+
+    def _publish_matchmaking_updates(self, session_ids: Iterable[str]) -> None:
+        """Push each session's current status as a matchmaking_update; call with no router lock held.
+
+        Every update gets a new status version, which also wakes long polls
+        waiting on that session.
+        """
+        for session_id in dict.fromkeys(session_ids):
+            with self._sessions_lock:
+                notifier = self._matchmaking_notifier
+                socket_sids = sorted(self._state.auth_socket_sids_by_session_id.get(session_id, ()))
+            with self._queue_lock:
+                update: JsonObject = {"session_id": session_id, **self._matchmaking_status_locked(session_id)}
+                version = next(self._status_version_counter)
+                self._status_versions[session_id] = version
+                update["status_version"] = version
+                if notifier is not None and socket_sids:
+                    self._updates_pushed += 1
+                    if update.get("queue_position") is not None:
+                        self._pushed_positions[session_id] = int(update["queue_position"])
+            if notifier is not None and socket_sids:
+                notifier(socket_sids, update)
+
+    def _start_room(self, room: RoomRecord, entries: tuple[QueueEntry, QueueEntry]) -> bool:
+        """Start a reserved room's worker and wait until it answers; runs on a spawner thread with no router lock held.
+
+        Returns False when the room was finished while it started. On
+        failure both players go back to the front of the queue.
+        """
+        try:
+            session_a = self._state.sessions_by_id.get(room.player_session_ids[0])
+            session_b = self._state.sessions_by_id.get(room.player_session_ids[1])
             session_a_name = session_a.username if session_a is not None else "Player 1"
             session_b_name = session_b.username if session_b is not None else "Player 2"
 
             def _selected_cards_for_session(session: SessionIdentity | None) -> list[str] | None:
                 if session is None:
                     return None
-                selected = self._storage.get_selected_deck(session.user_id)
-                if selected is None:
+                selected = self._storage.get_selected_deck_cards(session.user_id)
+                if selected is None or selected.cards is None:
                     return None
+                return [str(card_id) for card_id in selected.cards if isinstance(card_id, str) and card_id.strip()]
+
+            worker_options: dict[str, Any] = {
+                "room_id": room.room_id,
+                "player_session_ids": room.player_session_ids,
+                "host": room.bind_host,
+                "port": room.port,
+                "p1_username": session_a_name,
+                "p2_username": session_b_name,
+                "p1_selected_cards": _selected_cards_for_session(session_a),
+                "p2_selected_cards": _selected_cards_for_session(session_b),
+                "transport_mode": ROOM_TRANSPORT_MODE,
+                "on_finished": self._on_room_worker_finished,
+                "on_event": self.handle_room_worker_event,
+            }
+            worker: RoomWorker | HostedRoom | None = None
+            if self._room_host_pool is not None:
+                worker = self._room_host_pool.place_room(**worker_options)
+                if worker is None:
+                    print(f"[ROUTER] room_host_pool_full room_id={room.room_id} hosts={self._room_host_pool.size}")
+            if worker is None and self._room_worker_pool is not None:
+                worker = self._room_worker_pool.acquire(**worker_options)
+            if worker is None:
+                worker = RoomWorker(**worker_options)
+                worker.start()
+                # A hosted room is ready once open_room is acked and a warm
+                # worker once assign_room is; a fresh process once it answers.
                 try:
-                    parsed = json.loads(str(selected.get('card_payload_json', '[]')))
+                    worker.request("health", {}, timeout_seconds=ROOM_READY_TIMEOUT_SECONDS)
                 except Exception:
-                    return None
-                if not isinstance(parsed, list):
-                    return None
-                return [str(card_id) for card_id in parsed if isinstance(card_id, str) and card_id.strip()]
-
-            session_a_selected_cards = _selected_cards_for_session(session_a)
-            session_b_selected_cards = _selected_cards_for_session(session_b)
-
-            worker = RoomWorker(
-                room_id=room_id,
-                player_session_ids=room.player_session_ids,
-                host=room.bind_host,
-                port=room.port,
-                p1_username=session_a_name,
-                p2_username=session_b_name,
-                p1_selected_cards=session_a_selected_cards,
-                p2_selected_cards=session_b_selected_cards,
-                transport_mode=ROOM_TRANSPORT_MODE,
-                on_finished=self._on_room_worker_finished,
-                on_event=self.handle_room_worker_event,
-            )
-            room.worker = worker
-            self._state.rooms_by_id[room_id] = room
-            self._state.room_id_by_session_id[p1_entry.session_id] = room_id
-            self._state.room_id_by_session_id[p2_entry.session_id] = room_id
-
-            if session_a is not None:
-                session_a.current_room_id = room_id
-            if session_b is not None:
-                session_b.current_room_id = room_id
-
-            worker.start()
-            print(
-                f"[ROUTER] room_started room_id={room_id} "
-                f"players=({p1_entry.session_id},{p2_entry.session_id})"
-            )
-            last_assigned_room = room_id
+                    worker.stop(reason="room_start_failed")
+                    raise
+            else:
+                worker.start()
+        except Exception:
+            self._requeue_failed_room(room, entries)
+            raise
+
+        with self._rooms_lock:
+            cancelled = room.status != "starting"
+            if not cancelled:
+                room.worker = worker
+                room.status = "running"
+        if cancelled:
+            worker.stop(reason=room.finish_reason or "room_cancelled")
+            return False
+        print(
+            f"[ROUTER] room_started room_id={room.room_id} "
+            f"players=({room.player_session_ids[0]},{room.player_session_ids[1]})"
+        )
+        self._publish_matchmaking_updates(room.player_session_ids)
+        return True
 
-        return last_assigned_room
+    def _requeue_failed_room(self, room: RoomRecord, entries: tuple[QueueEntry, QueueEntry]) -> None:
+        now = monotonic()
+        with self._queue_lock:
+            with self._rooms_lock:
+                if room.status == "starting":
+                    room.status = "finished"
+                    room.finished_at = now
+                    self._retain_finished_room_locked(room, now)
+                    room.finish_reason = "room_start_failed"
+                for session_id in room.player_session_ids:
+                    if self._state.room_id_by_session_id.get(session_id) == room.room_id:
+                        self._state.room_id_by_session_id.pop(session_id, None)
+                    session = self._state.sessions_by_id.get(session_id)
+                    if session is not None and session.current_room_id == room.room_id:
+                        session.current_room_id = None
+
+            requeued: list[QueueEntry] = []
+            for entry in entries:
+                session = self._state.sessions_by_id.get(entry.session_id)
+                current = (
+                    session is not None
+                    and self._state.active_session_id_by_user_id.get(session.user_id) == entry.session_id
+                    and entry.session_id not in self._state.room_id_by_session_id
+                    and entry.session_id not in self._state.queue
+                )
+                if not current:
+                    continue
+                if entry.spawn_failures + 1 >= ROOM_SPAWN_MAX_ATTEMPTS:
+                    print(f"[ROUTER] room_start_gave_up session_id={entry.session_id} attempts={entry.spawn_failures + 1}")
+                    continue
+                requeued.append(replace(entry, spawn_failures=entry.spawn_failures + 1))
+            # Ahead of later arrivals, as they were when paired.
+            self._state.queue.push_front(requeued)
+            print(f"[ROUTER] room_start_failed room_id={room.room_id} requeued={len(requeued)}")
+            paired_rooms = self._assign_rooms_from_queue_locked(now)
+            self._ensure_queue_sweeper_locked()
+        self._publish_matchmaking_updates([*room.player_session_ids, *_session_ids_of(paired_rooms)])
 
     def _on_room_worker_finished(self, room_id: str, reason: str) -> None:
-        with self._lock:
+        with self._rooms_lock:
             room = self._state.rooms_by_id.get(room_id)
             if room is None:
                 return
@@ -868,13 +1362,13 @@ class MatchmakingRouter:
             now = monotonic()
             room.status = "finished"
             room.finished_at = now
-            room.retain_until = now + ROOM_FINISH_GRACE_SECONDS
+            self._retain_finished_room_locked(room, now)
             room.finish_reason = reason
 
             for session_id in room.player_session_ids:
                 if self._state.room_id_by_session_id.get(session_id) == room_id:
                     self._state.room_id_by_session_id.pop(session_id, None)
-                self._clear_transport_bindings_for_session_locked(session_id)
+                self._clear_transport_bindings_for_session(session_id)
                 session = self._state.sessions_by_id.get(session_id)
                 if session is not None and session.current_room_id == room_id:
                     session.current_room_id = None
@@ -883,8 +1377,12 @@ class MatchmakingRouter:
                 f"[ROUTER] room_finished room_id={room_id} reason={reason} "
                 f"retain_until={room.retain_until}"
             )
+        # Called on the pipe reactor thread when a room process exits; the push
+        # emits on sockets, so it goes to the room-finish thread.
+        self._room_finish_executor.submit(self._after_room_finished, room_id, room.player_session_ids, None, None)
 
     def _active_room_for_session_locked(self, session_id: str) -> RoomRecord | None:
+        """The caller holds the rooms lock."""
         room_id = self._state.room_id_by_session_id.get(session_id)
         if room_id is None:
             return None
@@ -898,7 +1396,7 @@ class MatchmakingRouter:
                 session.current_room_id = None
             return None
 
-        if room.status != "running":
+        if room.status not in {"starting", "running"}:
             # Finished rooms are retained for rejoin/debug, but queue/status
             # should not treat them as active matchmaking assignments.
             self._state.room_id_by_session_id.pop(session_id, None)
@@ -909,57 +1407,109 @@ class MatchmakingRouter:
 
         return room
 
-    def _cleanup_expired_rooms_locked(self, now: float) -> None:
-        expired_room_ids: list[str] = []
-        for room_id, room in self._state.rooms_by_id.items():
-            if room.status != "finished":
-                continue
-            if room.retain_until is None or now < room.retain_until:
-                continue
-            expired_room_ids.append(room_id)
+    def _retain_finished_room_locked(self, room: RoomRecord, now: float) -> None:
+        """Keep a finished room for ROOM_FINISH_GRACE_SECONDS, then drop it; the caller holds the rooms lock."""
+        room.retain_until = now + ROOM_FINISH_GRACE_SECONDS
+        room_id = room.room_id
+        self._timers.schedule(
+            ROOM_FINISH_GRACE_SECONDS,
+            lambda: self._maintenance_executor.submit(self._expire_finished_room, room_id),
+        )
 
-        for room_id in expired_room_ids:
-            room = self._state.rooms_by_id.pop(room_id, None)
-            if room is None:
-                continue
+    def _expire_finished_room(self, room_id: str) -> None:
+        # Runs on the maintenance thread once the room's retention ran out.
+        with self._rooms_lock:
+            room = self._state.rooms_by_id.get(room_id)
+            if room is None or room.status != "finished":
+                return
+            del self._state.rooms_by_id[room_id]
             for session_id in room.player_session_ids:
                 if self._state.room_id_by_session_id.get(session_id) == room_id:
                     self._state.room_id_by_session_id.pop(session_id, None)
-                self._clear_transport_bindings_for_session_locked(session_id)
+                self._clear_transport_bindings_for_session(session_id)
                 session = self._state.sessions_by_id.get(session_id)
                 if session is not None and session.current_room_id == room_id:
                     session.current_room_id = None
 
-    def _queue_position_locked(self, session_id: str) -> int | None:
-        for idx, entry in enumerate(self._state.queue, start=1):
-            if entry.session_id == session_id:
-                return idx
-        return None
+    def _remember_session_locked(self, session: SessionIdentity) -> None:
+        """Keep ``session`` in memory until it has been idle for its cookie lifetime; the caller holds the sessions lock."""
+        self._state.sessions_by_id[session.session_id] = session
+        self._arm_session_sweep_locked()
+
+    def _forget_session_locked(self, session_id: str) -> SessionIdentity | None:
+        """The caller holds the sessions lock."""
+        return self._state.sessions_by_id.pop(session_id, None)
+
+    def _arm_session_sweep_locked(self) -> None:
+        """The caller holds the sessions lock."""
+        if self._session_sweep_timer is not None and self._session_sweep_timer.active:
+            return
+        delay_seconds = min(SESSION_EXPIRY_SWEEP_SECONDS, SESSION_COOKIE_MAX_AGE_SECONDS)
+        self._session_sweep_timer = self._timers.schedule(
+            delay_seconds, lambda: self._maintenance_executor.submit(self._sweep_idle_sessions)
+        )
 
-    def _clear_transport_bindings_for_session_locked(self, session_id: str) -> None:
-        stale_game_sids = [
-            sid
-            for sid, sid_session_id in self._state.game_session_id_by_socket_sid.items()
-            if sid_session_id == session_id
-        ]
-        for stale_sid in stale_game_sids:
-            self._state.game_session_id_by_socket_sid.pop(stale_sid, None)
-
-        stale_client_ids = [
-            client_id
-            for client_id, client_session_id in self._state.game_session_id_by_client_id.items()
-            if client_session_id == session_id
-        ]
-        for stale_client_id in stale_client_ids:
-            self._state.game_session_id_by_client_id.pop(stale_client_id, None)
+    def _sweep_idle_sessions(self) -> None:
+        # Runs on the maintenance thread. One timer serves every session in
+        # memory; use pushes a session's expiry back through last_seen_at.
+        now = monotonic()
+        with self._sessions_lock:
+            self._session_sweep_timer = None
+            idle = [
+                (session, now - session.last_seen_at)
+                for session in self._state.sessions_by_id.values()
+                if now - session.last_seen_at >= SESSION_COOKIE_MAX_AGE_SECONDS
+            ]
+            if idle:
+                with self._queue_lock, self._rooms_lock:
+                    # Queued or seated players are kept however long they wait.
+                    idle = [
+                        (session, idle_for)
+                        for session, idle_for in idle
+                        if session.session_id not in self._state.queue
+                        and session.session_id not in self._state.room_id_by_session_id
+                    ]
+            for session, idle_for in idle:
+                session_id = session.session_id
+                self._forget_session_locked(session_id)
+                self._state.auth_socket_sids_by_session_id.pop(session_id, None)
+                if self._state.active_session_id_by_user_id.get(session.user_id) == session_id:
+                    self._state.active_session_id_by_user_id.pop(session.user_id, None)
+                self._status_versions.pop(session_id, None)
+                print(f"[ROUTER] session_expired session_id={session_id} idle_seconds={idle_for:.0f}")
+            if self._state.sessions_by_id:
+                self._arm_session_sweep_locked()
+
+    def _queue_position_locked(self, session_id: str) -> int | None:
+        """The caller holds the queue lock."""
+        return self._state.queue.position(session_id)
+
+    def _clear_transport_bindings_for_session(self, session_id: str) -> None:
+        with self._transport_lock:
+            stale_game_sids = [
+                sid
+                for sid, sid_session_id in self._state.game_session_id_by_socket_sid.items()
+                if sid_session_id == session_id
+            ]
+            for stale_sid in stale_game_sids:
+                self._state.game_session_id_by_socket_sid.pop(stale_sid, None)
+
+            stale_client_ids = [
+                client_id
+                for client_id, client_session_id in self._state.game_session_id_by_client_id.items()
+                if client_session_id == session_id
+            ]
+            for stale_client_id in stale_client_ids:
+                self._state.game_session_id_by_client_id.pop(stale_client_id, None)
 
     def _ensure_session_locked(self, session_id: str) -> SessionIdentity | None:
+        """The caller holds the sessions lock."""
         session = self._state.sessions_by_id.get(session_id)
         now = monotonic()
         if session is not None:
             active_session_id = self._state.active_session_id_by_user_id.get(session.user_id)
             if active_session_id is not None and active_session_id != session_id:
-                self._state.sessions_by_id.pop(session_id, None)
+                self._forget_session_locked(session_id)
                 self._state.superseded_session_ids.add(session_id)
                 self._storage.revoke_session(session_id)
                 return None
@@ -986,7 +1536,7 @@ class MatchmakingRouter:
             self._storage.revoke_session(hydrated.session_id)
             return None
 
-        self._state.sessions_by_id[hydrated.session_id] = hydrated
+        self._remember_session_locked(hydrated)
         self._state.active_session_id_by_user_id[hydrated.user_id] = hydrated.session_id
         self._state.superseded_session_ids.discard(hydrated.session_id)
         self._storage.touch_session(session_id, SESSION_COOKIE_MAX_AGE_SECONDS)
@@ -997,6 +1547,7 @@ class MatchmakingRouter:
         from_session_id: str,
         to_session_id: str,
     ) -> tuple[RoomRecord, str] | None:
+        """The caller holds the rooms lock."""
         if from_session_id == to_session_id:
             return None
 
@@ -1095,6 +1646,7 @@ class MatchmakingRouter:
         keep_session_id: str | None = None,
         preserve_room_session_id: str | None = None,
     ) -> None:
+        """The caller holds the sessions lock."""
         active_session_ids = set(self._storage.list_active_session_ids_for_user(user_id))
         active_session_ids.update(
             session.session_id
@@ -1108,14 +1660,16 @@ class MatchmakingRouter:
             if keep_session_id and session_id == keep_session_id:
                 continue
 
-            self._state.queue = [entry for entry in self._state.queue if entry.session_id != session_id]
-            if not preserve_room_session_id or session_id != preserve_room_session_id:
-                self._state.room_id_by_session_id.pop(session_id, None)
+            with self._queue_lock:
+                self._state.queue.remove(session_id)
+            with self._rooms_lock:
+                if not preserve_room_session_id or session_id != preserve_room_session_id:
+                    self._state.room_id_by_session_id.pop(session_id, None)
 
-            existing = self._state.sessions_by_id.pop(session_id, None)
-            if existing is not None:
-                existing.current_room_id = None
-            self._clear_transport_bindings_for_session_locked(session_id)
+                existing = self._forget_session_locked(session_id)
+                if existing is not None:
+                    existing.current_room_id = None
+            self._clear_transport_bindings_for_session(session_id)
 
             sid_list = list(self._state.auth_socket_sids_by_session_id.pop(session_id, set()))
             if sid_list:
@@ -1135,6 +1689,7 @@ class MatchmakingRouter:
                 self._superseded_notifier(session_id, sid_list)
 
     def _serialize_room_locked(self, room: RoomRecord) -> JsonObject:
+        """The caller holds the rooms lock."""
         worker_snapshot: RoomWorkerSnapshot | None = None
         if room.worker is not None:
             worker_snapshot = room.worker.snapshot()
@@ -1161,6 +1716,19 @@ class MatchmakingRouter:
         }
 
 
+def _assignment_status(room: RoomRecord) -> str:
+    return "assigned" if room.status == "running" else "starting"
+
+
+def _session_ids_of(rooms: list[RoomRecord]) -> list[str]:
+    return [session_id for room in rooms for session_id in room.player_session_ids]
+
+
+def _payload_winner_slot(payload: JsonObject) -> str | None:
+    winner = payload.get("winner")
+    return winner if winner in {"p1", "p2"} else None
+
+
 def _utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
@@ -1222,6 +1790,7 @@ if SocketIO is not None:
         app,
         cors_allowed_origins=socketio_origins,
         async_mode=ROUTER_SOCKETIO_ASYNC_MODE,
+        json=SocketJson,
     )
 
 
@@ -1241,6 +1810,24 @@ def _notify_superseded_session(session_id: str, socket_sids: list[str]) -> None:
 router.set_superseded_notifier(_notify_superseded_session)
 
 
+def _push_matchmaking_update(socket_sids: list[str], update: JsonObject) -> None:
+    if socketio is None:
+        return
+    for sid in socket_sids:
+        socketio.emit('matchmaking_update', update, to=sid)
+
+
+router.set_matchmaking_notifier(_push_matchmaking_update)
+
+
+def _wait_for_status_change(session_id: str, version: int, timeout_seconds: float) -> None:
+    # Short sleeps rather than a blocking wait, so the async server keeps serving meanwhile.
+    deadline = monotonic() + timeout_seconds
+    nap = socketio.sleep if socketio is not None else sleep
+    while router.status_version(session_id) == version and monotonic() < deadline:
+        nap(LONG_POLL_CHECK_SECONDS)
+
+
 def _socket_sid() -> str:
     raw_sid = getattr(request, 'sid', None)
     return raw_sid if isinstance(raw_sid, str) else ''
@@ -1584,6 +2171,12 @@ def matchmaking_status() -> tuple[JsonObject, int]:
     if not isinstance(session_id, str) or not session_id.strip():
         return router.session_error_payload(None)
 
+    # Long poll: with ?version=N&wait=S, answer once the status moves past N or after S seconds.
+    version = request.args.get("version", type=int)
+    wait_seconds = request.args.get("wait", default=0.0, type=float)
+    if version is not None and wait_seconds > 0:
+        _wait_for_status_change(session_id.strip(), version, min(wait_seconds, MATCHMAKING_LONG_POLL_SECONDS))
+
     result = router.status(session_id.strip())
     if not result.get("ok"):
         error_code = result.get("error_code") if isinstance(result.get("error_code"), str) else ""
@@ -1619,7 +2212,12 @@ def protocol_proxy() -> tuple[JsonObject, int]:
         bind_ok, bind_body = router.register_game_client(client_id, session_id)
         if not bind_ok:
             error_code = bind_body.get('error_code') if isinstance(bind_body.get('error_code'), str) else ''
-            status = 401 if error_code in {'session_superseded', 'unknown_session'} else 404
+            if error_code in {'session_superseded', 'unknown_session'}:
+                status = 401
+            elif error_code == 'room_starting':
+                status = 409
+            else:
+                status = 404
             return bind_body, status
     else:
         session_id = router.game_session_for_client(client_id)
@@ -1647,6 +2245,8 @@ def protocol_proxy() -> tuple[JsonObject, int]:
             status = 401
         elif error_code == 'no_active_room':
             status = 404
+        elif error_code == 'room_starting':
+            status = 409
         else:
             status = 502
         return forwarded_body, status
@@ -1706,12 +2306,44 @@ def room_finish() -> tuple[JsonObject, int]:
     if not isinstance(reason, str) or not reason.strip():
         reason = "finished"
 
+    # Unauthenticated: never takes a winner. Ratings change only on the room
+    # worker's own room_finished event.
     result = router.mark_room_finished(room_id.strip(), reason.strip())
     if not result.get("ok"):
         return result, 404
     return result, 200
 
 
+@app.get("/rooms/worker-pool")
+def room_worker_pool_metrics() -> tuple[JsonObject, int]:
+    return router.room_worker_pool_metrics()
+
+
+@app.get("/matchmaking/metrics")
+def matchmaking_metrics() -> tuple[JsonObject, int]:
+    return router.matchmaking_metrics()
+
+
+@app.get("/router/locks")
+def router_lock_metrics() -> tuple[JsonObject, int]:
+    return router.lock_metrics()
+
+
+@app.get("/router/timers")
+def router_timer_metrics() -> tuple[JsonObject, int]:
+    return router.timer_metrics()
+
+
+@app.get("/storage/metrics")
+def storage_metrics() -> tuple[JsonObject, int]:
+    return router.storage_metrics()
+
+
+@app.get("/rooms/<room_id>/engine-profile")
+def room_engine_profile(room_id: str) -> tuple[JsonObject, int]:
+    return router.room_engine_profile(room_id)
+
+
 if socketio is not None:
     @socketio.on('connect')
     def socket_connect() -> None:
@@ -1830,7 +2462,16 @@ if socketio is not None:
             })
             return
 
-        forwarded_ok, forwarded_body = router.dispatch_pipe_command_for_session(
+        def _report_protocol_error(error_body: JsonObject) -> None:
+            # Runs on the room pipe reader thread, outside this socket's request context.
+            socketio.emit('protocol_error', {
+                **error_body,
+                'packet_type': packet_type,
+                'status': 502,
+            }, to=sid)
+
+        # The room answers through socket_emit events, so the handler does not wait.
+        forward_error = router.forward_pipe_command_for_session(
             session_id,
             method='protocol_socket_event',
             params={
@@ -1838,12 +2479,12 @@ if socketio is not None:
                 'packet_type': packet_type,
                 'payload': payload if isinstance(payload, dict) else {},
             },
-            timeout_seconds=2.5,
+            on_error=_report_protocol_error,
         )
 
-        if not forwarded_ok:
+        if forward_error is not None:
             emit('protocol_error', {
-                **forwarded_body,
+                **forward_error,
                 'packet_type': packet_type,
                 'status': 502,
             })
@@ -1885,11 +2526,10 @@ if socketio is not None:
             return
 
         router.unregister_game_socket(sid)
-        router.dispatch_pipe_command_for_session(
+        router.forward_pipe_command_for_session(
             session_id,
             method='client_unloading',
             params={'sid': sid},
-            timeout_seconds=1.2,
         )
 
 
@@ -1901,11 +2541,10 @@ if socketio is not None:
 
         game_session_id = router.unregister_game_socket(sid)
         if isinstance(game_session_id, str) and game_session_id:
-            router.dispatch_pipe_command_for_session(
+            router.forward_pipe_command_for_session(
                 game_session_id,
                 method='disconnect',
                 params={'sid': sid},
-                timeout_seconds=1.2,
             )
 
         router.unregister_auth_socket(sid)
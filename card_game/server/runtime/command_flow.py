@@ -4,7 +4,7 @@ from typing import Any, Callable, cast
 from card_game.server.server_types import JsonObject, CommandPayload
 
 from ..models.server_models import ClientSession, MultiplayerTransportState, PendingCommandAck, PlayerSlot
-from ..protocol.command_codec import command_action, to_wire_command
+from ..protocol.command_codec import command_action, split_command, to_wire_command
 
 
 def enqueue_bridge_commands(
@@ -17,7 +17,7 @@ def enqueue_bridge_commands(
     pending_command_acks: list[PendingCommandAck],
     pending_command_ack_factory: Callable[..., PendingCommandAck],
     classify_required_ack_slots: Callable[[str, str | None], set[PlayerSlot]],
-    mark_room_finished_once: Callable[[str], None],
+    mark_room_finished_once: Callable[[str, PlayerSlot | None], None],
     transport_lock: Any,
     registration_condition: Any,
     emit_ready_commands_to_connected_clients: Callable[[], None],
@@ -50,14 +50,15 @@ def enqueue_bridge_commands(
             'response_payload': response_payload,
         })
 
-    if any(
-        isinstance(entry.get('command'), str)
-        and command_action(str(entry['command'])) == 'winner'
+    winner_commands = [
+        str(entry['command'])
         for entry in expanded_commands
-    ):
+        if isinstance(entry.get('command'), str) and command_action(str(entry['command'])) == 'winner'
+    ]
+    if winner_commands:
         winner_announced = True
         winner_main_menu_ack_slots = set()
-        mark_room_finished_once('winner_declared')
+        mark_room_finished_once('winner_declared', winner_slot_from_command(winner_commands[0]))
 
     for entry in expanded_commands:
         command = str(entry.get('command', '')).strip()
@@ -81,6 +82,17 @@ def enqueue_bridge_commands(
     return next_command_id, winner_announced, winner_main_menu_ack_slots
 
 
+def winner_slot_from_command(command: str) -> PlayerSlot | None:
+    """The winning slot named by a ``winner player-1|player-2 ...`` command, if any."""
+    parts = split_command(command)
+    target = parts[1] if len(parts) > 1 else ''
+    if target == 'player-1':
+        return 'p1'
+    if target == 'player-2':
+        return 'p2'
+    return None
+
+
 def emit_ready_commands_to_connected_clients(
     *,
     socketio: Any,
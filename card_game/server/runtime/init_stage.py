@@ -14,6 +14,7 @@ def build_finalized_bridge_from_init_submissions(
     source_bridge: Any,
     init_setup_submission_by_slot: dict[PlayerSlot, JsonObject | None],
     timeout_seconds: float,
+    recorder: Any = None,
 ) -> tuple[bool, str | None, Any, JsonObject | None, int, dict[str, JsonObject] | None]:
     p1_submission = init_setup_submission_by_slot['p1']
     p2_submission = init_setup_submission_by_slot['p2']
@@ -28,7 +29,10 @@ def build_finalized_bridge_from_init_submissions(
 
     def _build_finalized_bridge() -> None:
         try:
-            candidate_bridge = source_bridge.clone_with_init_setup(finalize_target)
+            if recorder is not None:
+                candidate_bridge = source_bridge.clone_with_init_setup(finalize_target, recorder=recorder)
+            else:
+                candidate_bridge = source_bridge.clone_with_init_setup(finalize_target)
             worker_result['bridge'] = candidate_bridge
             worker_result['setup_payload'] = candidate_bridge.get_setup_payload()
         except Exception as exc:
@@ -1,17 +1,19 @@
 from __future__ import annotations
 
 from typing import Callable
-from threading import Timer
 import json
 import urllib.error
 import urllib.request
 
+from ..timer_service import shared_timer_service
+
 
 def notify_router_room_finished(
     *,
     router_base_url: str,
     room_id_from_env: str,
     reason: str,
+    winner: str | None = None,
 ) -> None:
     if not room_id_from_env:
         return
@@ -21,6 +23,8 @@ def notify_router_room_finished(
         'room_id': room_id_from_env,
         'reason': reason,
     }
+    if winner is not None:
+        payload['winner'] = winner
     body = json.dumps(payload).encode('utf-8')
     request_obj = urllib.request.Request(
         endpoint,
@@ -60,9 +64,7 @@ def schedule_process_termination(
         return termination_requested
 
     on_scheduled()
-    timer = Timer(delay_seconds, terminate_process)
-    timer.daemon = True
-    timer.start()
+    shared_timer_service().schedule(delay_seconds, terminate_process)
     return True
 
 
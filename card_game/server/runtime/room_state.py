@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from dataclasses import dataclass, field, fields
+from functools import wraps
+from random import Random
+from threading import Condition, RLock, local
+from types import ModuleType
+from typing import TYPE_CHECKING, Any, Callable, Iterator
+import random
+
+from ..models.server_models import MultiplayerTransportState, PendingCommandAck, PlayerSlot
+from ..server_types import JsonObject
+
+if TYPE_CHECKING:
+    from ..game_runner import FrontendGameBridge
+    from ..timer_service import TimerHandle
+
+
+@dataclass(slots=True)
+class RoomRuntime:
+    """State of one match; the room server handlers read it through ``current_room()``."""
+
+    room_id_from_env: str
+    frontend_game_bridge: FrontendGameBridge
+    entity_setup_payload: JsonObject
+    transport_state: MultiplayerTransportState
+    expected_p1_session_id: str = ''
+    expected_p2_session_id: str = ''
+    p1_username: str = ''
+    p2_username: str = ''
+    protocol_seq: int = 0
+    room_stage: str = 'init'
+    init_setup_submission_by_slot: dict[PlayerSlot, JsonObject | None] = field(default_factory=lambda: {'p1': None, 'p2': None})
+    pending_command_acks: list[PendingCommandAck] = field(default_factory=list)
+    next_command_id: int = 1
+    first_player_join_seen: bool = False
+    winner_announced: bool = False
+    winner_main_menu_ack_slots: set[PlayerSlot] = field(default_factory=set)
+    room_finished_notified: bool = False
+    termination_requested: bool = False
+    disconnect_forfeit_timer_by_slot: dict[PlayerSlot, TimerHandle | None] = field(default_factory=lambda: {'p1': None, 'p2': None})
+    transport_lock: RLock = field(default_factory=RLock)
+    registration_condition: Condition = field(init=False)
+    # Each room draws from its own RNG stream so concurrent rooms stay
+    # independent and recordings see only their own draws.
+    rng: Random = field(default_factory=Random)
+    # Serializes the handlers of this room only; other rooms run beside it.
+    call_lock: RLock = field(default_factory=RLock)
+
+    def __post_init__(self) -> None:
+        self.registration_condition = Condition(self.transport_lock)
+
+    @property
+    def room_id(self) -> str:
+        return self.room_id_from_env
+
+
+# Room server module attributes that belong to one match. Everything else in
+# the module is process-wide config.
+ROOM_STATE_FIELDS: frozenset[str] = frozenset(
+    item.name for item in fields(RoomRuntime) if item.name not in {'rng', 'call_lock'}
+)
+
+_bound = local()
+_default_room: RoomRuntime | None = None
+_process_rng: Random = random.random.__self__  # type: ignore[attr-defined]
+
+
+def set_default_room(room: RoomRuntime) -> None:
+    """Make ``room`` the one threads see when no room is bound to them."""
+    global _default_room
+    _default_room = room
+
+
+def bound_room() -> RoomRuntime | None:
+    return getattr(_bound, 'room', None)
+
+
+def current_room() -> RoomRuntime:
+    room = getattr(_bound, 'room', None)
+    if room is not None:
+        return room
+    if _default_room is None:
+        raise RuntimeError('No room is bound to this thread and no default room is set.')
+    return _default_room
+
+
+@contextmanager
+def bind_room(room: RoomRuntime) -> Iterator[RoomRuntime]:
+    """Run the block with ``room`` as this thread's room, and on its RNG stream."""
+    previous_room = getattr(_bound, 'room', None)
+    previous_rng = getattr(_bound, 'rng', None)
+    _bound.room = room
+    _bound.rng = room.rng
+    try:
+        yield room
+    finally:
+        _bound.room = previous_room
+        _bound.rng = previous_rng
+
+
+@contextmanager
+def using_rng(rng: Random) -> Iterator[Random]:
+    """Run the block with the ``random`` module drawing from ``rng`` on this thread."""
+    previous_rng = getattr(_bound, 'rng', None)
+    _bound.rng = rng
+    try:
+        yield rng
+    finally:
+        _bound.rng = previous_rng
+
+
+def _thread_rng() -> Random:
+    rng = getattr(_bound, 'rng', None)
+    return rng if rng is not None else _process_rng
+
+
+def _rng_dispatch(name: str, original: Callable[..., Any]) -> Callable[..., Any]:
+    @wraps(original)
+    def _call(*args: Any, **kwargs: Any) -> Any:
+        return getattr(_thread_rng(), name)(*args, **kwargs)
+
+    return _call
+
+
+def install_rng_dispatch() -> None:
+    """Route the ``random`` module functions to the calling thread's RNG.
+
+    The engine and catalog draw through ``random.*``; with this installed a
+    thread bound to a room draws from that room's stream and every other
+    thread keeps the process RNG, so the module behaves as before outside a
+    room. Safe to call more than once.
+    """
+    for name in dir(random):
+        original = getattr(random, name)
+        if getattr(original, '__self__', None) is _process_rng:
+            setattr(random, name, _rng_dispatch(name, original))
+
+
+class CurrentRoom:
+    """Reads and writes the attributes of whichever room is current on this thread."""
+
+    __slots__ = ()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(current_room(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(current_room(), name, value)
+
+
+class RoomStateModule(ModuleType):
+    """Module type that keeps the per-room attributes on the current room.
+
+    ``module.protocol_seq`` and friends read and write the room bound to the
+    calling thread, so callers that reach into the room server module (the
+    pipe runtime, tests, benchmarks) keep working unchanged.
+    """
+
+    def __getattr__(self, name: str) -> Any:
+        if name in ROOM_STATE_FIELDS:
+            return getattr(current_room(), name)
+        raise AttributeError(f'module {self.__name__!r} has no attribute {name!r}')
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in ROOM_STATE_FIELDS:
+            setattr(current_room(), name, value)
+            return
+        super().__setattr__(name, value)
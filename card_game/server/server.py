@@ -2,12 +2,10 @@ from __future__ import annotations
 
 from copy import deepcopy
 from datetime import datetime, timezone
-from threading import Condition
-from threading import RLock
-from threading import Timer
-from typing import Any, Literal, cast
+from typing import Any, Callable, Literal, cast
 from card_game.server.server_types import JsonObject, CommandPayload
 import os
+import sys
 
 from flask import Flask, request
 
@@ -19,7 +17,8 @@ except ImportError:  # pragma: no cover - optional runtime dependency
     emit = None  # type: ignore[assignment]
 
 from .game_runner import BridgeEngineRuntimeError, FrontendGameBridge
-from .game_runner import p1_username, p2_username
+from .game_runner import p1_username as default_p1_username, p2_username as default_p2_username
+from .replay.recorder import GameRecorder
 from ..constants import max_bench_size
 from .logging import (
     log_input_trace,
@@ -53,6 +52,13 @@ from .models.server_models import (
     PendingCommandAck,
     PlayerSlot,
 )
+from .runtime.room_state import (
+    CurrentRoom,
+    RoomRuntime,
+    RoomStateModule,
+    install_rng_dispatch,
+    set_default_room,
+)
 from .runtime.config import (
     env_csv as runtime_env_csv,
     resolve_init_finalize_timeout_seconds as runtime_resolve_init_finalize_timeout_seconds,
@@ -70,6 +76,7 @@ from .runtime.session_binding import (
     recover_reconnect_token_for_expected_slot as runtime_recover_reconnect_token_for_expected_slot,
     short_session_id as runtime_short_session_id,
 )
+from .timer_service import TimerHandle, shared_timer_service
 from .runtime.lifecycle import (
     mark_room_finished_once as runtime_mark_room_finished_once,
     notify_router_room_finished as runtime_notify_router_room_finished,
@@ -125,11 +132,30 @@ from .runtime.http_api import (
 )
 
 app = Flask(__name__)
-frontend_game_bridge = FrontendGameBridge()
-entity_setup_payload: JsonObject = frontend_game_bridge.get_setup_payload()
-protocol_seq = 0
 DISCONNECT_GRACE_SECONDS = 5
 
+def _build_process_room() -> RoomRuntime:
+    bridge = FrontendGameBridge()
+    return RoomRuntime(
+        room_id_from_env=os.getenv('ROOM_ID', '').strip(),
+        frontend_game_bridge=bridge,
+        entity_setup_payload=bridge.get_setup_payload(),
+        transport_state=MultiplayerTransportState(disconnect_grace_seconds=DISCONNECT_GRACE_SECONDS),
+        expected_p1_session_id=os.getenv('P1_SESSION_ID', '').strip(),
+        expected_p2_session_id=os.getenv('P2_SESSION_ID', '').strip(),
+        p1_username=default_p1_username,
+        p2_username=default_p2_username,
+    )
+
+
+# Per-match state lives on a RoomRuntime, read through _room: the room bound
+# to the calling thread when a room host runs many matches, otherwise this
+# process's own room. The module attributes of the same names forward there.
+install_rng_dispatch()
+set_default_room(_build_process_room())
+_room = CurrentRoom()
+sys.modules[__name__].__class__ = RoomStateModule
+
 
 def _resolve_init_finalize_timeout_seconds() -> float:
     return runtime_resolve_init_finalize_timeout_seconds()
@@ -137,13 +163,6 @@ def _resolve_init_finalize_timeout_seconds() -> float:
 
 INIT_FINALIZE_TIMEOUT_SECONDS = _resolve_init_finalize_timeout_seconds()
 
-room_stage: str = 'init'
-init_setup_submission_by_slot: dict[PlayerSlot, JsonObject | None] = {
-    'p1': None,
-    'p2': None,
-}
-
-
 def _env_csv(name: str) -> list[str]:
     return runtime_env_csv(name)
 
@@ -183,32 +202,16 @@ SERVER_DEBUG = _env_bool('SERVER_DEBUG', ROUTER_DEBUG)
 SERVER_USE_RELOADER = _env_bool('SERVER_USE_RELOADER', ROUTER_USE_RELOADER)
 
 
-pending_command_acks: list[PendingCommandAck] = []
-next_command_id = 1
-first_player_join_seen = False
-winner_announced = False
-winner_main_menu_ack_slots: set[PlayerSlot] = set()
-room_finished_notified = False
-termination_requested = False
-disconnect_forfeit_timer_by_slot: dict[PlayerSlot, Timer | None] = {
-    'p1': None,
-    'p2': None,
-}
-
-transport_state = MultiplayerTransportState(disconnect_grace_seconds=DISCONNECT_GRACE_SECONDS)
-transport_lock = RLock()
-registration_condition = Condition(transport_lock)
-expected_p1_session_id = os.getenv('P1_SESSION_ID', '').strip()
-expected_p2_session_id = os.getenv('P2_SESSION_ID', '').strip()
 router_base_url = os.getenv('ROUTER_BASE_URL', 'http://127.0.0.1:5600').strip()
-room_id_from_env = os.getenv('ROOM_ID', '').strip()
+room_recording_dir = os.getenv('ROOM_RECORDING_DIR', '').strip()
+room_engine_profile_enabled = _env_bool('ROOM_ENGINE_PROFILE', False)
 
 
 def _expected_slot_for_router_session(session_id: str | None) -> PlayerSlot | None:
     return runtime_expected_slot_for_router_session(
         session_id,
-        expected_p1_session_id=expected_p1_session_id,
-        expected_p2_session_id=expected_p2_session_id,
+        expected_p1_session_id=_room.expected_p1_session_id,
+        expected_p2_session_id=_room.expected_p2_session_id,
     )
 
 
@@ -219,7 +222,7 @@ def _recover_reconnect_token_for_expected_slot(
     return runtime_recover_reconnect_token_for_expected_slot(
         expected_slot,
         provided_reconnect_token,
-        transport_state=transport_state,
+        transport_state=_room.transport_state,
     )
 
 
@@ -227,10 +230,13 @@ def _short_session_id(session_id: str | None) -> str:
     return runtime_short_session_id(session_id)
 
 
+def _schedule_timer(delay_seconds: float, callback: Callable[[], None]) -> TimerHandle:
+    return shared_timer_service().schedule(delay_seconds, callback)
+
+
 def _schedule_process_termination(reason: str) -> None:
-    global termination_requested
-    termination_requested = runtime_schedule_process_termination(
-        termination_requested=termination_requested,
+    _room.termination_requested = runtime_schedule_process_termination(
+        termination_requested=_room.termination_requested,
         on_scheduled=lambda: log_protocol_event(
             'server_termination_scheduled',
             ['reason'],
@@ -241,30 +247,54 @@ def _schedule_process_termination(reason: str) -> None:
     )
 
 
-def _notify_router_room_finished(reason: str) -> None:
+def _notify_router_room_finished(reason: str, winner: PlayerSlot | None = None) -> None:
     runtime_notify_router_room_finished(
         router_base_url=router_base_url,
-        room_id_from_env=room_id_from_env,
+        room_id_from_env=_room.room_id_from_env,
         reason=reason,
+        winner=winner,
     )
 
 
-def _mark_room_finished_once(reason: str) -> None:
-    global room_finished_notified
-    room_finished_notified = runtime_mark_room_finished_once(
-        room_finished_notified=room_finished_notified,
+def _open_game_recorder() -> GameRecorder | None:
+    if not room_recording_dir:
+        return None
+    try:
+        return GameRecorder.open_for_room(room_recording_dir, _room.room_id_from_env)
+    except OSError as exc:
+        print(f'[GAME_RECORDER] open_failed dir={room_recording_dir!r} error={exc!r}')
+        return None
+
+
+def engine_profile_snapshot() -> JsonObject:
+    profile = _room.frontend_game_bridge.engine_profile_snapshot()
+    return {
+        'ok': True,
+        'room_id': _room.room_id_from_env,
+        'room_stage': _room.room_stage,
+        'enabled': profile is not None,
+        'profile': profile,
+    }
+
+
+def _mark_room_finished_once(reason: str, winner: PlayerSlot | None = None) -> None:
+    if not _room.room_finished_notified:
+        _room.frontend_game_bridge.finish_recording(reason)
+    _room.room_finished_notified = runtime_mark_room_finished_once(
+        room_finished_notified=_room.room_finished_notified,
         reason=reason,
-        notify_callback=_notify_router_room_finished,
+        # The winner rides along so the router can update ratings.
+        notify_callback=lambda finished_reason: _notify_router_room_finished(finished_reason, winner),
     )
 
 
 def _schedule_both_disconnected_termination_timer_locked() -> None:
     runtime_schedule_both_disconnected_termination_if_needed(
-        first_player_join_seen=first_player_join_seen,
-        termination_requested=termination_requested,
+        first_player_join_seen=_room.first_player_join_seen,
+        termination_requested=_room.termination_requested,
         sid_by_slot={
-            'p1': transport_state.sid_by_slot['p1'],
-            'p2': transport_state.sid_by_slot['p2'],
+            'p1': _room.transport_state.sid_by_slot['p1'],
+            'p2': _room.transport_state.sid_by_slot['p2'],
         },
         mark_room_finished_once=_mark_room_finished_once,
         schedule_process_termination=_schedule_process_termination,
@@ -272,36 +302,37 @@ def _schedule_both_disconnected_termination_timer_locked() -> None:
 
 
 def _mark_player_join_seen_locked() -> None:
-    global first_player_join_seen
-    first_player_join_seen = True
+    _room.first_player_join_seen = True
 
 
 def _cancel_disconnect_forfeit_timer_locked(slot: PlayerSlot) -> None:
-    timer = disconnect_forfeit_timer_by_slot.get(slot)
+    timer = _room.disconnect_forfeit_timer_by_slot.get(slot)
     if timer is None:
         return
     timer.cancel()
-    disconnect_forfeit_timer_by_slot[slot] = None
+    _room.disconnect_forfeit_timer_by_slot[slot] = None
 
 
 def _schedule_disconnect_forfeit_timer_locked(disconnected_slot: PlayerSlot) -> None:
-    if termination_requested:
+    if _room.termination_requested:
         return
 
     _cancel_disconnect_forfeit_timer_locked(disconnected_slot)
 
     def _forfeit_if_still_disconnected() -> None:
         winner_command: str | None = None
-        with transport_lock:
-            disconnect_forfeit_timer_by_slot[disconnected_slot] = None
-            if transport_state.sid_by_slot[disconnected_slot] is not None:
+        with _room.transport_lock:
+            _room.disconnect_forfeit_timer_by_slot[disconnected_slot] = None
+            if _room.transport_state.sid_by_slot[disconnected_slot] is not None:
                 return
+            # The grace window ends with this timer; the reconnect token expires with it.
+            _room.transport_state.expire_grace_slot(disconnected_slot)
 
             winner_slot: PlayerSlot = 'p2' if disconnected_slot == 'p1' else 'p1'
-            if transport_state.sid_by_slot[winner_slot] is None:
+            if _room.transport_state.sid_by_slot[winner_slot] is None:
                 return
 
-            winner_label = p1_username if winner_slot == 'p1' else p2_username
+            winner_label = _room.p1_username if winner_slot == 'p1' else _room.p2_username
             winner_command = f'winner {"player-1" if winner_slot == "p1" else "player-2"} {winner_label}'
 
         if winner_command is not None:
@@ -313,10 +344,7 @@ def _schedule_disconnect_forfeit_timer_locked(disconnected_slot: PlayerSlot) ->
                 winner_slot,
             )
 
-    timer = Timer(DISCONNECT_GRACE_SECONDS, _forfeit_if_still_disconnected)
-    timer.daemon = True
-    disconnect_forfeit_timer_by_slot[disconnected_slot] = timer
-    timer.start()
+    _room.disconnect_forfeit_timer_by_slot[disconnected_slot] = _schedule_timer(DISCONNECT_GRACE_SECONDS, _forfeit_if_still_disconnected)
 
 socketio: Any = None
 if SocketIO is not None:
@@ -348,8 +376,7 @@ def _socket_sid() -> str:
 
 
 def _issue_backend_packet(packet_type: str, body: JsonObject, is_response: bool) -> JsonObject:
-    global protocol_seq
-    packet, protocol_seq = issue_backend_packet(protocol_seq, packet_type, body, is_response)
+    packet, _room.protocol_seq = issue_backend_packet(_room.protocol_seq, packet_type, body, is_response)
     return packet
 
 
@@ -374,7 +401,7 @@ def _drain_pending_packets_for_session(session: ClientSession) -> list[JsonObjec
 
 
 def _current_environment_body() -> JsonObject:
-    return deepcopy(entity_setup_payload) if isinstance(entity_setup_payload, dict) else {}
+    return deepcopy(_room.entity_setup_payload) if isinstance(_room.entity_setup_payload, dict) else {}
 
 
 def _environment_body_for_client(client_slot: str | None) -> JsonObject:
@@ -392,9 +419,9 @@ def _other_slot(slot: PlayerSlot) -> PlayerSlot:
 def _init_state_body_for_slot(slot: PlayerSlot) -> JsonObject:
     return runtime_init_state_body_for_slot(
         slot,
-        room_stage=room_stage,
-        init_setup_submission_by_slot=init_setup_submission_by_slot,
-        transport_state=transport_state,
+        room_stage=_room.room_stage,
+        init_setup_submission_by_slot=_room.init_setup_submission_by_slot,
+        transport_state=_room.transport_state,
     )
 
 
@@ -405,9 +432,9 @@ def _remove_pending_packets_by_type(session: ClientSession, packet_type: str) ->
 def _enqueue_init_state_for_connected_clients(force: bool = False) -> None:
     runtime_enqueue_init_state_for_connected_clients(
         force=force,
-        transport_state=transport_state,
-        init_setup_submission_by_slot=init_setup_submission_by_slot,
-        room_stage=room_stage,
+        transport_state=_room.transport_state,
+        init_setup_submission_by_slot=_room.init_setup_submission_by_slot,
+        room_stage=_room.room_stage,
         build_packet_blueprint=_build_packet_blueprint,
     )
 
@@ -425,7 +452,7 @@ def _validate_init_setup_submission(
 
 
 def _finalize_init_stage_locked() -> tuple[bool, str | None]:
-    global frontend_game_bridge, entity_setup_payload, room_stage, pending_command_acks, next_command_id
+    recorder = _open_game_recorder()
     (
         finalized_ok,
         finalize_error,
@@ -434,27 +461,34 @@ def _finalize_init_stage_locked() -> tuple[bool, str | None]:
         elapsed_ms,
         finalize_target,
     ) = runtime_build_finalized_bridge_from_init_submissions(
-        source_bridge=frontend_game_bridge,
-        init_setup_submission_by_slot=init_setup_submission_by_slot,
+        source_bridge=_room.frontend_game_bridge,
+        init_setup_submission_by_slot=_room.init_setup_submission_by_slot,
         timeout_seconds=INIT_FINALIZE_TIMEOUT_SECONDS,
+        recorder=recorder,
     )
     if not finalized_ok:
+        if recorder is not None:
+            recorder.close()
         return False, finalize_error or 'failed to finalize init setup'
 
     if not isinstance(candidate_bridge, FrontendGameBridge) or not isinstance(candidate_setup_payload, dict):
+        if recorder is not None:
+            recorder.close()
         return False, 'failed to finalize init setup: incomplete finalized state'
 
-    frontend_game_bridge = candidate_bridge
-    entity_setup_payload = candidate_setup_payload
-    pending_command_acks.clear()
-    next_command_id = 1
-    room_stage = 'live'
-    init_setup_submission_by_slot['p1'] = None
-    init_setup_submission_by_slot['p2'] = None
+    _room.frontend_game_bridge = candidate_bridge
+    if room_engine_profile_enabled:
+        _room.frontend_game_bridge.enable_engine_profiling()
+    _room.entity_setup_payload = candidate_setup_payload
+    _room.pending_command_acks.clear()
+    _room.next_command_id = 1
+    _room.room_stage = 'live'
+    _room.init_setup_submission_by_slot['p1'] = None
+    _room.init_setup_submission_by_slot['p2'] = None
 
     _enqueue_environment_for_connected_clients(force=True)
     _enqueue_init_state_for_connected_clients(force=True)
-    registration_condition.notify_all()
+    _room.registration_condition.notify_all()
     finalize_target_payload = finalize_target if isinstance(finalize_target, dict) else {'p1': {}, 'p2': {}}
     print(
         '[INIT_SETUP][FINALIZE_OK] '
@@ -468,7 +502,7 @@ def _finalize_init_stage_locked() -> tuple[bool, str | None]:
 def _enqueue_environment_for_connected_clients(force: bool = False) -> None:
     runtime_enqueue_environment_for_connected_clients(
         force=force,
-        transport_state=transport_state,
+        transport_state=_room.transport_state,
         remove_pending_packets_by_type=_remove_pending_packets_by_type,
         build_packet_blueprint=_build_packet_blueprint,
         environment_body_for_slot=_environment_body_for_client,
@@ -478,8 +512,8 @@ def _enqueue_environment_for_connected_clients(force: bool = False) -> None:
 def _emit_pending_packets_to_connected_clients(exclude_slots: set[PlayerSlot] | None = None) -> None:
     runtime_emit_pending_packets_to_connected_clients(
         socketio=socketio,
-        transport_lock=transport_lock,
-        transport_state=transport_state,
+        transport_lock=_room.transport_lock,
+        transport_state=_room.transport_state,
         drain_pending_packets_for_session=_drain_pending_packets_for_session,
         protocol_packets_emit_payload_for_slot=_protocol_packets_emit_payload_for_slot,
         log_protocol_send=log_protocol_send,
@@ -488,10 +522,9 @@ def _emit_pending_packets_to_connected_clients(exclude_slots: set[PlayerSlot] |
 
 
 def _extract_bridge_commands(bridge_result: JsonObject) -> list[JsonObject]:
-    global entity_setup_payload
     extracted, next_setup = runtime_extract_bridge_commands(bridge_result)
     if isinstance(next_setup, dict):
-        entity_setup_payload = next_setup
+        _room.entity_setup_payload = next_setup
     return extracted
 
 
@@ -520,8 +553,8 @@ def _handle_bridge_runtime_error(
 def _force_environment_sync_for_connected_clients() -> None:
     runtime_force_environment_sync_for_connected_clients(
         socketio=socketio,
-        transport_lock=transport_lock,
-        transport_state=transport_state,
+        transport_lock=_room.transport_lock,
+        transport_state=_room.transport_state,
         enqueue_environment_for_connected_clients=_enqueue_environment_for_connected_clients,
         issue_backend_packet_for_session=_issue_backend_packet_for_session,
         environment_body_for_client=_environment_body_for_client,
@@ -533,7 +566,7 @@ def _classify_required_ack_slots(command: str, source_slot: str | None) -> set[P
     return classify_required_ack_slots(
         command,
         source_slot,
-        transport_state,
+        _room.transport_state,
         _normalize_client_slot,
     )
 
@@ -541,7 +574,7 @@ def _classify_required_ack_slots(command: str, source_slot: str | None) -> set[P
 def _blocked_pending_command_for_slot(source_slot: str | None) -> PendingCommandAck | None:
     return runtime_blocked_pending_command_for_slot(
         source_slot,
-        pending_command_acks=pending_command_acks,
+        pending_command_acks=_room.pending_command_acks,
         normalize_client_slot=_normalize_client_slot,
     )
 
@@ -615,24 +648,23 @@ def _normalize_bridge_command_entries(commands: list[str] | list[JsonObject]) ->
 
 
 def _enqueue_bridge_commands(commands: list[str] | list[JsonObject], source_slot: str | None) -> None:
-    global next_command_id, winner_announced, winner_main_menu_ack_slots
     normalized_commands = _normalize_bridge_command_entries(commands)
     (
-        next_command_id,
-        winner_announced,
-        winner_main_menu_ack_slots,
+        _room.next_command_id,
+        _room.winner_announced,
+        _room.winner_main_menu_ack_slots,
     ) = runtime_enqueue_bridge_commands(
         normalized_commands,
         source_slot,
-        next_command_id=next_command_id,
-        winner_announced=winner_announced,
-        winner_main_menu_ack_slots=winner_main_menu_ack_slots,
-        pending_command_acks=pending_command_acks,
+        next_command_id=_room.next_command_id,
+        winner_announced=_room.winner_announced,
+        winner_main_menu_ack_slots=_room.winner_main_menu_ack_slots,
+        pending_command_acks=_room.pending_command_acks,
         pending_command_ack_factory=PendingCommandAck,
         classify_required_ack_slots=_classify_required_ack_slots,
         mark_room_finished_once=_mark_room_finished_once,
-        transport_lock=transport_lock,
-        registration_condition=registration_condition,
+        transport_lock=_room.transport_lock,
+        registration_condition=_room.registration_condition,
         emit_ready_commands_to_connected_clients=_emit_ready_commands_to_connected_clients,
         emit_pending_peer_ack_status_to_connected_clients=_emit_pending_peer_ack_status_to_connected_clients,
     )
@@ -641,8 +673,8 @@ def _enqueue_bridge_commands(commands: list[str] | list[JsonObject], source_slot
 def _emit_ready_commands_to_connected_clients() -> None:
     runtime_emit_ready_commands_to_connected_clients(
         socketio=socketio,
-        transport_lock=transport_lock,
-        transport_state=transport_state,
+        transport_lock=_room.transport_lock,
+        transport_state=_room.transport_state,
         commands_ready_for_slot=_commands_ready_for_slot,
         protocol_packets_emit_payload_for_slot=_protocol_packets_emit_payload_for_slot,
         log_protocol_send=log_protocol_send,
@@ -652,8 +684,8 @@ def _emit_ready_commands_to_connected_clients() -> None:
 def _emit_pending_peer_ack_status_to_connected_clients() -> None:
     runtime_emit_pending_peer_ack_status_to_connected_clients(
         socketio=socketio,
-        transport_lock=transport_lock,
-        transport_state=transport_state,
+        transport_lock=_room.transport_lock,
+        transport_state=_room.transport_state,
         protocol_packets_emit_payload_for_slot=_protocol_packets_emit_payload_for_slot,
         log_protocol_send=log_protocol_send,
     )
@@ -682,7 +714,7 @@ def _commands_ready_for_slot(
         slot,
         is_response,
         session,
-        pending_command_acks,
+        _room.pending_command_acks,
         _normalize_client_slot,
         _issue_backend_packet,
         _issue_backend_packet_for_session,
@@ -697,36 +729,36 @@ def _acknowledge_head_command(
     return acknowledge_head_command(
         command,
         source_slot,
-        pending_command_acks,
+        _room.pending_command_acks,
         _normalize_client_slot,
-        registration_condition,
-        transport_lock,
+        _room.registration_condition,
+        _room.transport_lock,
         command_id,
     )
 
 
 def _pending_commands_for_slot(slot: PlayerSlot) -> list[str]:
-    return pending_commands_for_slot(slot, pending_command_acks)
+    return pending_commands_for_slot(slot, _room.pending_command_acks)
 
 
 def _reset_delivery_state_for_slot(slot: PlayerSlot) -> None:
-    reset_delivery_state_for_slot(slot, pending_command_acks)
+    reset_delivery_state_for_slot(slot, _room.pending_command_acks)
 
 
 def _process_protocol_packet(payload: JsonObject, client_slot: str | None) -> tuple[JsonObject, int]:
     return runtime_process_protocol_packet(
         payload,
         client_slot,
-        protocol_seq=protocol_seq,
-        room_stage_getter=lambda: room_stage,
-        transport_lock=transport_lock,
-        transport_state=transport_state,
-        init_setup_submission_by_slot=init_setup_submission_by_slot,
-        expected_p1_session_id=expected_p1_session_id,
-        expected_p2_session_id=expected_p2_session_id,
-        winner_announced=winner_announced,
-        winner_main_menu_ack_slots=winner_main_menu_ack_slots,
-        frontend_game_bridge=frontend_game_bridge,
+        protocol_seq=_room.protocol_seq,
+        room_stage_getter=lambda: _room.room_stage,
+        transport_lock=_room.transport_lock,
+        transport_state=_room.transport_state,
+        init_setup_submission_by_slot=_room.init_setup_submission_by_slot,
+        expected_p1_session_id=_room.expected_p1_session_id,
+        expected_p2_session_id=_room.expected_p2_session_id,
+        winner_announced=_room.winner_announced,
+        winner_main_menu_ack_slots=_room.winner_main_menu_ack_slots,
+        frontend_game_bridge=_room.frontend_game_bridge,
         normalize_client_slot=_normalize_client_slot,
         extract_client_slot_hint=_extract_client_slot_hint,
         log_protocol_recv=log_protocol_recv,
@@ -744,7 +776,7 @@ def _process_protocol_packet(payload: JsonObject, client_slot: str | None) -> tu
         mark_player_join_seen_locked=_mark_player_join_seen_locked,
         enqueue_environment_for_connected_clients=_enqueue_environment_for_connected_clients,
         enqueue_init_state_for_connected_clients=_enqueue_init_state_for_connected_clients,
-        registration_condition=registration_condition,
+        registration_condition=_room.registration_condition,
         short_session_id=_short_session_id,
         drain_pending_packets_for_session=_drain_pending_packets_for_session,
         validate_init_setup_submission=_validate_init_setup_submission,
@@ -782,6 +814,11 @@ def health() -> tuple[dict[str, str], int]:
     return runtime_health_response(utc_now_iso=_utc_now_iso)
 
 
+@app.get('/engine-profile')
+def engine_profile() -> tuple[JsonObject, int]:
+    return engine_profile_snapshot(), 200
+
+
 @app.route('/protocol', methods=['POST', 'OPTIONS'])
 def protocol() -> tuple[JsonObject, int]:
     return runtime_handle_protocol_http(
@@ -800,8 +837,8 @@ def scanner_input() -> tuple[JsonObject, int]:
         payload=request.get_json(silent=True),
         normalize_scanner_command=normalize_scanner_command,
         enqueue_bridge_commands=_enqueue_bridge_commands,
-        transport_lock=transport_lock,
-        transport_state=transport_state,
+        transport_lock=_room.transport_lock,
+        transport_state=_room.transport_state,
         log_protocol_event=log_protocol_event,
     )
 
@@ -815,23 +852,22 @@ def room_replace_session() -> tuple[JsonObject, int]:
     if not isinstance(payload, dict):
         return {'ok': False, 'error': 'Body must be a JSON object.'}, 400
 
-    global expected_p1_session_id, expected_p2_session_id
     (
         response,
         status,
-        expected_p1_session_id,
-        expected_p2_session_id,
+        _room.expected_p1_session_id,
+        _room.expected_p2_session_id,
         replaced_slot,
         evicted_sid,
     ) = runtime_replace_room_session(
         payload,
-        transport_lock=transport_lock,
-        transport_state=transport_state,
-        expected_p1_session_id=expected_p1_session_id,
-        expected_p2_session_id=expected_p2_session_id,
+        transport_lock=_room.transport_lock,
+        transport_state=_room.transport_state,
+        expected_p1_session_id=_room.expected_p1_session_id,
+        expected_p2_session_id=_room.expected_p2_session_id,
         cancel_disconnect_forfeit_timer_locked=_cancel_disconnect_forfeit_timer_locked,
         reset_delivery_state_for_slot=_reset_delivery_state_for_slot,
-        registration_condition=registration_condition,
+        registration_condition=_room.registration_condition,
     )
 
     if status != 200:
@@ -861,10 +897,10 @@ def _handle_transport_sid_disconnect(
     runtime_handle_transport_sid_disconnect(
         sid,
         event_name=event_name,
-        transport_lock=transport_lock,
-        transport_state=transport_state,
-        winner_announced=winner_announced,
-        winner_main_menu_ack_slots=winner_main_menu_ack_slots,
+        transport_lock=_room.transport_lock,
+        transport_state=_room.transport_state,
+        winner_announced=_room.winner_announced,
+        winner_main_menu_ack_slots=_room.winner_main_menu_ack_slots,
         disconnect_grace_seconds=DISCONNECT_GRACE_SECONDS,
         socketio=socketio,
         reset_delivery_state_for_slot=_reset_delivery_state_for_slot,
@@ -889,8 +925,8 @@ if socketio is not None:
         runtime_register_client_or_play(
             payload,
             sid=sid,
-            transport_lock=transport_lock,
-            transport_state=transport_state,
+            transport_lock=_room.transport_lock,
+            transport_state=_room.transport_state,
             socketio=socketio,
             emit_fn=emit,
             process_protocol_packet=_process_protocol_packet,
@@ -907,8 +943,8 @@ if socketio is not None:
             payload,
             sid=sid,
             packet_type='ready',
-            transport_lock=transport_lock,
-            transport_state=transport_state,
+            transport_lock=_room.transport_lock,
+            transport_state=_room.transport_state,
             process_protocol_packet=_process_protocol_packet,
             protocol_packets_emit_payload_for_slot=_protocol_packets_emit_payload_for_slot,
             emit_fn=emit,
@@ -922,8 +958,8 @@ if socketio is not None:
             payload,
             sid=sid,
             packet_type='request_environment',
-            transport_lock=transport_lock,
-            transport_state=transport_state,
+            transport_lock=_room.transport_lock,
+            transport_state=_room.transport_state,
             process_protocol_packet=_process_protocol_packet,
             protocol_packets_emit_payload_for_slot=_protocol_packets_emit_payload_for_slot,
             emit_fn=emit,
@@ -937,8 +973,8 @@ if socketio is not None:
             payload,
             sid=sid,
             packet_type='update_frontend',
-            transport_lock=transport_lock,
-            transport_state=transport_state,
+            transport_lock=_room.transport_lock,
+            transport_state=_room.transport_state,
             process_protocol_packet=_process_protocol_packet,
             protocol_packets_emit_payload_for_slot=_protocol_packets_emit_payload_for_slot,
             emit_fn=emit,
@@ -952,8 +988,8 @@ if socketio is not None:
             payload,
             sid=sid,
             packet_type='init_setup_done',
-            transport_lock=transport_lock,
-            transport_state=transport_state,
+            transport_lock=_room.transport_lock,
+            transport_state=_room.transport_state,
             process_protocol_packet=_process_protocol_packet,
             protocol_packets_emit_payload_for_slot=_protocol_packets_emit_payload_for_slot,
             emit_fn=emit,
@@ -967,8 +1003,8 @@ if socketio is not None:
             payload,
             sid=sid,
             packet_type='frontend_event',
-            transport_lock=transport_lock,
-            transport_state=transport_state,
+            transport_lock=_room.transport_lock,
+            transport_state=_room.transport_state,
             process_protocol_packet=_process_protocol_packet,
             protocol_packets_emit_payload_for_slot=_protocol_packets_emit_payload_for_slot,
             emit_fn=emit,
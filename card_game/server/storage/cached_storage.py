@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from threading import Lock
+from typing import Any, Callable, Generic, TypeVar
+from card_game.server.server_types import JsonObject
+import json
+import time
+
+from .router_storage import SESSION_GC_SECONDS, RouterStorage, StoredDeck, StoredSession
+
+# Entries kept per cache; the least recently used go first.
+READ_CACHE_MAX_ENTRIES = 4096
+# Longest an entry is served without going back to SQLite. Writes through
+# this storage invalidate at once; the TTL bounds edits made elsewhere.
+READ_CACHE_TTL_SECONDS = 30.0
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+class TtlLruCache(Generic[K, V]):
+    """A bounded, thread-safe map whose entries also expire after ``ttl_seconds``."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self._max_entries = max(1, max_entries)
+        self._ttl_seconds = ttl_seconds
+        self._lock = Lock()
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        # Keys with a load in flight, mapped to [generation, loaders]. An
+        # invalidation bumps only its own key's generation, so a load that
+        # raced it is not stored and loads for other keys are unaffected.
+        self._in_flight: dict[K, list[int]] = {}
+        self._counts = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+
+    def get_or_load(self, key: K, load: Callable[[], V]) -> V:
+        """The cached value for ``key``, or ``load()`` stored under it."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                if time.monotonic() - stored_at < self._ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self._counts["hits"] += 1
+                    return value
+                del self._entries[key]
+                self._counts["expirations"] += 1
+            self._counts["misses"] += 1
+            in_flight = self._in_flight.setdefault(key, [0, 0])
+            in_flight[1] += 1
+            generation = in_flight[0]
+
+        try:
+            value = load()
+        except BaseException:
+            with self._lock:
+                self._finish_load_locked(key, in_flight)
+            raise
+        with self._lock:
+            if generation == in_flight[0]:
+                self._entries[key] = (time.monotonic(), value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self._max_entries:
+                    self._entries.popitem(last=False)
+                    self._counts["evictions"] += 1
+            self._finish_load_locked(key, in_flight)
+        return value
+
+    def invalidate(self, key: K) -> None:
+        with self._lock:
+            in_flight = self._in_flight.get(key)
+            if in_flight is not None:
+                in_flight[0] += 1
+            self._counts["invalidations"] += 1
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            for in_flight in self._in_flight.values():
+                in_flight[0] += 1
+            self._entries.clear()
+
+    def _finish_load_locked(self, key: K, in_flight: list[int]) -> None:
+        """Drop ``key`` from the in-flight map once its last loader is done; caller holds ``_lock``."""
+        in_flight[1] -= 1
+        if in_flight[1] == 0 and self._in_flight.get(key) is in_flight:
+            del self._in_flight[key]
+
+    def stats(self) -> JsonObject:
+        with self._lock:
+            lookups = self._counts["hits"] + self._counts["misses"]
+            return {
+                **self._counts,
+                "size": len(self._entries),
+                "hit_rate": self._counts["hits"] / lookups if lookups else 0.0,
+            }
+
+
+@dataclass(frozen=True)
+class SelectedDeckCards:
+    """A user's selected deck with its card list parsed once per load."""
+
+    deck: JsonObject
+    # The parsed payload, or None when it is not a JSON list.
+    cards: tuple[Any, ...] | None
+    # Why the deck cannot be played, or None when it can.
+    error: str | None
+
+
+class CachedRouterStorage(RouterStorage):
+    """``RouterStorage`` with read-through caches for sessions, selected decks and ratings.
+
+    Sessions are cached with their username; expiry still follows
+    ``touch_session``. Selected decks are cached parsed and checked by
+    ``validate_cards``. Every write below invalidates what it changes.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        *,
+        validate_cards: Callable[[list[Any]], str | None] | None = None,
+        max_entries: int = READ_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = READ_CACHE_TTL_SECONDS,
+        session_gc_seconds: float = SESSION_GC_SECONDS,
+    ) -> None:
+        super().__init__(db_path, session_gc_seconds=session_gc_seconds)
+        self._validate_cards = validate_cards
+        self._sessions: TtlLruCache[str, StoredSession | None] = TtlLruCache(max_entries, ttl_seconds)
+        self._selected_decks: TtlLruCache[str, SelectedDeckCards | None] = TtlLruCache(max_entries, ttl_seconds)
+        self._ratings: TtlLruCache[str, float] = TtlLruCache(max_entries, ttl_seconds)
+
+    def get_session(self, session_id: str) -> StoredSession | None:
+        cached = self._sessions.get_or_load(session_id, lambda: super(CachedRouterStorage, self).get_session(session_id))
+        if cached is None:
+            return None
+        expires_at = max(cached.expires_at, self._touched_expires_at(session_id))
+        if expires_at >= time.time():
+            return replace(cached, expires_at=expires_at)
+        # The cached expiry may predate a flushed touch; ask SQLite.
+        self._sessions.invalidate(session_id)
+        return super().get_session(session_id)
+
+    def create_or_update_session(self, session_id: str, user_id: str, ttl_seconds: int) -> None:
+        super().create_or_update_session(session_id, user_id, ttl_seconds)
+        self._sessions.invalidate(session_id)
+
+    def revoke_session(self, session_id: str) -> None:
+        super().revoke_session(session_id)
+        self._sessions.invalidate(session_id)
+
+    def get_selected_deck_cards(self, user_id: str) -> SelectedDeckCards | None:
+        return self._selected_decks.get_or_load(user_id, lambda: self._load_selected_deck_cards(user_id))
+
+    def get_selected_deck(self, user_id: str) -> JsonObject | None:
+        selected = self.get_selected_deck_cards(user_id)
+        return dict(selected.deck) if selected is not None else None
+
+    def create_deck(self, user_id: str, name: str, card_payload_json: str) -> StoredDeck:
+        deck = super().create_deck(user_id, name, card_payload_json)
+        self._selected_decks.invalidate(user_id)
+        return deck
+
+    def update_deck(self, deck_id: str, user_id: str, name: str, card_payload_json: str) -> bool:
+        updated = super().update_deck(deck_id, user_id, name, card_payload_json)
+        self._selected_decks.invalidate(user_id)
+        return updated
+
+    def delete_deck(self, deck_id: str, user_id: str) -> bool:
+        deleted = super().delete_deck(deck_id, user_id)
+        self._selected_decks.invalidate(user_id)
+        return deleted
+
+    def set_selected_deck(self, user_id: str, deck_id: str | None) -> bool:
+        selected = super().set_selected_deck(user_id, deck_id)
+        self._selected_decks.invalidate(user_id)
+        return selected
+
+    def get_rating(self, user_id: str) -> float:
+        return self._ratings.get_or_load(user_id, lambda: super(CachedRouterStorage, self).get_rating(user_id))
+
+    def record_match_result(self, winner_user_id: str, loser_user_id: str) -> tuple[float, float]:
+        updated = super().record_match_result(winner_user_id, loser_user_id)
+        self._ratings.invalidate(winner_user_id)
+        self._ratings.invalidate(loser_user_id)
+        return updated
+
+    def cache_stats(self) -> JsonObject:
+        return {
+            "sessions": self._sessions.stats(),
+            "selected_decks": self._selected_decks.stats(),
+            "ratings": self._ratings.stats(),
+        }
+
+    def _load_selected_deck_cards(self, user_id: str) -> SelectedDeckCards | None:
+        deck = super().get_selected_deck(user_id)
+        if deck is None:
+            return None
+        try:
+            parsed = json.loads(str(deck.get("card_payload_json", "[]")))
+        except Exception:
+            return SelectedDeckCards(deck=deck, cards=None, error="selected deck payload is invalid JSON.")
+        if not isinstance(parsed, list):
+            return SelectedDeckCards(deck=deck, cards=None, error="selected deck payload is not a card list.")
+        error = self._validate_cards(parsed) if self._validate_cards is not None else None
+        return SelectedDeckCards(deck=deck, cards=tuple(parsed), error=error)
@@ -1,14 +1,47 @@
 from __future__ import annotations
 
+from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
-from threading import RLock
-from typing import Any
+from queue import Empty, SimpleQueue
+from threading import Event, Lock, RLock, Thread
+from typing import Any, Iterator
 from card_game.server.server_types import JsonObject, CommandPayload
+import atexit
 import sqlite3
 import time
+from time import perf_counter_ns
 from uuid import uuid4
 
+# Idle read-only connections kept open between calls. Bursts open more; the
+# extras are closed when returned.
+READ_POOL_SIZE = 8
+# Session expiry refreshes are held in memory and written in one transaction
+# this often, and on close.
+SESSION_TOUCH_FLUSH_SECONDS = 2.0
+# Expired and revoked session rows are deleted this often, in transactions
+# of at most SESSION_GC_BATCH_ROWS rows so a login never waits long behind
+# one, and at most SESSION_GC_MAX_BATCHES per run.
+SESSION_GC_SECONDS = 600.0
+SESSION_GC_BATCH_ROWS = 1000
+SESSION_GC_MAX_BATCHES = 100
+# Free pages handed back to the filesystem per collection. Only databases
+# created with incremental auto-vacuum have any to hand back.
+INCREMENTAL_VACUUM_PAGES = 2048
+# Rating of a player with no finished rated match, and the Elo K-factor.
+DEFAULT_RATING = 1500.0
+RATING_K_FACTOR = 32.0
+# Prepared statements kept per connection, keyed by SQL text.
+STATEMENT_CACHE_SIZE = 64
+# Applied to every connection. In WAL mode synchronous=NORMAL stays
+# consistent after a crash; only a power loss can drop the latest commits.
+_CONNECTION_PRAGMAS = (
+    "PRAGMA busy_timeout = 5000",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -8192",
+)
+
 
 @dataclass(frozen=True)
 class StoredSession:
@@ -30,22 +63,106 @@ class StoredDeck:
 
 
 class RouterStorage:
-    def __init__(self, db_path: str) -> None:
+    """SQLite storage for users, sessions and decks.
+
+    Writes go through one long-lived connection, serialized by ``_lock``.
+    Reads borrow a read-only connection from a small pool and take no lock:
+    in WAL mode they see the last commit without waiting for the writer.
+    ``touch_session`` is write-behind: see ``flush_session_touches``.
+    Expired and revoked sessions are deleted in the background: see
+    ``collect_sessions``.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        touch_flush_seconds: float = SESSION_TOUCH_FLUSH_SECONDS,
+        session_gc_seconds: float = SESSION_GC_SECONDS,
+    ) -> None:
         self._db_path = Path(db_path)
         self._lock = RLock()
         self._db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._closed = False
+        self._idle_readers: SimpleQueue[sqlite3.Connection] = SimpleQueue()
+        self._writer = self._open(read_only=False)
         self._initialize_schema()
-
-    def _connect(self) -> sqlite3.Connection:
-        connection = sqlite3.connect(str(self._db_path))
+        # session_id -> newest requested expiry, waiting for the next flush.
+        # _flushing holds the batch being written so reads still see it.
+        self._touch_lock = Lock()
+        self._pending_touches: dict[str, float] = {}
+        self._flushing_touches: dict[str, float] = {}
+        self._touch_counts = {"requested": 0, "coalesced": 0, "flushed_rows": 0, "flushes": 0}
+        self._touch_flush_seconds = touch_flush_seconds
+        self._touch_flusher: Thread | None = None
+        self._stop_background = Event()
+        self._gc_lock = Lock()
+        self._gc_counts: dict[str, float] = {"runs": 0, "batches": 0, "deleted_rows": 0, "last_run_ms": 0.0, "batch_max_ms": 0.0}
+        self._session_gc_seconds = session_gc_seconds
+        self._session_collector: Thread | None = None
+        atexit.register(self.close)
+
+    def _open(self, *, read_only: bool) -> sqlite3.Connection:
+        # Pooled connections move between threads, but only one uses a connection at a time.
+        connection = sqlite3.connect(
+            str(self._db_path),
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE,
+            # Readers run each SELECT on its own, so no read transaction pins an old snapshot.
+            isolation_level=None if read_only else "",
+        )
         connection.row_factory = sqlite3.Row
+        for pragma in _CONNECTION_PRAGMAS:
+            connection.execute(pragma)
+        if read_only:
+            connection.execute("PRAGMA query_only = ON")
         return connection
 
+    @contextmanager
+    def _writing(self) -> Iterator[sqlite3.Connection]:
+        """The writer connection inside one transaction, committed on success."""
+        with self._lock:
+            if self._closed:
+                raise sqlite3.ProgrammingError("RouterStorage is closed")
+            with self._writer:
+                yield self._writer
+
+    @contextmanager
+    def _reading(self) -> Iterator[sqlite3.Connection]:
+        try:
+            connection = self._idle_readers.get_nowait()
+        except Empty:
+            connection = self._open(read_only=True)
+        try:
+            yield connection
+        finally:
+            if self._closed or self._idle_readers.qsize() >= READ_POOL_SIZE:
+                connection.close()
+            else:
+                self._idle_readers.put(connection)
+
+    def close(self) -> None:
+        """Write pending session touches and close every connection."""
+        atexit.unregister(self.close)
+        self._stop_background.set()
+        with self._lock:
+            if self._closed:
+                return
+            self.flush_session_touches()
+            self.optimize()
+            self._closed = True
+            self._writer.close()
+        while True:
+            try:
+                self._idle_readers.get_nowait().close()
+            except Empty:
+                return
+
     def _initialize_schema(self) -> None:
         with self._lock:
-            with self._connect() as conn:
+            with self._writer as conn:
                 conn.executescript(
                     """
+                    PRAGMA auto_vacuum=INCREMENTAL;
                     PRAGMA journal_mode=WAL;
 
                     CREATE TABLE IF NOT EXISTS users (
@@ -64,6 +181,14 @@ class RouterStorage:
                         FOREIGN KEY(user_id) REFERENCES users(user_id)
                     );
 
+                    -- Covers list_active_session_ids_for_user without reading the table.
+                    CREATE INDEX IF NOT EXISTS idx_sessions_user_active
+                        ON sessions(user_id, revoked_at, expires_at, session_id);
+                    -- Let collect_sessions find expired and revoked rows without a scan.
+                    CREATE INDEX IF NOT EXISTS idx_sessions_expires_at ON sessions(expires_at);
+                    CREATE INDEX IF NOT EXISTS idx_sessions_revoked_at
+                        ON sessions(revoked_at) WHERE revoked_at IS NOT NULL;
+
                     CREATE TABLE IF NOT EXISTS decks (
                         deck_id TEXT PRIMARY KEY,
                         user_id TEXT NOT NULL,
@@ -83,6 +208,14 @@ class RouterStorage:
                         FOREIGN KEY(user_id) REFERENCES users(user_id),
                         FOREIGN KEY(selected_deck_id) REFERENCES decks(deck_id)
                     );
+
+                    CREATE TABLE IF NOT EXISTS user_ratings (
+                        user_id TEXT PRIMARY KEY,
+                        rating REAL NOT NULL,
+                        games_played INTEGER NOT NULL,
+                        updated_at REAL NOT NULL,
+                        FOREIGN KEY(user_id) REFERENCES users(user_id)
+                    );
                     """
                 )
 
@@ -92,67 +225,72 @@ class RouterStorage:
             raise ValueError("username must not be empty")
 
         now = time.time()
-        with self._lock:
-            with self._connect() as conn:
-                row = conn.execute(
-                    "SELECT user_id FROM users WHERE username = ?",
-                    (normalized,),
-                ).fetchone()
-                if row is not None:
-                    conn.execute(
-                        "UPDATE users SET updated_at = ? WHERE user_id = ?",
-                        (now, row["user_id"]),
-                    )
-                    return str(row["user_id"])
-
-                user_id = uuid4().hex
+        with self._writing() as conn:
+            row = conn.execute(
+                "SELECT user_id FROM users WHERE username = ?",
+                (normalized,),
+            ).fetchone()
+            if row is not None:
                 conn.execute(
-                    "INSERT INTO users (user_id, username, created_at, updated_at) VALUES (?, ?, ?, ?)",
-                    (user_id, normalized, now, now),
+                    "UPDATE users SET updated_at = ? WHERE user_id = ?",
+                    (now, row["user_id"]),
                 )
-                conn.execute(
-                    "INSERT OR REPLACE INTO user_preferences (user_id, selected_deck_id, updated_at) VALUES (?, NULL, ?)",
-                    (user_id, now),
-                )
-                return user_id
+                return str(row["user_id"])
+
+            user_id = uuid4().hex
+            conn.execute(
+                "INSERT INTO users (user_id, username, created_at, updated_at) VALUES (?, ?, ?, ?)",
+                (user_id, normalized, now, now),
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO user_preferences (user_id, selected_deck_id, updated_at) VALUES (?, NULL, ?)",
+                (user_id, now),
+            )
+            return user_id
 
     def create_or_update_session(self, session_id: str, user_id: str, ttl_seconds: int) -> None:
         now = time.time()
         expires_at = now + max(1, ttl_seconds)
-        with self._lock:
-            with self._connect() as conn:
-                conn.execute(
-                    """
-                    INSERT INTO sessions (session_id, user_id, issued_at, expires_at, revoked_at)
-                    VALUES (?, ?, ?, ?, NULL)
-                    ON CONFLICT(session_id) DO UPDATE SET
-                        user_id = excluded.user_id,
-                        issued_at = excluded.issued_at,
-                        expires_at = excluded.expires_at,
-                        revoked_at = NULL
-                    """,
-                    (session_id, user_id, now, expires_at),
-                )
+        with self._writing() as conn:
+            conn.execute(
+                """
+                INSERT INTO sessions (session_id, user_id, issued_at, expires_at, revoked_at)
+                VALUES (?, ?, ?, ?, NULL)
+                ON CONFLICT(session_id) DO UPDATE SET
+                    user_id = excluded.user_id,
+                    issued_at = excluded.issued_at,
+                    expires_at = excluded.expires_at,
+                    revoked_at = NULL
+                """,
+                (session_id, user_id, now, expires_at),
+            )
+        if self._session_collector is None and self._session_gc_seconds > 0:
+            with self._gc_lock:
+                if self._session_collector is None:
+                    self._session_collector = Thread(target=self._collect_sessions_periodically, name="session-gc", daemon=True)
+                    self._session_collector.start()
 
     def get_session(self, session_id: str) -> StoredSession | None:
-        with self._lock:
-            with self._connect() as conn:
-                row = conn.execute(
-                    """
-                    SELECT s.session_id, s.user_id, u.username, s.issued_at, s.expires_at
-                    FROM sessions AS s
-                    JOIN users AS u ON u.user_id = s.user_id
-                    WHERE s.session_id = ?
-                      AND s.revoked_at IS NULL
-                    """,
-                    (session_id,),
-                ).fetchone()
+        # Read the pending expiry first: a flush in between then shows in the row.
+        touched_expires_at = self._touched_expires_at(session_id)
+        with self._reading() as conn:
+            row = conn.execute(
+                """
+                SELECT s.session_id, s.user_id, u.username, s.issued_at, s.expires_at
+                FROM sessions AS s
+                JOIN users AS u ON u.user_id = s.user_id
+                WHERE s.session_id = ?
+                  AND s.revoked_at IS NULL
+                """,
+                (session_id,),
+            ).fetchone()
 
         if row is None:
             return None
 
         now = time.time()
-        if float(row["expires_at"]) < now:
+        expires_at = max(float(row["expires_at"]), touched_expires_at)
+        if expires_at < now:
             return None
 
         return StoredSession(
@@ -160,51 +298,173 @@ class RouterStorage:
             user_id=str(row["user_id"]),
             username=str(row["username"]),
             issued_at=float(row["issued_at"]),
-            expires_at=float(row["expires_at"]),
+            expires_at=expires_at,
         )
 
     def touch_session(self, session_id: str, ttl_seconds: int) -> None:
-        now = time.time()
-        expires_at = now + max(1, ttl_seconds)
+        """Extend a session's expiry; written by the next flush, not now.
+
+        Repeated touches of one session between flushes become one row
+        update. A flush never shortens an expiry and never revives a
+        revoked session.
+        """
+        if self._closed:
+            raise sqlite3.ProgrammingError("RouterStorage is closed")
+        expires_at = time.time() + max(1, ttl_seconds)
+        with self._touch_lock:
+            self._touch_counts["requested"] += 1
+            if session_id in self._pending_touches:
+                self._touch_counts["coalesced"] += 1
+            self._pending_touches[session_id] = expires_at
+            if self._touch_flusher is None:
+                self._touch_flusher = Thread(target=self._flush_touches_periodically, name="session-touch-flusher", daemon=True)
+                self._touch_flusher.start()
+
+    def flush_session_touches(self) -> int:
+        """Write every pending session touch in one transaction; returns the rows written."""
         with self._lock:
-            with self._connect() as conn:
-                conn.execute(
-                    """
-                    UPDATE sessions
-                    SET expires_at = ?, revoked_at = NULL
-                    WHERE session_id = ?
-                    """,
-                    (expires_at, session_id),
-                )
+            with self._touch_lock:
+                batch, self._pending_touches = self._pending_touches, {}
+                self._flushing_touches = batch
+            if not batch:
+                return 0
+            try:
+                with self._writing() as conn:
+                    conn.executemany(
+                        """
+                        UPDATE sessions
+                        SET expires_at = MAX(expires_at, ?)
+                        WHERE session_id = ? AND revoked_at IS NULL
+                        """,
+                        [(expires_at, session_id) for session_id, expires_at in batch.items()],
+                    )
+            except Exception:
+                # Keep them for the next flush, behind any newer touches.
+                with self._touch_lock:
+                    for session_id, expires_at in batch.items():
+                        self._pending_touches[session_id] = max(expires_at, self._pending_touches.get(session_id, 0.0))
+                raise
+            finally:
+                with self._touch_lock:
+                    self._flushing_touches = {}
+            with self._touch_lock:
+                self._touch_counts["flushed_rows"] += len(batch)
+                self._touch_counts["flushes"] += 1
+            return len(batch)
+
+    def session_touch_stats(self) -> dict[str, int]:
+        """Touch counters; ``coalesced`` is row writes avoided against writing every touch."""
+        with self._touch_lock:
+            return {**self._touch_counts, "pending": len(self._pending_touches)}
+
+    def _touched_expires_at(self, session_id: str) -> float:
+        with self._touch_lock:
+            return max(self._pending_touches.get(session_id, 0.0), self._flushing_touches.get(session_id, 0.0))
+
+    def _flush_touches_periodically(self) -> None:
+        while not self._stop_background.wait(self._touch_flush_seconds):
+            try:
+                self.flush_session_touches()
+            except sqlite3.Error as exc:
+                print(f"[ROUTER_STORAGE] session_touch_flush_failed error={exc}")
+
+    def collect_sessions(
+        self,
+        batch_rows: int = SESSION_GC_BATCH_ROWS,
+        max_batches: int = SESSION_GC_MAX_BATCHES,
+    ) -> int:
+        """Delete expired and revoked sessions, ``batch_rows`` per transaction; returns the rows deleted.
+
+        Pending touches are flushed first, and a session touched since is
+        left alone, so no live session is deleted. Stops after
+        ``max_batches``; the next run picks up the rest.
+        """
+        self.flush_session_touches()
+        began = perf_counter_ns()
+        deleted = 0
+        batches = 0
+        batch_max_ns = 0
+        while batches < max_batches:
+            batch_began = perf_counter_ns()
+            now = time.time()
+            with self._touch_lock:
+                touched = {**self._flushing_touches, **self._pending_touches}
+            with self._writing() as conn:
+                # Two limited index range reads: a UNION would be built in full before its LIMIT.
+                revoked = conn.execute(
+                    "SELECT session_id FROM sessions WHERE revoked_at IS NOT NULL LIMIT ?",
+                    (batch_rows,),
+                ).fetchall()
+                expired = conn.execute(
+                    "SELECT session_id FROM sessions WHERE expires_at < ? AND revoked_at IS NULL LIMIT ?",
+                    (now, batch_rows - len(revoked)),
+                ).fetchall()
+                rows = [*revoked, *expired]
+                doomed = [(row["session_id"],) for row in revoked]
+                doomed.extend((row["session_id"],) for row in expired if touched.get(row["session_id"], 0.0) < now)
+                conn.executemany("DELETE FROM sessions WHERE session_id = ?", doomed)
+            batches += 1
+            deleted += len(doomed)
+            batch_max_ns = max(batch_max_ns, perf_counter_ns() - batch_began)
+            if len(rows) < batch_rows or not doomed:
+                break
+        self.optimize()
+        with self._gc_lock:
+            self._gc_counts["runs"] += 1
+            self._gc_counts["batches"] += batches
+            self._gc_counts["deleted_rows"] += deleted
+            self._gc_counts["last_run_ms"] = (perf_counter_ns() - began) / 1e6
+            self._gc_counts["batch_max_ms"] = max(self._gc_counts["batch_max_ms"], batch_max_ns / 1e6)
+        return deleted
+
+    def optimize(self) -> None:
+        """Hand back up to INCREMENTAL_VACUUM_PAGES free pages and let SQLite refresh planner statistics."""
+        with self._lock:
+            if self._closed:
+                return
+            self._writer.execute(f"PRAGMA incremental_vacuum({INCREMENTAL_VACUUM_PAGES})").fetchall()
+            self._writer.execute("PRAGMA optimize")
+
+    def session_gc_stats(self) -> JsonObject:
+        with self._gc_lock:
+            return dict(self._gc_counts)
+
+    def _collect_sessions_periodically(self) -> None:
+        while not self._stop_background.wait(self._session_gc_seconds):
+            try:
+                self.collect_sessions()
+            except sqlite3.Error as exc:
+                print(f"[ROUTER_STORAGE] session_gc_failed error={exc}")
 
     def revoke_session(self, session_id: str) -> None:
         now = time.time()
-        with self._lock:
-            with self._connect() as conn:
-                conn.execute(
-                    "UPDATE sessions SET revoked_at = ? WHERE session_id = ?",
-                    (now, session_id),
-                )
+        with self._writing() as conn:
+            conn.execute(
+                "UPDATE sessions SET revoked_at = ? WHERE session_id = ?",
+                (now, session_id),
+            )
 
     def list_active_session_ids_for_user(self, user_id: str) -> list[str]:
-        now = time.time()
-        with self._lock:
-            with self._connect() as conn:
-                rows = conn.execute(
-                    """
-                    SELECT session_id
-                    FROM sessions
-                    WHERE user_id = ?
-                      AND revoked_at IS NULL
-                      AND expires_at >= ?
-                    """,
-                    (user_id, now),
-                ).fetchall()
+        with self._touch_lock:
+            touched = {**self._flushing_touches, **self._pending_touches}
+        with self._reading() as conn:
+            rows = conn.execute(
+                """
+                SELECT session_id, expires_at
+                FROM sessions
+                WHERE user_id = ?
+                  AND revoked_at IS NULL
+                """,
+                (user_id,),
+            ).fetchall()
 
+        now = time.time()
         return [
             str(row["session_id"])
             for row in rows
-            if isinstance(row["session_id"], str) and row["session_id"].strip()
+            if isinstance(row["session_id"], str)
+            and row["session_id"].strip()
+            and max(float(row["expires_at"]), touched.get(row["session_id"], 0.0)) >= now
         ]
 
     def create_deck(self, user_id: str, name: str, card_payload_json: str) -> StoredDeck:
@@ -214,15 +474,14 @@ class RouterStorage:
 
         now = time.time()
         deck_id = uuid4().hex
-        with self._lock:
-            with self._connect() as conn:
-                conn.execute(
-                    """
-                    INSERT INTO decks (deck_id, user_id, name, card_payload_json, created_at, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                    """,
-                    (deck_id, user_id, normalized_name, card_payload_json, now, now),
-                )
+        with self._writing() as conn:
+            conn.execute(
+                """
+                INSERT INTO decks (deck_id, user_id, name, card_payload_json, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (deck_id, user_id, normalized_name, card_payload_json, now, now),
+            )
 
         return StoredDeck(
             deck_id=deck_id,
@@ -234,17 +493,16 @@ class RouterStorage:
         )
 
     def list_decks_for_user(self, user_id: str) -> list[StoredDeck]:
-        with self._lock:
-            with self._connect() as conn:
-                rows = conn.execute(
-                    """
-                    SELECT deck_id, user_id, name, card_payload_json, created_at, updated_at
-                    FROM decks
-                    WHERE user_id = ?
-                    ORDER BY updated_at DESC
-                    """,
-                    (user_id,),
-                ).fetchall()
+        with self._reading() as conn:
+            rows = conn.execute(
+                """
+                SELECT deck_id, user_id, name, card_payload_json, created_at, updated_at
+                FROM decks
+                WHERE user_id = ?
+                ORDER BY updated_at DESC
+                """,
+                (user_id,),
+            ).fetchall()
 
         return [
             StoredDeck(
@@ -264,72 +522,68 @@ class RouterStorage:
             raise ValueError("deck name must not be empty")
 
         now = time.time()
-        with self._lock:
-            with self._connect() as conn:
-                result = conn.execute(
-                    """
-                    UPDATE decks
-                    SET name = ?, card_payload_json = ?, updated_at = ?
-                    WHERE deck_id = ? AND user_id = ?
-                    """,
-                    (normalized_name, card_payload_json, now, deck_id, user_id),
-                )
-                return result.rowcount > 0
+        with self._writing() as conn:
+            result = conn.execute(
+                """
+                UPDATE decks
+                SET name = ?, card_payload_json = ?, updated_at = ?
+                WHERE deck_id = ? AND user_id = ?
+                """,
+                (normalized_name, card_payload_json, now, deck_id, user_id),
+            )
+            return result.rowcount > 0
 
     def delete_deck(self, deck_id: str, user_id: str) -> bool:
-        with self._lock:
-            with self._connect() as conn:
-                result = conn.execute(
-                    "DELETE FROM decks WHERE deck_id = ? AND user_id = ?",
-                    (deck_id, user_id),
-                )
-                if result.rowcount > 0:
-                    conn.execute(
-                        """
-                        UPDATE user_preferences
-                        SET selected_deck_id = NULL, updated_at = ?
-                        WHERE user_id = ? AND selected_deck_id = ?
-                        """,
-                        (time.time(), user_id, deck_id),
-                    )
-                return result.rowcount > 0
-
-    def set_selected_deck(self, user_id: str, deck_id: str | None) -> bool:
-        now = time.time()
-        with self._lock:
-            with self._connect() as conn:
-                if deck_id is not None:
-                    row = conn.execute(
-                        "SELECT 1 FROM decks WHERE deck_id = ? AND user_id = ?",
-                        (deck_id, user_id),
-                    ).fetchone()
-                    if row is None:
-                        return False
-
+        with self._writing() as conn:
+            result = conn.execute(
+                "DELETE FROM decks WHERE deck_id = ? AND user_id = ?",
+                (deck_id, user_id),
+            )
+            if result.rowcount > 0:
                 conn.execute(
                     """
-                    INSERT INTO user_preferences (user_id, selected_deck_id, updated_at)
-                    VALUES (?, ?, ?)
-                    ON CONFLICT(user_id) DO UPDATE SET
-                        selected_deck_id = excluded.selected_deck_id,
-                        updated_at = excluded.updated_at
+                    UPDATE user_preferences
+                    SET selected_deck_id = NULL, updated_at = ?
+                    WHERE user_id = ? AND selected_deck_id = ?
                     """,
-                    (user_id, deck_id, now),
+                    (time.time(), user_id, deck_id),
                 )
-                return True
+            return result.rowcount > 0
 
-    def get_selected_deck(self, user_id: str) -> JsonObject | None:
-        with self._lock:
-            with self._connect() as conn:
+    def set_selected_deck(self, user_id: str, deck_id: str | None) -> bool:
+        now = time.time()
+        with self._writing() as conn:
+            if deck_id is not None:
                 row = conn.execute(
-                    """
-                    SELECT d.deck_id, d.name, d.card_payload_json, d.updated_at
-                    FROM user_preferences AS p
-                    JOIN decks AS d ON d.deck_id = p.selected_deck_id
-                    WHERE p.user_id = ?
-                    """,
-                    (user_id,),
+                    "SELECT 1 FROM decks WHERE deck_id = ? AND user_id = ?",
+                    (deck_id, user_id),
                 ).fetchone()
+                if row is None:
+                    return False
+
+            conn.execute(
+                """
+                INSERT INTO user_preferences (user_id, selected_deck_id, updated_at)
+                VALUES (?, ?, ?)
+                ON CONFLICT(user_id) DO UPDATE SET
+                    selected_deck_id = excluded.selected_deck_id,
+                    updated_at = excluded.updated_at
+                """,
+                (user_id, deck_id, now),
+            )
+            return True
+
+    def get_selected_deck(self, user_id: str) -> JsonObject | None:
+        with self._reading() as conn:
+            row = conn.execute(
+                """
+                SELECT d.deck_id, d.name, d.card_payload_json, d.updated_at
+                FROM user_preferences AS p
+                JOIN decks AS d ON d.deck_id = p.selected_deck_id
+                WHERE p.user_id = ?
+                """,
+                (user_id,),
+            ).fetchone()
 
         if row is None:
             return None
@@ -340,3 +594,39 @@ class RouterStorage:
             "card_payload_json": str(row["card_payload_json"]),
             "updated_at": float(row["updated_at"]),
         }
+
+    def get_rating(self, user_id: str) -> float:
+        with self._reading() as conn:
+            row = conn.execute(
+                "SELECT rating FROM user_ratings WHERE user_id = ?",
+                (user_id,),
+            ).fetchone()
+        return float(row["rating"]) if row is not None else DEFAULT_RATING
+
+    def record_match_result(self, winner_user_id: str, loser_user_id: str) -> tuple[float, float]:
+        """Apply one Elo update for a decided match; returns the new (winner, loser) ratings."""
+        now = time.time()
+        with self._writing() as conn:
+            ratings: list[float] = []
+            for user_id in (winner_user_id, loser_user_id):
+                row = conn.execute(
+                    "SELECT rating FROM user_ratings WHERE user_id = ?",
+                    (user_id,),
+                ).fetchone()
+                ratings.append(float(row["rating"]) if row is not None else DEFAULT_RATING)
+            winner_rating, loser_rating = ratings
+            expected_win = 1.0 / (1.0 + 10 ** ((loser_rating - winner_rating) / 400.0))
+            delta = RATING_K_FACTOR * (1.0 - expected_win)
+            updated = (winner_rating + delta, loser_rating - delta)
+            conn.executemany(
+                """
+                INSERT INTO user_ratings (user_id, rating, games_played, updated_at)
+                VALUES (?, ?, 1, ?)
+                ON CONFLICT(user_id) DO UPDATE SET
+                    rating = excluded.rating,
+                    games_played = games_played + 1,
+                    updated_at = excluded.updated_at
+                """,
+                [(winner_user_id, updated[0], now), (loser_user_id, updated[1], now)],
+            )
+            return updated
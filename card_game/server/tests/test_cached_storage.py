@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from card_game.server.storage.cached_storage import CachedRouterStorage, TtlLruCache
+
+
+@pytest.fixture
+def storage(tmp_path):
+    instance = CachedRouterStorage(
+        str(tmp_path / 'router.sqlite3'),
+        validate_cards=lambda cards: None if len(cards) == 2 else 'Deck must contain exactly 2 cards.',
+    )
+    yield instance
+    instance.close()
+
+
+def test_cache_evicts_least_recent_and_skips_loads_that_raced_an_invalidation() -> None:
+    cache: TtlLruCache[str, int] = TtlLruCache(max_entries=2, ttl_seconds=60)
+    assert cache.get_or_load('a', lambda: 1) == 1
+    assert cache.get_or_load('b', lambda: 2) == 2
+    assert cache.get_or_load('a', lambda: -1) == 1
+    cache.get_or_load('c', lambda: 3)
+    assert cache.get_or_load('b', lambda: 20) == 20
+
+    def _load_then_get_invalidated() -> int:
+        cache.invalidate('d')
+        return 4
+
+    cache.get_or_load('d', _load_then_get_invalidated)
+    assert cache.get_or_load('d', lambda: 40) == 40
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['evictions'], stats['size']) == (1, 6, 3, 2)
+
+
+def test_invalidating_one_key_keeps_in_flight_loads_of_other_keys() -> None:
+    cache: TtlLruCache[str, int] = TtlLruCache(max_entries=8, ttl_seconds=60)
+
+    def _load_a_while_b_and_c_change() -> int:
+        cache.invalidate('b')
+        cache.get_or_load('c', lambda: 3)
+        cache.invalidate('c')
+        return 1
+
+    cache.get_or_load('a', _load_a_while_b_and_c_change)
+    assert cache.get_or_load('a', lambda: -1) == 1
+    assert cache.get_or_load('c', lambda: 30) == 30
+    assert cache._in_flight == {}
+
+
+def test_expired_entries_are_reloaded() -> None:
+    cache: TtlLruCache[str, int] = TtlLruCache(max_entries=8, ttl_seconds=0)
+    cache.get_or_load('a', lambda: 1)
+    assert cache.get_or_load('a', lambda: 2) == 2
+    assert cache.stats()['expirations'] == 1
+
+
+def test_sessions_are_cached_until_revoked(storage) -> None:
+    user_id = storage.get_or_create_user('alice')
+    storage.create_or_update_session('session-1', user_id, 60)
+    first = storage.get_session('session-1')
+    storage.touch_session('session-1', 600)
+    second = storage.get_session('session-1')
+
+    assert (first.username, second.username) == ('alice', 'alice')
+    assert second.expires_at > first.expires_at + 500
+    assert storage.cache_stats()['sessions']['hits'] == 1
+    storage.revoke_session('session-1')
+    assert storage.get_session('session-1') is None
+
+
+def test_selected_deck_is_parsed_once_and_invalidated_by_deck_writes(storage) -> None:
+    user_id = storage.get_or_create_user('bob')
+    deck = storage.create_deck(user_id, 'Two cards', json.dumps(['card-a', 'card-b']))
+    assert storage.get_selected_deck_cards(user_id) is None
+    storage.set_selected_deck(user_id, deck.deck_id)
+
+    selected = storage.get_selected_deck_cards(user_id)
+    assert (selected.cards, selected.error) == (('card-a', 'card-b'), None)
+    assert storage.get_selected_deck(user_id)['deck_id'] == deck.deck_id
+    assert storage.cache_stats()['selected_decks']['hits'] == 1
+
+    storage.update_deck(deck.deck_id, user_id, 'Three cards', json.dumps(['card-a', 'card-b', 'card-c']))
+    assert storage.get_selected_deck_cards(user_id).error == 'Deck must contain exactly 2 cards.'
+    storage.update_deck(deck.deck_id, user_id, 'Broken', '{')
+    assert storage.get_selected_deck_cards(user_id).error == 'selected deck payload is invalid JSON.'
+    storage.delete_deck(deck.deck_id, user_id)
+    assert storage.get_selected_deck_cards(user_id) is None
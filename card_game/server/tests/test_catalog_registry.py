@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+
+from card_game.benchmarks.import_time import STARTUP_TARGETS, _probe
+from card_game.catalog.registry import INDEX_PATH, build_index, card_entry, render_index
+
+
+def test_catalog_index_matches_the_card_modules() -> None:
+    # Fails after adding or changing a card: run python -m card_game.catalog.generate_index --write
+    assert INDEX_PATH.read_text(encoding='utf-8') == render_index(*build_index())
+
+
+def test_index_records_character_metadata() -> None:
+    entry = card_entry('AliceWang')
+    assert entry is not None
+    assert (entry.kind, entry.module) == ('character', 'card_game.catalog.characters.strings.AliceWang')
+    assert entry.hp == 110 and entry.card_type == 'STRING'
+    assert card_entry('AVGEBirb').kind == 'item'  # type: ignore[union-attr]
+    assert card_entry('NotACard') is None
+
+
+def test_router_startup_imports_no_card_modules() -> None:
+    # Only card_game.catalog.registry and its generated index.
+    assert _probe(STARTUP_TARGETS['router'])['catalog_modules'] == 2
+
+
+def test_cards_load_on_first_use() -> None:
+    script = (
+        'import sys\n'
+        'import card_game.catalog as catalog\n'
+        'from card_game.catalog.registry import load_card_class\n'
+        'loaded = lambda: sorted(m for m in sys.modules if m.startswith("card_game.catalog.") and m.count(".") > 2)\n'
+        'assert loaded() == [], loaded()\n'
+        'assert load_card_class("AVGEBirb").__name__ == "AVGEBirb"\n'
+        'assert loaded() == ["card_game.catalog.items.AVGEBirb"], loaded()\n'
+        'assert catalog.AliceWang is load_card_class("AliceWang")\n'
+        'namespace = {}\n'
+        'exec("from card_game.catalog import *", namespace)\n'
+        'assert namespace["MainHall"].__module__ == "card_game.catalog.stadiums.MainHall"\n'
+    )
+    completed = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, timeout=60)
+    assert completed.returncode == 0, completed.stderr
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from threading import Event
+from typing import Any
+
+from card_game.server.workers.command_lanes import CommandLanes
+from card_game.server.workers.room_worker import RoomWorker
+
+
+def _command(method: str, seq: int) -> dict[str, Any]:
+    return {'type': 'command', 'id': f'{method}-{seq}', 'method': method, 'params': {'seq': seq}}
+
+
+def test_control_commands_are_served_while_a_gameplay_command_runs() -> None:
+    drain_started = Event()
+    release_drain = Event()
+    control_done = Event()
+    handled: list[str] = []
+
+    def handle(message: dict[str, Any]) -> None:
+        if message['method'] == 'protocol_socket_event' and message['params']['seq'] == 0:
+            drain_started.set()
+            release_drain.wait(timeout=5)
+        handled.append(message['id'])
+        if message['id'] == 'disconnect-1':
+            control_done.set()
+
+    lanes = CommandLanes(handle)
+    lanes.route(_command('protocol_socket_event', 0))
+    lanes.route(_command('protocol_socket_event', 1))
+    assert drain_started.wait(timeout=2)
+    lanes.route(_command('health', 0))
+    lanes.route(_command('disconnect', 1))
+
+    assert control_done.wait(timeout=2)
+    assert handled == ['health-0', 'disconnect-1']
+    assert lanes.stats()['gameplay']['depth'] == 1
+
+    release_drain.set()
+    lanes.close(timeout=2)
+    assert handled[2:] == ['protocol_socket_event-0', 'protocol_socket_event-1']
+    stats = lanes.stats()
+    assert (stats['control']['served'], stats['gameplay']['served']) == (2, 2)
+    assert stats['gameplay']['wait_ms_max'] >= stats['gameplay']['wait_ms_avg'] > 0
+
+
+def test_keyed_gameplay_lanes_keep_rooms_apart() -> None:
+    room_a_started = Event()
+    release_room_a = Event()
+    room_b_done = Event()
+    handled: list[str] = []
+
+    def handle(message: dict[str, Any]) -> None:
+        if message['id'] == 'room-a-0':
+            room_a_started.set()
+            release_room_a.wait(timeout=5)
+        handled.append(message['id'])
+        if message['id'] == 'room-b-1':
+            room_b_done.set()
+
+    def room_command(room_id: str, seq: int) -> dict[str, Any]:
+        return {'type': 'command', 'id': f'{room_id}-{seq}', 'method': 'protocol_socket_event', 'params': {'room_id': room_id}}
+
+    lanes = CommandLanes(handle, lane_key=lambda message: message['params'].get('room_id'))
+    lanes.route(room_command('room-a', 0))
+    lanes.route(room_command('room-a', 1))
+    assert room_a_started.wait(timeout=2)
+    lanes.route(room_command('room-b', 0))
+    lanes.route(room_command('room-b', 1))
+
+    assert room_b_done.wait(timeout=2)
+    assert handled == ['room-b-0', 'room-b-1']
+    assert lanes.stats()['keyed']['room-a']['depth'] == 1
+
+    lanes.retire('room-b')
+    release_room_a.set()
+    lanes.close(timeout=2)
+    assert handled[2:] == ['room-a-0', 'room-a-1']
+    assert 'keyed' not in lanes.stats()
+
+
+def test_a_failing_command_does_not_stop_its_lane() -> None:
+    handled: list[Any] = []
+
+    def handle(message: Any) -> None:
+        if message == 'bad':
+            raise ValueError('bad command')
+        handled.append(message)
+
+    lanes = CommandLanes(handle)
+    lanes.route('bad')
+    lanes.route({'method': ['not', 'a', 'name']})
+    lanes.close(timeout=2)
+
+    assert handled == [{'method': ['not', 'a', 'name']}]
+
+
+def test_live_room_worker_reports_lane_stats_in_health() -> None:
+    worker = RoomWorker(
+        room_id='room-lanes',
+        player_session_ids=('lanes-p1', 'lanes-p2'),
+        host='127.0.0.1',
+        port=0,
+        p1_username='lanes-p1',
+        p2_username='lanes-p2',
+        p1_selected_cards=None,
+        p2_selected_cards=None,
+        transport_mode='pipe',
+        on_finished=lambda *args: None,
+    )
+    try:
+        worker.start()
+        worker.request('engine_profile', {}, timeout_seconds=30)
+        health = worker.request('health', {}, timeout_seconds=30)
+    finally:
+        worker.stop('test_done')
+
+    assert health['lanes']['control']['served'] == 1
+    assert health['lanes']['gameplay']['served'] == 1
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from pathlib import Path
+import json
+
+import card_game.server.router_server as router_server
+from card_game.server.game_runner import FrontendGameBridge
+from card_game.server.replay.selfplay import play_scripted_game
+
+
+def test_bridge_engine_profile_snapshot_covers_a_played_game() -> None:
+    bridge = FrontendGameBridge()
+    assert bridge.engine_profile_snapshot() is None
+
+    bridge.enable_engine_profiling()
+    play_scripted_game(bridge, choice_seed=4, max_frontend_events=300)
+    snapshot = bridge.engine_profile_snapshot()
+
+    assert snapshot is not None
+    json.dumps(snapshot)
+    assert snapshot['packets']['started'] > 0
+    assert snapshot['responses']['ACCEPT'] > 0
+    categories = {row['category'] for row in snapshot['top']}
+    assert {'event', 'listener'} <= categories
+    assert any(row['name'] == 'CORE' for row in snapshot['groups'])
+
+
+def test_router_fetches_engine_profile_from_room_worker(tmp_path: Path) -> None:
+    router = router_server.MatchmakingRouter(db_path=str(tmp_path / 'router.sqlite3'))
+    requests: list[str] = []
+
+    class FakeWorker:
+        def request(self, method: str, params: dict, timeout_seconds: float = 2.0) -> dict:
+            requests.append(method)
+            return {'ok': True, 'enabled': True, 'profile': {'packets': {'started': 3}}}
+
+    room = router_server.RoomRecord(
+        room_id='room-profile',
+        player_session_ids=('session-a', 'session-b'),
+        created_at=0.0,
+        bind_host='127.0.0.1',
+        port=9999,
+        worker=FakeWorker(),  # type: ignore[arg-type]
+    )
+    router._state.rooms_by_id[room.room_id] = room
+
+    body, status = router.room_engine_profile('room-profile')
+    assert status == 200
+    assert body['profile']['packets']['started'] == 3
+    assert requests == ['engine_profile']
+
+    body, status = router.room_engine_profile('missing-room')
+    assert status == 404
+    assert body['ok'] is False
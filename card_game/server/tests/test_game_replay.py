@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from copy import deepcopy
+from pathlib import Path
+import random
+
+import pytest
+
+from card_game.avge_abstracts.AVGEEnvironment import AVGEEnvironment
+from card_game.constants import ActionTypes, PlayerID
+from card_game.server.game_runner import FrontendGameBridge, p1_setup, p2_setup
+from card_game.server.replay.game_log import (
+    GameLogWriter,
+    RecordKind,
+    decode_engine_value,
+    encode_engine_value,
+    iter_game_log,
+)
+from card_game.server.replay.recorder import GameRecorder
+from card_game.server.replay.replayer import ReplayDivergenceError, benchmark_corpus, replay_game_log
+from card_game.server.replay.selfplay import play_scripted_game, record_scripted_game
+
+
+def _record(tmp_path: Path, seed: int = 3) -> Path:
+    path = tmp_path / f'game-{seed}.avgr'
+    result = record_scripted_game(path, seed=seed)
+    assert result.winner_declared
+    return path
+
+
+def test_recorded_scripted_game_replays_with_matching_checkpoints(tmp_path: Path) -> None:
+    path = _record(tmp_path)
+
+    kinds = [record.kind for record in iter_game_log(open(path, 'rb'))]
+    assert kinds[0] == RecordKind.HEADER
+    assert kinds[-1] == RecordKind.END
+    assert RecordKind.DRAIN in kinds
+
+    result = replay_game_log(path)
+
+    assert result.checkpoints_verified == kinds.count(RecordKind.CHECKPOINT)
+    assert result.checkpoints_verified > 0
+    assert result.drains == kinds.count(RecordKind.DRAIN)
+    assert result.end_reason == 'winner'
+
+
+def test_replay_reports_divergence_when_a_checkpoint_hash_changes(tmp_path: Path) -> None:
+    path = _record(tmp_path)
+    data = bytearray(path.read_bytes())
+    records = list(iter_game_log(open(path, 'rb')))
+    checkpoint = next(record for record in records if record.kind == RecordKind.CHECKPOINT)
+    offset = bytes(data).index(bytes([int(RecordKind.CHECKPOINT), len(checkpoint.body)]) + checkpoint.body)
+    data[offset + 2] ^= 0xFF
+    path.write_bytes(bytes(data))
+
+    with pytest.raises(ReplayDivergenceError, match='state hash mismatch at packet checkpoint 0'):
+        replay_game_log(path)
+
+
+def test_replay_accepts_torn_final_record(tmp_path: Path) -> None:
+    path = _record(tmp_path)
+    path.write_bytes(path.read_bytes()[:-3])
+
+    result = replay_game_log(path)
+
+    assert result.end_reason is None
+    assert result.checkpoints_verified > 0
+
+
+def test_randomness_outside_drains_is_captured_for_replay(tmp_path: Path) -> None:
+    path = tmp_path / 'rng.avgr'
+    recorder = GameRecorder(GameLogWriter(open(path, 'wb')), seed=11)
+    recorder.begin_game(p1_setup, p2_setup, PlayerID.P1, p1_username='a', p2_username='b', start_round=0)
+    env = AVGEEnvironment(deepcopy(p1_setup), deepcopy(p2_setup), PlayerID.P1, p1_username='a', p2_username='b')
+    bridge = FrontendGameBridge(env=env, recorder=recorder)
+    handle_frontend_event = bridge.handle_frontend_event
+
+    def _noisy_handle(event_type, response_data, context):
+        random.random()
+        return handle_frontend_event(event_type, response_data, context)
+
+    bridge.handle_frontend_event = _noisy_handle  # type: ignore[method-assign]
+    play_scripted_game(bridge, choice_seed=11)
+    recorder.finish('winner')
+
+    kinds = [record.kind for record in iter_game_log(open(path, 'rb'))]
+    assert RecordKind.RNG_STATE in kinds
+    assert replay_game_log(path).checkpoints_verified > 0
+
+
+def test_engine_values_round_trip_by_reference() -> None:
+    bridge = FrontendGameBridge()
+    card = next(iter(bridge.env.cards.values()))
+    listeners = [object(), object()]
+
+    encoded = encode_engine_value(
+        {'type': ActionTypes.ATK_1, 'input_result': [card, None, 2], 'group_ordering': [listeners[1], listeners[0]]},
+        ordering_group=listeners,
+    )
+    decoded = decode_engine_value(encoded, env=bridge.env, ordering_group=listeners)
+
+    assert encoded['type'] == {'$enum': 'ActionTypes', 'value': 'ATK_1'}
+    assert decoded == {'type': ActionTypes.ATK_1, 'input_result': [card, None, 2], 'group_ordering': [listeners[1], listeners[0]]}
+    assert decoded['input_result'][0] is card
+
+
+def test_benchmark_corpus_replays_every_recording_in_directory(tmp_path: Path) -> None:
+    _record(tmp_path, seed=1)
+    _record(tmp_path, seed=2)
+
+    result = benchmark_corpus([tmp_path], repeat=2)
+
+    assert len(result.games) == 2
+    assert result.summary()['engine_steps'] == result.engine_steps > 0
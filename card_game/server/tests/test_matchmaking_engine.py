@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+import card_game.server.router_server as router_server
+from card_game.server.matchmaking_engine import MatchmakingEngine, PairingWindow
+from card_game.server.matchmaking_queue import QueueEntry
+from card_game.server.runtime.command_flow import winner_slot_from_command
+
+
+def _engine() -> MatchmakingEngine:
+    return MatchmakingEngine(PairingWindow(bucket_width=50.0, base=100.0, growth_per_second=10.0, maximum=400.0))
+
+
+def _ids(pair: tuple[QueueEntry, QueueEntry] | None) -> set[str] | None:
+    return {pair[0].session_id, pair[1].session_id} if pair is not None else None
+
+
+def test_arrivals_pair_inside_the_window_and_sweeps_widen_it() -> None:
+    engine = _engine()
+    engine.push(QueueEntry('low', 0.0, rating=1200.0))
+    engine.push(QueueEntry('high', 0.0, rating=1600.0))
+    assert engine.match('high', 0.0) is None
+
+    engine.push(QueueEntry('near-high', 1.0, rating=1680.0))
+    assert _ids(engine.match('near-high', 1.0)) == {'high', 'near-high'}
+    assert engine.position('low') == 1 and len(engine) == 1
+
+    engine.push(QueueEntry('far', 2.0, rating=1500.0))
+    assert engine.match('far', 2.0) is None
+    # 300 apart: 'low' accepts that after 20 s queued, though 'far' would not yet.
+    assert engine.sweep(19.0) == []
+    assert [_ids(pair) for pair in engine.sweep(20.0)] == [{'low', 'far'}]
+    assert (len(engine), engine.stats()['buckets'], engine.stats()['paired']) == (0, 0, 2)
+
+
+def test_sweep_prefers_the_longest_waiting_head_and_keeps_requeued_players_first() -> None:
+    engine = _engine()
+    engine.push(QueueEntry('newer', 5.0, rating=1500.0))
+    engine.push(QueueEntry('older', 0.0, rating=1560.0))
+    engine.push_front([QueueEntry('requeued', 0.0, rating=1510.0, spawn_failures=1)])
+    assert [entry.session_id for entry in engine] == ['requeued', 'newer', 'older']
+
+    assert [_ids(pair) for pair in engine.sweep(5.0)] == [{'requeued', 'older'}]
+    assert [entry.session_id for entry in engine] == ['newer']
+
+
+class _StartedWorker:
+    def __init__(self, **_kwargs: object) -> None:
+        return
+
+    def start(self) -> None:
+        return
+
+    def request(self, method: str, params: dict[str, object], timeout_seconds: float = 2.0) -> dict[str, object]:
+        return {'status': 'ok'}
+
+    def stop(self, reason: str = 'stopped') -> None:
+        return
+
+    def snapshot(self) -> None:
+        return None
+
+
+@pytest.fixture
+def router(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(router_server, 'RoomWorker', _StartedWorker)
+    return router_server.MatchmakingRouter(db_path=str(tmp_path / 'router.sqlite3'))
+
+
+def test_declared_winner_updates_ratings_once(router) -> None:
+    alice = router.login('alice', None)
+    bob = router.login('bob', None)
+    router.enqueue(alice.session_id)
+    room = router.enqueue(bob.session_id)['room']
+    winner = 'p1' if room['player_session_ids'][0] == alice.session_id else 'p2'
+
+    router.mark_room_finished(room['room_id'], 'winner_declared', winner)
+    router.mark_room_finished(room['room_id'], 'winner_main_menu_ack', winner)
+    # Ratings are written off the caller's thread.
+    router._room_finish_executor.submit(lambda: None).result(timeout=5)
+
+    assert router._storage.get_rating(alice.user_id) == pytest.approx(1516.0)
+    assert router._storage.get_rating(bob.user_id) == pytest.approx(1484.0)
+    assert router.enqueue(alice.session_id)['status'] == 'waiting'
+    rematch = router.enqueue(bob.session_id)['room']
+    router.mark_room_finished(rematch['room_id'], 'both_players_disconnected')
+    router._room_finish_executor.submit(lambda: None).result(timeout=5)
+    assert router._storage.get_rating(alice.user_id) == pytest.approx(1516.0)
+    assert router.matchmaking_metrics()[0]['matchmaking']['paired'] == 2
+
+
+
+def test_http_finish_cannot_declare_a_winner(router, monkeypatch) -> None:
+    monkeypatch.setattr(router_server, 'router', router)
+    alice = router.login('alice', None)
+    bob = router.login('bob', None)
+    router.enqueue(alice.session_id)
+    room = router.enqueue(bob.session_id)['room']
+
+    response = router_server.app.test_client().post(
+        '/rooms/finish',
+        json={'room_id': room['room_id'], 'reason': 'winner_declared', 'winner': 'p1'},
+    )
+    router._room_finish_executor.submit(lambda: None).result(timeout=5)
+
+    assert response.status_code == 200
+    assert router._storage.get_rating(alice.user_id) == pytest.approx(1500.0)
+    assert router._storage.get_rating(bob.user_id) == pytest.approx(1500.0)
+
+def test_winner_slot_comes_from_the_winner_command() -> None:
+    assert winner_slot_from_command('winner player-2 Bob') == 'p2'
+    assert winner_slot_from_command('winner player-1') == 'p1'
+    assert winner_slot_from_command('winner Bob') is None
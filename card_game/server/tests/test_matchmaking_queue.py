@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import random
+
+from card_game.server.matchmaking_queue import MatchmakingQueue, QueueEntry, _Fenwick
+
+
+def test_queue_keeps_order_positions_and_duplicate_protection() -> None:
+    queue = MatchmakingQueue()
+    for name in ('a', 'b', 'c'):
+        assert queue.push(QueueEntry(name, 0.0))
+    assert not queue.push(QueueEntry('b', 1.0))
+
+    assert [queue.position(name) for name in ('a', 'b', 'c', 'd')] == [1, 2, 3, None]
+    assert queue.remove('b') is not None and queue.remove('b') is None
+    queue.push_front([QueueEntry('x', 0.0), QueueEntry('c', 0.0), QueueEntry('y', 0.0)])
+
+    assert [entry.session_id for entry in queue] == ['x', 'y', 'a', 'c']
+    assert queue.position('c') == 4
+    assert queue.pop_front().session_id == 'x'
+    assert (len(queue), 'x' in queue, queue.position('a')) == (3, False, 2)
+
+
+def test_queue_matches_a_plain_list_through_renumbering() -> None:
+    rng = random.Random(7)
+    queue = MatchmakingQueue()
+    model: list[str] = []
+    for step in range(5000):
+        session_id = f's{rng.randrange(300)}'
+        action = rng.random()
+        if action < 0.45:
+            assert queue.push(QueueEntry(session_id, float(step))) == (session_id not in model)
+            if session_id not in model:
+                model.append(session_id)
+        elif action < 0.55:
+            fresh = [name for name in (session_id, f'f{step}') if name not in model]
+            queue.push_front([QueueEntry(name, float(step)) for name in (session_id, f'f{step}')])
+            model[0:0] = fresh
+        elif action < 0.8:
+            assert (queue.remove(session_id) is not None) == (session_id in model)
+            if session_id in model:
+                model.remove(session_id)
+        elif model:
+            assert queue.pop_front().session_id == model.pop(0)
+
+        probe = f's{rng.randrange(300)}'
+        assert queue.position(probe) == (model.index(probe) + 1 if probe in model else None)
+        assert len(queue) == len(model)
+    assert [entry.session_id for entry in queue] == model
+
+
+def test_fenwick_built_from_counts_matches_one_add_per_slot() -> None:
+    rng = random.Random(11)
+    for size in (0, 1, 2, 7, 64, 129):
+        counts = [rng.randrange(3) for _ in range(size)]
+        added = _Fenwick(size)
+        for slot, count in enumerate(counts):
+            added.add(slot, count)
+        built = _Fenwick.from_counts(counts)
+        assert built._tree == added._tree
+        assert [built.prefix(slot) for slot in range(size)] == [sum(counts[: slot + 1]) for slot in range(size)]
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+from pathlib import Path
+from threading import Event, Thread, current_thread
+from time import monotonic, sleep
+
+import pytest
+
+import card_game.server.router_server as router_server
+from card_game.server.server_types import JsonObject
+
+
+class _GatedRoomWorker:
+    release = Event()
+
+    def __init__(self, **_kwargs: object) -> None:
+        return
+
+    def start(self) -> None:
+        assert type(self).release.wait(timeout=5)
+
+    def request(self, method: str, params: dict[str, object], timeout_seconds: float = 2.0) -> dict[str, object]:
+        return {'status': 'ok'}
+
+    def stop(self, reason: str = 'stopped') -> None:
+        return
+
+    def snapshot(self) -> None:
+        return None
+
+
+@pytest.fixture
+def router(tmp_path: Path, monkeypatch):
+    _GatedRoomWorker.release = Event()
+    monkeypatch.setattr(router_server, 'RoomWorker', _GatedRoomWorker)
+    return router_server.MatchmakingRouter(db_path=str(tmp_path / 'router.sqlite3'))
+
+
+@pytest.fixture
+def pushed(router) -> list[tuple[list[str], JsonObject]]:
+    updates: list[tuple[list[str], JsonObject]] = []
+    router.set_matchmaking_notifier(lambda sids, update: updates.append((sids, update)))
+    return updates
+
+
+def _statuses(pushed: list[tuple[list[str], JsonObject]], sid: str) -> list[str]:
+    return [str(update['status']) for sids, update in pushed if sid in sids]
+
+
+def _wait_for(condition, timeout: float = 5.0) -> None:
+    deadline = monotonic() + timeout
+    while not condition():
+        assert monotonic() < deadline, 'timed out'
+        sleep(0.01)
+
+
+def test_state_changes_are_pushed_to_auth_sockets(router, pushed) -> None:
+    alice = router.login('alice', None).session_id
+    bob = router.login('bob', None).session_id
+    assert router.register_auth_socket(alice, 'sid-alice')[0]
+    assert router.register_auth_socket(bob, 'sid-bob')[0]
+
+    router.enqueue(alice)
+    assert pushed[-1] == (['sid-alice'], {
+        'session_id': alice,
+        'status': 'waiting',
+        'queue_position': 1,
+        'status_version': router.status_version(alice),
+    })
+    router.enqueue(bob)
+    _GatedRoomWorker.release.set()
+    _wait_for(lambda: _statuses(pushed, 'sid-bob')[-1:] == ['assigned'])
+
+    assert _statuses(pushed, 'sid-alice') == ['waiting', 'starting', 'assigned']
+    assert _statuses(pushed, 'sid-bob') == ['starting', 'assigned']
+    room_id = router.status(alice)['room']['room_id']
+    router.mark_room_finished(room_id, 'winner_declared', 'p1')
+    _wait_for(lambda: _statuses(pushed, 'sid-alice')[-1] == 'idle')
+    assert router.matchmaking_metrics()[0]['updates_pushed'] == len(pushed)
+
+
+
+def test_room_process_exit_is_pushed_off_the_calling_thread(router) -> None:
+    pushed_on: list[str] = []
+    router.set_matchmaking_notifier(lambda _sids, update: pushed_on.append(current_thread().name))
+    alice = router.login('alice', None).session_id
+    assert router.register_auth_socket(alice, 'sid-alice')[0]
+    router.enqueue(alice)
+    router.enqueue(router.login('bob', None).session_id)
+    _GatedRoomWorker.release.set()
+    _wait_for(lambda: router.status(alice)['status'] == 'assigned')
+    pushed_on.clear()
+
+    router._on_room_worker_finished(router.status(alice)['room']['room_id'], 'room_process_exit')
+    _wait_for(lambda: bool(pushed_on))
+
+    assert router.status(alice)['status'] == 'idle'
+    assert all(name.startswith('room-finish') for name in pushed_on)
+
+def test_queue_positions_are_pushed_in_batches(router, pushed, monkeypatch) -> None:
+    monkeypatch.setattr(router_server, 'MATCHMAKING_SWEEP_MS', 20)
+    monkeypatch.setattr(router_server, 'MATCHMAKING_POSITION_PUSH_SECONDS', 0)
+    first = router.login('first', None)
+    second = router.login('second', None).session_id
+    # Too far apart in rating to be paired while this test runs.
+    monkeypatch.setattr(router._storage, 'get_rating', lambda user_id: 1000.0 if user_id == first.user_id else 3000.0)
+    assert router.register_auth_socket(second, 'sid-second')[0]
+    router.enqueue(first.session_id)
+    router.enqueue(second)
+    assert router.status(second)['queue_position'] == 2
+
+    router.dequeue(first.session_id)
+    _wait_for(lambda: pushed[-1][1].get('queue_position') == 1)
+    pushes = len(pushed)
+    sleep(0.1)
+    # Unchanged positions are not sent again.
+    assert len(pushed) == pushes
+    router.dequeue(second)
+
+
+def test_long_poll_answers_when_the_status_changes(router) -> None:
+    router_server.router = router
+    client = router_server.app.test_client()
+    session_id = router.login('alice', None).session_id
+    before = client.get(f'/matchmaking/status?session_id={session_id}').get_json()
+    assert (before['status'], before['poll_after_seconds']) == ('idle', router_server.MATCHMAKING_FALLBACK_POLL_SECONDS)
+
+    Thread(target=lambda: (sleep(0.2), router.enqueue(session_id))).start()
+    began = monotonic()
+    after = client.get(
+        f'/matchmaking/status?session_id={session_id}&version={before["status_version"]}&wait=5'
+    ).get_json()
+    assert after['status'] == 'waiting' and after['status_version'] > before['status_version']
+    assert monotonic() - began < 4
+    router.dequeue(session_id)
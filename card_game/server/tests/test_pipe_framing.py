@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+from io import BytesIO
+import json
+
+import pytest
+
+from card_game.benchmarks.pipe_ipc import measure_round_trip
+from card_game.constants import PlayerID
+from card_game.server.workers.pipe_framing import (
+    FRAME_LENGTH_BYTES,
+    MAX_FRAME_BYTES,
+    FrameDecoder,
+    PipeDesyncError,
+    PipeFrameError,
+    RawJson,
+    SocketEmitBatch,
+    SocketJson,
+    encode_message,
+    read_message,
+    socket_payload_fields,
+    socket_payload_from_event,
+)
+
+
+@pytest.mark.parametrize('framing', ['binary', 'jsonl'])
+def test_messages_round_trip_with_json_values(framing) -> None:
+    messages = [
+        {'type': 'command', 'id': 'a', 'method': 'health', 'params': {}},
+        {'type': 'response', 'id': 'b', 'ok': True, 'result': {'players': {PlayerID.P1: ('x', 1.5, None)}, 'text': 'é✓'}},
+    ]
+    stream = BytesIO(b''.join(encode_message(message, framing) for message in messages))
+
+    decoded = [read_message(stream, framing), read_message(stream, framing)]
+
+    assert decoded == json.loads(json.dumps(messages))
+    assert read_message(stream, framing) is None
+
+
+def test_bad_json_line_is_skipped_but_oversized_frame_desyncs() -> None:
+    stream = BytesIO(b'not json\n' + encode_message({'ok': True}, 'jsonl'))
+    with pytest.raises(PipeFrameError):
+        read_message(stream, 'jsonl')
+    assert read_message(stream, 'jsonl') == {'ok': True}
+
+    header = (MAX_FRAME_BYTES + 1).to_bytes(FRAME_LENGTH_BYTES, 'big')
+    with pytest.raises(PipeDesyncError):
+        read_message(BytesIO(header), 'binary')
+
+
+@pytest.mark.parametrize('framing', ['binary', 'jsonl'])
+def test_frame_decoder_reassembles_split_chunks(framing) -> None:
+    messages = [{'type': 'event', 'seq': seq, 'payload': {'text': 'é' * seq}} for seq in range(5)]
+    wire = b''.join(encode_message(message, framing) for message in messages)
+    decoder = FrameDecoder(framing)
+
+    decoded = []
+    for offset in range(0, len(wire), 3):
+        decoder.feed(wire[offset:offset + 3])
+        decoded.extend(decoder.messages())
+
+    assert decoded == messages
+    assert decoder.buffered_bytes == 0
+
+
+def test_frame_decoder_resumes_after_a_bad_frame() -> None:
+    decoder = FrameDecoder('binary')
+    decoder.feed(b'\x00\x00\x00\x02??' + encode_message({'ok': True}, 'binary'))
+    with pytest.raises(PipeFrameError):
+        list(decoder.messages())
+    assert list(decoder.messages()) == [{'ok': True}]
+
+    decoder.feed((MAX_FRAME_BYTES + 1).to_bytes(FRAME_LENGTH_BYTES, 'big'))
+    with pytest.raises(PipeDesyncError):
+        list(decoder.messages())
+
+
+def test_pre_encoded_socket_payload_is_emitted_verbatim() -> None:
+    payload = {'packets': [{'seq': 1, 'body': {'hp': 110, 'name': 'Alice Wang'}}]}
+    body = {'event': 'protocol_packets', **socket_payload_fields(payload, 'binary')}
+    socket_payload = socket_payload_from_event(json.loads(json.dumps(body)))
+
+    assert isinstance(socket_payload, RawJson)
+    encoded = SocketJson.dumps(['protocol_packets', socket_payload], separators=(',', ':'))
+    assert encoded == json.dumps(['protocol_packets', payload], separators=(',', ':'))
+    assert SocketJson.dumps({'sid': 'a'}) == json.dumps({'sid': 'a'})
+    assert socket_payload_from_event({'event': 'x', **socket_payload_fields(payload, 'jsonl')}) == payload
+
+
+@pytest.mark.parametrize('framing', ['binary', 'jsonl'])
+def test_live_room_worker_answers_in_both_framings(framing) -> None:
+    run = measure_round_trip(framing, {'padding': 'x' * 70_000}, requests=3)
+    assert len(run.round_trip_ns) == 3
+
+
+def test_router_delivers_pre_encoded_payload_as_an_object() -> None:
+    import card_game.server.router_server as router_server
+
+    client = router_server.socketio.test_client(router_server.app)
+    client.get_received()
+    payload = {'packets': [{'seq': 7, 'body': {'ok': True}}]}
+
+    router_server.router.handle_room_worker_event(
+        'room-test',
+        'socket_emit',
+        {'event': 'protocol_packets', **socket_payload_fields(payload, 'binary')},
+    )
+
+    received = [entry for entry in client.get_received() if entry['name'] == 'protocol_packets']
+    assert received == [{'name': 'protocol_packets', 'args': [payload], 'namespace': '/'}]
+    client.disconnect()
+
+
+def test_emit_batch_merges_protocol_packets_per_sid_in_order() -> None:
+    batch = SocketEmitBatch()
+    batch.add('protocol_packets', {'packets': [{'seq': 1}], 'blocked_pending_peer_ack': True}, to='a')
+    batch.add('protocol_packets', {'packets': [{'seq': 1}], 'client_slot': 'p2'}, to='b')
+    batch.add('protocol_packets', {'packets': [{'seq': 2}], 'blocked_pending_peer_ack': False}, to='a')
+    batch.add('peer_status', {'ready': True}, to='a')
+    batch.add('protocol_packets', {'packets': [{'seq': 3}], 'blocked_pending_peer_ack': False}, to='a')
+    batch.add('protocol_packets', {'packets': [], 'client_slot': 'p2'}, to='b')
+
+    [body] = batch.drain()
+    emits = [(emit['event'], emit.get('to'), json.loads(emit['payload_json'])) for emit in body['emits']]
+
+    assert emits == [
+        ('protocol_packets', 'a', {'packets': [{'seq': 1}, {'seq': 2}], 'blocked_pending_peer_ack': False}),
+        ('protocol_packets', 'b', {'packets': [{'seq': 1}], 'client_slot': 'p2'}),
+        ('peer_status', 'a', {'ready': True}),
+        ('protocol_packets', 'a', {'packets': [{'seq': 3}], 'blocked_pending_peer_ack': False}),
+    ]
+    assert len(batch) == 0
+
+
+def test_emit_batch_broadcast_ends_merging_and_rooms_get_their_own_batch() -> None:
+    batch = SocketEmitBatch()
+    batch.add('protocol_packets', {'packets': [{'seq': 1}]}, to='a', room_id='r1')
+    batch.add('room_notice', {'text': 'hi'}, room_id='r1')
+    batch.add('protocol_packets', {'packets': [{'seq': 2}]}, to='a', room_id='r1')
+    batch.add('protocol_packets', {'packets': [{'seq': 9}]}, to='z', room_id='r2')
+
+    bodies = batch.drain()
+
+    assert [body['room_id'] for body in bodies] == ['r1', 'r2']
+    assert [emit['event'] for emit in bodies[0]['emits']] == ['protocol_packets', 'room_notice', 'protocol_packets']
+    assert 'to' not in bodies[0]['emits'][1]
+
+
+def test_router_fans_out_a_batch_in_order() -> None:
+    import card_game.server.router_server as router_server
+
+    first, second = router_server.socketio.test_client(router_server.app), router_server.socketio.test_client(router_server.app)
+    first.get_received()
+    second.get_received()
+    first_sid = router_server.socketio.server.manager.sid_from_eio_sid(first.eio_sid, '/')
+    batch = SocketEmitBatch()
+    batch.add('protocol_packets', {'packets': [{'seq': 1}]}, to=first_sid)
+    batch.add('protocol_packets', {'packets': [{'seq': 2}]}, to=first_sid)
+    batch.add('room_notice', {'text': 'hi'})
+    [body] = batch.drain()
+
+    router_server.router.handle_room_worker_event('room-test', 'socket_emit_batch', json.loads(json.dumps(body)))
+
+    assert [(entry['name'], entry['args']) for entry in first.get_received()] == [
+        ('protocol_packets', [{'packets': [{'seq': 1}, {'seq': 2}]}]),
+        ('room_notice', [{'text': 'hi'}]),
+    ]
+    assert [entry['name'] for entry in second.get_received()] == ['room_notice']
+    first.disconnect()
+    second.disconnect()
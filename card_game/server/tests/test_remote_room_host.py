@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from threading import Thread
+from time import monotonic, sleep
+import os
+import signal
+import socket
+import subprocess
+import sys
+
+import pytest
+
+from card_game.server.workers.remote_room_host import RemoteHostListener, recv_handshake, send_handshake
+from card_game.server.workers.room_host_agent import RouterRejectedError, serve_once
+from card_game.server.workers.room_host_pool import RoomHostPool
+
+TOKEN = 'test-room-host-secret'
+
+
+@pytest.fixture
+def remote_pool():
+    pool = RoomHostPool(0, max_rooms_per_host=8)
+    listener = RemoteHostListener(
+        '127.0.0.1',
+        0,
+        TOKEN,
+        on_host=pool.add_host,
+        on_host_finished=pool.on_host_finished,
+    )
+    listener.start()
+    yield pool, listener.address
+    listener.close()
+    for host in pool.hosts():
+        host.stop('test_done')
+
+
+def _wait_for(condition, timeout: float = 30.0) -> None:
+    deadline = monotonic() + timeout
+    while not condition():
+        if monotonic() > deadline:
+            raise AssertionError('timed out')
+        sleep(0.05)
+
+
+def _place(pool: RoomHostPool, room_id: str, finished: dict[str, str]):
+    return pool.place_room(
+        room_id=room_id,
+        player_session_ids=(f'{room_id}-a', f'{room_id}-b'),
+        host='127.0.0.1',
+        port=0,
+        p1_username='alice',
+        p2_username='bob',
+        p1_selected_cards=None,
+        p2_selected_cards=None,
+        transport_mode='pipe',
+        on_finished=lambda finished_id, reason: finished.__setitem__(finished_id, reason),
+    )
+
+
+def test_rooms_run_on_a_registered_agent_until_it_is_lost(remote_pool) -> None:
+    pool, (host, port) = remote_pool
+    agent = subprocess.Popen(
+        [sys.executable, '-m', 'card_game.server.workers.room_host_agent', '--router', f'{host}:{port}', '--capacity', '2', '--host-id', 'box-1', '--once'],
+        env={**os.environ, 'ROOM_HOST_TOKEN': TOKEN},
+        # The agent and its room host process share a group, so one signal takes the machine down.
+        start_new_session=True,
+    )
+    finished: dict[str, str] = {}
+    try:
+        _wait_for(lambda: len(pool.hosts()) == 1)
+        [remote] = pool.hosts()
+        assert (remote.host_id, remote.capacity, remote.remote, remote.pipe_framing) == ('remote-box-1', 2, True, 'jsonl')
+
+        rooms = [_place(pool, 'remote-room-1', finished), _place(pool, 'remote-room-2', finished)]
+        assert _place(pool, 'remote-room-3', finished) is None
+        for room in rooms:
+            assert room is not None
+            room.start()
+            # Routed to the room itself, so this proves it opened on the remote host.
+            assert isinstance(room.request('engine_profile', {}, timeout_seconds=30), dict)
+        assert remote.request('health', {}, timeout_seconds=30)['room_ids'] == ['remote-room-1', 'remote-room-2']
+    finally:
+        os.killpg(agent.pid, signal.SIGKILL)
+        agent.wait(timeout=10)
+
+    _wait_for(lambda: len(finished) == 2, timeout=10)
+    assert finished == {'remote-room-1': 'room_host_lost', 'remote-room-2': 'room_host_lost'}
+    _wait_for(lambda: not pool.hosts(), timeout=10)
+
+
+def test_agent_with_the_wrong_token_is_turned_away(remote_pool) -> None:
+    pool, address = remote_pool
+    with pytest.raises(RouterRejectedError, match='bad token'):
+        serve_once(address, 'box-2', 4, 'wrong-secret')
+    assert pool.hosts() == []
+
+
+def test_agent_refuses_a_router_that_asks_for_marshal_frames() -> None:
+    server = socket.create_server(('127.0.0.1', 0))
+
+    def _old_router() -> None:
+        sock, _peer = server.accept()
+        with sock:
+            recv_handshake(sock)
+            send_handshake(sock, {'type': 'welcome', 'host_id': 'remote-box-3', 'framing': 'binary'})
+
+    router = Thread(target=_old_router, daemon=True)
+    router.start()
+    try:
+        with pytest.raises(RouterRejectedError, match="'binary' framing"):
+            serve_once(server.getsockname()[:2], 'box-3', 4, TOKEN)
+    finally:
+        router.join(timeout=5)
+        server.close()
@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+import random
+from threading import Event, Thread
+from time import monotonic
+from typing import Any
+
+import pytest
+
+import card_game.server.server as room_server
+from card_game.server.timer_service import shared_timer_service
+from card_game.server.workers.room_host import RoomHost
+from card_game.server.workers.room_host_pool import HostedRoom, RoomHostPool
+
+
+def _room_host(monkeypatch, **callbacks: Any) -> RoomHost:
+    # RoomHost installs its hooks on the module; let monkeypatch put them back.
+    for name in ('_schedule_timer', '_notify_router_room_finished', '_schedule_process_termination'):
+        monkeypatch.setattr(room_server, name, getattr(room_server, name))
+    return RoomHost(
+        room_server,
+        on_room_finished=callbacks.get('on_room_finished', lambda _room_id, _reason, _winner: None),
+        on_room_closed=callbacks.get('on_room_closed', lambda _room_id, _reason: None),
+        close_delay_seconds=0.0,
+    )
+
+
+def _open(host: RoomHost, room_id: str) -> None:
+    host.open_room(
+        room_id,
+        player_session_ids=(f'{room_id}-a', f'{room_id}-b'),
+        p1_username=f'{room_id}-alice',
+        p2_username=f'{room_id}-bob',
+    )
+
+
+def test_hosted_rooms_keep_separate_state_and_restore_module_globals(monkeypatch) -> None:
+    host = _room_host(monkeypatch)
+    _open(host, 'room-a')
+    _open(host, 'room-b')
+    bridge_before = room_server.frontend_game_bridge
+    seq_before = room_server.protocol_seq
+    rng_before = random.getstate()
+
+    def _advance() -> int:
+        room_server.protocol_seq += 5
+        room_server.room_stage = 'live'
+        return room_server.protocol_seq
+
+    assert host.call('room-a', _advance) == 5
+    assert host.call('room-a', _advance) == 10
+    assert host.call('room-b', lambda: (room_server.protocol_seq, room_server.room_stage)) == (0, 'init')
+    assert host.call('room-b', lambda: room_server.expected_p1_session_id) == 'room-b-a'
+    assert host.call('room-a', lambda: room_server.frontend_game_bridge) is not host.call('room-b', lambda: room_server.frontend_game_bridge)
+
+    assert room_server.frontend_game_bridge is bridge_before
+    assert room_server.protocol_seq == seq_before
+    assert random.getstate() == rng_before
+    assert host.bound_room_id is None
+    assert sorted(host.room_ids()) == ['room-a', 'room-b']
+
+
+def test_unknown_and_duplicate_rooms_are_rejected(monkeypatch) -> None:
+    host = _room_host(monkeypatch)
+    _open(host, 'room-a')
+
+    with pytest.raises(ValueError):
+        _open(host, 'room-a')
+    with pytest.raises(KeyError):
+        host.call('room-missing', lambda: None)
+    assert host.close_room('room-missing', 'test') is False
+
+
+def test_room_termination_closes_only_that_room(monkeypatch) -> None:
+    closed: list[tuple[str, str]] = []
+    finished: list[tuple[str, str, str | None]] = []
+    done = Event()
+
+    def _on_closed(room_id: str, reason: str) -> None:
+        closed.append((room_id, reason))
+        done.set()
+
+    host = _room_host(monkeypatch, on_room_closed=_on_closed, on_room_finished=lambda *args: finished.append(args))
+    _open(host, 'room-a')
+    _open(host, 'room-b')
+
+    def _finish() -> None:
+        room_server._notify_router_room_finished('winner_declared', 'p2')
+        room_server._schedule_process_termination('winner_main_menu_acked')
+
+    host.call('room-a', _finish)
+
+    assert done.wait(timeout=2.0)
+    assert finished == [('room-a', 'winner_declared', 'p2')]
+    assert closed == [('room-a', 'winner_main_menu_acked')]
+    assert host.room_ids() == ['room-b']
+    assert room_server.termination_requested is False
+
+
+
+def test_room_timers_wait_for_their_room_without_holding_up_other_timers(monkeypatch) -> None:
+    host = _room_host(monkeypatch)
+    _open(host, 'room-a')
+    _open(host, 'room-b')
+    in_room = Event()
+    other_timer = Event()
+    other_room_timer = Event()
+
+    host.call('room-a', lambda: room_server._schedule_timer(0.0, lambda: in_room.set()))
+    with host._rooms['room-a'].call_lock:
+        shared_timer_service().schedule(0.02, other_timer.set)
+        host.call('room-b', lambda: room_server._schedule_timer(0.0, lambda: other_room_timer.set()))
+        assert other_timer.wait(timeout=2.0)
+        assert other_room_timer.wait(timeout=2.0)
+        assert not in_room.is_set()
+    assert in_room.wait(timeout=2.0)
+
+
+def test_a_slow_room_does_not_delay_another_room(monkeypatch) -> None:
+    host = _room_host(monkeypatch)
+    _open(host, 'room-a')
+    _open(host, 'room-b')
+    entered = Event()
+    release = Event()
+
+    def _slow() -> str | None:
+        room_server.protocol_seq += 1
+        entered.set()
+        assert release.wait(timeout=5.0)
+        return room_server.room_id_from_env
+
+    slow_call = Thread(target=lambda: host.call('room-a', _slow), daemon=True)
+    slow_call.start()
+    try:
+        assert entered.wait(timeout=2.0)
+        started = monotonic()
+        seq = host.call('room-b', lambda: (room_server.protocol_seq, room_server.room_id_from_env))
+        assert monotonic() - started < 1.0
+        assert seq == (0, 'room-b')
+        assert host.bound_room_id is None
+    finally:
+        release.set()
+        slow_call.join(timeout=2.0)
+    assert host.call('room-a', lambda: room_server.protocol_seq) == 1
+
+
+def test_control_calls_do_not_wait_for_their_rooms_gameplay(monkeypatch) -> None:
+    host = _room_host(monkeypatch)
+    _open(host, 'room-a')
+    entered = Event()
+    release = Event()
+
+    def _long_drain() -> None:
+        entered.set()
+        assert release.wait(timeout=5.0)
+
+    gameplay = Thread(target=lambda: host.call('room-a', _long_drain), daemon=True)
+    gameplay.start()
+    try:
+        assert entered.wait(timeout=2.0)
+        started = monotonic()
+        session_id = host.call('room-a', lambda: room_server.expected_p1_session_id, exclusive=False)
+        assert monotonic() - started < 1.0
+        assert session_id == 'room-a-a'
+    finally:
+        release.set()
+        gameplay.join(timeout=2.0)
+
+
+def test_concurrent_rooms_draw_from_their_own_rng_streams(monkeypatch) -> None:
+    host = _room_host(monkeypatch)
+    _open(host, 'room-a')
+    _open(host, 'room-b')
+    expected = random.Random()
+    expected.setstate(host._rooms['room-a'].rng.getstate())
+    draws: list[float] = []
+    drawn = Event()
+    release = Event()
+
+    def _draw_around_other_room() -> None:
+        draws.append(random.random())
+        drawn.set()
+        assert release.wait(timeout=5.0)
+        draws.append(random.random())
+
+    in_room_a = Thread(target=lambda: host.call('room-a', _draw_around_other_room), daemon=True)
+    in_room_a.start()
+    try:
+        assert drawn.wait(timeout=2.0)
+        host.call('room-b', lambda: [random.random() for _ in range(10)])
+        random.random()
+    finally:
+        release.set()
+        in_room_a.join(timeout=2.0)
+    assert draws == [expected.random(), expected.random()]
+
+class _FakeHostWorker:
+    remote = False
+    capacity: int | None = None
+
+    def __init__(self, host_id: str, **_options: Any) -> None:
+        self.host_id = host_id
+        self.rooms: dict[str, HostedRoom] = {}
+        self.sent: list[str] = []
+        self.available = True
+
+    @property
+    def room_count(self) -> int:
+        return len(self.rooms)
+
+    def attach(self, room: HostedRoom) -> None:
+        self.rooms[room.room_id] = room
+
+    def release(self, room_id: str) -> None:
+        self.rooms.pop(room_id, None)
+
+    def start(self) -> None:
+        return
+
+    def request(self, method: str, params: dict[str, Any], timeout_seconds: float = 2.0) -> dict[str, Any]:
+        raise RuntimeError(f'{method} failed')
+
+    def send(self, method: str, params: dict[str, Any]) -> None:
+        self.sent.append(method)
+
+
+def _place(pool: RoomHostPool, room_id: str) -> HostedRoom | None:
+    return pool.place_room(
+        room_id=room_id,
+        player_session_ids=('a', 'b'),
+        host='127.0.0.1',
+        port=0,
+        p1_username='alice',
+        p2_username='bob',
+        p1_selected_cards=None,
+        p2_selected_cards=None,
+        transport_mode='pipe',
+        on_finished=lambda _room_id, _reason: None,
+    )
+
+
+def test_pool_spreads_rooms_and_reports_full() -> None:
+    pool = RoomHostPool(2, 2, worker_factory=_FakeHostWorker)  # type: ignore[arg-type]
+
+    placed = [_place(pool, f'room-{index}') for index in range(4)]
+
+    assert all(room is not None for room in placed)
+    assert len(pool.hosts()) == 2
+    assert sorted(host.room_count for host in pool.hosts()) == [2, 2]
+    assert _place(pool, 'room-overflow') is None
+
+    first = placed[0]
+    assert first is not None
+    first.mark_finished('test')
+    replacement = _place(pool, 'room-replacement')
+    assert replacement is not None
+    assert replacement.host_worker is first.host_worker
+
+
+def test_room_the_host_cannot_open_fails_its_start_and_frees_the_slot() -> None:
+    pool = RoomHostPool(1, 1, worker_factory=_FakeHostWorker)  # type: ignore[arg-type]
+    room = _place(pool, 'room-1')
+    assert room is not None
+
+    with pytest.raises(RuntimeError, match='open_room failed'):
+        room.start()
+
+    host = pool.hosts()[0]
+    assert host.room_count == 0 and host.sent == ['close_room']  # type: ignore[attr-defined]
+    assert room._finish_reason == 'room_open_failed: open_room failed'
+    assert _place(pool, 'room-2') is not None
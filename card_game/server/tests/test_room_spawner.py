@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from pathlib import Path
+from threading import Event
+from time import monotonic, sleep
+
+import pytest
+
+import card_game.server.router_server as router_server
+
+
+class _GatedRoomWorker:
+    """Stands in for RoomWorker; ``start`` waits for the test to let it through."""
+
+    release = Event()
+    fail_starts = 0
+    unready_starts = 0
+    started: list[str] = []
+
+    def __init__(self, room_id: str, **_kwargs: object) -> None:
+        self.room_id = room_id
+
+    def start(self) -> None:
+        assert type(self).release.wait(timeout=5)
+        if type(self).fail_starts > 0:
+            type(self).fail_starts -= 1
+            raise OSError('spawn failed')
+        type(self).started.append(self.room_id)
+
+    def request(self, method: str, params: dict[str, object], timeout_seconds: float = 2.0) -> dict[str, object]:
+        if type(self).unready_starts > 0:
+            type(self).unready_starts -= 1
+            raise TimeoutError(f'Pipe request timed out for method={method}')
+        return {'status': 'ok'}
+
+    def stop(self, reason: str = 'stopped') -> None:
+        return
+
+    def snapshot(self) -> None:
+        return None
+
+
+@pytest.fixture
+def router(tmp_path: Path, monkeypatch):
+    _GatedRoomWorker.release = Event()
+    _GatedRoomWorker.fail_starts = 0
+    _GatedRoomWorker.unready_starts = 0
+    _GatedRoomWorker.started = []
+    monkeypatch.setattr(router_server, 'RoomWorker', _GatedRoomWorker)
+    return router_server.MatchmakingRouter(db_path=str(tmp_path / 'router.sqlite3'))
+
+
+def _wait_for(condition, timeout: float = 5.0) -> None:
+    deadline = monotonic() + timeout
+    while not condition():
+        assert monotonic() < deadline, 'timed out'
+        sleep(0.01)
+
+
+def test_paired_players_see_starting_until_the_worker_runs(router) -> None:
+    alice = router.login('alice', None).session_id
+    bob = router.login('bob', None).session_id
+    assert router.enqueue(alice)['status'] == 'waiting'
+
+    paired = router.enqueue(bob)
+    assert (paired['status'], paired['room']['status']) == ('starting', 'starting')
+    assert router.status(alice)['status'] == 'starting'
+    _, error = router.room_worker_for_session(alice)
+    assert error is not None and error['error_code'] == 'room_starting'
+
+    _GatedRoomWorker.release.set()
+    _wait_for(lambda: router.status(alice)['status'] == 'assigned')
+    assert router.room_worker_for_session(bob)[1] is None
+    spawner = router.room_worker_pool_metrics()[0]['spawner']
+    assert (spawner['ready'], spawner['failed']) == (1, 0)
+    assert spawner['pair_to_ready_p50_ms'] > 0
+
+
+def test_failed_start_requeues_both_players_and_retries(router) -> None:
+    _GatedRoomWorker.fail_starts = 1
+    alice = router.login('alice', None).session_id
+    bob = router.login('bob', None).session_id
+    router.enqueue(alice)
+    first_room = router.enqueue(bob)['room_id']
+
+    _GatedRoomWorker.release.set()
+    _wait_for(lambda: router.status(alice)['status'] == 'assigned')
+    second_room = router.status(bob)['room']['room_id']
+
+    assert second_room != first_room
+    assert _GatedRoomWorker.started == [second_room]
+    assert router.room_worker_pool_metrics()[0]['spawner']['failed'] == 1
+
+
+def test_room_that_never_answers_counts_as_a_failed_start(router) -> None:
+    _GatedRoomWorker.unready_starts = 1
+    alice = router.login('alice', None).session_id
+    bob = router.login('bob', None).session_id
+    router.enqueue(alice)
+    first_room = router.enqueue(bob)['room_id']
+
+    _GatedRoomWorker.release.set()
+    _wait_for(lambda: router.status(alice)['status'] == 'assigned')
+
+    assert router.status(bob)['room']['room_id'] != first_room
+    spawner = router.room_worker_pool_metrics()[0]['spawner']
+    assert (spawner['ready'], spawner['failed']) == (1, 1)
+
+
+def test_players_leave_the_queue_after_repeated_failed_starts(router, monkeypatch) -> None:
+    monkeypatch.setattr(router_server, 'ROOM_SPAWN_MAX_ATTEMPTS', 2)
+    _GatedRoomWorker.fail_starts = 2
+    alice = router.login('alice', None).session_id
+    bob = router.login('bob', None).session_id
+    router.enqueue(alice)
+    router.enqueue(bob)
+
+    _GatedRoomWorker.release.set()
+    _wait_for(lambda: router.room_worker_pool_metrics()[0]['spawner']['failed'] == 2)
+    assert router.status(alice)['status'] == 'idle'
+    assert router.status(bob)['status'] == 'idle'
+    assert _GatedRoomWorker.started == []
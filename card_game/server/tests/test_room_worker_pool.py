@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from typing import Any
+
+import card_game.server.workers.room_worker_pool as room_worker_pool
+from card_game.server.workers.room_worker_pool import RoomWorkerPool
+
+
+class _FakeStandbyWorker:
+    def __init__(self, room_id: str, on_finished, standby: bool = False, **_options: Any) -> None:
+        self.room_id = room_id
+        self.standby = standby
+        self._on_finished = on_finished
+        self.started = False
+        self.stopped_reason: str | None = None
+        self.fail_assign = False
+
+    def start(self) -> None:
+        self.started = True
+
+    def request(self, method: str, params: dict[str, Any], timeout_seconds: float = 2.0) -> dict[str, Any]:
+        _ = (params, timeout_seconds)
+        assert method == 'health'
+        return {'status': 'ok', 'standby': True}
+
+    def assign_room(self, room_id: str, *_args: Any, on_finished, on_event=None, **_kwargs: Any) -> None:
+        _ = on_event
+        if self.fail_assign:
+            raise RuntimeError('room process exited with code 1')
+        self.room_id = room_id
+        self._on_finished = on_finished
+        self.standby = False
+
+    def stop(self, reason: str = 'stopped') -> None:
+        if self.stopped_reason is not None:
+            return
+        self.stopped_reason = reason
+        self._on_finished(self.room_id, reason)
+
+
+def _pool(size: int, **options: Any) -> tuple[RoomWorkerPool, list[_FakeStandbyWorker]]:
+    created: list[_FakeStandbyWorker] = []
+
+    def _factory(**kwargs: Any) -> _FakeStandbyWorker:
+        worker = _FakeStandbyWorker(**kwargs)
+        created.append(worker)
+        return worker
+
+    pool = RoomWorkerPool(size, host='127.0.0.1', port=0, transport_mode='pipe', worker_factory=_factory, **options)  # type: ignore[arg-type]
+    return pool, created
+
+
+def _acquire(pool: RoomWorkerPool, room_id: str, finished: list[tuple[str, str]]) -> Any:
+    return pool.acquire(
+        room_id=room_id,
+        player_session_ids=('a', 'b'),
+        host='127.0.0.1',
+        port=0,
+        p1_username='alice',
+        p2_username='bob',
+        p1_selected_cards=None,
+        p2_selected_cards=None,
+        transport_mode='pipe',
+        on_finished=lambda *args: finished.append(args),
+    )
+
+
+def test_warm_hits_assign_standbys_and_misses_fall_back() -> None:
+    pool, created = _pool(2)
+    pool.refill()
+    assert [worker.standby and worker.started for worker in created] == [True, True]
+
+    finished: list[tuple[str, str]] = []
+    first = _acquire(pool, 'room-1', finished)
+    second = _acquire(pool, 'room-2', finished)
+    assert _acquire(pool, 'room-3', finished) is None
+    assert (first.room_id, second.room_id) == ('room-1', 'room-2')
+
+    first.stop('winner_declared')
+    assert finished == [('room-1', 'winner_declared')]
+
+    metrics = pool.metrics()
+    assert (metrics['warm_hits'], metrics['cold_misses']) == (2, 1)
+    assert abs(metrics['warm_hit_rate'] - 2 / 3) < 1e-9
+    assert metrics['assign_p50_ms'] is not None
+
+    pool.refill()
+    assert pool.metrics()['idle'] == 2
+    assert len(created) == 4
+
+
+def test_failed_assignment_retires_the_standby_and_tries_the_next() -> None:
+    pool, created = _pool(2)
+    pool.refill()
+    created[0].fail_assign = True
+
+    worker = _acquire(pool, 'room-1', [])
+
+    assert worker is created[1]
+    assert created[0].stopped_reason == 'standby_assign_failed'
+    assert pool.metrics()['idle'] == 0
+
+
+def test_max_age_replaces_and_max_idle_drains(monkeypatch) -> None:
+    clock = [1000.0]
+    monkeypatch.setattr(room_worker_pool, 'monotonic', lambda: clock[0])
+    pool, created = _pool(1, max_age_seconds=200, max_idle_seconds=300)
+    pool.refill()
+
+    clock[0] += 201
+    pool.refill()
+    assert created[0].stopped_reason == 'standby_max_age'
+    assert pool.metrics()['idle'] == 1
+    assert pool.metrics()['retired_age'] == 1
+
+    clock[0] += 100
+    pool.refill()
+    assert created[1].stopped_reason == 'standby_max_idle'
+    assert pool.metrics()['idle'] == 0
+
+    assert _acquire(pool, 'room-1', []) is None
+    pool.refill()
+    assert pool.metrics()['idle'] == 1
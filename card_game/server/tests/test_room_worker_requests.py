@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+from threading import Event, Thread, active_count
+from typing import Any
+import os
+
+import pytest
+
+import card_game.server.workers.room_worker as room_worker
+from card_game.server.workers.pipe_framing import encode_message, read_message
+from card_game.server.workers.pipe_reactor import PipeReactor
+
+
+class _ScriptedRoomProcess:
+    """Popen stand-in whose room end is driven by the test over real pipes."""
+
+    def __init__(self, *_args: Any, **_kwargs: Any) -> None:
+        command_read, command_write = os.pipe()
+        event_read, event_write = os.pipe()
+        self.stdin = os.fdopen(command_write, 'wb')
+        self.stdout = os.fdopen(event_read, 'rb')
+        self.commands = os.fdopen(command_read, 'rb')
+        self.events = os.fdopen(event_write, 'wb')
+        self.pid = 4545
+        self.returncode: int | None = None
+        self.exited = Event()
+        _ScriptedRoomProcess.latest = self
+
+    latest: _ScriptedRoomProcess
+
+    def read_command(self) -> dict[str, Any]:
+        return read_message(self.commands, 'binary')
+
+    def emit(self, event_type: str, payload: dict[str, Any]) -> None:
+        self.events.write(encode_message({'type': 'event', 'event_type': event_type, 'payload': payload}, 'binary'))
+        self.events.flush()
+
+    def respond(self, command: dict[str, Any], **fields: Any) -> None:
+        self.events.write(encode_message({'type': 'response', 'id': command['id'], **fields}, 'binary'))
+        self.events.flush()
+
+    def exit(self, code: int) -> None:
+        self.returncode = code
+        self.events.close()
+        self.exited.set()
+
+    def poll(self) -> int | None:
+        return self.returncode
+
+    def wait(self, timeout: float | None = None) -> int:
+        self.exited.wait(timeout)
+        return self.returncode if self.returncode is not None else 0
+
+    def terminate(self) -> None:
+        if self.returncode is None:
+            self.exit(-15)
+
+    kill = terminate
+
+
+@pytest.fixture
+def scripted_rooms(monkeypatch, tmp_path) -> None:
+    monkeypatch.setenv('ROOM_PIPE_FRAMING', 'binary')
+    monkeypatch.setattr(room_worker.subprocess, 'Popen', _ScriptedRoomProcess)
+    monkeypatch.setattr(room_worker.tempfile, 'gettempdir', lambda: str(tmp_path))
+
+
+def _room_worker(room_id: str, **kwargs: Any) -> room_worker.RoomWorker:
+    return room_worker.RoomWorker(
+        room_id=room_id,
+        player_session_ids=('a', 'b'),
+        host='127.0.0.1',
+        port=0,
+        p1_username='alice',
+        p2_username='bob',
+        p1_selected_cards=None,
+        p2_selected_cards=None,
+        transport_mode='pipe',
+        **kwargs,
+    )
+
+
+@pytest.fixture
+def worker(scripted_rooms):
+    instance = _room_worker('room-requests', on_finished=lambda *args: None)
+    instance.start()
+    yield instance
+    instance.stop('test_done')
+
+
+def test_out_of_order_responses_complete_only_their_own_future(worker) -> None:
+    room = _ScriptedRoomProcess.latest
+    first = worker.submit('engine_profile', {'n': 1})
+    second = worker.submit('engine_profile', {'n': 2})
+    commands = [room.read_command(), room.read_command()]
+
+    room.respond(commands[1], ok=True, result={'n': 2})
+    assert second.result(timeout=2) == {'n': 2}
+    assert not first.done()
+
+    room.respond(commands[0], ok=False, error='room rejected it')
+    with pytest.raises(RuntimeError, match='room rejected it'):
+        first.result(timeout=2)
+
+
+def test_request_times_out_and_ignores_the_late_response(worker) -> None:
+    room = _ScriptedRoomProcess.latest
+    with pytest.raises(TimeoutError, match='method=health'):
+        worker.request('health', {}, timeout_seconds=0.1)
+    late = room.read_command()
+
+    answered: list[dict[str, Any]] = []
+    waiter = Thread(target=lambda: answered.append(worker.request('health', {}, timeout_seconds=2)))
+    waiter.start()
+    room.respond(late, ok=True, result={'late': True})
+    room.respond(room.read_command(), ok=True, result={'status': 'ok'})
+    waiter.join(timeout=2)
+
+    assert answered == [{'status': 'ok'}]
+
+
+def test_send_is_fire_and_forget_and_exit_fails_pending_requests(worker) -> None:
+    room = _ScriptedRoomProcess.latest
+    worker.send('disconnect', {'sid': 'sid-1'})
+    pending = worker.submit('health', {})
+
+    assert room.read_command()['method'] == 'disconnect'
+    assert room.read_command()['method'] == 'health'
+    room.exit(3)
+
+    with pytest.raises(RuntimeError, match='exited with code 3'):
+        pending.result(timeout=2)
+    with pytest.raises(RuntimeError, match='not available'):
+        worker.send('health', {})
+
+
+def test_send_from_an_event_callback_does_not_wait_on_a_full_pipe(scripted_rooms) -> None:
+    reactor = PipeReactor(name='test-pipe-reactor')
+    later_event = Event()
+    workers: list[room_worker.RoomWorker] = []
+
+    def _on_event(_room_id: str, event_type: str, _payload: dict[str, Any]) -> None:
+        if event_type == 'first':
+            # Far more than a pipe buffer, and the room is not reading yet.
+            workers[0].send('disconnect', {'blob': 'x' * (1 << 20)})
+        elif event_type == 'second':
+            later_event.set()
+
+    worker = _room_worker('room-full-pipe', on_finished=lambda *args: None, on_event=_on_event, reactor=reactor)
+    workers.append(worker)
+    worker.start()
+    room = _ScriptedRoomProcess.latest
+
+    room.emit('first', {})
+    room.emit('second', {})
+    assert later_event.wait(timeout=2)
+    command = room.read_command()
+    assert command['method'] == 'disconnect' and len(command['params']['blob']) == 1 << 20
+    worker.stop('test_done')
+
+
+def test_one_reactor_thread_serves_every_room(scripted_rooms) -> None:
+    reactor = PipeReactor(name='test-pipe-reactor')
+    finished: list[tuple[str, str]] = []
+    events: list[tuple[str, str, dict[str, Any]]] = []
+    threads_before = active_count()
+    workers = [
+        _room_worker(
+            f'room-{index}',
+            on_finished=lambda *args: finished.append(args),
+            on_event=lambda *args: events.append(args),
+            reactor=reactor,
+        )
+        for index in range(24)
+    ]
+    rooms = []
+    for worker in workers:
+        worker.start()
+        rooms.append(_ScriptedRoomProcess.latest)
+
+    futures = [worker.submit('health', {}) for worker in workers]
+    for index, room in enumerate(rooms):
+        room.emit('socket_emit', {'event': 'tick', 'room': index})
+        room.respond(room.read_command(), ok=True, result={'room': index})
+    assert [future.result(timeout=2) for future in futures] == [{'room': index} for index in range(24)]
+    assert active_count() == threads_before + 1
+    assert reactor.watched_count == 24
+
+    rooms[5].exit(3)
+    for room in rooms[6:9]:
+        room.exit(0)
+    for worker in workers[5:9]:
+        worker._stop_event.wait(timeout=2)
+
+    assert sorted(finished) == [
+        ('room-5', 'room_process_exit_3'),
+        ('room-6', 'room_process_exit_0'),
+        ('room-7', 'room_process_exit_0'),
+        ('room-8', 'room_process_exit_0'),
+    ]
+    assert sorted(event[2]['room'] for event in events) == list(range(24))
+    assert reactor.watched_count == 20
+    for worker in workers:
+        worker.stop('test_done')
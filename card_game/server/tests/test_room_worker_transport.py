@@ -34,7 +34,7 @@ def test_room_worker_pipe_mode_does_not_set_server_bind_env(monkeypatch) -> None
             return
 
     monkeypatch.setattr(room_worker.subprocess, 'Popen', _DummyPopen)
-    monkeypatch.setattr(room_worker.Thread, 'start', lambda self: None)
+    monkeypatch.setattr(room_worker.RoomWorker, '_watch_pipe_locked', lambda self: None)
 
     worker = room_worker.RoomWorker(
         room_id='room-test',
@@ -84,3 +84,48 @@ def test_room_worker_rejects_non_pipe_mode() -> None:
         assert False, 'Expected ValueError for non-pipe transport_mode.'
     except ValueError as exc:
         assert 'pipe transport_mode' in str(exc)
+
+
+def test_standby_room_worker_boots_without_room_env(monkeypatch) -> None:
+    popen_envs: list[dict[str, str]] = []
+
+    class _DummyPopen:
+        def __init__(self, *args: Any, **kwargs: Any) -> None:
+            popen_envs.append(kwargs['env'])
+            self.pid = 4343
+            self.stdin = None
+            self.stdout = None
+
+        def poll(self) -> None:
+            return None
+
+        def terminate(self) -> None:
+            return
+
+        def wait(self, timeout: float | None = None) -> int:
+            _ = timeout
+            return 0
+
+    monkeypatch.setenv('ROOM_ID', 'room-leaked-from-router-env')
+    monkeypatch.setattr(room_worker.subprocess, 'Popen', _DummyPopen)
+    monkeypatch.setattr(room_worker.RoomWorker, '_watch_pipe_locked', lambda self: None)
+
+    worker = room_worker.RoomWorker(
+        room_id='standby-test',
+        player_session_ids=('', ''),
+        host='127.0.0.1',
+        port=5600,
+        p1_username='',
+        p2_username='',
+        p1_selected_cards=None,
+        p2_selected_cards=None,
+        transport_mode='pipe',
+        on_finished=_noop_on_finished,
+        standby=True,
+    )
+    worker.start()
+
+    env = popen_envs[0]
+    assert env.get('ROOM_WORKER_STANDBY') == '1'
+    assert not set(room_worker.ROOM_ENV_VARS) & set(env)
+    worker.stop('test_shutdown')
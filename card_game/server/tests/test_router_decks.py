@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 from pathlib import Path
+from time import monotonic, sleep
 
+from card_game.catalog.registry import card_entries
 import card_game.server.game_runner as game_runner
 import card_game.server.router_server as router_server
 
@@ -68,25 +70,19 @@ def _valid_deck_cards_beta() -> list[str]:
 
 def _valid_non_character_deck_cards() -> list[str]:
     cards: list[str] = []
-    for symbol_name, symbol in sorted(router_server.__dict__.items()):
-        if not isinstance(symbol, type):
-            continue
-        if not issubclass(symbol, router_server.AVGECard):
-            continue
-        if not str(getattr(symbol, '__module__', '')).startswith('card_game.catalog'):
-            continue
-        if issubclass(symbol, router_server.AVGECharacterCard):
+    for entry in sorted(card_entries(), key=lambda entry: entry.card_id):
+        if entry.kind == 'character':
             continue
 
         max_copies = (
             router_server.DECK_MAX_ITEM_OR_TOOL_COPIES
-            if issubclass(symbol, router_server.AVGEItemCard) or issubclass(symbol, router_server.AVGEToolCard)
+            if entry.kind in {'item', 'tool'}
             else router_server.DECK_MAX_OTHER_COPIES
         )
 
         remaining = router_server.DECK_REQUIRED_CARD_COUNT - len(cards)
         copies_to_add = min(max_copies, remaining)
-        cards.extend([symbol_name] * copies_to_add)
+        cards.extend([entry.card_id] * copies_to_add)
         if len(cards) == router_server.DECK_REQUIRED_CARD_COUNT:
             break
 
@@ -269,6 +265,9 @@ def test_room_assignment_passes_selected_deck_cards_to_worker(tmp_path: Path) ->
         def stop(self, reason: str = 'stopped') -> None:
             return
 
+        def request(self, method: str, params: dict[str, object], timeout_seconds: float = 2.0) -> dict[str, object]:
+            return {'status': 'ok'}
+
         class _Snapshot:
             process_pid = None
             started_at = 0.0
@@ -326,6 +325,10 @@ def test_room_assignment_passes_selected_deck_cards_to_worker(tmp_path: Path) ->
         join_b = client.post('/matchmaking/queue', json={'action': 'join', 'session_id': session_b})
         assert join_b.status_code == 200
 
+        # Workers are started by the room spawner after pairing.
+        deadline = monotonic() + 5
+        while not captured_workers and monotonic() < deadline:
+            sleep(0.01)
         assert len(captured_workers) == 1
         worker_args = captured_workers[0]
         observed = {
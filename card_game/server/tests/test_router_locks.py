@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from pathlib import Path
+from threading import Event, Thread
+from time import sleep
+
+import card_game.server.router_server as router_server
+from card_game.server.lock_stats import TimedRLock
+
+
+class _FakeWorker:
+    def snapshot(self) -> None:
+        return None
+
+    def stop(self, reason: str) -> None:
+        return None
+
+
+def test_timed_lock_measures_outer_holds_and_contention() -> None:
+    lock = TimedRLock('test')
+    held = Event()
+    release = Event()
+
+    def _hold() -> None:
+        with lock:
+            held.set()
+            release.wait(timeout=5)
+
+    holder = Thread(target=_hold)
+    holder.start()
+    assert held.wait(timeout=5)
+    waiter = Thread(target=lambda: lock.acquire() or lock.release())
+    waiter.start()
+    # Give the waiter time to block on the held lock.
+    sleep(0.1)
+    release.set()
+    holder.join()
+    waiter.join()
+    with lock:
+        with lock:
+            pass
+
+    stats = lock.stats()
+    assert (stats['acquisitions'], stats['contended']) == (3, 1)
+    assert stats['hold_ms_max'] >= stats['hold_ms_avg'] > 0
+
+
+def test_packets_reach_a_running_room_without_taking_router_locks(tmp_path: Path) -> None:
+    router = router_server.MatchmakingRouter(db_path=str(tmp_path / 'router.sqlite3'))
+    session = router.login('alice', None)
+    worker = _FakeWorker()
+    room = router_server.RoomRecord(
+        room_id='room-locks',
+        player_session_ids=(session.session_id, 'session-b'),
+        created_at=0.0,
+        bind_host='127.0.0.1',
+        port=9999,
+        worker=worker,  # type: ignore[arg-type]
+    )
+    router._state.rooms_by_id[room.room_id] = room
+    router._state.room_id_by_session_id[session.session_id] = room.room_id
+    assert router.register_game_client('client-1', session.session_id)[0]
+    before, _ = router.lock_metrics()
+
+    for _ in range(10):
+        assert router.game_session_for_client('client-1') == session.session_id
+        assert router.room_worker_for_session(session.session_id) == (worker, None)
+
+    after, _ = router.lock_metrics()
+    assert after['locks'] == before['locks']
+
+    router.mark_room_finished(room.room_id, 'test_done')
+    assert router.game_session_for_client('client-1') is None
+    _, error = router.room_worker_for_session(session.session_id)
+    assert error is not None and error['error_code'] == 'no_active_room'
+    assert router.lock_metrics()[0]['locks']['sessions']['acquisitions'] > before['locks']['sessions']['acquisitions']
@@ -1,7 +1,12 @@
 from __future__ import annotations
 
 from pathlib import Path
+from threading import Thread
+import sqlite3
 
+import pytest
+
+from card_game.server.storage import router_storage
 from card_game.server.storage.router_storage import RouterStorage
 
 
@@ -68,3 +73,138 @@ def test_list_active_sessions_for_user_excludes_revoked(tmp_path: Path) -> None:
 
     active_after = set(storage.list_active_session_ids_for_user(user_id))
     assert active_after == {"session-b"}
+
+
+@pytest.fixture
+def storage(tmp_path):
+    instance = RouterStorage(str(tmp_path / 'router.sqlite3'))
+    yield instance
+    instance.close()
+
+
+def test_reads_on_other_threads_see_the_last_commit(storage) -> None:
+    user_id = storage.get_or_create_user('alice')
+    storage.create_or_update_session('session-1', user_id, 60)
+    seen: list[object] = []
+
+    def _read() -> None:
+        session = storage.get_session('session-1')
+        seen.append(session.username if session is not None else None)
+        storage.revoke_session('session-1')
+
+    reader = Thread(target=_read)
+    reader.start()
+    reader.join()
+
+    assert seen == ['alice']
+    assert storage.get_session('session-1') is None
+    assert storage.get_or_create_user('alice') == user_id
+
+
+def test_pooled_readers_are_read_only_and_bounded(storage, monkeypatch) -> None:
+    monkeypatch.setattr(router_storage, 'READ_POOL_SIZE', 2)
+    storage.get_or_create_user('bob')
+
+    with storage._reading() as first, storage._reading() as second, storage._reading() as third:
+        assert len({id(first), id(second), id(third)}) == 3
+        with pytest.raises(sqlite3.OperationalError, match='readonly'):
+            third.execute("DELETE FROM users")
+    assert storage._idle_readers.qsize() == 2
+    with storage._reading() as reused:
+        # Returned innermost first, so the outer one was closed over the limit.
+        assert reused in (second, third)
+    assert storage.list_decks_for_user('nobody') == []
+
+
+def test_failed_write_rolls_back_and_close_stops_writes(storage) -> None:
+    user_id = storage.get_or_create_user('carol')
+    with pytest.raises(sqlite3.IntegrityError):
+        with storage._writing() as conn:
+            conn.execute("UPDATE users SET updated_at = 0 WHERE user_id = ?", (user_id,))
+            conn.execute("INSERT INTO users (user_id, username, created_at, updated_at) VALUES ('x', 'carol', 0, 0)")
+    with storage._reading() as conn:
+        assert conn.execute("SELECT updated_at FROM users WHERE user_id = ?", (user_id,)).fetchone()[0] > 0
+
+    storage.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        storage.touch_session('session-1', 60)
+
+
+def _stored_expiry(storage: RouterStorage, session_id: str) -> float:
+    with storage._reading() as conn:
+        return conn.execute("SELECT expires_at FROM sessions WHERE session_id = ?", (session_id,)).fetchone()[0]
+
+
+def test_session_touches_are_coalesced_until_flushed(storage) -> None:
+    user_id = storage.get_or_create_user('dave')
+    storage.create_or_update_session('session-1', user_id, 1)
+    stored = _stored_expiry(storage, 'session-1')
+    for _ in range(5):
+        storage.touch_session('session-1', 600)
+
+    assert _stored_expiry(storage, 'session-1') == stored
+    assert storage.get_session('session-1').expires_at > stored + 500
+    assert storage.list_active_session_ids_for_user(user_id) == ['session-1']
+    assert storage.flush_session_touches() == 1
+    assert _stored_expiry(storage, 'session-1') > stored + 500
+    assert storage.session_touch_stats() == {'requested': 5, 'coalesced': 4, 'flushed_rows': 1, 'flushes': 1, 'pending': 0}
+
+
+def test_flushed_touch_does_not_revive_a_revoked_session(storage) -> None:
+    user_id = storage.get_or_create_user('erin')
+    storage.create_or_update_session('session-1', user_id, 60)
+    storage.touch_session('session-1', 600)
+    storage.revoke_session('session-1')
+
+    assert storage.get_session('session-1') is None
+    storage.flush_session_touches()
+    assert storage.get_session('session-1') is None
+    assert storage.list_active_session_ids_for_user(user_id) == []
+
+
+def test_close_flushes_pending_touches(tmp_path) -> None:
+    db_path = str(tmp_path / 'router.sqlite3')
+    first = RouterStorage(db_path)
+    user_id = first.get_or_create_user('frank')
+    first.create_or_update_session('session-1', user_id, 1)
+    first.touch_session('session-1', 600)
+    first.close()
+
+    second = RouterStorage(db_path)
+    try:
+        assert _stored_expiry(second, 'session-1') > second.get_session('session-1').issued_at + 500
+    finally:
+        second.close()
+
+
+def test_collect_sessions_deletes_expired_and_revoked_rows_in_batches(storage) -> None:
+    user_id = storage.get_or_create_user('grace')
+    for index in range(6):
+        storage.create_or_update_session(f'session-{index}', user_id, 600)
+    with storage._writing() as conn:
+        conn.execute("UPDATE sessions SET expires_at = 0 WHERE session_id IN ('session-0', 'session-1', 'session-2')")
+    storage.revoke_session('session-3')
+    storage.revoke_session('session-4')
+    # Expired in the table, but touched since: the touch wins.
+    storage.touch_session('session-2', 600)
+
+    assert storage.collect_sessions(batch_rows=2) == 4
+    assert sorted(storage.list_active_session_ids_for_user(user_id)) == ['session-2', 'session-5']
+    with storage._reading() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0] == 2
+    assert storage.session_gc_stats()['batches'] == 3 and storage.collect_sessions() == 0
+
+
+def test_session_queries_use_the_session_indexes(storage) -> None:
+    with storage._reading() as conn:
+        per_user = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT session_id, expires_at FROM sessions WHERE user_id = ? AND revoked_at IS NULL",
+            ('user',),
+        ).fetchall()
+        expired = conn.execute("EXPLAIN QUERY PLAN SELECT session_id FROM sessions WHERE expires_at < ?", (0,)).fetchall()
+        auto_vacuum = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+
+    assert 'COVERING INDEX idx_sessions_user_active' in per_user[0]['detail']
+    assert 'idx_sessions_expires_at' in expired[0]['detail']
+    # 2: incremental, so collections can hand free pages back.
+    assert auto_vacuum == 2
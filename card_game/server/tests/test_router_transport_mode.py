@@ -59,6 +59,9 @@ def test_queue_assignment_pipe_mode_launches_pipe_worker(tmp_path: Path) -> None
         def stop(self, reason: str = 'stopped') -> None:
             return
 
+        def request(self, method: str, params: dict[str, object], timeout_seconds: float = 2.0) -> dict[str, object]:
+            return {'status': 'ok'}
+
         def snapshot(self):
             class _Snapshot:
                 process_pid = None
@@ -187,6 +190,8 @@ def test_protocol_proxy_register_client_pipe_mode(tmp_path: Path) -> None:
             return
 
         def request(self, method: str, params: dict[str, object], timeout_seconds: float = 2.0) -> dict[str, object]:
+            if method == 'health':
+                return {'status': 'ok'}
             calls.append({
                 'method': method,
                 'params': params,
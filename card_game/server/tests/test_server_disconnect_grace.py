@@ -15,15 +15,11 @@ class _FakeTimer:
         self.interval = interval
         self.callback = callback
         self.cancelled = False
-        self.started = False
-        self.daemon = False
         _FakeTimer.created.append(self)
 
-    def start(self) -> None:
-        self.started = True
-
-    def cancel(self) -> None:
+    def cancel(self) -> bool:
         self.cancelled = True
+        return True
 
 
 class _FakeSocketIO:
@@ -44,7 +40,7 @@ def _prepare_disconnect_test_harness(monkeypatch):
     monkeypatch.setattr(server, 'disconnect_forfeit_timer_by_slot', {'p1': None, 'p2': None})
     monkeypatch.setattr(server, 'first_player_join_seen', True)
     monkeypatch.setattr(server, 'termination_requested', False)
-    monkeypatch.setattr(server, 'Timer', _FakeTimer)
+    monkeypatch.setattr(server, '_schedule_timer', _FakeTimer)
     monkeypatch.setattr(server, 'p1_username', 'P1')
     monkeypatch.setattr(server, 'p2_username', 'P2')
     monkeypatch.setattr(server, 'pending_command_acks', [])
@@ -72,12 +68,16 @@ def test_disconnect_forfeit_triggers_after_grace_timeout(monkeypatch) -> None:
 
     timer = _FakeTimer.created[-1]
     assert timer.interval == server.DISCONNECT_GRACE_SECONDS
-    assert timer.started is True
+    assert timer.cancelled is False
+    reconnect_token = session_p2.reconnect_token
 
     timer.callback()
 
     assert len(recorded_commands) == 1
     assert recorded_commands[0][0].startswith('winner player-1 ')
+    # The grace window closed with the timer: the slot's token no longer reconnects.
+    assert state.reserved_session_by_slot['p2'] is None
+    assert reconnect_token not in state.reconnect_token_to_slot
 
 
 def test_disconnect_forfeit_is_cancelled_when_player_reconnects(monkeypatch) -> None:
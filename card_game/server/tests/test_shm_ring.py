@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from io import BytesIO
+import os
+
+import pytest
+
+from card_game.benchmarks.pipe_ipc import measure_round_trip, measure_stream
+from card_game.server.workers.pipe_framing import encode_message
+from card_game.server.workers.shm_ring import RingReader, RingWriter, ShmRing, create_ring_fd
+
+pytestmark = pytest.mark.skipif(not hasattr(os, 'memfd_create'), reason='shared-memory rings need memfd_create')
+
+
+def _ring_pair(capacity: int) -> tuple[RingWriter, RingReader]:
+    fd = create_ring_fd(capacity)
+    try:
+        return RingWriter(ShmRing(fd), 'binary'), RingReader(ShmRing(fd), 'binary')
+    finally:
+        os.close(fd)
+
+
+def test_full_ring_spills_to_the_pipe_without_reordering() -> None:
+    writer, reader = _ring_pair(capacity=256)
+    pipe = BytesIO()
+    messages = [{'type': 'event', 'seq': seq, 'padding': 'x' * 60} for seq in range(5)]
+    frames = [encode_message(message, 'binary') for message in messages]
+
+    writer.write(pipe, frames[:4])
+    assert (writer.ring_frames, writer.pipe_frames) == (2, 2)
+    reader.feed(pipe.getvalue())
+    assert list(reader.messages()) == messages[:4]
+
+    # Every spilled message has been handled, so the ring is usable again,
+    # and it wraps around its end.
+    pipe = BytesIO()
+    writer.write(pipe, frames[4:])
+    assert writer.ring_frames == 3
+    reader.feed(pipe.getvalue())
+    assert list(reader.messages()) == messages[4:]
+    assert reader.idle()
+
+
+def test_doorbell_only_when_the_consumer_waits_on_an_empty_ring() -> None:
+    writer, reader = _ring_pair(capacity=4096)
+    frame = encode_message({'type': 'event', 'seq': 1}, 'binary')
+
+    pipe = BytesIO()
+    writer.write(pipe, [frame])
+    writer.write(pipe, [frame])
+    assert writer.doorbells == 1
+
+    reader.feed(pipe.getvalue())
+    assert list(reader.messages()) == [{'type': 'event', 'seq': 1}] * 2
+    writer.write(BytesIO(), [frame])
+    # Busy consumer: no doorbell, and idle() sends it back for the new message.
+    assert writer.doorbells == 1
+    assert not reader.idle()
+    assert len(list(reader.messages())) == 1
+
+
+def test_live_room_worker_answers_over_rings_and_spills_large_requests() -> None:
+    run = measure_round_trip('binary', {'padding': 'x' * 70_000}, requests=3, ring_bytes=4096)
+    assert run.transport == 'ring'
+    assert len(run.round_trip_ns) == 3
+
+
+def test_stream_benchmark_delivers_every_message_over_a_ring() -> None:
+    run = measure_stream('ring', 'binary', {'packets': [{'seq': 1}]}, messages=300, ring_bytes=2048)
+    assert run.messages == 300
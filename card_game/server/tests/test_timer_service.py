@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from pathlib import Path
+from threading import Event, current_thread
+from time import monotonic, sleep
+
+import pytest
+
+import card_game.server.router_server as router_server
+from card_game.server.timer_service import COMPACT_MIN_CANCELLED, TimerService
+
+
+def _wait_for(condition, timeout: float = 5.0) -> None:
+    deadline = monotonic() + timeout
+    while not condition():
+        assert monotonic() < deadline, 'timed out'
+        sleep(0.01)
+
+
+def test_timers_fire_in_deadline_order_and_cancelled_ones_do_not() -> None:
+    service = TimerService(name='test-timers')
+    fired: list[str] = []
+    done = Event()
+    service.schedule(0.06, lambda: (fired.append('late'), done.set()))
+    service.schedule(0.02, lambda: fired.append('early'))
+    cancelled = service.schedule(0.04, lambda: fired.append('cancelled'))
+    # A nearer deadline wakes the sleeping scheduler.
+    service.schedule(0.0, lambda: fired.append('now'))
+
+    assert cancelled.cancel() is True and cancelled.cancel() is False
+    assert done.wait(timeout=5)
+    assert fired == ['now', 'early', 'late']
+    _wait_for(lambda: service._thread is None)
+    stats = service.stats()
+    assert (stats['pending'], stats['scheduled'], stats['fired'], stats['cancelled']) == (0, 4, 3, 1)
+
+
+def test_cancelled_timers_are_compacted_and_failures_do_not_stop_the_scheduler() -> None:
+    service = TimerService(name='test-timers')
+    handles = [service.schedule(60.0, lambda: None) for _ in range(2 * COMPACT_MIN_CANCELLED)]
+    for handle in handles:
+        handle.cancel()
+    assert len(service._heap) < len(handles) and len(service) == 0
+
+    done = Event()
+    service.schedule(0.0, lambda: 1 / 0)
+    service.schedule(0.01, done.set)
+    assert done.wait(timeout=5)
+    assert service.stats()['failed'] == 1
+
+
+class _StartedWorker:
+    def __init__(self, **_kwargs: object) -> None:
+        return
+
+    def start(self) -> None:
+        return
+
+    def request(self, method: str, params: dict[str, object], timeout_seconds: float = 2.0) -> dict[str, object]:
+        return {'status': 'ok'}
+
+    def stop(self, reason: str = 'stopped') -> None:
+        return
+
+    def snapshot(self) -> None:
+        return None
+
+
+@pytest.fixture
+def router(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(router_server, 'RoomWorker', _StartedWorker)
+    return router_server.MatchmakingRouter(db_path=str(tmp_path / 'router.sqlite3'))
+
+
+def test_finished_rooms_are_dropped_when_their_retention_timer_fires(router, monkeypatch) -> None:
+    monkeypatch.setattr(router_server, 'ROOM_FINISH_GRACE_SECONDS', 0.05)
+    expired_on: list[str] = []
+    expire_finished_room = router._expire_finished_room
+
+    def _record_thread(room_id: str) -> None:
+        expired_on.append(current_thread().name)
+        expire_finished_room(room_id)
+
+    monkeypatch.setattr(router, '_expire_finished_room', _record_thread)
+    alice = router.login('alice', None).session_id
+    router.enqueue(alice)
+    room_id = router.enqueue(router.login('bob', None).session_id)['room']['room_id']
+
+    router.mark_room_finished(room_id, 'room_error')
+    assert room_id in router._state.rooms_by_id
+    _wait_for(lambda: room_id not in router._state.rooms_by_id)
+    assert router.status(alice)['status'] == 'idle'
+    # The shared timer thread only hands the expiry over; the router locks are taken elsewhere.
+    assert len(expired_on) == 1 and expired_on[0].startswith('router-maintenance')
+
+
+def test_idle_sessions_leave_memory_when_the_idle_sweep_runs(router, monkeypatch) -> None:
+    monkeypatch.setattr(router_server, 'SESSION_COOKIE_MAX_AGE_SECONDS', 1)
+    pending_before = router._timers.stats()['pending']
+    idle = router.login('idle', None).session_id
+    queued = router.login('queued', None).session_id
+    router.enqueue(queued)
+    for index in range(20):
+        router.login(f'player-{index}', None)
+    # One sweep timer covers every session in memory.
+    assert router._timers.stats()['pending'] - pending_before <= 1
+    assert router.timer_metrics()[0]['session_sweep_armed'] is True
+
+    _wait_for(lambda: idle not in router._state.sessions_by_id, timeout=5)
+    # Queued players are kept however long they wait.
+    assert queued in router._state.sessions_by_id
+    router.dequeue(queued)
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+from collections import deque
+from heapq import heapify, heappop, heappush
+from itertools import count
+from threading import Condition, Lock, Thread
+from time import monotonic
+from typing import Callable
+
+from .latency_stats import percentile_ms
+from .server_types import JsonObject
+
+# Firing delays kept for the lateness percentiles.
+SAMPLE_LIMIT = 1024
+# Cancelled timers stay in the heap until they reach the top, or until at
+# least this many pile up and make up half of it.
+COMPACT_MIN_CANCELLED = 64
+
+
+class TimerHandle:
+    """A scheduled callback; ``cancel`` stops it if it has not fired yet."""
+
+    __slots__ = ('deadline', 'callback', 'cancelled', 'fired', '_service')
+
+    def __init__(self, service: TimerService, deadline: float, callback: Callable[[], None]) -> None:
+        self.deadline = deadline
+        self.callback = callback
+        self.cancelled = False
+        self.fired = False
+        self._service = service
+
+    @property
+    def active(self) -> bool:
+        return not self.cancelled and not self.fired
+
+    def cancel(self) -> bool:
+        """True if this call stopped the timer."""
+        return self._service._cancel(self)
+
+
+class TimerService:
+    """Deadlines for many timers, kept in one heap and fired by one thread.
+
+    ``schedule`` is O(log n) and ``cancel`` O(1): cancelled timers are
+    skipped when they reach the top of the heap. The scheduler thread
+    starts with the first timer and exits once none is pending, so an idle
+    service holds no thread.
+
+    Callbacks run one at a time on the scheduler thread and should be
+    short; one that needs to block should hand its work to another thread.
+    """
+
+    def __init__(self, name: str = 'timer-service') -> None:
+        self.name = name
+        self._condition = Condition()
+        self._heap: list[tuple[float, int, TimerHandle]] = []
+        self._sequence = count()
+        self._thread: Thread | None = None
+        self._cancelled_in_heap = 0
+        self._scheduled = 0
+        self._fired = 0
+        self._cancelled = 0
+        self._failed = 0
+        self._late_ns: deque[int] = deque(maxlen=SAMPLE_LIMIT)
+
+    def __len__(self) -> int:
+        with self._condition:
+            return len(self._heap) - self._cancelled_in_heap
+
+    def schedule(self, delay_seconds: float, callback: Callable[[], None]) -> TimerHandle:
+        """Call ``callback`` on the scheduler thread after ``delay_seconds``."""
+        with self._condition:
+            handle = TimerHandle(self, monotonic() + max(0.0, delay_seconds), callback)
+            heappush(self._heap, (handle.deadline, next(self._sequence), handle))
+            self._scheduled += 1
+            if self._thread is None:
+                self._thread = Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+            elif self._heap[0][2] is handle:
+                self._condition.notify()
+            return handle
+
+    def stats(self) -> JsonObject:
+        with self._condition:
+            late = list(self._late_ns)
+            return {
+                'pending': len(self._heap) - self._cancelled_in_heap,
+                'scheduled': self._scheduled,
+                'fired': self._fired,
+                'cancelled': self._cancelled,
+                'failed': self._failed,
+                'late_p50_ms': percentile_ms(late, 0.50),
+                'late_p99_ms': percentile_ms(late, 0.99),
+            }
+
+    def _cancel(self, handle: TimerHandle) -> bool:
+        with self._condition:
+            if not handle.active:
+                return False
+            handle.cancelled = True
+            self._cancelled += 1
+            self._cancelled_in_heap += 1
+            if self._cancelled_in_heap >= COMPACT_MIN_CANCELLED and 2 * self._cancelled_in_heap >= len(self._heap):
+                self._heap = [item for item in self._heap if not item[2].cancelled]
+                heapify(self._heap)
+                self._cancelled_in_heap = 0
+            return True
+
+    def _next_due_locked(self) -> TimerHandle | None:
+        """Wait for the next deadline; None once nothing is pending. The caller holds the condition."""
+        while True:
+            while self._heap and self._heap[0][2].cancelled:
+                heappop(self._heap)
+                self._cancelled_in_heap -= 1
+            if not self._heap:
+                return None
+            wait = self._heap[0][0] - monotonic()
+            if wait <= 0:
+                handle = heappop(self._heap)[2]
+                handle.fired = True
+                self._fired += 1
+                self._late_ns.append(int(-wait * 1e9))
+                return handle
+            self._condition.wait(wait)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                handle = self._next_due_locked()
+                if handle is None:
+                    self._thread = None
+                    return
+            try:
+                handle.callback()
+            except Exception as exc:
+                with self._condition:
+                    self._failed += 1
+                print(f'[TIMER] callback_failed service={self.name} error={exc!r}')
+
+
+_shared_service: TimerService | None = None
+_shared_service_lock = Lock()
+
+
+def shared_timer_service() -> TimerService:
+    """The service every room, session and grace deadline in this process uses."""
+    global _shared_service
+    with _shared_service_lock:
+        if _shared_service is None:
+            _shared_service = TimerService()
+        return _shared_service
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from queue import Queue
+from threading import Lock, Thread
+from time import monotonic_ns
+from typing import Any, Callable
+
+# Router commands that only touch session bookkeeping. They get their own lane
+# so a long engine drain behind protocol_socket_event cannot hold them up.
+CONTROL_METHODS = frozenset({'health', 'disconnect', 'client_unloading', 'replace_room_session'})
+
+type CommandHandler = Callable[[Any], None]
+type LaneKey = Callable[[Any], str | None]
+
+_CLOSE = object()
+
+
+class CommandLane:
+    """FIFO of pipe commands served one at a time by the lane's own thread."""
+
+    def __init__(self, name: str, handler: CommandHandler) -> None:
+        self.name = name
+        self._handler = handler
+        self._queue: Queue[tuple[int, Any]] = Queue()
+        self._stats_lock = Lock()
+        self._served = 0
+        self._wait_ns_total = 0
+        self._wait_ns_max = 0
+        self._thread = Thread(target=self._run, name=f'room-{name}-lane', daemon=True)
+        self._thread.start()
+
+    def put(self, message: Any) -> None:
+        self._queue.put((monotonic_ns(), message))
+
+    def stop(self) -> None:
+        """Serve what is already queued, then let the thread end; does not wait for it."""
+        self._queue.put((monotonic_ns(), _CLOSE))
+
+    def close(self, timeout: float | None = None) -> None:
+        """Serve what is already queued, then stop the thread."""
+        self.stop()
+        self._thread.join(timeout)
+
+    def stats(self) -> dict[str, Any]:
+        with self._stats_lock:
+            served = self._served
+            wait_ns_total = self._wait_ns_total
+            wait_ns_max = self._wait_ns_max
+        return {
+            'depth': self._queue.qsize(),
+            'served': served,
+            'wait_ms_avg': round(wait_ns_total / served / 1e6, 3) if served else 0.0,
+            'wait_ms_max': round(wait_ns_max / 1e6, 3),
+        }
+
+    def _run(self) -> None:
+        while True:
+            queued_at, message = self._queue.get()
+            if message is _CLOSE:
+                return
+            wait_ns = monotonic_ns() - queued_at
+            with self._stats_lock:
+                self._served += 1
+                self._wait_ns_total += wait_ns
+                self._wait_ns_max = max(self._wait_ns_max, wait_ns)
+            try:
+                self._handler(message)
+            except Exception as exc:
+                print(f'[ROOM_WORKER] lane_command_failed lane={self.name} error={exc!r}')
+
+
+class CommandLanes:
+    """Control and gameplay lanes for one room process.
+
+    Each lane keeps its commands in arrival order; the lanes run side by
+    side, the way concurrent Socket.IO handlers did in a standalone room
+    server. Room state shared between them stays behind ``transport_lock``.
+
+    With ``lane_key`` set (a room host), gameplay commands that carry a key
+    get a lane per key, created on first use, so one room's long engine
+    drain does not queue another room's commands behind it.
+    """
+
+    def __init__(self, handler: CommandHandler, *, lane_key: LaneKey | None = None) -> None:
+        self._handler = handler
+        self._lane_key = lane_key
+        self._keyed_lock = Lock()
+        self._keyed: dict[str, CommandLane] = {}
+        self.control = CommandLane('control', handler)
+        self.gameplay = CommandLane('gameplay', handler)
+
+    def route(self, message: Any) -> None:
+        method = message.get('method') if isinstance(message, dict) else None
+        if isinstance(method, str) and method.strip() in CONTROL_METHODS:
+            self.control.put(message)
+            return
+        key = self._lane_key(message) if self._lane_key is not None else None
+        self._gameplay_lane(key).put(message)
+
+    def retire(self, key: str) -> None:
+        """Stop the lane for ``key`` once it has served what is queued; a later command opens a new one."""
+        with self._keyed_lock:
+            lane = self._keyed.pop(key, None)
+        if lane is not None:
+            lane.stop()
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        with self._keyed_lock:
+            keyed = dict(self._keyed)
+        stats = {'control': self.control.stats(), 'gameplay': self.gameplay.stats()}
+        if keyed:
+            stats['keyed'] = {key: lane.stats() for key, lane in keyed.items()}
+        return stats
+
+    def close(self, timeout: float | None = None) -> None:
+        with self._keyed_lock:
+            keyed = list(self._keyed.values())
+            self._keyed.clear()
+        for lane in (self.control, self.gameplay, *keyed):
+            lane.close(timeout)
+
+    def _gameplay_lane(self, key: str | None) -> CommandLane:
+        if not key:
+            return self.gameplay
+        with self._keyed_lock:
+            lane = self._keyed.get(key)
+            if lane is None:
+                lane = CommandLane(f'gameplay-{key}', self._handler)
+                self._keyed[key] = lane
+            return lane
@@ -0,0 +1,291 @@
+from __future__ import annotations
+
+from typing import Any, BinaryIO, Iterator, Literal
+import json
+import marshal
+import os
+import struct
+
+type PipeFraming = Literal['binary', 'jsonl']
+
+# Router and room read the same variable; the router sets it on every child.
+PIPE_FRAMING_ENV = 'ROOM_PIPE_FRAMING'
+DEFAULT_PIPE_FRAMING: PipeFraming = 'binary'
+# Binary frames start with the body length as a big-endian unsigned int.
+FRAME_LENGTH_BYTES = 4
+# A length prefix above this means the reader has lost frame alignment.
+MAX_FRAME_BYTES = 256 * 1024 * 1024
+
+_FRAME_LENGTH = struct.Struct('>I')
+_JSON_SEPARATORS = (',', ':')
+
+
+class PipeFrameError(ValueError):
+    """One message could not be decoded; the stream is still aligned."""
+
+
+class PipeDesyncError(PipeFrameError):
+    """The stream is no longer aligned on frame boundaries and must be closed."""
+
+
+class RawJson(str):
+    """JSON text encoded once by the room and spliced into Socket.IO packets as-is."""
+
+
+def pipe_framing_from_env() -> PipeFraming:
+    raw = os.getenv(PIPE_FRAMING_ENV, '').strip().lower()
+    return 'jsonl' if raw == 'jsonl' else DEFAULT_PIPE_FRAMING
+
+
+def encode_message(message: dict[str, Any], framing: PipeFraming) -> bytes:
+    """One pipe message as bytes: a JSON line, or a 4-byte big-endian length and a marshal body."""
+    if framing == 'jsonl':
+        return json.dumps(message, separators=_JSON_SEPARATORS).encode('utf-8') + b'\n'
+    try:
+        body = marshal.dumps(message)
+    except ValueError:
+        body = marshal.dumps(_json_plain(message))
+    return _FRAME_LENGTH.pack(len(body)) + body
+
+
+def _json_plain(value: Any) -> Any:
+    """``value`` as JSON would deliver it: tuples as lists, str and int enums as their values.
+
+    marshal only accepts exact builtin types, so messages holding enums (for
+    example ``PlayerID`` keys) are converted first; both framings then hand
+    the reader the same values.
+    """
+    if isinstance(value, dict):
+        return {_json_plain(key): _json_plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_plain(item) for item in value]
+    if value is None or type(value) in (str, int, float, bool):
+        return value
+    if isinstance(value, str):
+        return str.__str__(value)
+    if isinstance(value, int):
+        return int(value)
+    if isinstance(value, float):
+        return float(value)
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+def write_message(stream: BinaryIO, message: dict[str, Any], framing: PipeFraming) -> None:
+    stream.write(encode_message(message, framing))
+    stream.flush()
+
+
+def read_message(stream: BinaryIO, framing: PipeFraming) -> Any:
+    """Next decoded message, or None at end of stream."""
+    if framing == 'jsonl':
+        while True:
+            line = stream.readline()
+            if not line:
+                return None
+            raw = line.strip()
+            if not raw:
+                continue
+            try:
+                return json.loads(raw)
+            except ValueError as exc:
+                raise PipeFrameError(f'undecodable line {raw[:200]!r}') from exc
+
+    header = _read_exactly(stream, FRAME_LENGTH_BYTES)
+    if header is None:
+        return None
+    (length,) = _FRAME_LENGTH.unpack(header)
+    if length > MAX_FRAME_BYTES:
+        raise PipeDesyncError(f'frame length {length} exceeds {MAX_FRAME_BYTES}')
+    body = _read_exactly(stream, length)
+    if body is None:
+        return None
+    try:
+        return marshal.loads(body)
+    except (EOFError, TypeError, ValueError) as exc:
+        raise PipeFrameError(f'undecodable {length}-byte frame') from exc
+
+
+def _read_exactly(stream: BinaryIO, size: int) -> bytes | None:
+    chunks: list[bytes] = []
+    remaining = size
+    while remaining > 0:
+        chunk = stream.read(remaining)
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return chunks[0] if len(chunks) == 1 else b''.join(chunks)
+
+
+class FrameDecoder:
+    """Incremental ``read_message`` for non-blocking readers fed arbitrary chunks."""
+
+    def __init__(self, framing: PipeFraming) -> None:
+        self.framing = framing
+        self._buffer = bytearray()
+
+    @property
+    def buffered_bytes(self) -> int:
+        return len(self._buffer)
+
+    def feed(self, data: bytes) -> None:
+        self._buffer += data
+
+    def messages(self) -> Iterator[Any]:
+        """Yield every complete buffered message.
+
+        A bad message is consumed before its PipeFrameError is raised, so
+        calling ``messages`` again resumes after it. PipeDesyncError leaves
+        the buffer as it is; the stream is unusable.
+        """
+        buffer = self._buffer
+        while buffer:
+            if self.framing == 'jsonl':
+                end = buffer.find(b'\n')
+                if end < 0:
+                    return
+                raw = bytes(buffer[:end]).strip()
+                del buffer[:end + 1]
+                if not raw:
+                    continue
+                try:
+                    message = json.loads(raw)
+                except ValueError as exc:
+                    raise PipeFrameError(f'undecodable line {raw[:200]!r}') from exc
+                yield message
+                continue
+
+            if len(buffer) < FRAME_LENGTH_BYTES:
+                return
+            (length,) = _FRAME_LENGTH.unpack_from(buffer)
+            if length > MAX_FRAME_BYTES:
+                raise PipeDesyncError(f'frame length {length} exceeds {MAX_FRAME_BYTES}')
+            end = FRAME_LENGTH_BYTES + length
+            if len(buffer) < end:
+                return
+            body = bytes(buffer[FRAME_LENGTH_BYTES:end])
+            del buffer[:end]
+            try:
+                message = marshal.loads(body)
+            except (EOFError, TypeError, ValueError) as exc:
+                raise PipeFrameError(f'undecodable {length}-byte frame') from exc
+            yield message
+
+
+def socket_payload_fields(payload: Any, framing: PipeFraming) -> dict[str, Any]:
+    """Room side of a ``socket_emit`` event: binary framing ships the payload already JSON encoded."""
+    if framing == 'jsonl':
+        return {'payload': payload}
+    return {'payload_json': json.dumps(payload, separators=_JSON_SEPARATORS)}
+
+
+class SocketEmitBatch:
+    """Room-side socket emits collected over one command, sent as ``socket_emit_batch`` events.
+
+    Payloads are JSON-encoded as they are added, like a single emit would be.
+    A ``protocol_packets`` emit to a sid whose previous emit in the batch was
+    also ``protocol_packets`` is merged into it: packets are concatenated and
+    the other fields come from the later payload. Broadcasts and other events
+    to the sid end the run, so every sid sees its events in emit order.
+    """
+
+    def __init__(self) -> None:
+        self._entries: list[_BatchedEmit] = []
+        # (room_id, sid) -> entry still open to merging.
+        self._mergeable: dict[tuple[str | None, str], _BatchedEmit] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, event: str, payload: Any, to: str | None = None, room_id: str | None = None) -> None:
+        if not to:
+            self._mergeable = {key: entry for key, entry in self._mergeable.items() if key[0] != room_id}
+            self._entries.append(_BatchedEmit(event, None, room_id, payload_json=_dumps(payload)))
+            return
+
+        key = (room_id, to)
+        packets = payload.get('packets') if event == 'protocol_packets' and isinstance(payload, dict) else None
+        if not isinstance(packets, list):
+            self._mergeable.pop(key, None)
+            self._entries.append(_BatchedEmit(event, to, room_id, payload_json=_dumps(payload)))
+            return
+
+        fragment = _dumps(packets)[1:-1]
+        rest_json = _dumps({name: value for name, value in payload.items() if name != 'packets'})
+        entry = self._mergeable.get(key)
+        if entry is None:
+            entry = _BatchedEmit(event, to, room_id)
+            self._entries.append(entry)
+            self._mergeable[key] = entry
+        if fragment:
+            entry.packet_fragments.append(fragment)
+        entry.rest_json = rest_json
+
+    def drain(self) -> list[dict[str, Any]]:
+        """One ``socket_emit_batch`` payload per room, in emit order; leaves the batch empty."""
+        emits_by_room: dict[str | None, list[dict[str, Any]]] = {}
+        for entry in self._entries:
+            emits_by_room.setdefault(entry.room_id, []).append(entry.to_emit())
+        self._entries = []
+        self._mergeable = {}
+        return [
+            {'emits': emits} if room_id is None else {'room_id': room_id, 'emits': emits}
+            for room_id, emits in emits_by_room.items()
+        ]
+
+
+class _BatchedEmit:
+    __slots__ = ('event', 'to', 'room_id', 'payload_json', 'packet_fragments', 'rest_json')
+
+    def __init__(self, event: str, to: str | None, room_id: str | None, payload_json: str | None = None) -> None:
+        self.event = event
+        self.to = to
+        self.room_id = room_id
+        self.payload_json = payload_json
+        self.packet_fragments: list[str] = []
+        self.rest_json = '{}'
+
+    def to_emit(self) -> dict[str, Any]:
+        payload_json = self.payload_json
+        if payload_json is None:
+            packets = '{"packets":[' + ','.join(self.packet_fragments) + ']'
+            payload_json = packets + ('}' if self.rest_json == '{}' else ',' + self.rest_json[1:])
+        emit: dict[str, Any] = {'event': self.event, 'payload_json': payload_json}
+        if self.to:
+            emit['to'] = self.to
+        return emit
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, separators=_JSON_SEPARATORS)
+
+
+def socket_payload_from_event(body: dict[str, Any]) -> Any:
+    """Router side of a ``socket_emit`` event: the payload to hand to Socket.IO."""
+    payload_json = body.get('payload_json')
+    if isinstance(payload_json, str):
+        return RawJson(payload_json)
+    return body.get('payload')
+
+
+class SocketJson:
+    """``json`` module stand-in for Socket.IO that emits ``RawJson`` arguments verbatim.
+
+    Socket.IO encodes an event as the JSON array ``[event, *args]``; a
+    ``RawJson`` argument is copied into that array instead of being quoted as
+    a string. Everything else goes through the standard json module.
+    """
+
+    @staticmethod
+    def dumps(obj: Any, *args: Any, **kwargs: Any) -> str:
+        if not isinstance(obj, list) or not any(isinstance(item, RawJson) for item in obj):
+            return json.dumps(obj, *args, **kwargs)
+        separators = kwargs.get('separators') or (', ', ': ')
+        return '[' + separators[0].join(
+            str.__str__(item) if isinstance(item, RawJson) else json.dumps(item, *args, **kwargs)
+            for item in obj
+        ) + ']'
+
+    @staticmethod
+    def loads(text: str | bytes, *args: Any, **kwargs: Any) -> Any:
+        return json.loads(text, *args, **kwargs)
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+from threading import Lock, Thread, get_ident
+from time import monotonic
+from typing import Callable
+import os
+import selectors
+
+# Bytes read from one ready pipe before moving on to the next, so a room
+# streaming a large payload cannot starve the others.
+READ_CHUNK_BYTES = 64 * 1024
+
+type PipeDataCallback = Callable[[bytes], None]
+type PipeClosedCallback = Callable[[], None]
+type PipePollCallback = Callable[[], None]
+
+
+class PipeReactor:
+    """One thread reading the stdout pipe of every room process.
+
+    ``watch`` hands a pipe to the reactor; from then on ``on_data`` receives
+    every chunk read from it and ``on_closed`` runs once at end of stream.
+    An optional ``on_poll`` also runs every ``poll_interval`` seconds while
+    the pipe is open, for owners with state outside the pipe to check.
+    Callbacks run on the reactor thread and must not block: anything slow
+    stalls every room behind it.
+    """
+
+    def __init__(self, name: str = 'room-pipe-reactor', poll_interval: float = 0.05) -> None:
+        self.name = name
+        self.poll_interval = poll_interval
+        self._selector = selectors.DefaultSelector()
+        self._lock = Lock()
+        self._pending: list[tuple[int, PipeDataCallback, PipeClosedCallback, PipePollCallback | None]] = []
+        # Only touched on the reactor thread.
+        self._pollers: dict[int, PipePollCallback] = {}
+        self._next_poll_at = 0.0
+        self._thread: Thread | None = None
+        self._thread_ident: int | None = None
+        self._wake_read, self._wake_write = os.pipe()
+        os.set_blocking(self._wake_read, False)
+        os.set_blocking(self._wake_write, False)
+        self._selector.register(self._wake_read, selectors.EVENT_READ)
+
+    @property
+    def watched_count(self) -> int:
+        """Pipes currently being read, not counting ones still being handed over."""
+        return len(self._selector.get_map()) - 1
+
+    def in_reactor_thread(self) -> bool:
+        return self._thread_ident == get_ident()
+
+    def watch(
+        self,
+        fd: int,
+        on_data: PipeDataCallback,
+        on_closed: PipeClosedCallback,
+        on_poll: PipePollCallback | None = None,
+    ) -> None:
+        """Start reading ``fd``; safe from any thread.
+
+        The fd is switched to non-blocking mode; its owner keeps it open until
+        ``on_closed`` and closes it there.
+        """
+        os.set_blocking(fd, False)
+        with self._lock:
+            self._pending.append((fd, on_data, on_closed, on_poll))
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+        self._wake()
+
+    def _wake(self) -> None:
+        try:
+            os.write(self._wake_write, b'\0')
+        except BlockingIOError:
+            # Already full of wake-ups the reactor has not drained yet.
+            pass
+
+    def _run(self) -> None:
+        self._thread_ident = get_ident()
+        while True:
+            for key, _events in self._selector.select(self.poll_interval if self._pollers else None):
+                if key.fd == self._wake_read:
+                    self._register_pending()
+                    continue
+                on_data, on_closed = key.data
+                try:
+                    data = os.read(key.fd, READ_CHUNK_BYTES)
+                except BlockingIOError:
+                    continue
+                except OSError as exc:
+                    print(f'[PIPE_REACTOR] read_failed fd={key.fd} error={exc}')
+                    data = b''
+                if data:
+                    self._call(on_data, data)
+                    continue
+                self._selector.unregister(key.fd)
+                self._pollers.pop(key.fd, None)
+                self._call(on_closed)
+            if self._pollers and monotonic() >= self._next_poll_at:
+                self._next_poll_at = monotonic() + self.poll_interval
+                for on_poll in list(self._pollers.values()):
+                    self._call(on_poll)
+
+    def _register_pending(self) -> None:
+        try:
+            while os.read(self._wake_read, 4096):
+                pass
+        except BlockingIOError:
+            pass
+        with self._lock:
+            pending, self._pending = self._pending, []
+        for fd, on_data, on_closed, on_poll in pending:
+            try:
+                self._selector.register(fd, selectors.EVENT_READ, (on_data, on_closed))
+            except (KeyError, OSError, ValueError) as exc:
+                print(f'[PIPE_REACTOR] watch_failed fd={fd} error={exc}')
+                self._call(on_closed)
+                continue
+            if on_poll is not None:
+                self._pollers[fd] = on_poll
+
+    def _call(self, callback: Callable[..., None], *args: bytes) -> None:
+        try:
+            callback(*args)
+        except Exception as exc:
+            print(f'[PIPE_REACTOR] callback_failed error={exc!r}')
+
+
+_shared_reactor: PipeReactor | None = None
+_shared_reactor_lock = Lock()
+
+
+def shared_pipe_reactor() -> PipeReactor:
+    """The reactor every room worker in this process registers with."""
+    global _shared_reactor
+    with _shared_reactor_lock:
+        if _shared_reactor is None:
+            _shared_reactor = PipeReactor()
+        return _shared_reactor
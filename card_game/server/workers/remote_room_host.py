@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+from threading import Event, Thread
+from typing import Any, Callable
+import hmac
+import json
+import socket
+import subprocess
+
+from .pipe_framing import FrameDecoder, PipeFraming
+from .room_host_pool import RoomHostWorker
+
+# Router setting: TCP port room host agents register on; 0 keeps every room local.
+ROOM_HOST_LISTEN_PORT_ENV = 'ROOM_HOST_LISTEN_PORT'
+# Router setting: address the listener binds; should be a private interface.
+ROOM_HOST_LISTEN_HOST_ENV = 'ROOM_HOST_LISTEN_HOST'
+# Shared secret agents present when they register; the listener stays off without one.
+ROOM_HOST_TOKEN_ENV = 'ROOM_HOST_TOKEN'
+# The hello and welcome lines are small JSON objects; anything longer is refused.
+HANDSHAKE_MAX_BYTES = 4096
+HANDSHAKE_TIMEOUT_SECONDS = 5.0
+# A write to a remote host that makes no progress for this long fails its command.
+SEND_TIMEOUT_SECONDS = 10.0
+# The router probes every remote host this often and drops one that does not answer in time.
+HEARTBEAT_INTERVAL_SECONDS = 5.0
+HEARTBEAT_TIMEOUT_SECONDS = 10.0
+# Remote hosts always speak JSON lines. The binary framing is marshal, which
+# is unsafe to decode from another machine and changes between Python
+# versions, so it stays on local pipes between processes of one install.
+REMOTE_HOST_FRAMING: PipeFraming = 'jsonl'
+
+
+def send_handshake(sock: socket.socket, message: dict[str, Any]) -> None:
+    sock.sendall(json.dumps(message, separators=(',', ':')).encode('utf-8') + b'\n')
+
+
+def recv_handshake(sock: socket.socket) -> dict[str, Any]:
+    """Read one handshake line without reading past it: the room stream follows on the same socket."""
+    line = bytearray()
+    while not line.endswith(b'\n'):
+        if len(line) >= HANDSHAKE_MAX_BYTES:
+            raise ValueError('handshake line too long')
+        chunk = sock.recv(1)
+        if not chunk:
+            raise ConnectionError('connection closed during handshake')
+        line += chunk
+    message = json.loads(line)
+    if not isinstance(message, dict):
+        raise ValueError('handshake is not an object')
+    return message
+
+
+class _RemoteHostConnection:
+    """Stands in for the Popen of a local room host: the socket is both its stdin and stdout."""
+
+    def __init__(self, sock: socket.socket) -> None:
+        # A timeout keeps the fd non-blocking for the reactor while sendall
+        # still waits for buffer space.
+        sock.settimeout(SEND_TIMEOUT_SECONDS)
+        self._sock = sock
+        self._closed = Event()
+        self._fileno = sock.fileno()
+        self.stdin = self
+        self.stdout = self
+        self.pid: int | None = None
+        self.returncode: int | None = None
+        self._hung_up_by_router = False
+
+    def fileno(self) -> int:
+        return self._fileno
+
+    def write(self, data: bytes) -> None:
+        self._sock.sendall(data)
+
+    def flush(self) -> None:
+        return
+
+    def close(self) -> None:
+        """Reactor end of stream: the agent is gone or the router hung up."""
+        self._sock.close()
+        if self.returncode is None:
+            self.returncode = 0 if self._hung_up_by_router else 1
+        self._closed.set()
+
+    def poll(self) -> int | None:
+        return self.returncode
+
+    def wait(self, timeout: float | None = None) -> int:
+        if not self._closed.wait(timeout):
+            raise subprocess.TimeoutExpired('room host agent', timeout or 0)
+        return self.returncode if self.returncode is not None else 1
+
+    def hang_up(self, *, lost: bool) -> None:
+        """Shut the socket down; the reactor then sees end of stream and closes it."""
+        self._hung_up_by_router = not lost
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+    def terminate(self) -> None:
+        self.hang_up(lost=False)
+
+    kill = terminate
+
+
+class RemoteRoomHost(RoomHostWorker):
+    """A room host on another machine, reached through its agent's TCP connection.
+
+    Rooms, commands and events work as with a local ``RoomHostWorker``; the
+    connection replaces the process pipes, framed as JSON lines. Losing the
+    connection, or a heartbeat going unanswered, finishes every room on the
+    host.
+    """
+
+    remote = True
+
+    def __init__(
+        self,
+        host_id: str,
+        sock: socket.socket,
+        capacity: int,
+        on_finished: Callable[[str, str], None],
+    ) -> None:
+        peer_host, peer_port = sock.getpeername()[:2]
+        super().__init__(
+            host_id=host_id,
+            host=peer_host,
+            port=peer_port,
+            transport_mode='pipe',
+            on_finished=on_finished,
+        )
+        self.capacity = capacity
+        self.pipe_framing = REMOTE_HOST_FRAMING
+        self.ring_bytes = 0
+        self._decoder = FrameDecoder(REMOTE_HOST_FRAMING)
+        self._log_path = f'remote:{peer_host}:{peer_port}'
+        self._connection = _RemoteHostConnection(sock)
+        self._process = self._connection  # type: ignore[assignment]
+        self._heartbeat_thread: Thread | None = None
+
+    def start(self) -> None:
+        """Start reading the connection and probing the host; later calls do nothing."""
+        with self._lock:
+            if self._finished or self._heartbeat_thread is not None:
+                return
+            self._watch_pipe_locked()
+            self._heartbeat_thread = Thread(target=self._heartbeat, name=f'room-host-heartbeat-{self.host_id}', daemon=True)
+            self._heartbeat_thread.start()
+
+    def _heartbeat(self) -> None:
+        while not self._stop_event.wait(HEARTBEAT_INTERVAL_SECONDS):
+            try:
+                self.request('health', {}, timeout_seconds=HEARTBEAT_TIMEOUT_SECONDS)
+            except (RuntimeError, TimeoutError) as exc:
+                if self._stop_event.is_set():
+                    return
+                print(f'[ROOM_HOST] remote_host_unresponsive host_id={self.host_id} error={exc}')
+                self._connection.hang_up(lost=True)
+                return
+
+    def _finish_pipe(self, process: subprocess.Popen[bytes]) -> None:
+        if process.wait() != 0:
+            self.mark_finished('room_host_lost')
+        super()._finish_pipe(process)
+
+
+class RemoteHostListener:
+    """Accepts room host agents on a TCP port and hands each one to ``on_host``.
+
+    The connection is plain TCP and, once the token checks out, the router
+    trusts what the agent sends. Bind ``host`` to a private interface only.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        token: str,
+        on_host: Callable[[RemoteRoomHost], bool],
+        on_host_finished: Callable[[str, str], None],
+    ) -> None:
+        if not token:
+            raise ValueError(f'{ROOM_HOST_TOKEN_ENV} must be set to accept remote room hosts')
+        self._token = token.encode('utf-8')
+        self._on_host = on_host
+        self._on_host_finished = on_host_finished
+        self._server = socket.create_server((host, port))
+        self._thread = Thread(target=self._accept_loop, name='room-host-listener', daemon=True)
+
+    @property
+    def address(self) -> tuple[str, int]:
+        return self._server.getsockname()[:2]
+
+    def start(self) -> None:
+        self._thread.start()
+        print(f'[ROOM_HOST] listening address={self.address[0]}:{self.address[1]}')
+        if self.address[0] in {'0.0.0.0', '::'}:
+            print(f'[ROOM_HOST] listener_on_all_interfaces hint=set {ROOM_HOST_LISTEN_HOST_ENV} to a private address')
+
+    def close(self) -> None:
+        self._server.close()
+
+    def _accept_loop(self) -> None:
+        while True:
+            try:
+                sock, peer = self._server.accept()
+            except OSError:
+                return
+            # A slow or silent client must not hold up the next agent.
+            Thread(target=self._handshake, args=(sock, peer), name='room-host-handshake', daemon=True).start()
+
+    def _handshake(self, sock: socket.socket, peer: tuple[str, int]) -> None:
+        try:
+            self._register(sock)
+        except Exception as exc:
+            print(f'[ROOM_HOST] agent_rejected peer={peer[0]}:{peer[1]} error={exc}')
+            sock.close()
+
+    def _register(self, sock: socket.socket) -> None:
+        sock.settimeout(HANDSHAKE_TIMEOUT_SECONDS)
+        hello = recv_handshake(sock)
+        token = hello.get('token')
+        if not isinstance(token, str) or not hmac.compare_digest(token.encode('utf-8'), self._token):
+            send_handshake(sock, {'type': 'rejected', 'error': 'bad token'})
+            raise PermissionError('bad token')
+        host_id_raw = hello.get('host_id')
+        host_id = host_id_raw.strip() if isinstance(host_id_raw, str) else ''
+        capacity = hello.get('capacity')
+        if hello.get('type') != 'hello' or not host_id or not isinstance(capacity, int) or capacity < 1:
+            send_handshake(sock, {'type': 'rejected', 'error': 'invalid hello'})
+            raise ValueError(f'invalid hello {hello!r}')
+
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        # Welcome first: once the host is placeable, room commands follow on this socket.
+        send_handshake(sock, {'type': 'welcome', 'host_id': f'remote-{host_id}', 'framing': REMOTE_HOST_FRAMING})
+        host = RemoteRoomHost(f'remote-{host_id}', sock, capacity, self._on_host_finished)
+        host.start()
+        if not self._on_host(host):
+            print(f'[ROOM_HOST] agent_rejected host_id={host.host_id} error=host_id already registered')
+            host.stop('room_host_duplicate')
+            return
+        print(f'[ROOM_HOST] remote_host_registered host_id={host.host_id} capacity={capacity} peer={host.host}:{host.port}')
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+from random import Random
+from threading import RLock
+from types import ModuleType
+from typing import Callable
+import random
+
+from ..game_runner import FrontendGameBridge, build_environment_for_players
+from ..models.server_models import MultiplayerTransportState
+from ..runtime.room_state import RoomRuntime, bind_room, bound_room, set_default_room, using_rng
+from ..timer_service import TimerHandle, shared_timer_service
+from .command_lanes import CommandLane
+
+
+def build_room_runtime(
+    room_server: ModuleType,
+    room_id: str,
+    *,
+    player_session_ids: tuple[str, str] = ('', ''),
+    p1_username: str,
+    p2_username: str,
+    p1_card_ids: list[str] | None = None,
+    p2_card_ids: list[str] | None = None,
+) -> RoomRuntime:
+    """Build a fresh room on its own RNG stream; the process RNG is left as it was."""
+    rng = Random()
+    with using_rng(rng):
+        bridge = FrontendGameBridge(env=build_environment_for_players(p1_username, p2_username, p1_card_ids, p2_card_ids))
+        setup_payload = bridge.get_setup_payload()
+
+    return RoomRuntime(
+        room_id_from_env=room_id,
+        frontend_game_bridge=bridge,
+        entity_setup_payload=setup_payload,
+        transport_state=MultiplayerTransportState(disconnect_grace_seconds=room_server.DISCONNECT_GRACE_SECONDS),
+        expected_p1_session_id=player_session_ids[0],
+        expected_p2_session_id=player_session_ids[1],
+        p1_username=p1_username,
+        p2_username=p2_username,
+        rng=rng,
+    )
+
+
+def install_room_runtime(room_server: ModuleType, room: RoomRuntime) -> None:
+    """Make ``room`` the room server's only room, for processes that host one match."""
+    set_default_room(room)
+    # One match per process: the process RNG carries on the room's stream.
+    random.setstate(room.rng.getstate())
+
+
+class RoomHost:
+    """Hosts many rooms in one room server process.
+
+    The room server handlers read per-match state through the room bound to
+    the calling thread (see ``runtime.room_state``), so each call binds its
+    room for the duration of the call. Calls into one room are serialized by
+    that room's lock; different rooms run side by side. Timers a room
+    schedules (disconnect forfeit, close after winner) re-enter through the
+    same path from the room's own timer lane, so a busy room holds up
+    neither the shared timer thread nor another room's timers. Process
+    termination becomes closing the room.
+    """
+
+    def __init__(
+        self,
+        room_server: ModuleType,
+        *,
+        on_room_finished: Callable[[str, str, str | None], None],
+        on_room_closed: Callable[[str, str], None],
+        close_delay_seconds: float = 0.25,
+    ) -> None:
+        self._server = room_server
+        # Guards the room tables only; never held while a room runs.
+        self._lock = RLock()
+        self._rooms: dict[str, RoomRuntime] = {}
+        # Due room timers run on their room's lane, in firing order, instead
+        # of on the process-wide timer thread.
+        self._timer_lanes: dict[str, CommandLane] = {}
+        self._on_room_finished = on_room_finished
+        self._on_room_closed = on_room_closed
+        self._close_delay_seconds = close_delay_seconds
+
+        room_server._schedule_timer = self._room_timer
+        room_server._notify_router_room_finished = self._notify_room_finished
+        room_server._schedule_process_termination = self._schedule_room_close
+
+    @property
+    def bound_room_id(self) -> str | None:
+        room = bound_room()
+        return room.room_id if room is not None else None
+
+    def room_ids(self) -> list[str]:
+        # No host lock: health answers from the control lane while a room
+        # call runs, and copying the dict's keys is atomic under the GIL.
+        return list(self._rooms)
+
+    def open_room(
+        self,
+        room_id: str,
+        *,
+        player_session_ids: tuple[str, str] = ('', ''),
+        p1_username: str,
+        p2_username: str,
+        p1_card_ids: list[str] | None = None,
+        p2_card_ids: list[str] | None = None,
+    ) -> RoomRuntime:
+        with self._lock:
+            if room_id in self._rooms:
+                raise ValueError(f'Room already hosted: {room_id}')
+
+        room = build_room_runtime(
+            self._server,
+            room_id,
+            player_session_ids=player_session_ids,
+            p1_username=p1_username,
+            p2_username=p2_username,
+            p1_card_ids=p1_card_ids,
+            p2_card_ids=p2_card_ids,
+        )
+        with self._lock:
+            if room_id in self._rooms:
+                raise ValueError(f'Room already hosted: {room_id}')
+            self._rooms[room_id] = room
+            self._timer_lanes[room_id] = CommandLane(f'timers-{room_id}', lambda call: call())
+        return room
+
+    def close_room(self, room_id: str, reason: str) -> bool:
+        with self._lock:
+            room = self._rooms.pop(room_id, None)
+            timer_lane = self._timer_lanes.pop(room_id, None)
+        if timer_lane is not None:
+            timer_lane.stop()
+        if room is None:
+            return False
+        with room.call_lock:
+            for timer in room.disconnect_forfeit_timer_by_slot.values():
+                if timer is not None:
+                    timer.cancel()
+            if not room.room_finished_notified:
+                with bind_room(room):
+                    room.frontend_game_bridge.finish_recording(reason)
+        self._on_room_closed(room_id, reason)
+        return True
+
+    def call[T](self, room_id: str, fn: Callable[[], T], *, exclusive: bool = True) -> T:
+        """Run ``fn`` with ``room_id`` bound, after any other call into that room.
+
+        ``exclusive=False`` skips the room's call lock, for control commands
+        that only touch state behind ``transport_lock``; they then run beside
+        the room's gameplay the way they do in a single-room process.
+        """
+        with self._lock:
+            room = self._rooms.get(room_id)
+        if room is None:
+            raise KeyError(f'Unknown room: {room_id}')
+        if not exclusive:
+            with bind_room(room):
+                return fn()
+        with room.call_lock, bind_room(room):
+            return fn()
+
+    def _room_timer(self, interval: float, function: Callable[[], None]) -> TimerHandle:
+        room = bound_room()
+        if room is None:
+            return shared_timer_service().schedule(interval, function)
+        room_id = room.room_id
+
+        def _in_room() -> None:
+            try:
+                self.call(room_id, function)
+            except KeyError:
+                return
+
+        return shared_timer_service().schedule(interval, lambda: self._put_timer(room_id, _in_room))
+
+    def _put_timer(self, room_id: str, call: Callable[[], None]) -> None:
+        with self._lock:
+            lane = self._timer_lanes.get(room_id)
+        if lane is not None:
+            lane.put(call)
+
+    def _notify_room_finished(self, reason: str, winner: str | None = None) -> None:
+        room_id = self.bound_room_id
+        if room_id is not None:
+            self._on_room_finished(room_id, reason, winner)
+
+    def _schedule_room_close(self, reason: str) -> None:
+        room = bound_room()
+        if room is None or room.termination_requested:
+            return
+        room.termination_requested = True
+        room_id = room.room_id
+        print(f'[ROOM_HOST] room_close_scheduled room_id={room_id} reason={reason!r}')
+        shared_timer_service().schedule(
+            self._close_delay_seconds,
+            lambda: self._put_timer(room_id, lambda: self.close_room(room_id, reason)),
+        )
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from pathlib import Path
+from time import sleep
+from uuid import uuid4
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+
+from .pipe_framing import PIPE_FRAMING_ENV, PipeFraming
+from .remote_room_host import HANDSHAKE_TIMEOUT_SECONDS, REMOTE_HOST_FRAMING, ROOM_HOST_TOKEN_ENV, recv_handshake, send_handshake
+from .room_worker import ROOM_ENV_VARS
+
+# Agent setting: "host:port" of the router's ROOM_HOST_LISTEN_PORT.
+ROOM_HOST_ROUTER_ENV = 'ROOM_HOST_ROUTER'
+# Rooms this machine takes at most; the router never places more on it.
+ROOM_HOST_CAPACITY_ENV = 'ROOM_HOST_CAPACITY'
+DEFAULT_CAPACITY = 16
+RECONNECT_SECONDS = 2.0
+
+
+class RouterRejectedError(RuntimeError):
+    """The router refused the agent's registration; retrying will not help."""
+
+
+def parse_router_address(raw: str) -> tuple[str, int]:
+    host, _, port = raw.strip().rpartition(':')
+    if not host or not port.isdigit():
+        raise ValueError(f'router address must be host:port, got {raw!r}')
+    return host.strip('[]'), int(port)
+
+
+def host_process_env(host_id: str, framing: PipeFraming) -> dict[str, str]:
+    env = os.environ.copy()
+    for name in ROOM_ENV_VARS:
+        env.pop(name, None)
+    # Room code has no use for the router secret.
+    env.pop(ROOM_HOST_TOKEN_ENV, None)
+    env['ROOM_TRANSPORT_MODE'] = 'pipe'
+    env['ROOM_HOST_ID'] = host_id
+    env[PIPE_FRAMING_ENV] = framing
+    env.setdefault('SERVER_DEBUG', 'false')
+    env.setdefault('PYTHONUNBUFFERED', '1')
+    return env
+
+
+def serve_once(router: tuple[str, int], host_id: str, capacity: int, token: str) -> int:
+    """Register with the router and host its rooms until the connection ends.
+
+    The room host process reads commands from and writes events to the
+    router connection directly, exactly as it would its pipes. Returns that
+    process's exit code.
+    """
+    sock = socket.create_connection(router, timeout=HANDSHAKE_TIMEOUT_SECONDS)
+    try:
+        send_handshake(sock, {'type': 'hello', 'host_id': host_id, 'capacity': capacity, 'token': token})
+        welcome = recv_handshake(sock)
+        if welcome.get('type') != 'welcome':
+            raise RouterRejectedError(str(welcome.get('error') or 'no reason given'))
+        if welcome.get('framing') != REMOTE_HOST_FRAMING:
+            # Never decode marshal frames from another machine.
+            raise RouterRejectedError(f'router asked for {welcome.get("framing")!r} framing; remote hosts use {REMOTE_HOST_FRAMING}')
+        framing: PipeFraming = REMOTE_HOST_FRAMING
+        # The host process inherits the descriptor and expects blocking reads.
+        sock.settimeout(None)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        log_path = Path(tempfile.gettempdir()) / f'avge-room-host-{host_id}-{datetime.now().isoformat()}.log'
+        with open(log_path, 'a', encoding='utf-8') as log_file:
+            process = subprocess.Popen(
+                [sys.executable, '-m', 'card_game.server.workers.room_pipe_runtime'],
+                cwd=str(Path(__file__).resolve().parents[3]),
+                env=host_process_env(host_id, framing),
+                stdin=sock.fileno(),
+                stdout=sock.fileno(),
+                stderr=log_file,
+            )
+    finally:
+        # From here the host process holds the only copy of the connection.
+        sock.close()
+
+    print(f'[ROOM_HOST_AGENT] registered host_id={welcome.get("host_id")} pid={process.pid} log={log_path}')
+    try:
+        return process.wait()
+    except KeyboardInterrupt:
+        process.terminate()
+        raise
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='Host rooms on this machine for a router elsewhere.')
+    parser.add_argument('--router', default=os.getenv(ROOM_HOST_ROUTER_ENV, ''), help=f'Router host:port (default: ${ROOM_HOST_ROUTER_ENV}).')
+    parser.add_argument('--host-id', default=f'{socket.gethostname()}-{uuid4().hex[:6]}', help='Name of this host in router logs.')
+    parser.add_argument(
+        '--capacity',
+        type=int,
+        default=int(os.getenv(ROOM_HOST_CAPACITY_ENV, '') or DEFAULT_CAPACITY),
+        help=f'Rooms to host at most (default: ${ROOM_HOST_CAPACITY_ENV} or {DEFAULT_CAPACITY}).',
+    )
+    parser.add_argument('--once', action='store_true', help='Exit when the router connection ends instead of reconnecting.')
+    args = parser.parse_args(argv)
+
+    token = os.getenv(ROOM_HOST_TOKEN_ENV, '').strip()
+    if not token:
+        parser.error(f'{ROOM_HOST_TOKEN_ENV} must be set to the router secret')
+    if args.capacity < 1:
+        parser.error('--capacity must be at least 1')
+    try:
+        router = parse_router_address(args.router)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    while True:
+        try:
+            exit_code = serve_once(router, args.host_id, args.capacity, token)
+            print(f'[ROOM_HOST_AGENT] disconnected host_id={args.host_id} code={exit_code}')
+        except RouterRejectedError as exc:
+            print(f'[ROOM_HOST_AGENT] rejected host_id={args.host_id} error={exc}')
+            return 1
+        except (OSError, ValueError) as exc:
+            exit_code = 1
+            print(f'[ROOM_HOST_AGENT] connect_failed router={args.router} error={exc}')
+        if args.once:
+            return exit_code
+        sleep(RECONNECT_SECONDS)
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,320 @@
+from __future__ import annotations
+
+from concurrent.futures import Future
+from pathlib import Path
+from threading import RLock
+from time import monotonic
+from typing import Any, Callable
+import subprocess
+import tempfile
+from datetime import datetime
+from uuid import uuid4
+
+from .room_worker import ROOM_ENV_VARS, RoomTransportMode, RoomWorker, RoomWorkerSnapshot
+
+# How long a room waits for its host to acknowledge open_room, including the
+# host booting if this is its first room.
+OPEN_ROOM_TIMEOUT_SECONDS = 10.0
+
+
+class RoomHostWorker(RoomWorker):
+    """Supervisor for one room host process running many rooms.
+
+    Events from the process carry a ``room_id`` and are routed to the
+    ``HostedRoom`` it belongs to. When the process exits every room still on
+    it is finished.
+    """
+
+    # Remote hosts (see remote_room_host) declare their own capacity and do
+    # not count against the pool's local process limit.
+    remote = False
+    capacity: int | None = None
+
+    def __init__(
+        self,
+        host_id: str,
+        host: str,
+        port: int,
+        transport_mode: RoomTransportMode,
+        on_finished: Callable[[str, str], None],
+    ) -> None:
+        super().__init__(
+            room_id=host_id,
+            player_session_ids=('', ''),
+            host=host,
+            port=port,
+            p1_username='',
+            p2_username='',
+            p1_selected_cards=None,
+            p2_selected_cards=None,
+            transport_mode=transport_mode,
+            on_finished=on_finished,
+        )
+        self.host_id = host_id
+        self._rooms: dict[str, HostedRoom] = {}
+        self._log_path = str(Path(tempfile.gettempdir()) / f"avge-room-host-{host_id}-{datetime.now().isoformat()}.log")
+
+    @property
+    def room_count(self) -> int:
+        with self._lock:
+            return len(self._rooms)
+
+    @property
+    def available(self) -> bool:
+        with self._lock:
+            process = self._process
+            return not self._finished and (process is None or process.poll() is None)
+
+    def attach(self, room: HostedRoom) -> None:
+        with self._lock:
+            self._rooms[room.room_id] = room
+
+    def release(self, room_id: str) -> None:
+        with self._lock:
+            self._rooms.pop(room_id, None)
+
+    def _child_env(self) -> dict[str, str]:
+        env = super()._child_env()
+        for name in ROOM_ENV_VARS:
+            env.pop(name, None)
+        env['ROOM_HOST_ID'] = self.host_id
+        return env
+
+    def _finish_pipe(self, process: subprocess.Popen[bytes]) -> None:
+        super()._finish_pipe(process)
+        with self._lock:
+            rooms = list(self._rooms.values())
+            reason = self._finish_reason or 'room_host_exit'
+        # Finish rooms outside the host lock; their callbacks take the router lock.
+        for room in rooms:
+            room.mark_finished(reason)
+
+    def _dispatch_event(self, event_type: str, payload: dict[str, Any]) -> None:
+        room_id = payload.get('room_id')
+        with self._lock:
+            room = self._rooms.get(room_id) if isinstance(room_id, str) else None
+        if room is None:
+            if event_type == 'room_closed':
+                # Rooms the router stopped are released before the host confirms.
+                return
+            print(f'[ROOM_HOST] event_dropped host_id={self.host_id} room_id={room_id!r} event={event_type}')
+            return
+
+        if event_type == 'room_closed':
+            reason_raw = payload.get('reason')
+            reason = reason_raw.strip() if isinstance(reason_raw, str) and reason_raw.strip() else 'room_closed'
+            room.mark_finished(reason)
+            return
+        room.dispatch_event(event_type, payload)
+
+
+class HostedRoom:
+    """One room living on a ``RoomHostWorker``; interchangeable with ``RoomWorker``."""
+
+    def __init__(
+        self,
+        room_id: str,
+        player_session_ids: tuple[str, str],
+        p1_username: str,
+        p2_username: str,
+        p1_selected_cards: list[str] | None,
+        p2_selected_cards: list[str] | None,
+        host_worker: RoomHostWorker,
+        on_finished: Callable[[str, str], None],
+        on_event: Callable[[str, str, dict[str, Any]], None] | None = None,
+    ) -> None:
+        self.room_id = room_id
+        self.player_session_ids = player_session_ids
+        self.p1_username = p1_username
+        self.p2_username = p2_username
+        self.p1_selected_cards = p1_selected_cards
+        self.p2_selected_cards = p2_selected_cards
+        self.host_worker = host_worker
+        self._on_finished = on_finished
+        self._on_event = on_event
+        self._lock = RLock()
+        self._started_at = monotonic()
+        self._started = False
+        self._finished = False
+        self._finish_reason: str | None = None
+
+    def start(self) -> None:
+        with self._lock:
+            if self._started or self._finished:
+                return
+            self._started = True
+
+        self.host_worker.attach(self)
+        try:
+            self.host_worker.start()
+            # Wait for the ack so a host that cannot open the room fails the
+            # start, and the router requeues the players.
+            self.host_worker.request('open_room', {
+                'room_id': self.room_id,
+                'player_session_ids': list(self.player_session_ids),
+                'p1_username': self.p1_username,
+                'p2_username': self.p2_username,
+                'p1_selected_cards': self.p1_selected_cards,
+                'p2_selected_cards': self.p2_selected_cards,
+            }, timeout_seconds=OPEN_ROOM_TIMEOUT_SECONDS)
+        except Exception as exc:
+            self._abandon(f'room_open_failed: {exc}')
+            raise
+        print(f'[ROOM_HOST] room_placed room_id={self.room_id} host_id={self.host_worker.host_id}')
+
+    def _abandon(self, reason: str) -> None:
+        """Drop a room that never opened; the caller reports it, so ``on_finished`` is not called."""
+        with self._lock:
+            if self._finished:
+                return
+            self._finished = True
+            self._finish_reason = reason
+        self.host_worker.release(self.room_id)
+        try:
+            # The host may still open it after a timeout.
+            self.host_worker.send('close_room', {'room_id': self.room_id, 'reason': 'room_open_failed'})
+        except RuntimeError:
+            pass
+        print(f'[ROOM_HOST] room_open_failed room_id={self.room_id} host_id={self.host_worker.host_id} reason={reason!r}')
+
+    def request(self, method: str, params: dict[str, Any], timeout_seconds: float = 2.0) -> dict[str, Any]:
+        return self.host_worker.request(method, {**params, 'room_id': self.room_id}, timeout_seconds=timeout_seconds)
+
+    def submit(self, method: str, params: dict[str, Any]) -> Future[dict[str, Any]]:
+        return self.host_worker.submit(method, {**params, 'room_id': self.room_id})
+
+    def send(self, method: str, params: dict[str, Any]) -> None:
+        self.host_worker.send(method, {**params, 'room_id': self.room_id})
+
+    def stop(self, reason: str = 'stopped') -> None:
+        with self._lock:
+            if self._finished:
+                return
+        try:
+            self.host_worker.send('close_room', {'room_id': self.room_id, 'reason': reason})
+        except RuntimeError:
+            pass
+        self.mark_finished(reason)
+
+    def mark_finished(self, reason: str) -> None:
+        with self._lock:
+            if self._finished:
+                return
+            self._finished = True
+            self._finish_reason = reason
+        self.host_worker.release(self.room_id)
+        self._on_finished(self.room_id, reason)
+
+    def dispatch_event(self, event_type: str, payload: dict[str, Any]) -> None:
+        if self._on_event is None:
+            return
+        try:
+            self._on_event(self.room_id, event_type, payload)
+        except Exception as exc:
+            print(
+                f'[ROOM_HOST] event_callback_failed room_id={self.room_id} '
+                f'event={event_type} error={exc}'
+            )
+
+    def snapshot(self) -> RoomWorkerSnapshot:
+        host_snapshot = self.host_worker.snapshot()
+        return RoomWorkerSnapshot(
+            room_id=self.room_id,
+            host=host_snapshot.host,
+            port=host_snapshot.port,
+            transport_mode=host_snapshot.transport_mode,
+            process_pid=host_snapshot.process_pid,
+            log_path=host_snapshot.log_path,
+            started_at=self._started_at,
+            finished=self._finished,
+            finish_reason=self._finish_reason,
+        )
+
+
+class RoomHostPool:
+    """Bounded set of room host processes; rooms go to the least loaded one.
+
+    Remote hosts registered by agents join the same set. Load is rooms over
+    capacity, so a large remote host fills at the same rate as a local one.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        max_rooms_per_host: int,
+        *,
+        worker_factory: Callable[..., RoomHostWorker] = RoomHostWorker,
+    ) -> None:
+        self.size = max(0, size)
+        self.max_rooms_per_host = max(1, max_rooms_per_host)
+        self._worker_factory = worker_factory
+        self._lock = RLock()
+        self._hosts: list[RoomHostWorker] = []
+
+    def hosts(self) -> list[RoomHostWorker]:
+        with self._lock:
+            return list(self._hosts)
+
+    def add_host(self, host_worker: RoomHostWorker) -> bool:
+        """Take an already running host, such as a remote one; False if its id is taken."""
+        with self._lock:
+            if any(candidate.host_id == host_worker.host_id for candidate in self._hosts if candidate.available):
+                return False
+            self._hosts.append(host_worker)
+            return True
+
+    def _capacity(self, host_worker: RoomHostWorker) -> int:
+        return host_worker.capacity or self.max_rooms_per_host
+
+    def place_room(
+        self,
+        *,
+        room_id: str,
+        player_session_ids: tuple[str, str],
+        host: str,
+        port: int,
+        p1_username: str,
+        p2_username: str,
+        p1_selected_cards: list[str] | None,
+        p2_selected_cards: list[str] | None,
+        transport_mode: RoomTransportMode,
+        on_finished: Callable[[str, str], None],
+        on_event: Callable[[str, str, dict[str, Any]], None] | None = None,
+    ) -> HostedRoom | None:
+        """Return an unstarted room on a host with capacity, or None when the pool is full."""
+        with self._lock:
+            self._hosts = [candidate for candidate in self._hosts if candidate.available]
+            candidates = [candidate for candidate in self._hosts if candidate.room_count < self._capacity(candidate)]
+            if candidates:
+                host_worker = min(candidates, key=lambda candidate: candidate.room_count / self._capacity(candidate))
+            elif sum(1 for candidate in self._hosts if not candidate.remote) < self.size:
+                host_worker = self._worker_factory(
+                    host_id=f"host-{uuid4().hex[:8]}",
+                    host=host,
+                    port=port,
+                    transport_mode=transport_mode,
+                    on_finished=self.on_host_finished,
+                )
+                self._hosts.append(host_worker)
+            else:
+                return None
+
+            room = HostedRoom(
+                room_id=room_id,
+                player_session_ids=player_session_ids,
+                p1_username=p1_username,
+                p2_username=p2_username,
+                p1_selected_cards=p1_selected_cards,
+                p2_selected_cards=p2_selected_cards,
+                host_worker=host_worker,
+                on_finished=on_finished,
+                on_event=on_event,
+            )
+            # Count the room against the host now so back-to-back placements spread.
+            host_worker.attach(room)
+            return room
+
+    def on_host_finished(self, host_id: str, reason: str) -> None:
+        with self._lock:
+            self._hosts = [candidate for candidate in self._hosts if candidate.host_id != host_id]
+        print(f'[ROOM_HOST] host_finished host_id={host_id} reason={reason!r}')
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import builtins
-import json
+import os
+import select
 import sys
+from contextlib import contextmanager
 from threading import RLock
-from typing import Any
+from typing import Any, BinaryIO, Iterator
 
 
 _ORIGINAL_PRINT = builtins.print
@@ -26,35 +28,138 @@ def _pipe_safe_print(*args: Any, **kwargs: Any) -> None:
 builtins.print = _pipe_safe_print
 
 import card_game.server.server as room_server
+from card_game.server.workers.command_lanes import CONTROL_METHODS, CommandLanes
+from card_game.server.workers.pipe_framing import (
+    PipeDesyncError,
+    PipeFrameError,
+    SocketEmitBatch,
+    encode_message,
+    pipe_framing_from_env,
+    read_message,
+    socket_payload_fields,
+    write_message,
+)
+from card_game.server.workers.shm_ring import RING_FDS_ENV, RING_POLL_SECONDS, RingReader, RingWriter, ShmRing
+from card_game.server.workers.room_host import RoomHost, build_room_runtime, install_room_runtime
 
 
 _write_lock = RLock()
+PIPE_FRAMING = pipe_framing_from_env()
+# Set by main(); the pipe to the router, on its own descriptor.
+_pipe_out: BinaryIO | None = None
+# Set by main() when the router passed shared-memory rings down.
+_ring_writer: RingWriter | None = None
+# Socket emits held back while commands run; guarded by _write_lock.
+_socket_batch: SocketEmitBatch | None = None
+# Commands currently holding the batch open, one per lane at most.
+_socket_batch_users = 0
+# Set by main(); serves control commands beside gameplay ones.
+_lanes: CommandLanes | None = None
+# Set by the router for pooled workers: the process hosts many rooms, opened
+# with open_room, and every room command carries a room_id.
+ROOM_HOST_ID = os.getenv('ROOM_HOST_ID', '').strip()
+# Set by the router's warm pool: the process boots without a room and waits
+# for assign_room to deliver one.
+ROOM_WORKER_STANDBY = os.getenv('ROOM_WORKER_STANDBY', '').strip().lower() in {'1', 'true', 'yes', 'on'}
 
 
 def _write_message(message: dict[str, Any]) -> None:
     with _write_lock:
-        sys.stdout.write(json.dumps(message, separators=(',', ':')) + '\n')
-        sys.stdout.flush()
+        pipe_out = _pipe_out or sys.stdout.buffer
+        if _ring_writer is not None:
+            _ring_writer.write(pipe_out, [encode_message(message, PIPE_FRAMING)])
+        else:
+            write_message(pipe_out, message, PIPE_FRAMING)
+
+
+def _open_pipe_out() -> BinaryIO:
+    """Move the router pipe off fd 1 and point fd 1 at stderr.
+
+    Writes that bypass print() (C extensions, child processes) then land in
+    the room log instead of splitting a frame on the pipe.
+    """
+    sys.stdout.flush()
+    pipe_out = os.fdopen(os.dup(sys.stdout.fileno()), 'wb')
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    return pipe_out
+
+
+def _open_rings() -> RingReader | None:
+    """Map the command and event rings named by ROOM_PIPE_RING_FDS, if the router sent any."""
+    global _ring_writer
+    raw = os.getenv(RING_FDS_ENV, '').strip()
+    if not raw:
+        return None
+    command_fd, event_fd = (int(part) for part in raw.split(','))
+    command_reader = RingReader(ShmRing(command_fd), PIPE_FRAMING)
+    _ring_writer = RingWriter(ShmRing(event_fd), PIPE_FRAMING)
+    os.close(command_fd)
+    os.close(event_fd)
+    return command_reader
 
 
 def _emit_event(event_type: str, payload: dict[str, Any]) -> None:
-    _write_message({
-        'type': 'event',
-        'event_type': event_type,
-        'payload': payload,
-    })
+    with _write_lock:
+        # Anything else the router hears about must not overtake held emits.
+        _flush_socket_batch()
+        _write_message({
+            'type': 'event',
+            'event_type': event_type,
+            'payload': payload,
+        })
 
 
 def _emit_socket_event(event: str, payload: Any, to: str | None = None) -> None:
+    room_id = room_host.bound_room_id if room_host is not None else None
+    with _write_lock:
+        if _socket_batch is not None:
+            _socket_batch.add(event, payload, to=to or None, room_id=room_id)
+            return
+
     body: dict[str, Any] = {
         'event': event,
-        'payload': payload,
+        **socket_payload_fields(payload, PIPE_FRAMING),
     }
     if isinstance(to, str) and to:
         body['to'] = to
+    if room_id is not None:
+        body['room_id'] = room_id
     _emit_event('socket_emit', body)
 
 
+def _flush_socket_batch() -> None:
+    if not _socket_batch:
+        return
+    for body in _socket_batch.drain():
+        _write_message({
+            'type': 'event',
+            'event_type': 'socket_emit_batch',
+            'payload': body,
+        })
+
+
+@contextmanager
+def _batched_socket_emits() -> Iterator[None]:
+    """Hold socket emits from any thread until the block ends, then send them as one batch.
+
+    The lanes share one batch; whichever command ends first flushes what
+    is held so far, which keeps the emits in order.
+    """
+    global _socket_batch, _socket_batch_users
+    with _write_lock:
+        if _socket_batch is None:
+            _socket_batch = SocketEmitBatch()
+        _socket_batch_users += 1
+    try:
+        yield
+    finally:
+        with _write_lock:
+            _flush_socket_batch()
+            _socket_batch_users -= 1
+            if _socket_batch_users == 0:
+                _socket_batch = None
+
+
 class _PipeSocketBridge:
     def emit(self, event: str, payload: Any, to: str | None = None) -> None:
         _emit_socket_event(event, payload, to=to)
@@ -67,8 +172,24 @@ def _emit_fn_for_sid(sid: str):
     return _emit
 
 
-def _pipe_notify_router_room_finished(reason: str) -> None:
-    _emit_event('room_finished', {'reason': reason})
+def _pipe_notify_router_room_finished(reason: str, winner: str | None = None) -> None:
+    payload: dict[str, Any] = {'reason': reason}
+    if winner is not None:
+        payload['winner'] = winner
+    _emit_event('room_finished', payload)
+
+
+def _pipe_notify_hosted_room_finished(room_id: str, reason: str, winner: str | None = None) -> None:
+    payload: dict[str, Any] = {'room_id': room_id, 'reason': reason}
+    if winner is not None:
+        payload['winner'] = winner
+    _emit_event('room_finished', payload)
+
+
+def _pipe_notify_hosted_room_closed(room_id: str, reason: str) -> None:
+    _emit_event('room_closed', {'room_id': room_id, 'reason': reason})
+    if _lanes is not None:
+        _lanes.retire(room_id)
 
 
 # Route all room-side socket emits through the worker pipe event stream.
@@ -76,14 +197,116 @@ room_server.socketio = _PipeSocketBridge()
 # Replace legacy room->router HTTP callback with pipe event delivery.
 room_server._notify_router_room_finished = _pipe_notify_router_room_finished
 
+room_host: RoomHost | None = None
+room_assigned = not ROOM_WORKER_STANDBY
+if ROOM_HOST_ID:
+    room_host = RoomHost(
+        room_server,
+        on_room_finished=_pipe_notify_hosted_room_finished,
+        on_room_closed=_pipe_notify_hosted_room_closed,
+    )
+
+
+def _required_str(params: dict[str, Any], name: str, method: str) -> str:
+    raw = params.get(name)
+    value = raw.strip() if isinstance(raw, str) else ''
+    if not value:
+        raise ValueError(f'{method} requires {name}')
+    return value
+
+
+def _optional_card_ids(raw: Any) -> list[str] | None:
+    if not isinstance(raw, list):
+        return None
+    return [card_id for card_id in raw if isinstance(card_id, str)]
+
+
+def _room_options(params: dict[str, Any]) -> dict[str, Any]:
+    session_ids = params.get('player_session_ids')
+    player_session_ids = ('', '')
+    if isinstance(session_ids, list) and len(session_ids) == 2:
+        player_session_ids = (str(session_ids[0] or ''), str(session_ids[1] or ''))
+    return {
+        'player_session_ids': player_session_ids,
+        'p1_username': str(params.get('p1_username') or 'Player 1'),
+        'p2_username': str(params.get('p2_username') or 'Player 2'),
+        'p1_card_ids': _optional_card_ids(params.get('p1_selected_cards')),
+        'p2_card_ids': _optional_card_ids(params.get('p2_selected_cards')),
+    }
+
+
+def _assign_standby_room(params: dict[str, Any]) -> dict[str, Any]:
+    global room_assigned
+    if room_assigned:
+        raise RuntimeError('room worker already has a room')
+    room_id = _required_str(params, 'room_id', 'assign_room')
+    install_room_runtime(room_server, build_room_runtime(room_server, room_id, **_room_options(params)))
+    room_assigned = True
+    print(f'[ROOM_WORKER] room_assigned room_id={room_id}')
+    return {'ok': True, 'room_id': room_id}
+
+
+def _dispatch_host_command(host: RoomHost, method: str, params: dict[str, Any]) -> dict[str, Any]:
+    if method == 'health':
+        return {
+            'status': 'ok',
+            'timestamp': room_server._utc_now_iso(),
+            'host_id': ROOM_HOST_ID,
+            'room_ids': host.room_ids(),
+        }
+
+    if method == 'open_room':
+        room_id = _required_str(params, 'room_id', method)
+        # A failure here is the error reply the router waits for.
+        host.open_room(room_id, **_room_options(params))
+        print(f'[ROOM_HOST] room_opened host_id={ROOM_HOST_ID} room_id={room_id} rooms={len(host.room_ids())}')
+        return {'ok': True, 'room_id': room_id}
+
+    if method == 'close_room':
+        room_id = _required_str(params, 'room_id', method)
+        reason_raw = params.get('reason')
+        reason = reason_raw.strip() if isinstance(reason_raw, str) and reason_raw.strip() else 'closed'
+        return {'ok': True, 'closed': host.close_room(room_id, reason)}
+
+    room_id = _required_str(params, 'room_id', method)
+    # Control commands skip the room's call lock so they are not held up by
+    # that room's gameplay, as on a single-room worker's control lane.
+    exclusive = method not in CONTROL_METHODS
+    try:
+        return host.call(room_id, lambda: _dispatch_room_command(method, params), exclusive=exclusive)
+    except KeyError:
+        # A late command for a closed room must not keep a lane open for it.
+        if _lanes is not None and room_id not in host.room_ids():
+            _lanes.retire(room_id)
+        raise
+
 
 def _dispatch_command(method: str, params: dict[str, Any]) -> dict[str, Any]:
+    if room_host is not None:
+        return _dispatch_host_command(room_host, method, params)
+    if method == 'assign_room':
+        return _assign_standby_room(params)
+    if not room_assigned:
+        if method == 'health':
+            return {
+                'status': 'ok',
+                'timestamp': room_server._utc_now_iso(),
+                'standby': True,
+            }
+        raise RuntimeError(f'room worker is on standby; {method} needs assign_room first')
+    return _dispatch_room_command(method, params)
+
+
+def _dispatch_room_command(method: str, params: dict[str, Any]) -> dict[str, Any]:
     if method == 'health':
         return {
             'status': 'ok',
             'timestamp': room_server._utc_now_iso(),
         }
 
+    if method == 'engine_profile':
+        return room_server.engine_profile_snapshot()
+
     if method == 'register_client_or_play':
         sid_raw = params.get('sid')
         sid = sid_raw.strip() if isinstance(sid_raw, str) else ''
@@ -183,26 +406,29 @@ def _dispatch_command(method: str, params: dict[str, Any]) -> dict[str, Any]:
         if not isinstance(payload, dict):
             raise ValueError('replace_room_session requires payload object')
 
-        (
-            response,
-            status,
-            next_expected_p1_session_id,
-            next_expected_p2_session_id,
-            replaced_slot,
-            evicted_sid,
-        ) = room_server.runtime_replace_room_session(
-            payload,
-            transport_lock=room_server.transport_lock,
-            transport_state=room_server.transport_state,
-            expected_p1_session_id=room_server.expected_p1_session_id,
-            expected_p2_session_id=room_server.expected_p2_session_id,
-            cancel_disconnect_forfeit_timer_locked=room_server._cancel_disconnect_forfeit_timer_locked,
-            reset_delivery_state_for_slot=room_server._reset_delivery_state_for_slot,
-            registration_condition=room_server.registration_condition,
-        )
+        # This runs on the control lane beside gameplay; swap the expected
+        # session ids in the same transport_lock section as the seat release.
+        with room_server.transport_lock:
+            (
+                response,
+                status,
+                next_expected_p1_session_id,
+                next_expected_p2_session_id,
+                replaced_slot,
+                evicted_sid,
+            ) = room_server.runtime_replace_room_session(
+                payload,
+                transport_lock=room_server.transport_lock,
+                transport_state=room_server.transport_state,
+                expected_p1_session_id=room_server.expected_p1_session_id,
+                expected_p2_session_id=room_server.expected_p2_session_id,
+                cancel_disconnect_forfeit_timer_locked=room_server._cancel_disconnect_forfeit_timer_locked,
+                reset_delivery_state_for_slot=room_server._reset_delivery_state_for_slot,
+                registration_condition=room_server.registration_condition,
+            )
 
-        room_server.expected_p1_session_id = next_expected_p1_session_id
-        room_server.expected_p2_session_id = next_expected_p2_session_id
+            room_server.expected_p1_session_id = next_expected_p1_session_id
+            room_server.expected_p2_session_id = next_expected_p2_session_id
 
         if status != 200:
             raise RuntimeError(str(response.get('error') or 'replace_room_session failed'))
@@ -224,58 +450,112 @@ def _dispatch_command(method: str, params: dict[str, Any]) -> dict[str, Any]:
     raise ValueError(f'Unsupported pipe command method: {method}')
 
 
-def main() -> int:
-    for raw_line in sys.stdin:
-        line = raw_line.strip()
-        if not line:
-            continue
+def _handle_command_message(message: Any) -> None:
+    if not isinstance(message, dict):
+        return
 
-        try:
-            message = json.loads(line)
-        except Exception:
-            continue
+    if message.get('type') != 'command':
+        return
 
-        if not isinstance(message, dict):
-            continue
+    request_id = message.get('id')
+    if not isinstance(request_id, str) or not request_id:
+        return
 
-        if message.get('type') != 'command':
-            continue
+    method = message.get('method')
+    params = message.get('params')
 
-        request_id = message.get('id')
-        if not isinstance(request_id, str) or not request_id:
-            continue
+    if not isinstance(method, str) or not method.strip() or not isinstance(params, dict):
+        _write_message({
+            'type': 'response',
+            'id': request_id,
+            'ok': False,
+            'error': 'invalid command envelope',
+        })
+        return
 
-        method = message.get('method')
-        params = message.get('params')
+    try:
+        # The response follows the command's emits, as it did when each emit was its own message.
+        with _batched_socket_emits():
+            result = _dispatch_command(method.strip(), params)
+    except Exception as exc:
+        _write_message({
+            'type': 'response',
+            'id': request_id,
+            'ok': False,
+            'error': str(exc),
+        })
+        return
+
+    if method.strip() == 'health' and _lanes is not None and isinstance(result, dict):
+        result = {**result, 'lanes': _lanes.stats()}
+
+    _write_message({
+        'type': 'response',
+        'id': request_id,
+        'ok': True,
+        'result': result,
+    })
 
-        if not isinstance(method, str) or not method.strip() or not isinstance(params, dict):
-            _write_message({
-                'type': 'response',
-                'id': request_id,
-                'ok': False,
-                'error': 'invalid command envelope',
-            })
+
+def _room_lane_key(message: Any) -> str | None:
+    """Room hosts run each room's gameplay commands on that room's own lane."""
+    params = message.get('params') if isinstance(message, dict) else None
+    room_id = params.get('room_id') if isinstance(params, dict) else None
+    return room_id.strip() if isinstance(room_id, str) and room_id.strip() else None
+
+
+def _serve_rings(command_reader: RingReader, lanes: CommandLanes) -> int:
+    """Command loop when the router uses rings: the pipe only wakes us or carries overflow."""
+    pipe_in = sys.stdin.buffer.fileno()
+    while True:
+        try:
+            for message in command_reader.messages():
+                lanes.route(message)
+        except PipeDesyncError as exc:
+            print(f'[ROOM_WORKER] pipe_desync error={exc}')
+            return 1
+        except PipeFrameError:
             continue
+        if not command_reader.idle():
+            continue
+        readable, _, _ = select.select([pipe_in], [], [], RING_POLL_SECONDS)
+        if not readable:
+            continue
+        data = os.read(pipe_in, 64 * 1024)
+        if not data:
+            return 0
+        command_reader.feed(data)
+
 
+def _serve_pipe(lanes: CommandLanes) -> int:
+    pipe_in = sys.stdin.buffer
+    while True:
         try:
-            result = _dispatch_command(method.strip(), params)
-        except Exception as exc:
-            _write_message({
-                'type': 'response',
-                'id': request_id,
-                'ok': False,
-                'error': str(exc),
-            })
+            message = read_message(pipe_in, PIPE_FRAMING)
+        except PipeDesyncError as exc:
+            print(f'[ROOM_WORKER] pipe_desync error={exc}')
+            return 1
+        except PipeFrameError:
             continue
+        if message is None:
+            return 0
+        lanes.route(message)
 
-        _write_message({
-            'type': 'response',
-            'id': request_id,
-            'ok': True,
-            'result': result,
-        })
 
-    return 0
+def main() -> int:
+    global _pipe_out, _lanes
+    _pipe_out = _open_pipe_out()
+    command_reader = _open_rings()
+    # This thread only reads; each lane runs its commands in arrival order.
+    _lanes = CommandLanes(_handle_command_message, lane_key=_room_lane_key if room_host is not None else None)
+    if command_reader is not None:
+        exit_code = _serve_rings(command_reader, _lanes)
+    else:
+        exit_code = _serve_pipe(_lanes)
+    if exit_code == 0:
+        # The router closed the pipe; answer what it already sent.
+        _lanes.close()
+    return exit_code
 
 
 if __name__ == '__main__':
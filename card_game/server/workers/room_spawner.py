@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from time import perf_counter_ns
+from typing import Any, Callable
+
+from ..latency_stats import percentile_ms
+
+# Pairing-to-ready latencies kept for the percentile metrics.
+READY_SAMPLE_LIMIT = 1024
+
+
+class RoomSpawner:
+    """Starts rooms on a few background threads, off the router locks.
+
+    ``submit`` is called when a pair is matched. ``start`` then runs on a
+    spawner thread and returns True once the room has answered (its open,
+    assign or first health reply), or False when the room was cancelled
+    while it started. An exception, including a timed-out reply, counts as
+    a failed start; ``start`` itself puts the players back in the queue.
+    """
+
+    def __init__(self, concurrency: int) -> None:
+        self.concurrency = max(1, concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='room-spawn')
+        self._lock = Lock()
+        self._queued = 0
+        self._starting = 0
+        self._ready = 0
+        self._failed = 0
+        self._abandoned = 0
+        self._ready_ns: deque[int] = deque(maxlen=READY_SAMPLE_LIMIT)
+
+    def submit(self, room_id: str, start: Callable[[], bool]) -> None:
+        paired_at_ns = perf_counter_ns()
+        with self._lock:
+            self._queued += 1
+        self._executor.submit(self._run, room_id, start, paired_at_ns)
+
+    def _run(self, room_id: str, start: Callable[[], bool], paired_at_ns: int) -> None:
+        with self._lock:
+            self._queued -= 1
+            self._starting += 1
+        outcome = 'failed'
+        try:
+            outcome = 'ready' if start() else 'abandoned'
+        except Exception as exc:
+            print(f'[ROOM_SPAWN] start_failed room_id={room_id} error={exc}')
+        finally:
+            with self._lock:
+                self._starting -= 1
+                if outcome == 'ready':
+                    self._ready += 1
+                    self._ready_ns.append(perf_counter_ns() - paired_at_ns)
+                elif outcome == 'abandoned':
+                    self._abandoned += 1
+                else:
+                    self._failed += 1
+
+    def metrics(self) -> dict[str, Any]:
+        with self._lock:
+            samples = list(self._ready_ns)
+            return {
+                'concurrency': self.concurrency,
+                'queued': self._queued,
+                'starting': self._starting,
+                'ready': self._ready,
+                'failed': self._failed,
+                'abandoned': self._abandoned,
+                'pair_to_ready_p50_ms': percentile_ms(samples, 0.50),
+                'pair_to_ready_p99_ms': percentile_ms(samples, 0.99),
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
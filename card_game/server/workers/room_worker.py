@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+from collections import deque
+from concurrent.futures import Future, InvalidStateError, ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from threading import Condition, Event, RLock, Thread
+from threading import Event, Lock, RLock, Thread
 from time import monotonic
-from typing import Any, Callable, Literal, TextIO
+from typing import Any, BinaryIO, Callable, Literal
 import json
 import os
 import subprocess
@@ -13,9 +15,38 @@ import tempfile
 from datetime import datetime
 from uuid import uuid4
 
+from .pipe_framing import (
+    PIPE_FRAMING_ENV,
+    FrameDecoder,
+    PipeDesyncError,
+    PipeFrameError,
+    PipeFraming,
+    encode_message,
+    pipe_framing_from_env,
+)
+from .pipe_reactor import PipeReactor, shared_pipe_reactor
+from .shm_ring import RING_FDS_ENV, RingReader, RingWriter, ShmRing, create_ring_fd, ring_bytes_from_env
+
 
 type RoomTransportMode = Literal['pipe']
 
+# Per-room variables the room runtime reads at import. Standby and host
+# processes boot without them and receive rooms over the pipe instead.
+ROOM_ENV_VARS = (
+    'ROOM_ID',
+    'P1_USERNAME',
+    'P2_USERNAME',
+    'P1_SESSION_ID',
+    'P2_SESSION_ID',
+    'P1_DECK_CARDS_JSON',
+    'P2_DECK_CARDS_JSON',
+)
+
+# Writes queued from the pipe reactor thread are flushed here: a room that
+# stops reading its stdin would otherwise stall every room's events. A few
+# threads, so one stuck room does not hold up the others' commands.
+_REACTOR_WRITE_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix='room-pipe-write')
+
 
 @dataclass(frozen=True)
 class RoomWorkerSnapshot:
@@ -46,6 +77,8 @@ class RoomWorker:
         transport_mode: RoomTransportMode,
         on_finished: Callable[[str, str], None],
         on_event: Callable[[str, str, dict[str, Any]], None] | None = None,
+        standby: bool = False,
+        reactor: PipeReactor | None = None,
     ) -> None:
         if transport_mode != 'pipe':
             raise ValueError('RoomWorker only supports pipe transport_mode.')
@@ -61,107 +94,253 @@ class RoomWorker:
         self.p2_selected_cards = p2_selected_cards
         self._on_finished = on_finished
         self._on_event = on_event
+        self._standby = standby
+        self.pipe_framing: PipeFraming = pipe_framing_from_env()
         self._stop_event = Event()
         self._lock = RLock()
-        self._response_condition = Condition(self._lock)
-        self._monitor_thread = Thread(target=self._run, name=f"room-worker-{p1_username}-{p2_username}-{datetime.now().isoformat()}", daemon=True)
+        self._reactor = reactor if reactor is not None else shared_pipe_reactor()
+        self._decoder = FrameDecoder(self.pipe_framing)
+        self._pipe_desynced = False
+        # Shared-memory rings beside the pipe (ROOM_PIPE_RING_BYTES); set up at
+        # spawn, None while the pipe carries everything.
+        self.ring_bytes = ring_bytes_from_env()
+        self._command_writer: RingWriter | None = None
+        self._event_reader: RingReader | None = None
         self._started_at = monotonic()
-        self._process: subprocess.Popen[str] | None = None
-        self._log_path = str(Path(tempfile.gettempdir()) / f"avge-room-{p1_username}-{p2_username}-{datetime.now().isoformat()}.log")
-        self._log_file: TextIO | None = None
-        self._pending_responses: dict[str, dict[str, Any] | None] = {}
+        self._process: subprocess.Popen[bytes] | None = None
+        log_name = f"standby-{room_id}" if standby else f"{p1_username}-{p2_username}"
+        self._log_path = str(Path(tempfile.gettempdir()) / f"avge-room-{log_name}-{datetime.now().isoformat()}.log")
+        # request id -> (method, future) for commands awaiting a response.
+        self._pending: dict[str, tuple[str, Future[dict[str, Any]]]] = {}
+        # Encoded commands waiting for the pipe. Whichever caller holds
+        # _write_lock writes everything queued, so callers never wait on
+        # each other's flushes.
+        self._write_queue: deque[tuple[str, str, bytes]] = deque()
+        self._write_lock = Lock()
         self._finished = False
         self._finish_reason: str | None = None
 
     def start(self) -> None:
         with self._lock:
-            if self._monitor_thread.is_alive() or self._finished:
+            if self._process is not None or self._finished:
                 return
 
-            env = os.environ.copy()
-            env['ROOM_TRANSPORT_MODE'] = self.transport_mode
-            env['ROOM_ID'] = self.room_id
-            env['P1_USERNAME'] = self.p1_username
-            env['P2_USERNAME'] = self.p2_username
-            env['P1_SESSION_ID'] = self.player_session_ids[0]
-            env['P2_SESSION_ID'] = self.player_session_ids[1]
-            if isinstance(self.p1_selected_cards, list):
-                env['P1_DECK_CARDS_JSON'] = json.dumps(self.p1_selected_cards)
-            if isinstance(self.p2_selected_cards, list):
-                env['P2_DECK_CARDS_JSON'] = json.dumps(self.p2_selected_cards)
-            env.setdefault('SERVER_DEBUG', 'false')
-            env.setdefault('PYTHONUNBUFFERED', '1')
-
-            # If router is launched with Flask debug reloader, these inherited
-            # vars can make child room servers try to reuse invalid fds.
-            env.pop('WERKZEUG_SERVER_FD', None)
-            env.pop('WERKZEUG_RUN_MAIN', None)
-            env.pop('FLASK_RUN_FROM_CLI', None)
-
-            project_root = Path(__file__).resolve().parents[3]
-            self._log_file = open(self._log_path, 'a', encoding='utf-8')
-            self._process = subprocess.Popen(
-                [sys.executable, '-m', 'card_game.server.workers.room_pipe_runtime'],
-                cwd=str(project_root),
-                env=env,
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=self._log_file,
-                text=True,
-                bufsize=1,
-            )
+            self._spawn_process_locked()
+            self._watch_pipe_locked()
+
+    def _child_env(self) -> dict[str, str]:
+        env = os.environ.copy()
+        env['ROOM_TRANSPORT_MODE'] = self.transport_mode
+        if self._standby:
+            for name in ROOM_ENV_VARS:
+                env.pop(name, None)
+            env['ROOM_WORKER_STANDBY'] = '1'
+            return self._finish_child_env(env)
+
+        env['ROOM_ID'] = self.room_id
+        env['P1_USERNAME'] = self.p1_username
+        env['P2_USERNAME'] = self.p2_username
+        env['P1_SESSION_ID'] = self.player_session_ids[0]
+        env['P2_SESSION_ID'] = self.player_session_ids[1]
+        if isinstance(self.p1_selected_cards, list):
+            env['P1_DECK_CARDS_JSON'] = json.dumps(self.p1_selected_cards)
+        if isinstance(self.p2_selected_cards, list):
+            env['P2_DECK_CARDS_JSON'] = json.dumps(self.p2_selected_cards)
+        return self._finish_child_env(env)
+
+    def _finish_child_env(self, env: dict[str, str]) -> dict[str, str]:
+        env.setdefault('SERVER_DEBUG', 'false')
+        env[PIPE_FRAMING_ENV] = self.pipe_framing
+        env.pop(RING_FDS_ENV, None)
+        env.setdefault('PYTHONUNBUFFERED', '1')
+
+        # If router is launched with Flask debug reloader, these inherited
+        # vars can make child room servers try to reuse invalid fds.
+        env.pop('WERKZEUG_SERVER_FD', None)
+        env.pop('WERKZEUG_RUN_MAIN', None)
+        env.pop('FLASK_RUN_FROM_CLI', None)
+        return env
+
+    def _spawn_process_locked(self) -> None:
+        project_root = Path(__file__).resolve().parents[3]
+        env = self._child_env()
+        ring_fds: tuple[int, ...] = ()
+        if self.ring_bytes > 0:
+            ring_fds = (create_ring_fd(self.ring_bytes), create_ring_fd(self.ring_bytes))
+            env[RING_FDS_ENV] = ','.join(str(fd) for fd in ring_fds)
+        try:
+            # The child writes its stderr straight to the log; the router keeps
+            # no handle open per room.
+            with open(self._log_path, 'a', encoding='utf-8') as log_file:
+                self._process = subprocess.Popen(
+                    [sys.executable, '-m', 'card_game.server.workers.room_pipe_runtime'],
+                    cwd=str(project_root),
+                    env=env,
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=log_file,
+                    pass_fds=ring_fds,
+                )
+            if ring_fds:
+                self._command_writer = RingWriter(ShmRing(ring_fds[0]), self.pipe_framing)
+                self._event_reader = RingReader(ShmRing(ring_fds[1]), self.pipe_framing)
+        finally:
+            for fd in ring_fds:
+                os.close(fd)
+
+        print(
+            f"[ROOM_WORKER] process_started room_id={self.room_id} "
+            f"pid={self._process.pid} framing={self.pipe_framing} ring_bytes={self.ring_bytes} log={self._log_path}"
+        )
 
-            print(
-                f"[ROOM_WORKER] process_started room_id={self.room_id} "
-                f"pid={self._process.pid} log={self._log_path}"
-            )
+    def submit(self, method: str, params: dict[str, Any]) -> Future[dict[str, Any]]:
+        """Queue a command and return a future for its result.
 
-            self._monitor_thread.start()
+        The future fails with RuntimeError if the room answers with an error,
+        the command cannot be written, or the process exits first.
+        """
+        return self._submit(method, params)[1]
 
     def request(self, method: str, params: dict[str, Any], timeout_seconds: float = 2.0) -> dict[str, Any]:
-        with self._lock:
-            process = self._process
-            stdin = process.stdin if process is not None else None
-            if process is None or process.poll() is not None or stdin is None:
-                raise RuntimeError('Room worker process is not available for pipe request.')
-
-            request_id = uuid4().hex
-            self._pending_responses[request_id] = None
-            payload = {
-                'type': 'command',
-                'id': request_id,
-                'method': method,
-                'params': params,
-            }
+        request_id, future = self._submit(method, params)
+        try:
+            return future.result(timeout=max(0.1, timeout_seconds))
+        except TimeoutError:
+            with self._lock:
+                self._pending.pop(request_id, None)
+            future.cancel()
+            raise TimeoutError(f'Pipe request timed out for method={method}') from None
 
-            try:
-                stdin.write(json.dumps(payload, separators=(',', ':')) + '\n')
-                stdin.flush()
-            except Exception as exc:
-                self._pending_responses.pop(request_id, None)
-                raise RuntimeError(f'Failed to send pipe request {method}: {exc}') from exc
+    def _submit(self, method: str, params: dict[str, Any]) -> tuple[str, Future[dict[str, Any]]]:
+        request_id = uuid4().hex
+        future: Future[dict[str, Any]] = Future()
+        with self._lock:
+            self._pending[request_id] = (method, future)
+        try:
+            self._enqueue_command(request_id, method, params)
+        except Exception:
+            with self._lock:
+                self._pending.pop(request_id, None)
+            raise
+        return request_id, future
 
-            deadline = monotonic() + max(0.1, timeout_seconds)
-            while self._pending_responses.get(request_id) is None:
-                remaining = deadline - monotonic()
-                if remaining <= 0:
-                    self._pending_responses.pop(request_id, None)
-                    raise TimeoutError(f'Pipe request timed out for method={method}')
-                self._response_condition.wait(timeout=remaining)
+    def assign_room(
+        self,
+        room_id: str,
+        player_session_ids: tuple[str, str],
+        p1_username: str,
+        p2_username: str,
+        p1_selected_cards: list[str] | None,
+        p2_selected_cards: list[str] | None,
+        on_finished: Callable[[str, str], None],
+        on_event: Callable[[str, str, dict[str, Any]], None] | None = None,
+        timeout_seconds: float = 2.0,
+    ) -> None:
+        """Hand a running standby process its room and take over its callbacks."""
+        if not self._standby:
+            raise RuntimeError('Room worker already has a room.')
+        self.request('assign_room', {
+            'room_id': room_id,
+            'player_session_ids': list(player_session_ids),
+            'p1_username': p1_username,
+            'p2_username': p2_username,
+            'p1_selected_cards': p1_selected_cards,
+            'p2_selected_cards': p2_selected_cards,
+        }, timeout_seconds=timeout_seconds)
+        with self._lock:
+            self.room_id = room_id
+            self.player_session_ids = player_session_ids
+            self.p1_username = p1_username
+            self.p2_username = p2_username
+            self.p1_selected_cards = p1_selected_cards
+            self.p2_selected_cards = p2_selected_cards
+            self._on_finished = on_finished
+            self._on_event = on_event
+            self._standby = False
+
+    def send(self, method: str, params: dict[str, Any]) -> None:
+        """Queue a command whose response is ignored.
+
+        From the reactor thread (an event callback) this never blocks: the
+        write is handed to a pipe writer thread. Any other caller writes the
+        queue itself unless another caller already is, and so can block
+        while the room's stdin pipe is full.
+        """
+        self._enqueue_command(uuid4().hex, method, params)
+
+    def _enqueue_command(self, request_id: str, method: str, params: dict[str, Any]) -> None:
+        process = self._process
+        stdin = process.stdin if process is not None else None
+        if process is None or process.poll() is not None or stdin is None:
+            raise RuntimeError('Room worker process is not available for pipe request.')
+
+        payload = {
+            'type': 'command',
+            'id': request_id,
+            'method': method,
+            'params': params,
+        }
+        self._write_queue.append((request_id, method, encode_message(payload, self.pipe_framing)))
+        if self._reactor.in_reactor_thread():
+            _REACTOR_WRITE_EXECUTOR.submit(self._flush_write_queue, stdin)
+            return
+        self._flush_write_queue(stdin)
 
-            response = self._pending_responses.pop(request_id)
+    def _flush_write_queue(self, stdin: BinaryIO) -> None:
+        # If another caller is writing it will pick queued commands up: it
+        # checks the queue again after releasing the lock.
+        while self._write_queue:
+            if not self._write_lock.acquire(blocking=False):
+                return
+            try:
+                self._write_queued(stdin)
+            finally:
+                self._write_lock.release()
 
-        if not isinstance(response, dict):
-            raise RuntimeError(f'Invalid pipe response for method={method}')
+    def _write_queued(self, stdin: BinaryIO) -> None:
+        # Only the _write_lock holder pops, so the queue cannot empty under us.
+        batch = [self._write_queue.popleft() for _ in range(len(self._write_queue))]
+        try:
+            if self._command_writer is not None:
+                self._command_writer.write(stdin, [frame for _request_id, _method, frame in batch])
+            else:
+                for _request_id, _method, frame in batch:
+                    stdin.write(frame)
+                stdin.flush()
+        except Exception as exc:
+            for request_id, method, _frame in batch:
+                self._fail_pending(request_id, RuntimeError(f'Failed to send pipe request {method}: {exc}'))
 
-        if response.get('ok') is not True:
-            error = response.get('error')
-            if isinstance(error, str) and error.strip():
-                raise RuntimeError(error.strip())
-            raise RuntimeError(f'Pipe request failed for method={method}')
+    def _complete_pending(self, response: dict[str, Any]) -> None:
+        response_id = response.get('id')
+        if not isinstance(response_id, str) or not response_id:
+            return
+        with self._lock:
+            pending = self._pending.pop(response_id, None)
+        if pending is None:
+            return
+        method, future = pending
+        try:
+            if response.get('ok') is not True:
+                error = response.get('error')
+                message = error.strip() if isinstance(error, str) and error.strip() else f'Pipe request failed for method={method}'
+                future.set_exception(RuntimeError(message))
+                return
+            result = response.get('result')
+            future.set_result(result if isinstance(result, dict) else {})
+        except InvalidStateError:
+            # The caller timed out and cancelled it.
+            return
 
-        result = response.get('result')
-        return result if isinstance(result, dict) else {}
+    def _fail_pending(self, request_id: str, error: Exception) -> None:
+        with self._lock:
+            pending = self._pending.pop(request_id, None)
+        if pending is None:
+            return
+        try:
+            pending[1].set_exception(error)
+        except InvalidStateError:
+            return
 
     def stop(self, reason: str = "stopped") -> None:
         with self._lock:
@@ -170,16 +349,11 @@ class RoomWorker:
 
             process = self._process
             if process is not None and process.poll() is None:
-                process.terminate()
-                try:
-                    process.wait(timeout=2)
-                except subprocess.TimeoutExpired:
-                    process.kill()
-
-            if self._log_file is not None:
-                self._log_file.flush()
-                self._log_file.close()
-                self._log_file = None
+                if self._reactor.in_reactor_thread():
+                    # Reached from a room event; waiting here would stall every room's pipe.
+                    Thread(target=_terminate_process, args=(process,), name=f'room-stop-{self.room_id}', daemon=True).start()
+                else:
+                    _terminate_process(process)
 
             self._mark_finished_locked(reason)
 
@@ -209,74 +383,85 @@ class RoomWorker:
             finish_reason=self._finish_reason,
         )
 
-    def _run(self) -> None:
-        process: subprocess.Popen[str] | None = None
-        with self._lock:
-            process = self._process
+    def _watch_pipe_locked(self) -> None:
+        process = self._process
+        stdout = process.stdout if process is not None else None
+        if process is None or stdout is None:
+            self._mark_finished_locked('room_pipe_stdout_unavailable')
+            return
+        self._reactor.watch(
+            stdout.fileno(),
+            self._on_pipe_data,
+            lambda: self._on_pipe_closed(process),
+            on_poll=self._on_ring_poll if self._event_reader is not None else None,
+        )
 
-        if process is None:
+    def _on_pipe_data(self, data: bytes) -> None:
+        """Reactor callback: decode whatever complete messages ``data`` finishes."""
+        if self._pipe_desynced:
             return
+        reader = self._event_reader
+        source = reader if reader is not None else self._decoder
+        source.feed(data)
+        while True:
+            try:
+                for message in source.messages():
+                    self._handle_message(message)
+                if reader is None or reader.idle():
+                    return
+            except PipeDesyncError as exc:
+                print(f'[ROOM_WORKER] pipe_desync room_id={self.room_id} error={exc}')
+                # Ignore the rest of the stream; the process exit finishes the worker.
+                self._pipe_desynced = True
+                process = self._process
+                if process is not None:
+                    process.kill()
+                return
+            except PipeFrameError as exc:
+                print(f'[ROOM_WORKER] pipe_decode_failed room_id={self.room_id} error={exc}')
 
-        self._run_pipe(process)
+    def _on_ring_poll(self) -> None:
+        """Reactor poll: pick up ring messages whose doorbell was missed."""
+        reader = self._event_reader
+        if reader is not None and not reader.ring.is_empty():
+            self._on_pipe_data(b'')
 
-    def _run_pipe(self, process: subprocess.Popen[str]) -> None:
-        stdout = process.stdout
-        if stdout is None:
-            with self._lock:
-                if self._finished:
-                    return
-                self._mark_finished_locked('room_pipe_stdout_unavailable')
+    def _handle_message(self, message: Any) -> None:
+        if not isinstance(message, dict):
             return
 
-        for line in stdout:
-            raw = line.strip()
-            if not raw:
-                continue
+        message_type = message.get('type')
+        if message_type == 'response':
+            self._complete_pending(message)
+            return
 
-            try:
-                message = json.loads(raw)
-            except Exception:
-                print(f'[ROOM_WORKER] pipe_decode_failed room_id={self.room_id} line={raw!r}')
-                continue
-
-            if not isinstance(message, dict):
-                continue
-
-            message_type = message.get('type')
-            if message_type == 'response':
-                response_id = message.get('id')
-                if not isinstance(response_id, str) or not response_id:
-                    continue
-                with self._lock:
-                    if response_id in self._pending_responses:
-                        self._pending_responses[response_id] = message
-                        self._response_condition.notify_all()
-                continue
-
-            if message_type == 'event':
-                event_type = message.get('event_type')
-                payload = message.get('payload')
-                if not isinstance(event_type, str) or not event_type.strip() or not isinstance(payload, dict):
-                    continue
-                self._dispatch_event(event_type.strip(), payload)
+        if message_type == 'event':
+            event_type = message.get('event_type')
+            payload = message.get('payload')
+            if not isinstance(event_type, str) or not event_type.strip() or not isinstance(payload, dict):
+                return
+            self._dispatch_event(event_type.strip(), payload)
+
+    def _on_pipe_closed(self, process: subprocess.Popen[bytes]) -> None:
+        """Reactor callback at end of stream."""
+        if process.stdout is not None:
+            process.stdout.close()
+        if process.poll() is None:
+            # Stdout is closed but the process has not exited yet; wait for it
+            # off the reactor thread.
+            Thread(target=self._finish_pipe, args=(process,), name=f'room-reap-{self.room_id}', daemon=True).start()
+            return
+        self._finish_pipe(process)
 
+    def _finish_pipe(self, process: subprocess.Popen[bytes]) -> None:
         return_code = process.wait()
+        self._close_rings()
         with self._lock:
-            for response_id, pending in list(self._pending_responses.items()):
-                if pending is None:
-                    self._pending_responses[response_id] = {
-                        'type': 'response',
-                        'id': response_id,
-                        'ok': False,
-                        'error': f'room process exited with code {return_code}',
-                    }
-            self._response_condition.notify_all()
-
-            if self._log_file is not None:
-                self._log_file.flush()
-                self._log_file.close()
-                self._log_file = None
+            pending_ids = list(self._pending)
+        for request_id in pending_ids:
+            self._fail_pending(request_id, RuntimeError(f'room process exited with code {return_code}'))
 
+        with self._lock:
             if self._finished:
                 return
             reason = f'room_process_exit_{return_code}'
@@ -287,6 +472,15 @@ class RoomWorker:
                 )
             self._mark_finished_locked(reason)
 
+    def _close_rings(self) -> None:
+        with self._write_lock:
+            writer, self._command_writer = self._command_writer, None
+        reader, self._event_reader = self._event_reader, None
+        if writer is not None:
+            writer.ring.close()
+        if reader is not None:
+            reader.ring.close()
+
     def _dispatch_event(self, event_type: str, payload: dict[str, Any]) -> None:
         if self._on_event is None:
             return
@@ -297,3 +491,11 @@ class RoomWorker:
                 f'[ROOM_WORKER] event_callback_failed room_id={self.room_id} '
                 f'event={event_type} error={exc}'
             )
+
+
+def _terminate_process(process: subprocess.Popen[bytes]) -> None:
+    process.terminate()
+    try:
+        process.wait(timeout=2)
+    except subprocess.TimeoutExpired:
+        process.kill()
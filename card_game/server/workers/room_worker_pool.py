@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+from threading import Event, RLock, Thread
+from time import monotonic, perf_counter_ns
+from typing import Any, Callable
+from uuid import uuid4
+
+from ..latency_stats import percentile_ms
+from .room_worker import RoomTransportMode, RoomWorker
+
+# Assignment latencies kept for the percentile metrics.
+ASSIGN_SAMPLE_LIMIT = 1024
+
+
+@dataclass
+class _Standby:
+    worker: RoomWorker
+    spawned_at: float
+    ready_at: float | None = None
+
+
+class RoomWorkerPool:
+    """Keeps fully imported room worker processes idle until a match needs one.
+
+    A standby process has already paid for interpreter start and the Flask,
+    gevent and catalog imports; ``acquire`` hands it a room with one
+    ``assign_room`` pipe command. A background thread keeps ``size`` standbys
+    ready, replaces any older than ``max_age_seconds``, and lets the pool
+    drain to empty once no match has been assigned for ``max_idle_seconds``
+    (refilling on the next assignment). Zero disables either limit.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        *,
+        host: str,
+        port: int,
+        transport_mode: RoomTransportMode,
+        max_idle_seconds: float = 0.0,
+        max_age_seconds: float = 0.0,
+        refill_interval_seconds: float = 1.0,
+        boot_timeout_seconds: float = 30.0,
+        worker_factory: Callable[..., RoomWorker] = RoomWorker,
+    ) -> None:
+        self.size = max(0, size)
+        self.host = host
+        self.port = port
+        self.transport_mode: RoomTransportMode = transport_mode
+        self.max_idle_seconds = max(0.0, max_idle_seconds)
+        self.max_age_seconds = max(0.0, max_age_seconds)
+        self.refill_interval_seconds = refill_interval_seconds
+        self.boot_timeout_seconds = boot_timeout_seconds
+        self._worker_factory = worker_factory
+        self._lock = RLock()
+        self._idle: deque[_Standby] = deque()
+        self._booting: list[_Standby] = []
+        self._last_demand_at = monotonic()
+        self._wake_event = Event()
+        self._stop_event = Event()
+        self._thread: Thread | None = None
+        self._assign_ns: deque[int] = deque(maxlen=ASSIGN_SAMPLE_LIMIT)
+        self._warm_hits = 0
+        self._cold_misses = 0
+        self._spawned = 0
+        self._boot_failures = 0
+        self._retired_idle = 0
+        self._retired_age = 0
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = Thread(target=self._run, name='room-worker-pool', daemon=True)
+            self._thread.start()
+
+    def shutdown(self) -> None:
+        self._stop_event.set()
+        self._wake_event.set()
+        with self._lock:
+            standbys = list(self._idle) + self._booting
+            self._idle.clear()
+            self._booting = []
+        for standby in standbys:
+            standby.worker.stop('standby_pool_shutdown')
+
+    def acquire(
+        self,
+        *,
+        room_id: str,
+        player_session_ids: tuple[str, str],
+        host: str,
+        port: int,
+        p1_username: str,
+        p2_username: str,
+        p1_selected_cards: list[str] | None,
+        p2_selected_cards: list[str] | None,
+        transport_mode: RoomTransportMode,
+        on_finished: Callable[[str, str], None],
+        on_event: Callable[[str, str, dict[str, Any]], None] | None = None,
+    ) -> RoomWorker | None:
+        """Assign the room to a warm worker, or return None so the caller cold-starts one."""
+        _ = (host, port, transport_mode)
+        began = perf_counter_ns()
+        with self._lock:
+            self._last_demand_at = monotonic()
+        self._wake_event.set()
+
+        while True:
+            with self._lock:
+                standby = self._idle.popleft() if self._idle else None
+                if standby is None:
+                    self._cold_misses += 1
+                    return None
+            try:
+                standby.worker.assign_room(
+                    room_id,
+                    player_session_ids,
+                    p1_username,
+                    p2_username,
+                    p1_selected_cards,
+                    p2_selected_cards,
+                    on_finished=on_finished,
+                    on_event=on_event,
+                )
+            except Exception as exc:
+                print(f'[ROOM_POOL] assign_failed room_id={room_id} error={exc}')
+                standby.worker.stop('standby_assign_failed')
+                continue
+
+            elapsed_ns = perf_counter_ns() - began
+            with self._lock:
+                self._warm_hits += 1
+                self._assign_ns.append(elapsed_ns)
+            print(f'[ROOM_POOL] warm_assigned room_id={room_id} assign_ms={elapsed_ns / 1e6:.2f}')
+            return standby.worker
+
+    def refill(self) -> None:
+        """Retire expired standbys, spawn replacements, and wait for new ones to boot."""
+        now = monotonic()
+        retired: list[tuple[_Standby, str]] = []
+        spawned: list[_Standby] = []
+        with self._lock:
+            quiet = self.max_idle_seconds > 0 and now - self._last_demand_at > self.max_idle_seconds
+            kept: deque[_Standby] = deque()
+            for standby in self._idle:
+                if self.max_age_seconds > 0 and now - standby.spawned_at > self.max_age_seconds:
+                    self._retired_age += 1
+                    retired.append((standby, 'standby_max_age'))
+                elif quiet:
+                    self._retired_idle += 1
+                    retired.append((standby, 'standby_max_idle'))
+                else:
+                    kept.append(standby)
+            self._idle = kept
+
+            target = 0 if quiet else self.size
+            for _ in range(target - len(self._idle) - len(self._booting)):
+                standby = _Standby(
+                    worker=self._worker_factory(
+                        room_id=f'standby-{uuid4().hex[:8]}',
+                        player_session_ids=('', ''),
+                        host=self.host,
+                        port=self.port,
+                        p1_username='',
+                        p2_username='',
+                        p1_selected_cards=None,
+                        p2_selected_cards=None,
+                        transport_mode=self.transport_mode,
+                        on_finished=self._on_standby_finished,
+                        standby=True,
+                    ),
+                    spawned_at=now,
+                )
+                self._booting.append(standby)
+                self._spawned += 1
+                spawned.append(standby)
+
+        # Process start and stop happen outside the pool lock so acquire never waits on them.
+        for standby, reason in retired:
+            standby.worker.stop(reason)
+        for standby in spawned:
+            standby.worker.start()
+
+        with self._lock:
+            booting = list(self._booting)
+        for standby in booting:
+            try:
+                standby.worker.request('health', {}, timeout_seconds=self.boot_timeout_seconds)
+            except Exception as exc:
+                print(f'[ROOM_POOL] standby_boot_failed room_id={standby.worker.room_id} error={exc}')
+                with self._lock:
+                    self._boot_failures += 1
+                    if standby in self._booting:
+                        self._booting.remove(standby)
+                standby.worker.stop('standby_boot_failed')
+                continue
+            with self._lock:
+                if standby in self._booting:
+                    self._booting.remove(standby)
+                    standby.ready_at = monotonic()
+                    self._idle.append(standby)
+
+    def metrics(self) -> dict[str, Any]:
+        with self._lock:
+            requests = self._warm_hits + self._cold_misses
+            samples = list(self._assign_ns)
+            return {
+                'size': self.size,
+                'idle': len(self._idle),
+                'booting': len(self._booting),
+                'warm_hits': self._warm_hits,
+                'cold_misses': self._cold_misses,
+                'warm_hit_rate': (self._warm_hits / requests) if requests else None,
+                'assign_p50_ms': percentile_ms(samples, 0.50),
+                'assign_p99_ms': percentile_ms(samples, 0.99),
+                'spawned': self._spawned,
+                'boot_failures': self._boot_failures,
+                'retired_idle': self._retired_idle,
+                'retired_age': self._retired_age,
+                'max_idle_seconds': self.max_idle_seconds,
+                'max_age_seconds': self.max_age_seconds,
+            }
+
+    def _on_standby_finished(self, room_id: str, reason: str) -> None:
+        # Only called while the process is still a standby; assigned workers
+        # report to the router instead.
+        with self._lock:
+            self._idle = deque(standby for standby in self._idle if standby.worker.room_id != room_id)
+            self._booting = [standby for standby in self._booting if standby.worker.room_id != room_id]
+        if not reason.startswith('standby_'):
+            print(f'[ROOM_POOL] standby_exited room_id={room_id} reason={reason!r}')
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                self.refill()
+            except Exception as exc:
+                print(f'[ROOM_POOL] refill_failed error={exc}')
+            self._wake_event.wait(timeout=self.refill_interval_seconds)
+            self._wake_event.clear()
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+from typing import Any, BinaryIO, Iterable, Iterator
+import mmap
+import os
+
+from .pipe_framing import FrameDecoder, PipeDesyncError, PipeFrameError, PipeFraming, encode_message
+
+# Router setting: bytes in each direction's ring; unset or 0 keeps plain pipes.
+RING_BYTES_ENV = 'ROOM_PIPE_RING_BYTES'
+# Set by the router on the child: "<commands fd>,<events fd>", inherited descriptors.
+RING_FDS_ENV = 'ROOM_PIPE_RING_FDS'
+# Consumers also check their ring this often, in case a doorbell was missed.
+RING_POLL_SECONDS = 0.05
+# Pipe message that only says "the ring has data"; never handed to callers.
+RING_DOORBELL = 'ring'
+
+# Header counters, as indexes into the ring's native uint64 view. Each gets
+# its own cache line so producer and consumer do not share one.
+_HEAD = 0
+_TAIL = 8
+_CONSUMER_WAITING = 16
+_PIPE_CONSUMED = 24
+_HEADER_BYTES = 256
+
+
+def ring_bytes_from_env() -> int:
+    """Configured ring size, or 0 when rings are off or this platform has no memfd."""
+    raw = os.getenv(RING_BYTES_ENV, '').strip()
+    if not raw or not hasattr(os, 'memfd_create'):
+        return 0
+    try:
+        return max(0, int(raw))
+    except ValueError:
+        return 0
+
+
+def create_ring_fd(capacity: int) -> int:
+    """Anonymous shared memory for one ring, to be passed to the child with ``pass_fds``.
+
+    The memory is freed once both processes close it, so a crashed router
+    leaves nothing behind in /dev/shm.
+    """
+    fd = os.memfd_create('avge-room-ring', os.MFD_CLOEXEC)
+    os.ftruncate(fd, _HEADER_BYTES + capacity)
+    ring = ShmRing(fd)
+    ring.consumer_waiting = True
+    ring.close()
+    return fd
+
+
+class ShmRing:
+    """Single-producer/single-consumer byte ring in shared memory.
+
+    ``head`` and ``tail`` count bytes ever written and read; only the producer
+    moves head and only the consumer moves tail. The producer copies a frame
+    in before publishing the new head, so the consumer never sees a partial
+    frame.
+    """
+
+    def __init__(self, fd: int) -> None:
+        # mmap keeps its own descriptor; the caller may close ``fd``.
+        self._mmap = mmap.mmap(fd, os.fstat(fd).st_size)
+        self.capacity = len(self._mmap) - _HEADER_BYTES
+        # Aligned 8-byte loads and stores, one C call each.
+        self._header = memoryview(self._mmap)[:_HEADER_BYTES].cast('Q')
+
+    def close(self) -> None:
+        self._header.release()
+        self._mmap.close()
+
+    @property
+    def consumer_waiting(self) -> bool:
+        return self._header[_CONSUMER_WAITING] != 0
+
+    @consumer_waiting.setter
+    def consumer_waiting(self, waiting: bool) -> None:
+        self._header[_CONSUMER_WAITING] = 1 if waiting else 0
+
+    @property
+    def pipe_consumed(self) -> int:
+        return self._header[_PIPE_CONSUMED]
+
+    @pipe_consumed.setter
+    def pipe_consumed(self, count: int) -> None:
+        self._header[_PIPE_CONSUMED] = count
+
+    def is_empty(self) -> bool:
+        header = self._header
+        return header[_HEAD] == header[_TAIL]
+
+    def try_write(self, frame: bytes) -> bool:
+        """Copy ``frame`` in whole, or return False if it does not fit right now."""
+        header = self._header
+        head = header[_HEAD]
+        size = len(frame)
+        if size > self.capacity - (head - header[_TAIL]):
+            return False
+        start = head % self.capacity
+        first = min(size, self.capacity - start)
+        self._mmap[_HEADER_BYTES + start:_HEADER_BYTES + start + first] = frame[:first]
+        if first < size:
+            self._mmap[_HEADER_BYTES:_HEADER_BYTES + size - first] = frame[first:]
+        header[_HEAD] = head + size
+        return True
+
+    def read_available(self) -> bytes:
+        """Take every published byte."""
+        header = self._header
+        tail = header[_TAIL]
+        size = header[_HEAD] - tail
+        if size == 0:
+            return b''
+        start = tail % self.capacity
+        end = start + size
+        if end <= self.capacity:
+            data = self._mmap[_HEADER_BYTES + start:_HEADER_BYTES + end]
+        else:
+            data = self._mmap[_HEADER_BYTES + start:] + self._mmap[_HEADER_BYTES:_HEADER_BYTES + end - self.capacity]
+        header[_TAIL] = tail + size
+        return data
+
+
+class RingWriter:
+    """Producer end of one direction: frames go through the ring, or the pipe when it is full.
+
+    Order across the two is kept by one rule: the ring is only used once the
+    consumer has handled every message this writer put on the pipe. The
+    consumer drains the ring before each pipe message, so everything arrives
+    in the order it was written.
+    """
+
+    def __init__(self, ring: ShmRing, framing: PipeFraming) -> None:
+        self.ring = ring
+        self._pipe_sent = 0
+        self._doorbell = encode_message({'type': RING_DOORBELL}, framing)
+        self.ring_frames = 0
+        self.pipe_frames = 0
+        self.doorbells = 0
+
+    def write(self, pipe: BinaryIO, frames: Iterable[bytes]) -> None:
+        """Send ``frames`` in order; the caller serialises writers."""
+        ring = self.ring
+        was_empty = ring.is_empty()
+        wrote_ring = wrote_pipe = False
+        for frame in frames:
+            if not wrote_pipe and self._pipe_sent == ring.pipe_consumed and ring.try_write(frame):
+                wrote_ring = True
+                self.ring_frames += 1
+                continue
+            pipe.write(frame)
+            self._pipe_sent += 1
+            self.pipe_frames += 1
+            wrote_pipe = True
+        # A ring that already held data has a doorbell or a drain on the way.
+        if wrote_ring and not wrote_pipe and was_empty and ring.consumer_waiting:
+            # Carries no message, so it is not counted against the ring rule.
+            pipe.write(self._doorbell)
+            self.doorbells += 1
+            wrote_pipe = True
+        if wrote_pipe:
+            pipe.flush()
+
+
+class RingReader:
+    """Consumer end of one direction; a drop-in for ``FrameDecoder`` on the pipe bytes.
+
+    ``messages`` yields ring and pipe messages in the order the writer sent
+    them. Call ``idle`` before blocking on the pipe again.
+    """
+
+    def __init__(self, ring: ShmRing, framing: PipeFraming) -> None:
+        self.ring = ring
+        self._ring_decoder = FrameDecoder(framing)
+        self._pipe_decoder = FrameDecoder(framing)
+
+    def feed(self, data: bytes) -> None:
+        self._pipe_decoder.feed(data)
+
+    def messages(self) -> Iterator[Any]:
+        ring = self.ring
+        ring.consumer_waiting = False
+        pipe_messages = self._pipe_decoder.messages()
+        while True:
+            # Only pipe bytes already read are decoded below, and the writer
+            # cannot have used the ring since sending those; draining first
+            # keeps every earlier ring message ahead of them.
+            yield from self._ring_messages()
+            try:
+                message = next(pipe_messages)
+            except StopIteration:
+                return
+            except PipeDesyncError:
+                raise
+            except PipeFrameError:
+                ring.pipe_consumed += 1
+                raise
+            if isinstance(message, dict) and message.get('type') == RING_DOORBELL:
+                continue
+            yield message
+            ring.pipe_consumed += 1
+
+    def _ring_messages(self) -> Iterator[Any]:
+        data = self.ring.read_available()
+        if data:
+            self._ring_decoder.feed(data)
+        yield from self._ring_decoder.messages()
+
+    def idle(self) -> bool:
+        """Mark the consumer as waiting; False if data arrived meanwhile and ``messages`` should run again."""
+        ring = self.ring
+        ring.consumer_waiting = True
+        if ring.is_empty():
+            return True
+        ring.consumer_waiting = False
+        return False